@@ -0,0 +1,114 @@
+"""Compare the previous and the scan-oriented parsing of a corpus of .eml files.
+
+Usage: python benchmarks/eml_scan.py [--messages 200] [--attachment-kb 2048] [--repeat 3]
+
+Synthetic messages with a text body and a base64 attachment are written to a
+temporary directory. The previous path parsed each file with BytesParser,
+decoded every part in memory and serialised the message to JSON; the current
+path is Eml in scan-only mode, which spools attachments as it reaches them.
+Peak Python allocations are measured with tracemalloc in a separate pass.
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from email import parser
+from pathlib import Path
+from typing import Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+
+from panhunt.formats.eml import Attachment, Eml  # noqa: E402
+
+
+def write_corpus(directory: str, messages: int, attachment_bytes: int) -> list[str]:
+    attachment = (b'Invoice line ref 4111 1111 1111 1111 total 12.00\n' * (attachment_bytes // 50 + 1))[:attachment_bytes]
+    encoded = base64.encodebytes(attachment)
+    paths = []
+    for index in range(messages):
+        body = f'Hello,\n\nPlease find invoice {index} attached. Card on file 5555 5555 5555 4444.\n' * 20
+        content = (
+            f'From: billing@example.com\nTo: customer{index}@example.com\nSubject: Invoice {index}\n'
+            'MIME-Version: 1.0\nContent-Type: multipart/mixed; boundary="b"\n\n'
+            f'--b\nContent-Type: text/plain; charset=utf-8\n\n{body}\n'
+            f'--b\nContent-Type: application/octet-stream\nContent-Disposition: attachment; filename="invoice{index}.txt"\n'
+            'Content-Transfer-Encoding: base64\n\n'
+        ).encode('utf-8') + encoded + b'--b--\n'
+        path = os.path.join(directory, f'{index:05d}.eml')
+        with open(path, 'wb') as f:
+            f.write(content)
+        paths.append(path)
+    return paths
+
+
+def previous_parse(path: str) -> int:
+    with open(path, 'rb') as f:
+        msg = parser.BytesParser().parsebytes(f.read())
+    body = ''
+    attachments = []
+    for part in msg.walk():
+        if part.is_multipart():
+            continue
+        if part.get_content_disposition() == 'attachment' or part.get_filename():
+            attachments.append(part.get_payload(decode=True))
+        elif part.get_content_type() == 'text/plain':
+            body += part.get_payload(decode=True).decode(part.get_content_charset() or 'utf-8')
+    json.dumps({'filename': path, 'body': body, 'attachments': [str(len(a)) for a in attachments]}, indent=4)
+    return len(body) + sum(len(a) for a in attachments)
+
+
+def scan_parse(path: str) -> int:
+    total = 0
+    for item in Eml(path, scan_only=True).iter_parts():
+        if isinstance(item, Attachment):
+            total += item.Size
+            item.close()
+        else:
+            total += len(item)
+    return total
+
+
+def measure(parse: Callable[[str], int], paths: list[str], repeat: int) -> tuple[float, int, int]:
+    best = float('inf')
+    total = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        total = sum(parse(path) for path in paths)
+        best = min(best, time.perf_counter() - started)
+    tracemalloc.start()
+    for path in paths:
+        parse(path)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak, total
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--messages', type=int, default=200)
+    arg_parser.add_argument('--attachment-kb', type=int, default=2048)
+    arg_parser.add_argument('--repeat', type=int, default=3)
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = write_corpus(directory, args.messages, args.attachment_kb * 1024)
+        size_mb = sum(os.path.getsize(path) for path in paths) / (1024 * 1024)
+        totals = {}
+        for name, parse in (('previous', previous_parse), ('scan', scan_parse)):
+            elapsed, peak, totals[name] = measure(parse, paths, args.repeat)
+            print(f'{name:>8}: {size_mb:8.1f} MB in {elapsed:6.2f} s  {size_mb / elapsed:8.1f} MB/s  '
+                  f'peak {peak / (1024 * 1024):7.1f} MB')
+
+    if totals['previous'] != totals['scan']:
+        sys.exit('decoded sizes differ')
+
+
+if __name__ == '__main__':
+    main()
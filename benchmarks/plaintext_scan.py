@@ -0,0 +1,87 @@
+"""Compare line-by-line and memory-mapped scanning of a large plain-text file.
+
+Usage: python benchmarks/plaintext_scan.py [--size-mb 256] [--repeat 3]
+
+A synthetic log with a PAN on every 500th line is written to a temporary
+directory and scanned by both PlainTextFileScanner paths. The page cache is
+warmed first so both paths measure matching rather than disk reads.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+
+from panhunt.bytesource import ByteSource  # noqa: E402
+from panhunt.config import ScanConfiguration  # noqa: E402
+from panhunt.scanner import PlainTextFileScanner  # noqa: E402
+
+
+def write_log(path: str, size_bytes: int) -> None:
+    line_number = 0
+    written = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        while written < size_bytes:
+            block = []
+            for _ in range(10_000):
+                line_number += 1
+                card = '4111 1111 1111 1111' if line_number % 500 == 0 else 'n/a'
+                block.append(f'2026-10-19T12:00:00Z host{line_number % 64:02d} sshd[{line_number}]: '
+                             f'session opened for user app ref={card} bytes={line_number * 7}\n')
+            text = ''.join(block)
+            f.write(text)
+            written += len(text)
+
+
+def scan_lines(scanner: PlainTextFileScanner, path: str) -> int:
+    return len(scanner._scan_lines(path, 'utf8'))
+
+
+def scan_mapped(scanner: PlainTextFileScanner, path: str) -> int:
+    source = ByteSource(path=path)
+    view = source.view()
+    try:
+        return len(scanner._scan_mapped(view, 'utf8'))
+    finally:
+        view.release()
+        source.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size-mb', type=int, default=256)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    scanner = PlainTextFileScanner(buffer=MagicMock(), config=ScanConfiguration())
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bench.log')
+        write_log(path, args.size_mb * 1024 * 1024)
+        size_mb = os.path.getsize(path) / (1024 * 1024)
+        with open(path, 'rb') as f:
+            while f.read(64 * 1024 * 1024):
+                pass  # warm the page cache
+
+        results = {}
+        for name, scan in (('lines', scan_lines), ('mmap', scan_mapped)):
+            best = float('inf')
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                matches = scan(scanner, path)
+                best = min(best, time.perf_counter() - started)
+            results[name] = matches
+            print(f'{name:>5}: {size_mb:8.1f} MB in {best:6.2f} s  {size_mb / best:8.1f} MB/s  {matches} matches')
+
+        if results['lines'] != results['mmap']:
+            sys.exit(f'match counts differ: {results}')
+
+
+if __name__ == '__main__':
+    main()
@@ -59,15 +59,22 @@ def main() -> None:
     arg_parser.add_argument('-x', dest='exclude_paths', help='paths to exclude from the search, including files or directories (use absolute paths)')
     arg_parser.add_argument('-o', dest='report_dir', help='Report file directory for TXT formatted PAN report', default='./')
     arg_parser.add_argument('-j', dest='json_dir', help='Report file directory for JSON formatted PAN report', default=None)
+    arg_parser.add_argument('-n', dest='ndjson_dir', help='Directory for an NDJSON file streaming each result as it is found', default=None)
     arg_parser.add_argument('-C', dest='config', help='configuration file to use')
     arg_parser.add_argument('-X', dest='exclude_pan', help='PAN to exclude from search')
     arg_parser.add_argument('-w', dest='workers', type=int, default=None, help='Number of worker threads (default: 1)')
     arg_parser.add_argument('-q', dest='quiet', action='store_true', default=False, help='No terminal output')
+    arg_parser.add_argument('-F', dest='full_rescan', action='store_true', default=False,
+                            help='Rescan files the scan state records as unchanged')
+    arg_parser.add_argument('-S', dest='scan_state_dir', default=None,
+                            help='Scan state directory used to skip unchanged files')
 
     args = arg_parser.parse_args()
 
     if args.config:
-        config = ScanConfiguration.from_file(config_file=args.config, quiet=args.quiet or None)
+        config = ScanConfiguration.from_file(config_file=args.config, quiet=args.quiet or None,
+                                             scan_state_dir=args.scan_state_dir,
+                                             full_rescan=args.full_rescan or None)
     elif args.target_path is None:
         arg_parser.print_usage()
         print('No scan target or configuration file specified; no scan was started.')
@@ -78,11 +85,17 @@ def main() -> None:
             target_path=args.target_path,
             report_dir=args.report_dir,
             json_dir=args.json_dir,
+            ndjson_dir=args.ndjson_dir,
             excluded_paths_string=args.exclude_paths,
             excluded_pans_string=args.exclude_pan,
             worker_count=args.workers,
+            scan_state_dir=args.scan_state_dir,
+            full_rescan=args.full_rescan,
             quiet=args.quiet)
 
+    if args.full_rescan and config.scan_state_dir is None:
+        arg_parser.error('-F needs a scan state: use -S or set scanState in the -C configuration file')
+
     result = PanHuntService().scan(config)
     CliPresenter().show(result)
 
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import threading
+from collections import deque
+from typing import Any, Optional
+
+import psutil
+
+from . import panutils
+from .constants import STREAM_CHUNK_SIZE_BYTES
+from .limitedio import FileRangeReader, LimitedReader
+
+
+def default_max_in_flight_bytes() -> int:
+    """Return the default in-flight payload ceiling: half of physical memory."""
+    return max(1, psutil.virtual_memory().total // 2)
+
+
+def payload_footprint(payload: Any, size: Optional[int] = None) -> int:
+    """Return the number of bytes a job payload is charged against the in-flight budget.
+
+    In-memory buffers and spooled streams are charged their full size. Lazy
+    decompression streams and file ranges are charged one read chunk, which is
+    the working set a scanner holds while consuming them.
+    """
+    if payload is None:
+        return 0
+    if isinstance(payload, (bytes, bytearray)):
+        return len(payload)
+    if isinstance(payload, memoryview):
+        return payload.nbytes
+    if isinstance(payload, (LimitedReader, FileRangeReader)):
+        return STREAM_CHUNK_SIZE_BYTES
+    if size is not None:
+        return size
+    if panutils.is_seekable_file_like(payload):
+        try:
+            position = payload.tell()
+            payload.seek(0, 2)
+            end = payload.tell()
+            payload.seek(position)
+            return end
+        except (OSError, IOError):
+            pass
+    return STREAM_CHUNK_SIZE_BYTES
+
+
+class ByteAdmissionController:
+    """Fair byte semaphore bounding the payload bytes held by queued and running jobs.
+
+    Producers acquire bytes when they create a payload and the buffer releases
+    them when the owning job completes. Waiters are admitted strictly in arrival
+    order. A request is always admitted when nothing else is in flight, and the
+    head waiter is admitted over capacity when every running job is itself
+    blocked here, because no consumer could release bytes otherwise.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        if capacity < 1:
+            raise ValueError('capacity must be a positive integer')
+        self._capacity = capacity
+        self._in_flight = 0
+        self._active_jobs = 0
+        self._blocked_consumers = 0
+        self._next_ticket = 0
+        self._waiters: deque[int] = deque()
+        self._condition = threading.Condition()
+        self._local = threading.local()
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def in_flight(self) -> int:
+        with self._condition:
+            return self._in_flight
+
+    def acquire(self, byte_count: int) -> int:
+        """Block until ``byte_count`` bytes are admitted and return the amount reserved."""
+        if byte_count <= 0:
+            return 0
+        with self._condition:
+            ticket = self._next_ticket
+            self._next_ticket += 1
+            self._waiters.append(ticket)
+            consumer = getattr(self._local, 'active', 0) > 0
+            if consumer:
+                self._blocked_consumers += 1
+                self._condition.notify_all()
+            try:
+                while not self._can_admit(ticket, byte_count):
+                    self._condition.wait()
+                self._in_flight += byte_count
+            finally:
+                self._waiters.remove(ticket)
+                if consumer:
+                    self._blocked_consumers -= 1
+                self._condition.notify_all()
+        return byte_count
+
+    def release(self, byte_count: int) -> None:
+        if byte_count <= 0:
+            return
+        with self._condition:
+            self._in_flight = max(0, self._in_flight - byte_count)
+            self._condition.notify_all()
+
+    def job_started(self) -> None:
+        """Record that the calling thread is now running a job."""
+        with self._condition:
+            self._active_jobs += 1
+        self._local.active = getattr(self._local, 'active', 0) + 1
+
+    def job_finished(self) -> None:
+        """Record that the calling thread finished a job and wake any waiters."""
+        self._local.active = max(0, getattr(self._local, 'active', 0) - 1)
+        with self._condition:
+            self._active_jobs = max(0, self._active_jobs - 1)
+            self._condition.notify_all()
+
+    def _can_admit(self, ticket: int, byte_count: int) -> bool:
+        if self._waiters[0] != ticket:
+            return False
+        if self._in_flight == 0 or self._in_flight + byte_count <= self._capacity:
+            return True
+        return self._active_jobs > 0 and self._blocked_consumers >= self._active_jobs
@@ -11,6 +11,9 @@
 from zipfile import ZipFile, ZipInfo
 
 from . import panutils
+from .admission import ByteAdmissionController, payload_footprint
+from .bytesource import ByteSource
+from .dedup import new_digest
 from .exceptions import PANHuntException
 from .job import Job
 from .limitedio import LimitedReader, spool_limited
@@ -32,15 +35,19 @@ def __init__(
             max_members: int = 10_000,
             compression_ratio_limit: int = 100,
             max_path_length: int = 4096,
-            spool_threshold: int = 8 * 1024 * 1024) -> None:
+            spool_threshold: int = 8 * 1024 * 1024,
+            admission: Optional[ByteAdmissionController] = None,
+            source: Optional[ByteSource] = None) -> None:
         self.path = path
         self.payload = payload
+        self.source = source if source is not None else ByteSource.from_payload(path, payload)
         self.size_limit = size_limit
         self.context = context
         self.max_members = max_members
         self.compression_ratio_limit = compression_ratio_limit
         self.max_path_length = max_path_length
         self.spool_threshold = spool_threshold
+        self.admission = admission
 
     def get_children(self) -> tuple[list[Job], Optional[PANHuntException]]:
         raise NotImplementedError()
@@ -60,21 +67,37 @@ def _validate_path_length(self, member_path: str) -> Optional[PANHuntException]:
             )
         return None
 
+    def _open_source(self) -> Union[str, IO[bytes]]:
+        """Return the container as a path, or as a rewound reader that shares the payload's memory."""
+        if self.source.kind == ByteSource.PATH:
+            return self.path
+        return self.source.open()
+
     def _child_context(self, basename: str, payload_size: int = 0) -> Optional[ScanContext]:
         return self.context.child(basename=basename, payload_size=payload_size) if self.context else None
 
-    def _spool_child(self, stream: IO[bytes], basename: str) -> tuple[IO[bytes], int, Optional[ScanContext]]:
-        payload, size = spool_limited(stream, self.size_limit, spool_threshold=self.spool_threshold)
+    def _spool_child(self, stream: IO[bytes], basename: str) -> tuple[IO[bytes], int, Optional[ScanContext], bytes]:
+        """Spool a member, returning its payload, size, context and content hash."""
+        digest = new_digest()
+        payload, size = spool_limited(stream, self.size_limit, spool_threshold=self.spool_threshold, digest=digest)
         try:
             context = self._child_context(basename, size)
-            return payload, size, context
+            return payload, size, context, digest.digest()
         except Exception:
             payload.close()
             raise
 
-    @staticmethod
-    def _close_children(children: list[Job]) -> None:
+    def _reserve(self, payload: Union[bytes, IO[bytes]], size: Optional[int] = None) -> int:
+        """Charge a newly created child payload against the shared in-flight byte budget."""
+        if self.admission is None:
+            return 0
+        return self.admission.acquire(payload_footprint(payload, size))
+
+    def _close_children(self, children: list[Job]) -> None:
         for child in children:
+            if self.admission is not None:
+                self.admission.release(child.reserved_bytes)
+                child.reserved_bytes = 0
             payload = child.payload
             if panutils.is_file_like(payload):
                 close = getattr(payload, 'close', None)
@@ -107,14 +130,7 @@ def get_children(self) -> tuple[list[Job], Optional[PANHuntException]]:
         children: list[Job] = []
         total_size = 0
         try:
-            if isinstance(self.payload, bytes):
-                zip_source = BytesIO(self.payload)
-            elif self.payload is not None:
-                payload_stream = cast(IO[bytes], self.payload)
-                payload_stream.seek(0)
-                zip_source = payload_stream
-            else:
-                zip_source = self.path
+            zip_source = self._open_source()
             with ZipFile(zip_source, 'r') as zip_ref:
                 infos = zip_ref.infolist()
                 if len(infos) > self.max_members:
@@ -128,13 +144,15 @@ def get_children(self) -> tuple[list[Job], Optional[PANHuntException]]:
                         self._close_children(children)
                         return [], limit_error
                     with zip_ref.open(file_info) as file:
-                        payload, payload_size, child_context = self._spool_child(file, file_info.filename)
+                        payload, payload_size, child_context, content_hash = self._spool_child(file, file_info.filename)
                     total_size += payload_size
                     children.append(Job(
                         basename=file_info.filename,
                         dirname=self.path,
                         payload=payload,
-                        context=child_context))
+                        context=child_context,
+                        reserved_bytes=self._reserve(payload, payload_size),
+                        content_hash=content_hash))
         except PANHuntException as ex:
             self._close_children(children)
             return [], ex
@@ -161,14 +179,7 @@ def get_children(self) -> tuple[list[Job], Optional[PANHuntException]]:
         children: list[Job] = []
         total_size = 0
         try:
-            if isinstance(self.payload, bytes):
-                zip_source = BytesIO(self.payload)
-            elif self.payload is not None:
-                payload_stream = cast(IO[bytes], self.payload)
-                payload_stream.seek(0)
-                zip_source = payload_stream
-            else:
-                zip_source = self.path
+            zip_source = self._open_source()
 
             with ZipFile(zip_source, 'r') as zip_ref:
                 infos = zip_ref.infolist()
@@ -191,7 +202,7 @@ def get_children(self) -> tuple[list[Job], Optional[PANHuntException]]:
                         return [], limit_error
 
                     with zip_ref.open(file_info) as file:
-                        payload, payload_size, child_context = self._spool_child(file, file_info.filename)
+                        payload, payload_size, child_context, content_hash = self._spool_child(file, file_info.filename)
                     total_size += payload_size
 
                     if file_info.filename in self._TEXT_XML_MEMBERS:
@@ -204,14 +215,17 @@ def get_children(self) -> tuple[list[Job], Optional[PANHuntException]]:
                                 basename=text_basename,
                                 dirname=self.path,
                                 payload=text_stream,
-                                context=self._child_context(text_basename, len(text_payload))))
+                                context=self._child_context(text_basename, len(text_payload)),
+                                reserved_bytes=self._reserve(text_stream, len(text_payload))))
                         continue
 
                     children.append(Job(
                         basename=file_info.filename,
                         dirname=self.path,
                         payload=payload,
-                        context=child_context))
+                        context=child_context,
+                        reserved_bytes=self._reserve(payload, payload_size),
+                        content_hash=content_hash))
         except PANHuntException as ex:
             self._close_children(children)
             return [], ex
@@ -259,14 +273,11 @@ def get_children(self) -> tuple[list[Job], Optional[PANHuntException]]:
         total_size = 0
 
         try:
-            if isinstance(self.payload, bytes):
-                tar_ref: TarFile = tarfile.open(fileobj=BytesIO(self.payload), mode='r')
-            elif self.payload is not None:
-                payload_stream = cast(IO[bytes], self.payload)
-                payload_stream.seek(0)
-                tar_ref = tarfile.open(fileobj=payload_stream, mode='r')
+            tar_source = self._open_source()
+            if isinstance(tar_source, str):
+                tar_ref: TarFile = tarfile.open(tar_source, 'r')
             else:
-                tar_ref = tarfile.open(self.path, 'r')
+                tar_ref = tarfile.open(fileobj=tar_source, mode='r')
 
             with tar_ref:
                 members: list[TarInfo] = tar_ref.getmembers()
@@ -289,13 +300,15 @@ def get_children(self) -> tuple[list[Job], Optional[PANHuntException]]:
 
                     extracted: Optional[IO[bytes]] = tar_ref.extractfile(file_info)
                     if extracted is not None:
-                        payload, payload_size, child_context = self._spool_child(extracted, file_info.path)
+                        payload, payload_size, child_context, content_hash = self._spool_child(extracted, file_info.path)
                         total_size += payload_size
                         children.append(Job(
                             basename=file_info.path,
                             dirname=self.path,
                             payload=payload,
-                            context=child_context))
+                            context=child_context,
+                            reserved_bytes=self._reserve(payload, payload_size),
+                            content_hash=content_hash))
 
         except PANHuntException as ex:
             self._close_children(children)
@@ -314,16 +327,12 @@ def get_children(self) -> tuple[list[Job], Optional[PANHuntException]]:
         try:
             gz_file: GzipFile
 
-            if isinstance(self.payload, bytes):
-                gz_file = GzipFile(fileobj=BytesIO(self.payload), mode='r')
-                gz_file.name = self.path
-            elif self.payload is not None:
-                payload_stream = cast(IO[bytes], self.payload)
-                payload_stream.seek(0)
-                gz_file = GzipFile(fileobj=payload_stream, mode='r')
-                gz_file.name = self.path
+            gz_source = self._open_source()
+            if isinstance(gz_source, str):
+                gz_file = GzipFile(filename=gz_source, mode='r')
             else:
-                gz_file = GzipFile(filename=self.path, mode='r')
+                gz_file = GzipFile(fileobj=gz_source, mode='r')
+                gz_file.name = self.path
 
             compressed_filename: str = panutils.get_compressed_filename(
                 gz_file)
@@ -334,11 +343,13 @@ def get_children(self) -> tuple[list[Job], Optional[PANHuntException]]:
                 gz_file.close()
                 return [], path_error
             child_context = self._child_context(compressed_filename)
+            reader = cast(IO[bytes], LimitedReader(cast(IO[bytes], gz_file), self.size_limit, self.path, child_context))
             job = Job(
                 basename=compressed_filename,
                 dirname=self.path,
-                payload=cast(IO[bytes], LimitedReader(cast(IO[bytes], gz_file), self.size_limit, self.path, child_context)),
-                context=child_context
+                payload=reader,
+                context=child_context,
+                reserved_bytes=self._reserve(reader)
             )
             return [job], None
         except Exception as ex:
@@ -352,14 +363,7 @@ def get_children(self) -> tuple[list[Job], Optional[PANHuntException]]:
         try:
             xz_file: LZMAFile
 
-            if isinstance(self.payload, bytes):
-                xz_file = LZMAFile(filename=BytesIO(self.payload), mode='r')
-            elif self.payload is not None:
-                payload_stream = cast(IO[bytes], self.payload)
-                payload_stream.seek(0)
-                xz_file = LZMAFile(filename=payload_stream, mode='r')
-            else:
-                xz_file = LZMAFile(filename=self.path, mode='r')
+            xz_file = LZMAFile(filename=self._open_source(), mode='r')
 
             compressed_filename: str = os.path.basename(
                 self.path).replace('.xz', '')
@@ -370,11 +374,13 @@ def get_children(self) -> tuple[list[Job], Optional[PANHuntException]]:
                 xz_file.close()
                 return [], path_error
             child_context = self._child_context(compressed_filename)
+            reader = cast(IO[bytes], LimitedReader(xz_file, self.size_limit, self.path, child_context))
             job = Job(
                 basename=compressed_filename,
                 dirname=self.path,
-                payload=cast(IO[bytes], LimitedReader(xz_file, self.size_limit, self.path, child_context)),
-                context=child_context
+                payload=reader,
+                context=child_context,
+                reserved_bytes=self._reserve(reader)
             )
             return [job], None
         except Exception as ex:
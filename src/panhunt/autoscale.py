@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import logging
+import math
+import os
+import threading
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+import psutil
+
+CGROUP_ROOT = '/sys/fs/cgroup'
+
+
+def available_cpu_count() -> int:
+    """Return the number of CPUs this process may actually use.
+
+    This is the smaller of the scheduler affinity mask and the cgroup v2
+    ``cpu.max`` quota (rounded up), so a systemd ``CPUQuota=60%`` unit or a
+    container limited to two CPUs is not sized by the host core count.
+    """
+    sched_getaffinity = getattr(os, 'sched_getaffinity', None)
+    if callable(sched_getaffinity):
+        try:
+            cpus = len(sched_getaffinity(0))
+        except OSError:
+            cpus = os.cpu_count() or 1
+    else:
+        cpus = os.cpu_count() or 1
+
+    quota = cgroup_cpu_quota()
+    if quota is not None:
+        cpus = min(cpus, math.ceil(quota))
+    return max(1, cpus)
+
+
+def cgroup_cpu_quota(cgroup_root: str = CGROUP_ROOT, proc_cgroup: str = '/proc/self/cgroup') -> Optional[float]:
+    """Return the tightest cgroup v2 CPU quota, in CPUs, from this process' cgroup up to the root.
+
+    Returns None when no quota applies or cgroup v2 is not mounted.
+    """
+    relative = _cgroup_v2_path(proc_cgroup)
+    if relative is None:
+        return None
+
+    quota: Optional[float] = None
+    path = os.path.join(cgroup_root, relative.lstrip('/'))
+    root = os.path.abspath(cgroup_root)
+    while True:
+        limit = _read_cpu_max(os.path.join(path, 'cpu.max'))
+        if limit is not None:
+            quota = limit if quota is None else min(quota, limit)
+        if os.path.abspath(path) == root:
+            break
+        path = os.path.dirname(path)
+    return quota
+
+
+def _cgroup_v2_path(proc_cgroup: str) -> Optional[str]:
+    try:
+        with open(proc_cgroup, 'r', encoding='utf-8') as f:
+            for line in f:
+                # cgroup v2 entries have the form "0::/system.slice/panhunt.service"
+                if line.startswith('0::'):
+                    return line[3:].strip() or '/'
+    except OSError:
+        pass
+    return None
+
+
+def _read_cpu_max(path: str) -> Optional[float]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            fields = f.read().split()
+    except OSError:
+        return None
+    if len(fields) != 2 or fields[0] == 'max':
+        return None
+    try:
+        quota, period = int(fields[0]), int(fields[1])
+    except ValueError:
+        return None
+    if quota <= 0 or period <= 0:
+        return None
+    return quota / period
+
+
+@dataclass(frozen=True)
+class LoadSample:
+    """One autoscaler measurement.
+
+    ``cpu_utilisation`` is this process' CPU time as a fraction of the CPUs it
+    may use (1.0 means the quota is saturated). ``iowait`` is the system-wide
+    fraction of CPU time spent waiting for I/O.
+    """
+
+    cpu_utilisation: float
+    iowait: float
+    queue_depth: int
+
+
+class WorkerAutoscaler:
+    """Periodically resizes the dispatcher's worker pool within configured bounds.
+
+    Workers are added one at a time while jobs are queued and the CPU budget
+    has headroom or workers are waiting on I/O, and removed one at a time when
+    the queue is empty or the process saturates its CPU quota with more
+    workers than CPUs. Every change is logged with the measurements behind it.
+    """
+
+    GROW_BELOW_UTILISATION = 0.75
+    SHRINK_ABOVE_UTILISATION = 0.95
+    IOWAIT_THRESHOLD = 0.20
+
+    def __init__(self,
+                 get_worker_count: Callable[[], int],
+                 resize: Callable[[int], None],
+                 queue_depth: Callable[[], int],
+                 min_workers: int,
+                 max_workers: int,
+                 cpu_limit: Optional[int] = None,
+                 interval_seconds: float = 2.0) -> None:
+        if min_workers < 1 or max_workers < min_workers:
+            raise ValueError('worker bounds must satisfy 1 <= min_workers <= max_workers')
+        self._get_worker_count = get_worker_count
+        self._resize = resize
+        self._queue_depth = queue_depth
+        self.min_workers = min_workers
+        self.max_workers = max_workers
+        self.cpu_limit = cpu_limit if cpu_limit is not None else available_cpu_count()
+        self.interval_seconds = interval_seconds
+        self._process = psutil.Process()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._stop_event.clear()
+        self._process.cpu_percent(None)  # prime the per-process counter
+        psutil.cpu_times_percent(None)
+        self._thread = threading.Thread(target=self._run, name='panhunt-autoscaler', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=self.interval_seconds + 1)
+
+    def sample(self) -> LoadSample:
+        cpu_percent = self._process.cpu_percent(None)
+        times = psutil.cpu_times_percent(None)
+        return LoadSample(
+            cpu_utilisation=cpu_percent / (100.0 * self.cpu_limit),
+            iowait=getattr(times, 'iowait', 0.0) / 100.0,
+            queue_depth=self._queue_depth(),
+        )
+
+    def decide(self, workers: int, sample: LoadSample) -> int:
+        """Return the worker count to move to, one step at a time and within bounds."""
+        target = workers
+        if sample.queue_depth == 0:
+            target = workers - 1
+        elif sample.cpu_utilisation >= self.SHRINK_ABOVE_UTILISATION and workers > self.cpu_limit:
+            target = workers - 1
+        elif sample.queue_depth > workers and (
+                sample.cpu_utilisation < self.GROW_BELOW_UTILISATION or sample.iowait >= self.IOWAIT_THRESHOLD):
+            target = workers + 1
+        return max(self.min_workers, min(self.max_workers, target))
+
+    def step(self) -> int:
+        workers = self._get_worker_count()
+        sample = self.sample()
+        target = self.decide(workers, sample)
+        if target != workers:
+            logging.info(
+                f'Autoscaler: {"growing" if target > workers else "shrinking"} workers {workers} -> {target} '
+                f'(cpu {sample.cpu_utilisation:.0%} of {self.cpu_limit} CPUs, '
+                f'iowait {sample.iowait:.0%}, queue depth {sample.queue_depth})'
+            )
+            self._resize(target)
+        return target
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.interval_seconds):
+            try:
+                self.step()
+            except Exception:
+                logging.error('Autoscaler step failed', exc_info=True)
@@ -3,12 +3,10 @@
 import threading
 import time
 from abc import ABC, abstractmethod
-from queue import Empty, Queue
+from collections import deque
 from typing import Optional
 
-import psutil
-
-from .constants import MEMORY_CHECK_TIMEOUT_SECONDS
+from .admission import ByteAdmissionController, default_max_in_flight_bytes, payload_footprint
 from .job import Job
 
 
@@ -24,13 +22,21 @@ def dequeue(self, timeout: float = 0.1) -> Optional[Job]:
         pass
 
     @abstractmethod
-    def complete_job(self) -> None:
+    def complete_job(self, job: Optional[Job] = None) -> None:
         pass
 
     @abstractmethod
     def mark_input_complete(self) -> None:
         pass
 
+    @abstractmethod
+    def drain(self) -> list[Job]:
+        """Remove and return every job that has not been dequeued yet.
+
+        The buffer stays closed afterwards: jobs enqueued later are not
+        handed to workers but returned by the next ``drain``.
+        """
+
     @abstractmethod
     def is_finished(self) -> bool:
         pass
@@ -39,45 +45,131 @@ def is_finished(self) -> bool:
     def has_jobs(self) -> bool:
         pass
 
+    def queue_depth(self) -> int:
+        """Return the number of jobs waiting to be dequeued."""
+        return 1 if self.has_jobs() else 0
 
-class InMemoryJobBuffer(JobBuffer):
-    """Thread-safe in-memory job buffer."""
+    def release_worker(self) -> None:
+        """Called by a worker thread as it exits, to give up any state the buffer holds for it."""
+
+    @property
+    def admission(self) -> Optional[ByteAdmissionController]:
+        """Byte budget that producers reserve payloads against, or None when not enforced."""
+        return None
 
-    def __init__(self) -> None:
-        self._job_queue: Queue[Job] = Queue()
+
+class InMemoryJobBuffer(JobBuffer):
+    """Thread-safe in-memory job buffer with per-worker work-stealing deques.
+
+    Jobs enqueued by the hunter go to a shared FIFO injection queue. Jobs
+    enqueued by a worker while it runs a job (archive members, attachments)
+    go to that worker's own deque, which the worker pops LIFO so children are
+    scanned while their spooled payloads are still hot and released early.
+    Idle workers steal the oldest job from another worker's deque. Deque
+    pushes and pops are atomic, so the lock only guards counters and wakeups.
+    A worker's deque is unregistered by ``release_worker`` when it exits.
+
+    Every enqueued payload is charged against a shared byte budget until
+    ``complete_job`` releases it, so producers block once the configured
+    in-flight ceiling is reached instead of polling system memory.
+
+    ``drain`` closes the buffer, so children that still-running workers
+    enqueue afterwards are kept for the next ``drain`` rather than lost.
+    """
+
+    def __init__(self, max_in_flight_bytes: Optional[int] = None) -> None:
+        self._admission = ByteAdmissionController(
+            max_in_flight_bytes if max_in_flight_bytes is not None else default_max_in_flight_bytes()
+        )
+        self._injection_queue: deque[Job] = deque()
+        self._worker_queues: list[deque[Job]] = []
+        self._local = threading.local()
         self._jobs_enqueued: int = 0
         self._jobs_processed: int = 0
         self._jobs_in_progress: int = 0
         self._finished: bool = False
+        self._closed: bool = False
+        self._late_jobs: list[Job] = []
         self._lock = threading.Lock()
+        self._job_available = threading.Condition(self._lock)
+
+    @property
+    def admission(self) -> ByteAdmissionController:
+        return self._admission
 
     def enqueue(self, job: Job) -> None:
-        self._ensure_memory_ready(job)
+        self._reserve_payload(job)
+        if job.context is not None:
+            job.context.tree.add()
+        target = self._injection_queue
+        if getattr(self._local, 'running', 0) > 0:
+            target = self._own_queue()
         with self._lock:
-            self._job_queue.put(job)
             self._jobs_enqueued += 1
+            if self._closed:
+                self._late_jobs.append(job)
+                self._jobs_processed += 1
+            else:
+                target.append(job)
+                self._job_available.notify()
+                return
+        self._admission.release(job.reserved_bytes)
+        job.reserved_bytes = 0
 
     def dequeue(self, timeout: float = 0.1) -> Optional[Job]:
-        try:
-            job = self._job_queue.get(timeout=timeout)
-            # self._lock is intentional: Queue's internal lock guards only the
-            # queue itself, not _jobs_in_progress, which is also read/written
-            # by complete_job() and is_finished() under the same lock.
+        own_queue = self._own_queue()
+        job = self._take(own_queue)
+        if job is None:
+            deadline = time.monotonic() + timeout
             with self._lock:
-                self._jobs_in_progress += 1
-            return job
-        except Empty:
-            return None
-
-    def complete_job(self) -> None:
+                while True:
+                    # Re-check under the lock: enqueue appends and notifies
+                    # while holding it, so no wakeup can be missed here.
+                    job = self._take(own_queue)
+                    if job is not None:
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return None
+                    self._job_available.wait(remaining)
+        with self._lock:
+            self._jobs_in_progress += 1
+        self._local.running = getattr(self._local, 'running', 0) + 1
+        self._admission.job_started()
+        return job
+
+    def complete_job(self, job: Optional[Job] = None) -> None:
+        if job is not None:
+            self._admission.release(job.reserved_bytes)
+            job.reserved_bytes = 0
         with self._lock:
             self._jobs_in_progress -= 1
             self._jobs_processed += 1
+        self._local.running = max(0, getattr(self._local, 'running', 0) - 1)
+        self._admission.job_finished()
 
     def mark_input_complete(self) -> None:
         with self._lock:
             self._finished = True
 
+    def drain(self) -> list[Job]:
+        with self._lock:
+            self._closed = True
+            jobs, self._late_jobs = self._late_jobs, []
+            late = len(jobs)
+            for queue in (self._injection_queue, *self._worker_queues):
+                while True:
+                    try:
+                        jobs.append(queue.popleft())
+                    except IndexError:
+                        break
+        for job in jobs[late:]:
+            self._admission.release(job.reserved_bytes)
+            job.reserved_bytes = 0
+        with self._lock:
+            self._jobs_processed += len(jobs) - late
+        return jobs
+
     def is_finished(self) -> bool:
         with self._lock:
             return (
@@ -87,19 +179,55 @@ def is_finished(self) -> bool:
             )
 
     def has_jobs(self) -> bool:
-        return not self._job_queue.empty()
+        return bool(self._injection_queue) or any(self._worker_queues)
 
-    def _ensure_memory_ready(self, job: Job) -> None:
-        if job.payload is None or not isinstance(job.payload, bytes):
-            return
+    def queue_depth(self) -> int:
+        return len(self._injection_queue) + sum(len(queue) for queue in tuple(self._worker_queues))
 
-        size = len(job.payload)
-        if size >= psutil.virtual_memory().total:
-            raise MemoryError(f"Insufficient memory to process job: {job.abspath}")
+    def _own_queue(self) -> deque[Job]:
+        own_queue: Optional[deque[Job]] = getattr(self._local, 'queue', None)
+        if own_queue is None:
+            own_queue = deque()
+            self._local.queue = own_queue
+            with self._lock:
+                self._worker_queues.append(own_queue)
+        return own_queue
 
-        sleep_time = 0.0
-        while size >= psutil.virtual_memory().available / 2:
-            sleep_time += 0.1
-            if sleep_time >= MEMORY_CHECK_TIMEOUT_SECONDS:
-                raise MemoryError(f"Insufficient memory to process job: {job.abspath}")
-            time.sleep(0.1)
+    def release_worker(self) -> None:
+        """Unregister the calling thread's deque, moving jobs left in it to the injection queue."""
+        own_queue: Optional[deque[Job]] = getattr(self._local, 'queue', None)
+        if own_queue is None:
+            return
+        self._local.queue = None
+        with self._lock:
+            self._worker_queues.remove(own_queue)
+            if own_queue:
+                while True:
+                    try:
+                        self._injection_queue.append(own_queue.popleft())
+                    except IndexError:
+                        break
+                self._job_available.notify_all()
+
+    def _take(self, own_queue: deque[Job]) -> Optional[Job]:
+        try:
+            return own_queue.pop()
+        except IndexError:
+            pass
+        try:
+            return self._injection_queue.popleft()
+        except IndexError:
+            pass
+        for victim in tuple(self._worker_queues):
+            if victim is own_queue:
+                continue
+            try:
+                return victim.popleft()
+            except IndexError:
+                continue
+        return None
+
+    def _reserve_payload(self, job: Job) -> None:
+        if job.reserved_bytes:
+            return  # already charged by the producer that created the payload
+        job.reserved_bytes = self._admission.acquire(payload_footprint(job.payload))
@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+import io
+import mmap
+import os
+from typing import IO, Any, Optional, Union
+
+from .signatures import SNIFF_BYTES
+
+Buffer = Union[bytes, bytearray, memoryview, mmap.mmap]
+
+
+class ByteSource:
+    """Read-only access to job content held as a file path, a buffer or a stream.
+
+    A buffer may be ``bytes``, ``bytearray``, ``memoryview`` or ``mmap``. The
+    size and the leading bytes used for content sniffing are read once and
+    cached, so size checks, MIME detection, ZIP validation and findings no
+    longer seek and re-read the payload each. Buffers and files are exposed as
+    memoryview slices and readers over the same memory without copying; files
+    are memory-mapped on first use. Streams stay owned by the caller and are
+    never closed here.
+    """
+
+    PATH = 'path'
+    BUFFER = 'buffer'
+    STREAM = 'stream'
+
+    def __init__(self,
+                 path: Optional[str] = None,
+                 buffer: Optional[Buffer] = None,
+                 stream: Optional[IO[bytes]] = None) -> None:
+        if sum(value is not None for value in (path, buffer, stream)) != 1:
+            raise ValueError('ByteSource needs exactly one of path, buffer or stream')
+        self.path = path
+        self._buffer = buffer
+        self._stream = stream
+        self._stat: Optional[os.stat_result] = None
+        self._size: Optional[int] = None
+        self._size_known = False
+        self._header: Optional[bytes] = None
+        self._mmap: Optional[mmap.mmap] = None
+        self._stream_bytes: Optional[bytes] = None
+
+    @classmethod
+    def from_payload(cls, path: str, payload: Any = None) -> 'ByteSource':
+        """Wrap a job payload, or the file at ``path`` when there is no payload."""
+        if payload is None:
+            return cls(path=path)
+        if isinstance(payload, (bytes, bytearray, memoryview, mmap.mmap)):
+            return cls(buffer=payload)
+        if callable(getattr(payload, 'read', None)):
+            return cls(stream=payload)
+        raise TypeError(f'Unsupported payload type: {type(payload).__name__}')
+
+    @property
+    def kind(self) -> str:
+        if self.path is not None:
+            return self.PATH
+        if self._buffer is not None:
+            return self.BUFFER
+        return self.STREAM
+
+    @property
+    def stream(self) -> Optional[IO[bytes]]:
+        return self._stream
+
+    def stat(self) -> os.stat_result:
+        """Return the file's stat result, taken once. Only valid for path sources."""
+        if self.path is None:
+            raise TypeError('stat() requires a path source')
+        if self._stat is None:
+            self._stat = os.stat(self.path)
+        return self._stat
+
+    @property
+    def size(self) -> Optional[int]:
+        """Size in bytes, or None when a stream cannot report it without being consumed."""
+        if not self._size_known:
+            self._size = self._measure_size()
+            self._size_known = True
+        return self._size
+
+    def _measure_size(self) -> Optional[int]:
+        if self.path is not None:
+            return self.stat().st_size
+        if self._buffer is not None:
+            return len(self._buffer)
+        stream = self._stream
+        seekable = getattr(stream, 'seekable', None)
+        seek = getattr(stream, 'seek', None)
+        tell = getattr(stream, 'tell', None)
+        # Older SpooledTemporaryFile implementations lack seekable() but can seek.
+        if (callable(seekable) and not seekable()) or not callable(seek) or not callable(tell):
+            return None
+        try:
+            position = tell()
+            seek(0, os.SEEK_END)
+            size = tell()
+            seek(position)
+        except (OSError, ValueError, io.UnsupportedOperation):
+            return None
+        return size
+
+    def sniff_header(self) -> tuple[bytes, bool]:
+        """Return the first ``SNIFF_BYTES`` and whether they are the whole content."""
+        if self._header is None:
+            if self._buffer is not None:
+                self._header = bytes(memoryview(self._buffer)[:SNIFF_BYTES + 1])
+            elif self.path is not None:
+                with open(self.path, 'rb') as file:
+                    self._header = file.read(SNIFF_BYTES + 1)
+            else:
+                self._header = self._read_stream_prefix(SNIFF_BYTES + 1)
+        return self._header[:SNIFF_BYTES], len(self._header) <= SNIFF_BYTES
+
+    def _read_stream_prefix(self, size: int) -> bytes:
+        stream = self._stream
+        assert stream is not None
+        self._rewind()
+        data = stream.read(size)
+        self._rewind()
+        return bytes(data) if data else b''
+
+    def _rewind(self) -> None:
+        seek = getattr(self._stream, 'seek', None)
+        if callable(seek):
+            try:
+                seek(0)
+            except (OSError, io.UnsupportedOperation):
+                pass  # non-seekable stream; read from current position
+
+    def view(self, start: int = 0, end: Optional[int] = None) -> memoryview:
+        """Return a memoryview over the content without copying buffers or files.
+
+        Files are memory-mapped; streams are read into memory once. Files that
+        another process may truncate meanwhile, such as live logs, must be read
+        through a ``FileSlices`` instead.
+        """
+        if self._buffer is not None:
+            return memoryview(self._buffer)[start:end]
+        if self.path is not None:
+            mapped = self._map()
+            return (memoryview(mapped) if mapped is not None else memoryview(b''))[start:end]
+        return memoryview(self._read_stream())[start:end]
+
+    def _map(self) -> Optional[mmap.mmap]:
+        if self._mmap is None:
+            assert self.path is not None
+            with open(self.path, 'rb') as file:
+                if os.fstat(file.fileno()).st_size == 0:
+                    return None  # empty files cannot be mapped
+                self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._mmap
+
+    def _read_stream(self) -> bytes:
+        if self._stream_bytes is None:
+            assert self._stream is not None
+            self._rewind()
+            data = self._stream.read()
+            self._stream_bytes = bytes(data) if not isinstance(data, bytes) else data
+        return self._stream_bytes
+
+    def open(self) -> IO[bytes]:
+        """Return a seekable binary reader positioned at the start of the content.
+
+        Path sources open a new file object that the caller must close. Stream
+        sources return the underlying stream itself, rewound.
+        """
+        if self._buffer is not None:
+            return BufferReader(memoryview(self._buffer))
+        if self.path is not None:
+            return open(self.path, 'rb')
+        self._rewind()
+        return self._stream  # type: ignore[return-value]
+
+    def to_bytes(self) -> bytes:
+        """Return the whole content as ``bytes``; ``bytes`` buffers are returned as is."""
+        if isinstance(self._buffer, bytes):
+            return self._buffer
+        if self._buffer is not None:
+            return bytes(self._buffer)
+        if self.path is not None:
+            with open(self.path, 'rb') as file:
+                return file.read()
+        if self._stream_bytes is not None:
+            return self._stream_bytes
+        assert self._stream is not None
+        self._rewind()
+        data = self._stream.read()
+        return data if isinstance(data, bytes) else bytes(data)
+
+    def close(self) -> None:
+        """Release memory maps and cached stream content; the payload itself is left open."""
+        self._stream_bytes = None
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                pass  # a view is still exported; the mapping is released with it
+            self._mmap = None
+
+
+class FileSlices:
+    """Sliceable view of a file that is read instead of memory-mapped.
+
+    For files another process may append to or truncate while they are
+    scanned, such as live logs: reading a mapping past the new end of a
+    truncated file raises SIGBUS and kills the process, while a read just
+    returns fewer bytes. The length is taken when the file is opened; each
+    slice is read with one ``pread`` and may be shorter than requested.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._file = open(path, 'rb')
+        self._length = os.fstat(self._file.fileno()).st_size
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, key: slice) -> memoryview:
+        start, stop, _ = key.indices(self._length)
+        if stop <= start:
+            return memoryview(b'')
+        return memoryview(os.pread(self._file.fileno(), stop - start, start))
+
+    def release(self) -> None:
+        self._file.close()
+
+
+class BufferReader(io.RawIOBase):
+    """Seekable binary reader over a memoryview that does not copy the buffer up front."""
+
+    def __init__(self, view: memoryview) -> None:
+        super().__init__()
+        self._view = view.cast('B') if view.format != 'B' or view.ndim != 1 else view
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        if whence == os.SEEK_SET:
+            position = offset
+        elif whence == os.SEEK_CUR:
+            position = self._position + offset
+        elif whence == os.SEEK_END:
+            position = len(self._view) + offset
+        else:
+            raise ValueError(f'invalid whence ({whence})')
+        if position < 0:
+            raise ValueError(f'negative seek position {position}')
+        self._position = position
+        return position
+
+    def read(self, size: Optional[int] = -1) -> bytes:
+        start = min(self._position, len(self._view))
+        end = len(self._view) if size is None or size < 0 else min(start + size, len(self._view))
+        self._position = end
+        return self._view[start:end].tobytes()
+
+    def readall(self) -> bytes:
+        return self.read(-1)
+
+    def readinto(self, buffer: Any) -> int:
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
@@ -5,6 +5,9 @@
 import time
 from typing import Optional
 
+from .admission import default_max_in_flight_bytes
+from .autoscale import available_cpu_count
+
 
 class ScanConfiguration:
     """Configuration for a single scan session. Created once and injected into all components."""
@@ -12,10 +15,22 @@ class ScanConfiguration:
     target_path: Optional[str]
     report_dir: str
     json_dir: Optional[str]
+    ndjson_dir: Optional[str]
+    mime_cache_dir: Optional[str]
+    mime_cache_max_entries: int
+    mime_cache_max_age_days: int
+    log_state_dir: Optional[str]
+    scan_state_dir: Optional[str]
+    scan_state_hash: bool
+    full_rescan: bool
     excluded_paths: list[str]
     excluded_pans: list[str]
     size_limit: int
     worker_count: int
+    autoscale_workers: bool
+    min_worker_count: int
+    max_worker_count: int
+    max_runtime_seconds: int
     max_scan_depth: int
     max_child_jobs: int
     max_total_expanded_bytes: int
@@ -23,6 +38,13 @@ class ScanConfiguration:
     max_archive_compression_ratio: int
     max_archive_path_length: int
     archive_spool_threshold: int
+    range_split_threshold: int
+    range_size: int
+    mbox_split_threshold: int
+    mbox_batch_messages: int
+    maildir_batch_messages: int
+    content_cache_entries: int
+    max_in_flight_bytes: int
     max_attachment_size: int
     max_attachments_per_message: int
     max_total_attachment_bytes: int
@@ -35,6 +57,7 @@ class ScanConfiguration:
     quiet: bool
     report_file: str
     json_file: str
+    ndjson_file: str
 
     def __init__(self) -> None:
         self.target_path = None
@@ -47,9 +70,21 @@ def __init__(self) -> None:
         self.file_path = None
         self.report_dir = os.getcwd()
         self.json_dir = None
+        self.ndjson_dir = None
+        self.mime_cache_dir = None  # no persistent MIME cache
+        self.mime_cache_max_entries = 1_000_000
+        self.mime_cache_max_age_days = 30
+        self.log_state_dir = None  # plain-text files are always scanned in full
+        self.scan_state_dir = None  # every file is scanned on every run
+        self.scan_state_hash = False
+        self.full_rescan = False
         self.excluded_pans = []
         self.size_limit = 8 * 1_073_741_824  # 8GB
-        self.worker_count = os.cpu_count() or 1
+        self.worker_count = available_cpu_count()
+        self.autoscale_workers = False
+        self.min_worker_count = 1
+        self.max_worker_count = 2 * self.worker_count
+        self.max_runtime_seconds = 0  # no deadline
         self.max_scan_depth = 25
         self.max_child_jobs = 100_000
         self.max_total_expanded_bytes = self.size_limit
@@ -57,6 +92,13 @@ def __init__(self) -> None:
         self.max_archive_compression_ratio = 100
         self.max_archive_path_length = 4096
         self.archive_spool_threshold = 8 * 1024 * 1024
+        self.range_split_threshold = 1_073_741_824  # 1GB
+        self.range_size = 256 * 1024 * 1024
+        self.mbox_split_threshold = 1_073_741_824  # 1GB
+        self.mbox_batch_messages = 1_000
+        self.maildir_batch_messages = 200
+        self.content_cache_entries = 100_000
+        self.max_in_flight_bytes = default_max_in_flight_bytes()
         self.max_attachment_size = self.size_limit
         self.max_attachments_per_message = 1_000
         self.max_total_attachment_bytes = self.size_limit
@@ -70,6 +112,7 @@ def __init__(self) -> None:
         timestamp = time.strftime("%Y-%m-%d-%H%M%S")
         self.report_file = f'panhunt_{timestamp}.report'
         self.json_file = f'panhunt_{timestamp}.json'
+        self.ndjson_file = f'panhunt_{timestamp}.ndjson'
 
     def get_report_path(self) -> str:
         return os.path.join(self.report_dir, self.report_file)
@@ -79,6 +122,11 @@ def get_json_path(self) -> Optional[str]:
             return os.path.join(self.json_dir, self.json_file)
         return None
 
+    def get_ndjson_path(self) -> Optional[str]:
+        if self.ndjson_dir:
+            return os.path.join(self.ndjson_dir, self.ndjson_file)
+        return None
+
     def validate(self) -> None:
         """Validate resolved configuration values before a scan starts."""
         if not self.target_path:
@@ -89,9 +137,27 @@ def validate(self) -> None:
             raise ValueError(f'report_dir exists and is not a directory: {self.report_dir}')
         if self.json_dir is not None and os.path.exists(self.json_dir) and not os.path.isdir(self.json_dir):
             raise ValueError(f'json_dir exists and is not a directory: {self.json_dir}')
-
+        if self.ndjson_dir is not None and os.path.exists(self.ndjson_dir) and not os.path.isdir(self.ndjson_dir):
+            raise ValueError(f'ndjson_dir exists and is not a directory: {self.ndjson_dir}')
+        if (self.mime_cache_dir is not None and os.path.exists(self.mime_cache_dir)
+                and not os.path.isdir(self.mime_cache_dir)):
+            raise ValueError(f'mime_cache_dir exists and is not a directory: {self.mime_cache_dir}')
+        if (self.log_state_dir is not None and os.path.exists(self.log_state_dir)
+                and not os.path.isdir(self.log_state_dir)):
+            raise ValueError(f'log_state_dir exists and is not a directory: {self.log_state_dir}')
+        if (self.scan_state_dir is not None and os.path.exists(self.scan_state_dir)
+                and not os.path.isdir(self.scan_state_dir)):
+            raise ValueError(f'scan_state_dir exists and is not a directory: {self.scan_state_dir}')
+
+        self._validate_positive_int('mime_cache_max_entries', self.mime_cache_max_entries)
+        self._validate_non_negative_int('mime_cache_max_age_days', self.mime_cache_max_age_days)
         self._validate_non_negative_int('size_limit', self.size_limit)
         self._validate_positive_int('worker_count', self.worker_count)
+        self._validate_positive_int('min_worker_count', self.min_worker_count)
+        self._validate_positive_int('max_worker_count', self.max_worker_count)
+        if self.min_worker_count > self.max_worker_count:
+            raise ValueError('min_worker_count must not exceed max_worker_count')
+        self._validate_non_negative_int('max_runtime_seconds', self.max_runtime_seconds)
         self._validate_non_negative_int('max_scan_depth', self.max_scan_depth)
         self._validate_positive_int('max_child_jobs', self.max_child_jobs)
         self._validate_non_negative_int('max_total_expanded_bytes', self.max_total_expanded_bytes)
@@ -99,6 +165,13 @@ def validate(self) -> None:
         self._validate_positive_int('max_archive_compression_ratio', self.max_archive_compression_ratio)
         self._validate_positive_int('max_archive_path_length', self.max_archive_path_length)
         self._validate_non_negative_int('archive_spool_threshold', self.archive_spool_threshold)
+        self._validate_non_negative_int('range_split_threshold', self.range_split_threshold)
+        self._validate_positive_int('range_size', self.range_size)
+        self._validate_non_negative_int('mbox_split_threshold', self.mbox_split_threshold)
+        self._validate_positive_int('mbox_batch_messages', self.mbox_batch_messages)
+        self._validate_non_negative_int('maildir_batch_messages', self.maildir_batch_messages)
+        self._validate_non_negative_int('content_cache_entries', self.content_cache_entries)
+        self._validate_positive_int('max_in_flight_bytes', self.max_in_flight_bytes)
         self._validate_non_negative_int('max_attachment_size', self.max_attachment_size)
         self._validate_positive_int('max_attachments_per_message', self.max_attachments_per_message)
         self._validate_non_negative_int('max_total_attachment_bytes', self.max_total_attachment_bytes)
@@ -115,10 +188,22 @@ def from_args(cls,
                   target_path: Optional[str] = None,
                   report_dir: Optional[str] = None,
                   json_dir: Optional[str] = None,
+                  ndjson_dir: Optional[str] = None,
+                  mime_cache_dir: Optional[str] = None,
+                  mime_cache_max_entries: Optional[int] = None,
+                  mime_cache_max_age_days: Optional[int] = None,
+                  log_state_dir: Optional[str] = None,
+                  scan_state_dir: Optional[str] = None,
+                  scan_state_hash: Optional[bool] = None,
+                  full_rescan: Optional[bool] = None,
                   excluded_paths_string: Optional[str] = None,
                   excluded_pans_string: Optional[str] = None,
                   size_limit: Optional[int] = None,
                   worker_count: Optional[int] = None,
+                  autoscale_workers: Optional[bool] = None,
+                  min_worker_count: Optional[int] = None,
+                  max_worker_count: Optional[int] = None,
+                  max_runtime_seconds: Optional[int] = None,
                   max_scan_depth: Optional[int] = None,
                   max_child_jobs: Optional[int] = None,
                   max_total_expanded_bytes: Optional[int] = None,
@@ -126,6 +211,13 @@ def from_args(cls,
                   max_archive_compression_ratio: Optional[int] = None,
                   max_archive_path_length: Optional[int] = None,
                   archive_spool_threshold: Optional[int] = None,
+                  range_split_threshold: Optional[int] = None,
+                  range_size: Optional[int] = None,
+                  mbox_split_threshold: Optional[int] = None,
+                  mbox_batch_messages: Optional[int] = None,
+                  maildir_batch_messages: Optional[int] = None,
+                  content_cache_entries: Optional[int] = None,
+                  max_in_flight_bytes: Optional[int] = None,
                   max_attachment_size: Optional[int] = None,
                   max_attachments_per_message: Optional[int] = None,
                   max_total_attachment_bytes: Optional[int] = None,
@@ -142,10 +234,22 @@ def from_args(cls,
             target_path=target_path,
             report_dir=report_dir,
             json_dir=json_dir,
+            ndjson_dir=ndjson_dir,
+            mime_cache_dir=mime_cache_dir,
+            mime_cache_max_entries=mime_cache_max_entries,
+            mime_cache_max_age_days=mime_cache_max_age_days,
+            log_state_dir=log_state_dir,
+            scan_state_dir=scan_state_dir,
+            scan_state_hash=scan_state_hash,
+            full_rescan=full_rescan,
             excluded_paths_string=excluded_paths_string,
             excluded_pans_string=excluded_pans_string,
             size_limit=size_limit,
             worker_count=worker_count,
+            autoscale_workers=autoscale_workers,
+            min_worker_count=min_worker_count,
+            max_worker_count=max_worker_count,
+            max_runtime_seconds=max_runtime_seconds,
             max_scan_depth=max_scan_depth,
             max_child_jobs=max_child_jobs,
             max_total_expanded_bytes=max_total_expanded_bytes,
@@ -153,6 +257,13 @@ def from_args(cls,
             max_archive_compression_ratio=max_archive_compression_ratio,
             max_archive_path_length=max_archive_path_length,
             archive_spool_threshold=archive_spool_threshold,
+            range_split_threshold=range_split_threshold,
+            range_size=range_size,
+            mbox_split_threshold=mbox_split_threshold,
+            mbox_batch_messages=mbox_batch_messages,
+            maildir_batch_messages=maildir_batch_messages,
+            content_cache_entries=content_cache_entries,
+            max_in_flight_bytes=max_in_flight_bytes,
             max_attachment_size=max_attachment_size,
             max_attachments_per_message=max_attachments_per_message,
             max_total_attachment_bytes=max_total_attachment_bytes,
@@ -167,7 +278,9 @@ def from_args(cls,
         return config
 
     @classmethod
-    def from_file(cls, config_file: str, quiet: Optional[bool] = None) -> 'ScanConfiguration':
+    def from_file(cls, config_file: str, quiet: Optional[bool] = None,
+                  scan_state_dir: Optional[str] = None,
+                  full_rescan: Optional[bool] = None) -> 'ScanConfiguration':
         if not os.path.isfile(config_file):
             raise ValueError("Invalid configuration file.")
 
@@ -178,10 +291,22 @@ def from_file(cls, config_file: str, quiet: Optional[bool] = None) -> 'ScanConfi
                 raw, 'search') or cls._try_parse(raw, 'file'),
             report_dir=cls._try_parse(raw, 'outfile'),
             json_dir=cls._try_parse(raw, 'json'),
+            ndjson_dir=cls._try_parse(raw, 'ndjson'),
+            mime_cache_dir=cls._try_parse(raw, 'mimecache'),
+            mime_cache_max_entries=cls._try_parse_int(raw, 'mimecachemaxentries'),
+            mime_cache_max_age_days=cls._try_parse_int(raw, 'mimecachemaxagedays'),
+            log_state_dir=cls._try_parse(raw, 'logstate'),
+            scan_state_dir=scan_state_dir or cls._try_parse(raw, 'scanstate'),
+            scan_state_hash=cls._try_parse_bool(raw, 'scanstatehash'),
+            full_rescan=full_rescan if full_rescan is not None else cls._try_parse_bool(raw, 'fullrescan'),
             excluded_paths_string=cls._try_parse(raw, 'exclude'),
             excluded_pans_string=cls._try_parse(raw, 'excludepans'),
             size_limit=cls._try_parse_int(raw, 'sizelimit'),
             worker_count=cls._try_parse_int(raw, 'workers'),
+            autoscale_workers=cls._try_parse_bool(raw, 'autoscale'),
+            min_worker_count=cls._try_parse_int(raw, 'minworkers'),
+            max_worker_count=cls._try_parse_int(raw, 'maxworkers'),
+            max_runtime_seconds=cls._try_parse_int(raw, 'maxruntimeseconds'),
             max_scan_depth=cls._try_parse_int(raw, 'maxscandepth'),
             max_child_jobs=cls._try_parse_int(raw, 'maxchildjobs'),
             max_total_expanded_bytes=cls._try_parse_int(raw, 'maxtotalexpandedbytes'),
@@ -189,6 +314,13 @@ def from_file(cls, config_file: str, quiet: Optional[bool] = None) -> 'ScanConfi
             max_archive_compression_ratio=cls._try_parse_int(raw, 'maxarchivecompressionratio'),
             max_archive_path_length=cls._try_parse_int(raw, 'maxarchivepathlength'),
             archive_spool_threshold=cls._try_parse_int(raw, 'archivespoolthreshold'),
+            range_split_threshold=cls._try_parse_int(raw, 'rangesplitthreshold'),
+            range_size=cls._try_parse_int(raw, 'rangesize'),
+            mbox_split_threshold=cls._try_parse_int(raw, 'mboxsplitthreshold'),
+            mbox_batch_messages=cls._try_parse_int(raw, 'mboxbatchmessages'),
+            maildir_batch_messages=cls._try_parse_int(raw, 'maildirbatchmessages'),
+            content_cache_entries=cls._try_parse_int(raw, 'contentcacheentries'),
+            max_in_flight_bytes=cls._try_parse_int(raw, 'maxinflightbytes'),
             max_attachment_size=cls._try_parse_int(raw, 'maxattachmentsize'),
             max_attachments_per_message=cls._try_parse_int(raw, 'maxattachmentspermessage'),
             max_total_attachment_bytes=cls._try_parse_int(raw, 'maxtotalattachmentbytes'),
@@ -208,7 +340,19 @@ def _update(self,
                 excluded_paths_string: Optional[str],
                 excluded_pans_string: Optional[str],
                 size_limit: Optional[int],
+                ndjson_dir: Optional[str] = None,
+                mime_cache_dir: Optional[str] = None,
+                mime_cache_max_entries: Optional[int] = None,
+                mime_cache_max_age_days: Optional[int] = None,
+                log_state_dir: Optional[str] = None,
+                scan_state_dir: Optional[str] = None,
+                scan_state_hash: Optional[bool] = None,
+                full_rescan: Optional[bool] = None,
                 worker_count: Optional[int] = None,
+                autoscale_workers: Optional[bool] = None,
+                min_worker_count: Optional[int] = None,
+                max_worker_count: Optional[int] = None,
+                max_runtime_seconds: Optional[int] = None,
                 max_scan_depth: Optional[int] = None,
                 max_child_jobs: Optional[int] = None,
                 max_total_expanded_bytes: Optional[int] = None,
@@ -216,6 +360,13 @@ def _update(self,
                 max_archive_compression_ratio: Optional[int] = None,
                 max_archive_path_length: Optional[int] = None,
                 archive_spool_threshold: Optional[int] = None,
+                range_split_threshold: Optional[int] = None,
+                range_size: Optional[int] = None,
+                mbox_split_threshold: Optional[int] = None,
+                mbox_batch_messages: Optional[int] = None,
+                maildir_batch_messages: Optional[int] = None,
+                content_cache_entries: Optional[int] = None,
+                max_in_flight_bytes: Optional[int] = None,
                 max_attachment_size: Optional[int] = None,
                 max_attachments_per_message: Optional[int] = None,
                 max_total_attachment_bytes: Optional[int] = None,
@@ -236,6 +387,32 @@ def _update(self,
         if json_dir:
             self.json_dir = os.getcwd() if json_dir == './' else os.path.abspath(json_dir)
 
+        if ndjson_dir and ndjson_dir != 'None':
+            self.ndjson_dir = os.getcwd() if ndjson_dir == './' else os.path.abspath(ndjson_dir)
+
+        if mime_cache_dir and mime_cache_dir != 'None':
+            self.mime_cache_dir = os.path.abspath(mime_cache_dir)
+
+        if mime_cache_max_entries is not None:
+            self._validate_positive_int('mime_cache_max_entries', mime_cache_max_entries)
+            self.mime_cache_max_entries = mime_cache_max_entries
+
+        if mime_cache_max_age_days is not None:
+            self._validate_non_negative_int('mime_cache_max_age_days', mime_cache_max_age_days)
+            self.mime_cache_max_age_days = mime_cache_max_age_days
+
+        if log_state_dir and log_state_dir != 'None':
+            self.log_state_dir = os.path.abspath(log_state_dir)
+
+        if scan_state_dir and scan_state_dir != 'None':
+            self.scan_state_dir = os.path.abspath(scan_state_dir)
+
+        if scan_state_hash is not None:
+            self.scan_state_hash = scan_state_hash
+
+        if full_rescan is not None:
+            self.full_rescan = full_rescan
+
         if excluded_paths_string and excluded_paths_string != 'None':
             self.excluded_paths = [d.lower() for d in excluded_paths_string.split(',')]
 
@@ -257,6 +434,21 @@ def _update(self,
             self._validate_positive_int('worker_count', worker_count)
             self.worker_count = worker_count
 
+        if autoscale_workers is not None:
+            self.autoscale_workers = autoscale_workers
+
+        if min_worker_count is not None:
+            self._validate_positive_int('min_worker_count', min_worker_count)
+            self.min_worker_count = min_worker_count
+
+        if max_worker_count is not None:
+            self._validate_positive_int('max_worker_count', max_worker_count)
+            self.max_worker_count = max_worker_count
+
+        if max_runtime_seconds is not None:
+            self._validate_non_negative_int('max_runtime_seconds', max_runtime_seconds)
+            self.max_runtime_seconds = max_runtime_seconds
+
         if max_scan_depth is not None:
             self._validate_non_negative_int('max_scan_depth', max_scan_depth)
             self.max_scan_depth = max_scan_depth
@@ -285,6 +477,34 @@ def _update(self,
             self._validate_non_negative_int('archive_spool_threshold', archive_spool_threshold)
             self.archive_spool_threshold = archive_spool_threshold
 
+        if range_split_threshold is not None:
+            self._validate_non_negative_int('range_split_threshold', range_split_threshold)
+            self.range_split_threshold = range_split_threshold
+
+        if range_size is not None:
+            self._validate_positive_int('range_size', range_size)
+            self.range_size = range_size
+
+        if mbox_split_threshold is not None:
+            self._validate_non_negative_int('mbox_split_threshold', mbox_split_threshold)
+            self.mbox_split_threshold = mbox_split_threshold
+
+        if mbox_batch_messages is not None:
+            self._validate_positive_int('mbox_batch_messages', mbox_batch_messages)
+            self.mbox_batch_messages = mbox_batch_messages
+
+        if maildir_batch_messages is not None:
+            self._validate_non_negative_int('maildir_batch_messages', maildir_batch_messages)
+            self.maildir_batch_messages = maildir_batch_messages
+
+        if content_cache_entries is not None:
+            self._validate_non_negative_int('content_cache_entries', content_cache_entries)
+            self.content_cache_entries = content_cache_entries
+
+        if max_in_flight_bytes is not None:
+            self._validate_positive_int('max_in_flight_bytes', max_in_flight_bytes)
+            self.max_in_flight_bytes = max_in_flight_bytes
+
         if max_attachment_size is not None:
             self._validate_non_negative_int('max_attachment_size', max_attachment_size)
             self.max_attachment_size = max_attachment_size
@@ -6,9 +6,10 @@
 # Balances memory usage against system-call overhead.
 STREAM_CHUNK_SIZE_BYTES: int = 8 * 1024 * 1024   # 8 MB
 
+# Window of a memory-mapped file decoded and matched in one pass.
+# Large enough to amortise per-call overhead, small enough to bound the decoded text.
+MMAP_WINDOW_BYTES: int = 16 * 1024 * 1024   # 16 MB
+
 # Minimum character count for a string to be a valid PAN.
 # ISO/IEC 7812: card numbers are 13–19 digits; 12 is the practical minimum due to Maestro.
 MIN_PAN_LENGTH: int = 12
-
-# Seconds to wait for available memory before aborting a large payload enqueue.
-MEMORY_CHECK_TIMEOUT_SECONDS: int = 20
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+from .pan import PAN
+
+DIGEST_SIZE = 32
+
+
+def new_digest() -> Any:
+    return hashlib.blake2b(digest_size=DIGEST_SIZE)
+
+
+def payload_digest(payload: bytes) -> bytes:
+    return hashlib.blake2b(payload, digest_size=DIGEST_SIZE).digest()
+
+
+class CachedScan:
+    """The outcome of scanning one archive member or attachment payload."""
+
+    __slots__ = ('mime_type', 'encoding', 'matches', 'error')
+
+    def __init__(self, mime_type: str, encoding: str, matches: list[PAN], error: Optional[Exception] = None) -> None:
+        self.mime_type = mime_type
+        self.encoding = encoding
+        self.matches = tuple(matches)
+        self.error = error
+
+
+class ContentCache:
+    """Scan-wide cache of scan outcomes keyed by payload hash and file extension.
+
+    Archive members and attachments are hashed with BLAKE2b while they are
+    extracted. When the same logo, signature block or forwarded document
+    occurs again, its stored outcome is reported for the new logical path
+    instead of detecting, parsing and matching the payload again. The
+    extension is part of the key because it takes part in classification.
+
+    Only scanner outcomes are stored; containers are expanded every time so
+    their members keep their own logical paths. The least recently used
+    entries above ``max_entries`` are dropped.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple[bytes, str], CachedScan] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, digest: bytes, extension: str) -> Optional[CachedScan]:
+        with self._lock:
+            entry = self._entries.get((digest, extension))
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end((digest, extension))
+            self.hits += 1
+            return entry
+
+    def put(self, digest: bytes, extension: str, entry: CachedScan) -> None:
+        with self._lock:
+            self._entries[(digest, extension)] = entry
+            self._entries.move_to_end((digest, extension))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def summary(self) -> str:
+        return f'Content cache: {self.hits} duplicate payloads reused, {self.misses} scanned'
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
@@ -1,36 +1,55 @@
 from __future__ import annotations
 
+import concurrent.futures
 import logging
+import multiprocessing
 import os
 import threading
 import time
-from typing import IO, Optional, cast
+from collections import deque
+from typing import IO, Iterator, Optional, Sequence, cast
 
-from . import enums, panutils
+from . import enums, panutils, signatures
 from .archive import Archive, ZipArchive
+from .autoscale import WorkerAutoscaler
 from .buffer import JobBuffer
 from .config import ScanConfiguration
-from .exceptions import PANHuntException
-from .factory import ArchiveFactory, ScannerFactory
+from .dedup import CachedScan, ContentCache
+from .exceptions import PANHuntException, ScanCancelledException
+from .factory import ArchiveFactory, ScannerFactory, classify_file_type
 from .finding import Finding
 from .job import Job
 from .limitedio import LimitedReader
+from .logstate import LogState
 from .pan import PAN
+from .ranges import RangeGroup
+from .results import ResultShards
+from .scanner import PlainTextFileScanner, ScannerBase, scan_file_range
 from .scancontext import ResourceBudget, ScanContext, ScanLimits
+from .scanstate import ScanState
+from .sink import FindingRecord, ResultRecord, ResultSink
+
+# How often a worker waiting on a range scan in another process checks for cancellation.
+RANGE_CANCEL_POLL_SECONDS = 0.5
 
 
 class Dispatcher:
-    findings: list[Finding]
-    failures: list[Finding]
+    findings: ResultShards[ResultRecord]
+    failures: ResultShards[ResultRecord]
 
     _stop_event: threading.Event
     _threads: list[threading.Thread]
-    __findings_lock: threading.Lock
 
-    def __init__(self, buffer: JobBuffer, config: ScanConfiguration) -> None:
+    def __init__(self, buffer: JobBuffer, config: ScanConfiguration,
+                 sink: Optional[ResultSink] = None,
+                 log_state: Optional[LogState] = None,
+                 scan_state: Optional[ScanState] = None) -> None:
         self._buffer = buffer
         self._config = config
-        self._scanner_factory = ScannerFactory(buffer=buffer, config=config)
+        self._sink = sink
+        self._log_state = log_state
+        self._scan_state = scan_state
+        self._scanner_factory = ScannerFactory(buffer=buffer, config=config, report=self._record)
         self._scan_limits = ScanLimits(
             max_depth=self._config.max_scan_depth,
             max_child_jobs=self._config.max_child_jobs,
@@ -43,86 +62,288 @@ def __init__(self, buffer: JobBuffer, config: ScanConfiguration) -> None:
         self._resource_budget = ResourceBudget(self._scan_limits)
         self._stop_event = threading.Event()
         self._threads = []
-        self.findings = []
-        self.failures = []
-        self.__findings_lock = threading.Lock()
+        self._worker_lock = threading.Lock()
+        self._target_workers = 0
+        self._live_workers = 0
+        self._next_worker_id = 0
+        self._autoscaler: Optional[WorkerAutoscaler] = None
+        self._range_lock = threading.Lock()
+        self._range_executor: Optional[concurrent.futures.ProcessPoolExecutor] = None
+        self._range_processes_unavailable = False
+        self.content_cache: Optional[ContentCache] = (
+            ContentCache(config.content_cache_entries) if config.content_cache_entries else None
+        )
+        self.findings = ResultShards()
+        self.failures = ResultShards()
+        self._results_lock = threading.Lock()
+        self._results_idle = threading.Condition(self._results_lock)
+        self._storing = 0
+        self._sealed = False
+        self._in_flight: set[Job] = set()
+        self._abandoned_paths: list[str] = []
 
     def start(self) -> None:
         self._stop_event.clear()
-        self._threads = [
-            threading.Thread(
-                target=self._run_dispatch_loop,
-                name=f"panhunt-worker-{i}",
-                daemon=True,
+        with self._worker_lock:
+            self._threads = []
+            self._next_worker_id = 0
+        worker_count = self._config.worker_count
+        if self._config.autoscale_workers:
+            worker_count = max(self._config.min_worker_count, min(self._config.max_worker_count, worker_count))
+            self._autoscaler = WorkerAutoscaler(
+                get_worker_count=lambda: self.worker_count,
+                resize=self.resize,
+                queue_depth=self._buffer.queue_depth,
+                min_workers=self._config.min_worker_count,
+                max_workers=self._config.max_worker_count,
             )
-            for i in range(self._config.worker_count)
-        ]
-        for thread in self._threads:
-            thread.start()
+        self.resize(worker_count)
+        if self._autoscaler is not None:
+            self._autoscaler.start()
 
     def stop(self) -> None:
         self._stop_event.set()
+        if self._autoscaler is not None:
+            self._autoscaler.stop()
+        with self._range_lock:
+            executor, self._range_executor = self._range_executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def cancel(self) -> None:
+        """Stop dequeuing and ask running scanners to stop at their next cancellation check."""
+        self._resource_budget.cancel()
+        self.stop()
+
+    @property
+    def worker_count(self) -> int:
+        """Number of workers the pool is currently sized for."""
+        with self._worker_lock:
+            return self._target_workers
+
+    def resize(self, worker_count: int) -> None:
+        """Grow the pool immediately, or let surplus workers retire after their current job."""
+        if worker_count < 1:
+            raise ValueError('worker_count must be a positive integer')
+        with self._worker_lock:
+            self._target_workers = worker_count
+            if self._stop_event.is_set():
+                return
+            self._threads = [thread for thread in self._threads if thread.is_alive()]
+            while self._live_workers < worker_count:
+                thread = threading.Thread(
+                    target=self._run_worker,
+                    name=f"panhunt-worker-{self._next_worker_id}",
+                    daemon=True,
+                )
+                self._next_worker_id += 1
+                self._live_workers += 1
+                self._threads.append(thread)
+                thread.start()
 
     def join(self, timeout: float = 5.0) -> None:
         deadline = time.monotonic() + timeout
-        for thread in self._threads:
+        with self._worker_lock:
+            threads = list(self._threads)
+        for thread in threads:
             remaining = max(0.05, deadline - time.monotonic())
             thread.join(timeout=remaining)
 
-    def get_findings(self) -> list[Finding]:
-        with self.__findings_lock:
-            return list(self.findings)
+    def get_findings(self) -> Sequence[ResultRecord]:
+        """Return a point-in-time view of the findings without copying them.
+
+        With a result sink, the view re-reads the sink instead of memory.
+        """
+        if self._sink is not None:
+            return self._sink.findings()
+        return self.findings.snapshot()
+
+    def get_failures(self) -> Sequence[ResultRecord]:
+        """Return a point-in-time view of the failures without copying them."""
+        if self._sink is not None:
+            return self._sink.failures()
+        return self.failures.snapshot()
+
+    def iter_findings(self) -> Iterator[ResultRecord]:
+        return iter(self.get_findings())
 
-    def get_failures(self) -> list[Finding]:
-        with self.__findings_lock:
-            return list(self.failures)
+    def iter_failures(self) -> Iterator[ResultRecord]:
+        return iter(self.get_failures())
+
+    @staticmethod
+    def unscanned_paths(job: Job) -> list[str]:
+        """Return the paths to report for a job that was not scanned to the end."""
+        if job.batch is not None:
+            # Copied first: a running batch takes names from the front concurrently.
+            return [os.path.join(job.dirname, name) for name in tuple(job.batch)]
+        path = job.context.logical_path if job.context else job.abspath
+        if job.range_group is not None:
+            start, end = job.range_group.ranges[job.range_index]
+            path = f'{path} (bytes {start}-{end})'
+        elif job.message_range is not None:
+            path = f'{path} (messages {job.message_range[0]}-{job.message_range[1]})'
+        return [path]
+
+    def abandon(self, job: Job) -> None:
+        """Note that a job was dropped unscanned, so its file's previous scan state is kept.
+
+        Until ``seal`` is called the job's paths are also kept for the list
+        of unscanned paths that ``seal`` returns.
+        """
+        with self._results_lock:
+            self._in_flight.discard(job)
+            if not self._sealed:
+                self._abandoned_paths.extend(self.unscanned_paths(job))
+        if self._scan_state is None:
+            return
+        if job.batch is not None:
+            for name in job.batch:
+                self._scan_state.interrupt(os.path.join(job.dirname, name))
+        else:
+            self._scan_state.interrupt(job.context.root_path if job.context else job.abspath)
+
+    def seal(self) -> list[str]:
+        """Stop recording results and return the paths of abandoned and still-running jobs.
+
+        Called when a cancelled scan winds down: a worker that outlived
+        ``join`` can no longer add to the results the report is built from,
+        so its job is reported as unscanned instead. Waits for results that
+        are being written to finish.
+        """
+        with self._results_lock:
+            self._sealed = True
+            while self._storing:
+                self._results_idle.wait()
+            paths, self._abandoned_paths = self._abandoned_paths, []
+            for job in self._in_flight:
+                paths.extend(self.unscanned_paths(job))
+            self._in_flight.clear()
+        return paths
+
+    def _record(self, finding: ResultRecord, job: Optional[Job] = None) -> bool:
+        """Store a result, attributed to ``job`` if it is the job's own; returns False once sealed."""
+        if self._sealed:
+            return False
+        if self._scan_state is not None:
+            if isinstance(finding, Finding):
+                root_path = finding.container_chain[0] if finding.container_chain else finding.logical_path
+                self._scan_state.add(root_path, FindingRecord.from_finding(finding))
+            else:
+                self._scan_state.add(finding.abspath, finding)  # merged results of a resumed log
+        return self._store(finding, job)
 
-    def _run_dispatch_loop(self) -> None:
+    def _store(self, finding: ResultRecord, job: Optional[Job] = None) -> bool:
+        with self._results_lock:
+            if self._sealed:
+                return False
+            # Under the same lock as the check above, so ``seal`` lists a job
+            # either as running or by its stored result, never both.
+            if job is not None:
+                self._in_flight.discard(job)
+            self._storing += 1
+        try:
+            if self._sink is not None:
+                self._sink.write(finding)
+            elif finding.status == enums.ScanStatusEnum.Success:
+                self.findings.append(finding)
+            else:
+                self.failures.append(finding)
+        finally:
+            with self._results_lock:
+                self._storing -= 1
+                if not self._storing:
+                    self._results_idle.notify_all()
+        return True
+
+    def _run_worker(self) -> None:
+        retired = False
+        try:
+            retired = self._run_dispatch_loop()
+        finally:
+            self._buffer.release_worker()
+            if not retired:
+                with self._worker_lock:
+                    self._live_workers -= 1
+
+    def _retire_if_surplus(self) -> bool:
+        with self._worker_lock:
+            if self._live_workers > self._target_workers:
+                self._live_workers -= 1
+                return True
+        return False
+
+    def _run_dispatch_loop(self) -> bool:
+        """Process jobs until stopped or finished; return True if this worker retired after a shrink."""
         while not self._stop_event.is_set():
+            if self._retire_if_surplus():
+                return True
             job: Optional[Job] = self._buffer.dequeue(timeout=0.1)
             if job is None:
                 if self._buffer.is_finished():
                     break
                 continue
             try:
-                res: Optional[Finding] = self._dispatch_job(job)
-                if res is not None:
-                    with self.__findings_lock:
-                        if res.status == enums.ScanStatusEnum.Success:
-                            self.findings.append(res)
-                        else:
-                            self.failures.append(res)
-            except Exception as ex:
-                if isinstance(ex, (AttributeError, NameError, AssertionError)):
-                    raise
-                logging.error(f"Unhandled error processing {job.abspath}: {ex}", exc_info=True)
-                try:
-                    failure = Finding(
-                        basename=job.basename,
-                        dirname=job.dirname,
-                        payload=None,
-                        mimetype='Unknown',
-                        encoding='Unknown',
-                        err=ex,
-                        context=job.context,
-                    )
-                    with self.__findings_lock:
-                        self.failures.append(failure)
-                except Exception:
-                    logging.error(f"Failed to record failure for {job.abspath}", exc_info=True)
+                self._process(job)
             finally:
-                if job.payload and panutils.is_file_like(job.payload):
-                    close = getattr(job.payload, 'close', None)
-                    if callable(close):
-                        try:
-                            close()
-                        except Exception as e:
-                            logging.warning(f"Failed to close payload for {job.abspath}: {e}")
-                job.payload = None
+                self._buffer.complete_job(job)
                 job = None
-                self._buffer.complete_job()
+        return False
+
+    def _process(self, job: Job) -> None:
+        """Dispatch one job, record its result or failure and release its payload."""
+        with self._results_lock:
+            self._in_flight.add(job)
+        recorded = False
+        try:
+            res: Optional[ResultRecord] = self._dispatch_job(job)
+            if res is not None:
+                recorded = self._record_result(job, res)
+        except Exception as ex:
+            if isinstance(ex, (AttributeError, NameError, AssertionError)):
+                raise
+            logging.error(f"Unhandled error processing {job.abspath}: {ex}", exc_info=True)
+            try:
+                failure = Finding(
+                    basename=job.basename,
+                    dirname=job.dirname,
+                    payload=None,
+                    mimetype=job.mime_type or 'Unknown',
+                    encoding=job.encoding or 'Unknown',
+                    err=ex,
+                    context=job.context,
+                )
+                recorded = self._record_result(job, failure)
+            except Exception:
+                logging.error(f"Failed to record failure for {job.abspath}", exc_info=True)
+        finally:
+            # A job whose result is stored is not reported as unscanned too.
+            if self._resource_budget.cancelled and not recorded:
+                self.abandon(job)
+            else:
+                with self._results_lock:
+                    self._in_flight.discard(job)
+                # The file's state is saved once its last job, possibly a
+                # member, range or batch queued by another, has completed.
+                if job.context is not None and job.context.tree.done() and self._scan_state is not None:
+                    self._scan_state.finish(job.context.root_path)
+            if job.payload and panutils.is_file_like(job.payload):
+                close = getattr(job.payload, 'close', None)
+                if callable(close):
+                    try:
+                        close()
+                    except Exception as e:
+                        logging.warning(f"Failed to close payload for {job.abspath}: {e}")
+            job.payload = None
 
-    def _dispatch_job(self, job: Job) -> Optional[Finding]:
+    def _record_result(self, job: Job, result: ResultRecord) -> bool:
+        """Record the result of a job; returns False if the job is to be reported as unscanned instead."""
+        if result.status != enums.ScanStatusEnum.Success and self._resource_budget.cancelled:
+            return False  # most likely the cancellation itself
+        return self._record(result, job)
+
+    def _dispatch_job(self, job: Job) -> Optional[ResultRecord]:
+        if job.batch is not None:
+            return self._scan_batch(job)
         logging.info(f"Processing job: {job.abspath}")
         if job.context is None:
             job.context = ScanContext.root(
@@ -130,32 +351,22 @@ def _dispatch_job(self, job: Job) -> Optional[Finding]:
                 limits=self._scan_limits,
                 budget=self._resource_budget
             )
+            if self._scan_state is not None and job.payload is None:
+                previous = self._scan_state.previous_results(job.abspath, job.source.stat())
+                if previous is not None:
+                    logging.info(f"Unchanged since the last scan, reusing its results: {job.abspath}")
+                    for record in previous:
+                        self._store(record)
+                    return None
 
-        if job.payload is not None:
-            if isinstance(job.payload, LimitedReader):
-                size = 0
-            elif isinstance(job.payload, bytes):
-                size = len(job.payload)
-            elif panutils.is_file_like(job.payload):
-                seek = getattr(job.payload, 'seek', None)
-                tell = getattr(job.payload, 'tell', None)
-                if callable(seek) and callable(tell):
-                    try:
-                        seek(0, 2)
-                        size = cast(int, tell())
-                        seek(0)
-                    except (OSError, IOError):
-                        size = 0
-                else:
-                    size = 0
-            else:
-                size = 0
+        if isinstance(job.payload, LimitedReader):
+            size = 0  # enforces its own limit; measuring would decompress the member
         else:
-            size = os.stat(job.abspath).st_size
+            size = job.source.size or 0
 
         if size > self._config.size_limit:
             return Finding(
-                basename=job.basename, dirname=job.dirname, payload=job.payload,
+                basename=job.basename, dirname=job.dirname, source=job.source,
                 mimetype='Unknown', encoding='Unknown',
                 err=PANHuntException(
                     f'File size {panutils.size_friendly(size=size)} over limit of '
@@ -164,36 +375,65 @@ def _dispatch_job(self, job: Job) -> Optional[Finding]:
                 context=job.context
             )  # type: ignore
 
-        mime_type, encoding, error = panutils.get_mimetype(path=job.abspath, payload=job.payload)
+        if self.content_cache is not None and job.content_hash is not None:
+            cached = self.content_cache.get(job.content_hash, panutils.get_ext(job.basename))
+            if cached is not None:
+                return self._reuse(job, cached)
+
+        error = self._classify(job)
+        mime_type, encoding = cast(str, job.mime_type), cast(str, job.encoding)
 
         if error:
             return Finding(
-                basename=job.basename, dirname=job.dirname, payload=job.payload,
+                basename=job.basename, dirname=job.dirname, source=job.source,
                 mimetype=mime_type, encoding=encoding, err=error, context=job.context
             )
 
-        archive_type: Optional[type[Archive]] = ArchiveFactory.get_archive(
-            mime_type=mime_type,
-            extension=panutils.get_ext(job.basename)
-        )
+        if job.range_group is not None:
+            return self._scan_range(job)
 
-        if archive_type is not None:
+        if (job.handler is PlainTextFileScanner and job.payload is None
+                and PlainTextFileScanner.supports_ranges(encoding)):
+            start = self._log_state.resume_offset(job.abspath, job.source.stat()) if self._log_state else 0
+            earlier_matches: list[str] = []
+            if start and self._scan_state is not None:
+                # The stored results cover the bytes before the offset; without them scan the whole file.
+                earlier = self._scan_state.carry_forward(job.abspath)
+                if earlier is None:
+                    start = 0
+                earlier_matches = [match for record in earlier or () for match in record.matches]
+            if 0 < self._config.range_split_threshold < size - start:
+                ranges = PlainTextFileScanner.split_ranges(
+                    job.abspath, encoding, self._config.range_size, start=start, end=size,
+                    live=self._log_state is not None
+                )
+                if len(ranges) > 1:
+                    self._enqueue_ranges(job, RangeGroup(ranges, earlier_matches))
+                    return None
+            if self._log_state is not None:
+                # Scan the appended bytes as a single range on this worker.
+                job.range_group, job.range_index = RangeGroup([(start, size)], earlier_matches), 0
+                return self._scan_range(job)
+
+        if isinstance(job.handler, type) and issubclass(job.handler, Archive):
+            archive_type: type[Archive] = job.handler
             if (issubclass(archive_type, ZipArchive)
-                    and not panutils.is_valid_zip(path=job.abspath, payload=job.payload)):
+                    and not panutils.is_valid_zip(source=job.source)):
                 logging.warning(f"Skipping ZIP parser for invalid ZIP container: {job.abspath}")
-                return self._scan_file(job, mime_type, encoding)
+                job.handler = self._scanner_factory.get_scanner_class(cast(enums.FileTypeEnum, job.file_type))
+                return self._scan_file(job)
 
             archive_name = archive_type.__name__.replace('Archive', '').lower()
             if self._config.allowed_archive_types and archive_name not in self._config.allowed_archive_types:
                 return Finding(
-                    basename=job.basename, dirname=job.dirname, payload=job.payload,
+                    basename=job.basename, dirname=job.dirname, source=job.source,
                     mimetype=mime_type, encoding=encoding,
                     err=PANHuntException(f'Archive type "{archive_name}" is not allowed by policy'),
                     context=job.context
                 )  # type: ignore
             if archive_name in self._config.denied_archive_types:
                 return Finding(
-                    basename=job.basename, dirname=job.dirname, payload=job.payload,
+                    basename=job.basename, dirname=job.dirname, source=job.source,
                     mimetype=mime_type, encoding=encoding,
                     err=PANHuntException(f'Archive type "{archive_name}" is denied by policy'),
                     context=job.context
@@ -201,18 +441,20 @@ def _dispatch_job(self, job: Job) -> Optional[Finding]:
             archive = archive_type(
                 path=job.abspath,
                 payload=cast(IO[bytes], job.payload) if job.payload is not None and not isinstance(job.payload, bytes) else job.payload,
+                source=job.source,
                 size_limit=self._config.size_limit,
                 context=job.context,
                 max_members=self._config.max_archive_members,
                 compression_ratio_limit=self._config.max_archive_compression_ratio,
                 max_path_length=self._config.max_archive_path_length,
-                spool_threshold=self._config.archive_spool_threshold
+                spool_threshold=self._config.archive_spool_threshold,
+                admission=self._buffer.admission
             )
             try:
                 children, e = archive.get_children()
                 if e:
                     return Finding(
-                        basename=job.basename, dirname=job.dirname, payload=job.payload,
+                        basename=job.basename, dirname=job.dirname, source=job.source,
                         mimetype=mime_type, encoding=encoding, err=e, context=job.context
                     )  # type: ignore
                 for child in children:
@@ -220,32 +462,174 @@ def _dispatch_job(self, job: Job) -> Optional[Finding]:
                 return None
             except Exception as ex:
                 return Finding(
-                    basename=job.basename, dirname=job.dirname, payload=job.payload,
+                    basename=job.basename, dirname=job.dirname, source=job.source,
                     mimetype=mime_type, encoding=encoding, err=ex, context=job.context
                 )  # type: ignore
 
-        return self._scan_file(job, mime_type, encoding)
+        return self._scan_file(job)
+
+    def _classify(self, job: Job) -> Optional[Exception]:
+        """Resolve the job's MIME type, file type and handler, once per job."""
+        if job.file_type is not None:
+            return None
+        mime_type, encoding, error = panutils.get_mimetype(path=job.abspath, source=job.source)
+        job.mime_type = mime_type
+        job.encoding = encoding
+        if error:
+            return error
+        self._set_file_type(job, mime_type, encoding)
+        return None
+
+    def _set_file_type(self, job: Job, mime_type: str, encoding: str) -> None:
+        job.mime_type, job.encoding = mime_type, encoding
+        file_type = classify_file_type(mime_type, panutils.get_ext(job.basename))
+        job.file_type = file_type
+        job.handler = ArchiveFactory.get_archive_for(file_type) or self._scanner_factory.get_scanner_class(file_type)
+
+    def _scan_batch(self, job: Job) -> None:
+        """Scan a batch of Maildir messages in turn, each reported under its own path.
+
+        A message whose leading header fields are recognised is classified as
+        mail without consulting the MIME cache or libmagic. Messages still in
+        the batch when the scan is cancelled are left for ``abandon``, which
+        reports them as unscanned.
+        """
+        names = deque(cast(Sequence[str], job.batch))
+        job.batch = names
+        logging.info(f"Processing {len(names)} messages in {job.dirname}")
+        while names and not self._resource_budget.cancelled:
+            message = Job(basename=names.popleft(), dirname=job.dirname)
+            self._classify_message(message)
+            self._process(message)
+
+    def _classify_message(self, job: Job) -> None:
+        try:
+            header, complete = job.source.sniff_header()
+        except OSError:
+            return  # reported by the regular classification
+        detected = signatures.sniff_rfc822(header, complete, known_mail=True)
+        if detected is not None:
+            signatures.detection_stats.record(signature_hit=True)
+            self._set_file_type(job, *detected)
+
+    def _enqueue_ranges(self, job: Job, group: RangeGroup) -> None:
+        """Queue one sub-job per byte range so idle workers scan parts of the file concurrently."""
+        logging.info(f"Splitting {job.abspath} into {len(group.ranges)} byte ranges")
+        for index in range(len(group.ranges)):
+            part = Job(basename=job.basename, dirname=job.dirname, context=job.context)
+            part.mime_type, part.encoding = job.mime_type, job.encoding
+            part.file_type, part.handler = job.file_type, job.handler
+            part.range_group, part.range_index = group, index
+            self._buffer.enqueue(part)
+
+    def _scan_range(self, job: Job) -> Optional[ResultRecord]:
+        """Scan one byte range; the worker finishing the last range reports the whole file.
 
-    def _scan_file(self, job: Job, mimetype: str, encoding: str) -> Optional[Finding]:
-        scanner_instance = self._scanner_factory.get_scanner(
-            mime_type=mimetype,
-            extension=panutils.get_ext(job.basename)
+        The matches carried forward from the earlier part of a resumed log are
+        merged into the same result, so the file is reported once.
+        """
+        group = cast(RangeGroup, job.range_group)
+        matches: list[PAN] = []
+        error: Optional[Exception] = None
+        try:
+            matches = self._run_range_scan(job)
+        except Exception as ex:
+            error = ex
+        if not group.complete(job.range_index, matches, error):
+            return None
+
+        if self._log_state is not None and group.error is None:
+            end = group.ranges[-1][1]
+            self._log_state.record(job.abspath, job.source.stat(), PlainTextFileScanner.resume_point(job.abspath, end))
+        matches = group.matches
+        if not matches and not group.earlier_matches and group.error is None:
+            return None
+        finding = Finding(
+            basename=job.basename, dirname=job.dirname, source=job.source,
+            mimetype=cast(str, job.mime_type), encoding=cast(str, job.encoding),
+            err=group.error, context=job.context
         )
-        if not scanner_instance:
+        finding.matches = matches
+        if not group.earlier_matches:
+            return finding
+        record = FindingRecord.from_finding(finding)
+        record.matches = group.earlier_matches + record.matches
+        return record
+
+    def _run_range_scan(self, job: Job) -> list[PAN]:
+        group = cast(RangeGroup, job.range_group)
+        context = cast(ScanContext, job.context)
+        start, end = group.ranges[job.range_index]
+        encoding = cast(str, job.encoding)
+        # Files scanned with a log state may be live logs, which are read rather than mapped.
+        live = self._log_state is not None
+        executor = self._get_range_executor() if len(group.ranges) > 1 else None
+        if executor is None:
+            return scan_file_range(self._config, job.abspath, encoding, start, end, context, live)
+
+        # Regular expression matching holds the GIL, so ranges are matched in
+        # worker processes; this thread only waits and watches for cancellation.
+        future = executor.submit(scan_file_range, self._config, job.abspath, encoding, start, end, None, live)
+        while True:
+            try:
+                return future.result(timeout=RANGE_CANCEL_POLL_SECONDS)
+            except concurrent.futures.TimeoutError:
+                if context.budget.cancelled:
+                    future.cancel()
+                context.check_cancelled()
+
+    def _get_range_executor(self) -> Optional[concurrent.futures.ProcessPoolExecutor]:
+        with self._range_lock:
+            if self._range_executor is None and not self._range_processes_unavailable:
+                max_workers = (self._config.max_worker_count if self._config.autoscale_workers
+                               else self._config.worker_count)
+                try:
+                    self._range_executor = concurrent.futures.ProcessPoolExecutor(
+                        max_workers=max_workers,
+                        mp_context=multiprocessing.get_context('spawn')
+                    )
+                except (ImportError, NotImplementedError, OSError) as ex:
+                    logging.warning(f"Process pool unavailable, scanning byte ranges in worker threads: {ex}")
+                    self._range_processes_unavailable = True
+            return self._range_executor
+
+    def _scan_file(self, job: Job) -> Optional[Finding]:
+        if not (isinstance(job.handler, type) and issubclass(job.handler, ScannerBase)):
             return None
+        scanner_instance = self._scanner_factory.create(job.handler)
+        mimetype, encoding = cast(str, job.mime_type), cast(str, job.encoding)
 
         finding = None
+        matches: list[PAN] = []
+        error: Optional[Exception] = None
         try:
-            matches: list[PAN] = scanner_instance.scan(job=job, encoding=encoding)
+            matches = scanner_instance.scan(job=job, encoding=encoding)
             if matches:
                 finding = Finding(
-                    basename=job.basename, dirname=job.dirname, payload=job.payload,
+                    basename=job.basename, dirname=job.dirname, source=job.source,
                     mimetype=mimetype, encoding=encoding, context=job.context
                 )
                 finding.matches = matches
         except Exception as ex:
+            error = ex
             finding = Finding(
-                basename=job.basename, dirname=job.dirname, payload=job.payload,
+                basename=job.basename, dirname=job.dirname, source=job.source,
                 mimetype=mimetype, encoding=encoding, err=ex, context=job.context
             )  # type: ignore
+        if (self.content_cache is not None and job.content_hash is not None
+                and not job.handler.enqueues_children and not isinstance(error, ScanCancelledException)):
+            self.content_cache.put(job.content_hash, panutils.get_ext(job.basename),
+                                   CachedScan(mimetype, encoding, matches, error))
+        return finding
+
+    def _reuse(self, job: Job, cached: CachedScan) -> Optional[Finding]:
+        """Report the stored outcome of an identical payload under this job's logical path."""
+        logging.info(f"Duplicate content, reusing the result of an earlier scan: {job.abspath}")
+        if not cached.matches and cached.error is None:
+            return None
+        finding = Finding(
+            basename=job.basename, dirname=job.dirname, source=job.source,
+            mimetype=cached.mime_type, encoding=cached.encoding, err=cached.error, context=job.context
+        )
+        finding.matches = list(cached.matches)
         return finding
@@ -1,3 +1,7 @@
 class PANHuntException(Exception):
     def __init__(self, message: str) -> None:
         super().__init__(message)
+
+
+class ScanCancelledException(PANHuntException):
+    """Raised inside a running job once the scan has been asked to stop."""
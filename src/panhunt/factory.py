@@ -1,36 +1,199 @@
 from __future__ import annotations
 
-from typing import Optional, Type
+from typing import Callable, Optional, Type
 
 from . import enums
 from .archive import Archive, GzipArchive, OpenDocumentArchive, TarArchive, XzArchive, ZipArchive
 from .buffer import JobBuffer
 from .config import ScanConfiguration
 from .finder import PanFinder
+from .finding import Finding
 from .scanner import EmlScanner, MboxScanner, MsgScanner, LegacyOfficeScanner, PdfScanner, PlainTextFileScanner, PstScanner, ScannerBase
 
+_LEGACY_OFFICE_FILETYPES = frozenset({
+    enums.FileTypeEnum.MsWordLegacy,
+    enums.FileTypeEnum.MsExcelLegacy,
+    enums.FileTypeEnum.MsPowerpointLegacy,
+})
+
+_OPENDOCUMENT_FILETYPES = frozenset({
+    enums.FileTypeEnum.OpenDocumentText,
+    enums.FileTypeEnum.OpenDocumentSpreadsheet,
+    enums.FileTypeEnum.OpenDocumentPresentation,
+    enums.FileTypeEnum.OpenDocumentDrawing,
+    enums.FileTypeEnum.OpenDocumentFormula,
+    enums.FileTypeEnum.OpenDocumentMaster,
+})
+
+_EXTENSION_FILETYPES: dict[str, enums.FileTypeEnum] = {
+    '.doc': enums.FileTypeEnum.MsWordLegacy,
+    '.xls': enums.FileTypeEnum.MsExcelLegacy,
+    '.ppt': enums.FileTypeEnum.MsPowerpointLegacy,
+    '.docx': enums.FileTypeEnum.MsWord,
+    '.xlsx': enums.FileTypeEnum.MsExcel,
+    '.pptx': enums.FileTypeEnum.MsPowerpoint,
+    '.mbox': enums.FileTypeEnum.Mbox,
+    '.pst': enums.FileTypeEnum.MsPst,
+    '.odt': enums.FileTypeEnum.OpenDocumentText,
+    '.ott': enums.FileTypeEnum.OpenDocumentText,
+    '.ods': enums.FileTypeEnum.OpenDocumentSpreadsheet,
+    '.ots': enums.FileTypeEnum.OpenDocumentSpreadsheet,
+    '.odp': enums.FileTypeEnum.OpenDocumentPresentation,
+    '.otp': enums.FileTypeEnum.OpenDocumentPresentation,
+    '.odg': enums.FileTypeEnum.OpenDocumentDrawing,
+    '.otg': enums.FileTypeEnum.OpenDocumentDrawing,
+    '.odf': enums.FileTypeEnum.OpenDocumentFormula,
+    '.odm': enums.FileTypeEnum.OpenDocumentMaster,
+    '.fodt': enums.FileTypeEnum.Plaintext,
+    '.fods': enums.FileTypeEnum.Plaintext,
+    '.fodp': enums.FileTypeEnum.Plaintext,
+}
+
+_NON_DOCUMENT_MEDIA_TYPES = frozenset({
+    'Unknown', 'audio', 'video', 'image', 'chemical', 'model', 'gcode', 'x-conference', 'font', 'x-world',
+})
+
+# Subtypes of application/* whose file type does not depend on the extension.
+_APPLICATION_FILETYPES: dict[str, enums.FileTypeEnum] = {
+    'vnd.openxmlformats-officedocument.wordprocessingml.document': enums.FileTypeEnum.MsWord,
+    'vnd.openxmlformats-officedocument.spreadsheetml.sheet': enums.FileTypeEnum.MsExcel,
+    'vnd.openxmlformats-officedocument.presentationml.presentation': enums.FileTypeEnum.MsPowerpoint,
+    'vnd.oasis.opendocument.text': enums.FileTypeEnum.OpenDocumentText,
+    'vnd.oasis.opendocument.text-template': enums.FileTypeEnum.OpenDocumentText,
+    'vnd.oasis.opendocument.text-flat-xml': enums.FileTypeEnum.Plaintext,
+    'vnd.oasis.opendocument.spreadsheet': enums.FileTypeEnum.OpenDocumentSpreadsheet,
+    'vnd.oasis.opendocument.spreadsheet-template': enums.FileTypeEnum.OpenDocumentSpreadsheet,
+    'vnd.oasis.opendocument.spreadsheet-flat-xml': enums.FileTypeEnum.Plaintext,
+    'vnd.oasis.opendocument.presentation': enums.FileTypeEnum.OpenDocumentPresentation,
+    'vnd.oasis.opendocument.presentation-template': enums.FileTypeEnum.OpenDocumentPresentation,
+    'vnd.oasis.opendocument.presentation-flat-xml': enums.FileTypeEnum.Plaintext,
+    'vnd.oasis.opendocument.graphics': enums.FileTypeEnum.OpenDocumentDrawing,
+    'vnd.oasis.opendocument.graphics-template': enums.FileTypeEnum.OpenDocumentDrawing,
+    'vnd.oasis.opendocument.formula': enums.FileTypeEnum.OpenDocumentFormula,
+    'vnd.oasis.opendocument.text-master': enums.FileTypeEnum.OpenDocumentMaster,
+    'msword': enums.FileTypeEnum.MsWordLegacy,
+    'vnd.ms-excel': enums.FileTypeEnum.MsExcelLegacy,
+    'vnd.ms-powerpoint': enums.FileTypeEnum.MsPowerpointLegacy,
+    'vnd.ms-outlook': enums.FileTypeEnum.MsMsg,
+    'pdf': enums.FileTypeEnum.Pdf,
+    'zip': enums.FileTypeEnum.Zip,
+    'x-zip-compressed': enums.FileTypeEnum.Zip,
+    'x-tar': enums.FileTypeEnum.Tar,
+    'gzip': enums.FileTypeEnum.Gzip,
+    'x-gzip': enums.FileTypeEnum.Gzip,
+    'gzip-compressed': enums.FileTypeEnum.Gzip,
+    'gzipped': enums.FileTypeEnum.Gzip,
+    'x-gunzip': enums.FileTypeEnum.Gzip,
+    'x-compress': enums.FileTypeEnum.Gzip,
+    'x-compressed': enums.FileTypeEnum.Gzip,
+    'x-xz': enums.FileTypeEnum.Xz,
+}
+
+# Generic containers whose concrete type can only be told from the extension.
+_EXTENSION_RESOLVED_SUBTYPES = frozenset({'octet-stream', 'x-ole-storage'})
+
+# Upper bound on memoised (MIME type, extension) pairs; extensions come from
+# arbitrary file names, so the table must not grow without limit.
+CLASSIFICATION_CACHE_LIMIT = 4096
+
+
+def _resolve_file_type(mime_type_text: str, extension: str) -> enums.FileTypeEnum:
+    parts = mime_type_text.split(sep='/')
+    mime_type = parts[0]
+    mime_subtype = parts[1] if len(parts) > 1 else ''
+    extension_file_type = _EXTENSION_FILETYPES.get(extension, enums.FileTypeEnum.Unknown)
+
+    if extension_file_type in _LEGACY_OFFICE_FILETYPES:
+        return extension_file_type
+
+    if mime_type in _NON_DOCUMENT_MEDIA_TYPES:
+        return enums.FileTypeEnum.Unknown
+
+    if mime_type in ('text', 'message'):
+        if mime_subtype == 'rfc822':
+            return enums.FileTypeEnum.Eml
+        if mime_subtype == 'plain':
+            if extension == '.eml':
+                return enums.FileTypeEnum.Eml
+            if extension == '.mbox':
+                return enums.FileTypeEnum.Mbox
+        return enums.FileTypeEnum.Plaintext
+
+    if mime_type == 'application':
+        if mime_subtype in _EXTENSION_RESOLVED_SUBTYPES:
+            return extension_file_type
+        if mime_subtype in ('zip', 'x-zip-compressed') and extension_file_type in _OPENDOCUMENT_FILETYPES:
+            return extension_file_type
+        return _APPLICATION_FILETYPES.get(mime_subtype, enums.FileTypeEnum.Unknown)
+
+    return enums.FileTypeEnum.Unknown
+
+
+def _precompute_classifications() -> dict[tuple[str, str], enums.FileTypeEnum]:
+    mime_types = [f'application/{subtype}' for subtype in _APPLICATION_FILETYPES]
+    mime_types += [f'application/{subtype}' for subtype in _EXTENSION_RESOLVED_SUBTYPES]
+    mime_types += ['text/plain', 'message/rfc822', 'Unknown/Unknown']
+    extensions = ['', '.eml', *_EXTENSION_FILETYPES]
+    return {
+        (mime_type, extension): _resolve_file_type(mime_type, extension)
+        for mime_type in mime_types
+        for extension in extensions
+    }
+
+
+_classifications: dict[tuple[str, str], enums.FileTypeEnum] = _precompute_classifications()
+_PRECOMPUTED_CLASSIFICATIONS = len(_classifications)
+
+
+def classify_file_type(mime_type: str, extension: str) -> enums.FileTypeEnum:
+    """Resolve the file type for a MIME type and file extension.
+
+    Known MIME types and extensions are resolved from a table built at import
+    time; other pairs are classified once and memoised, up to
+    ``CLASSIFICATION_CACHE_LIMIT`` additional entries.
+    """
+    key = (mime_type, extension)
+    file_type = _classifications.get(key)
+    if file_type is None:
+        file_type = _resolve_file_type(mime_type, extension)
+        if len(_classifications) < _PRECOMPUTED_CLASSIFICATIONS + CLASSIFICATION_CACHE_LIMIT:
+            _classifications[key] = file_type
+    return file_type
+
 
 class ScannerFactory:
     """Creates scanner instances with properly injected dependencies."""
 
-    def __init__(self, buffer: JobBuffer, config: ScanConfiguration) -> None:
+    def __init__(self, buffer: JobBuffer, config: ScanConfiguration,
+                 report: Optional[Callable[[Finding], None]] = None) -> None:
         self._buffer = buffer
         self._config = config
+        self._report = report
         self._pan_finder = PanFinder(config)
         self._registry: dict[enums.FileTypeEnum, Type[ScannerBase]] = self._build_registry()
 
     def get_scanner(self, mime_type: str, extension: str) -> Optional[ScannerBase]:
         """Get a scanner instance for the given file type."""
-        file_type = self._detect_file_type(mime_type, extension)
-        scanner_class = self._registry.get(file_type)
+        return self.get_scanner_for(classify_file_type(mime_type, extension))
+
+    def get_scanner_for(self, file_type: enums.FileTypeEnum) -> Optional[ScannerBase]:
+        """Get a scanner instance for an already classified file type."""
+        scanner_class = self.get_scanner_class(file_type)
 
         if not scanner_class:
             return None
 
+        return self.create(scanner_class)
+
+    def get_scanner_class(self, file_type: enums.FileTypeEnum) -> Optional[Type[ScannerBase]]:
+        return self._registry.get(file_type)
+
+    def create(self, scanner_class: Type[ScannerBase]) -> ScannerBase:
         return scanner_class(
             buffer=self._buffer,
             config=self._config,
-            pan_finder=self._pan_finder
+            pan_finder=self._pan_finder,
+            report=self._report
         )
 
     def register(self, file_type: enums.FileTypeEnum, scanner_class: Type[ScannerBase]) -> None:
@@ -52,134 +215,10 @@ def _build_registry(self) -> dict[enums.FileTypeEnum, Type[ScannerBase]]:
             enums.FileTypeEnum.Pdf: PdfScanner,
         }
 
-    def _detect_file_type(self, mime_type: str, extension: str) -> enums.FileTypeEnum:
-        """Detect file type from MIME type and extension."""
-        return self._get_filetype(mime_type, extension)
-
     @staticmethod
     def _get_filetype(mime_type_text: str, extension: str) -> enums.FileTypeEnum:
         """Extract file type from MIME type and extension."""
-        parts = mime_type_text.split(sep='/')
-        mime_type = parts[0]
-        mime_subtype = parts[1] if len(parts) > 1 else ''
-        extension_file_type = ScannerFactory._get_filetype_from_extension(extension)
-
-        if extension_file_type in {
-                enums.FileTypeEnum.MsWordLegacy,
-                enums.FileTypeEnum.MsExcelLegacy,
-                enums.FileTypeEnum.MsPowerpointLegacy}:
-            return extension_file_type
-
-        # Early return for non-document types
-        if mime_type in ['Unknown', 'audio', 'video', 'image', 'chemical', 'model', 'gcode', 'x-conference', 'font', 'x-world']:
-            return enums.FileTypeEnum.Unknown
-
-        # Text/message types
-        if mime_type in ['text', 'message']:
-            if mime_subtype == 'rfc822':
-                return enums.FileTypeEnum.Eml
-            if mime_subtype == 'plain':
-                if extension == '.eml':
-                    return enums.FileTypeEnum.Eml
-                if extension == '.mbox':
-                    return enums.FileTypeEnum.Mbox
-            return enums.FileTypeEnum.Plaintext
-
-        # Application types
-        if mime_type == 'application':
-            if mime_subtype == 'octet-stream':
-                if extension_file_type != enums.FileTypeEnum.Unknown:
-                    return extension_file_type
-                return enums.FileTypeEnum.Unknown
-
-            if (mime_subtype in ['zip', 'x-zip-compressed']
-                    and extension_file_type in ScannerFactory._opendocument_filetypes()):
-                return extension_file_type
-
-            if mime_subtype == 'vnd.openxmlformats-officedocument.wordprocessingml.document':
-                return enums.FileTypeEnum.MsWord
-            elif mime_subtype == 'vnd.openxmlformats-officedocument.spreadsheetml.sheet':
-                return enums.FileTypeEnum.MsExcel
-            elif mime_subtype == 'vnd.openxmlformats-officedocument.presentationml.presentation':
-                return enums.FileTypeEnum.MsPowerpoint
-            elif mime_subtype in ['vnd.oasis.opendocument.text', 'vnd.oasis.opendocument.text-template']:
-                return enums.FileTypeEnum.OpenDocumentText
-            elif mime_subtype == 'vnd.oasis.opendocument.text-flat-xml':
-                return enums.FileTypeEnum.Plaintext
-            elif mime_subtype in ['vnd.oasis.opendocument.spreadsheet', 'vnd.oasis.opendocument.spreadsheet-template']:
-                return enums.FileTypeEnum.OpenDocumentSpreadsheet
-            elif mime_subtype == 'vnd.oasis.opendocument.spreadsheet-flat-xml':
-                return enums.FileTypeEnum.Plaintext
-            elif mime_subtype in ['vnd.oasis.opendocument.presentation', 'vnd.oasis.opendocument.presentation-template']:
-                return enums.FileTypeEnum.OpenDocumentPresentation
-            elif mime_subtype == 'vnd.oasis.opendocument.presentation-flat-xml':
-                return enums.FileTypeEnum.Plaintext
-            elif mime_subtype in ['vnd.oasis.opendocument.graphics', 'vnd.oasis.opendocument.graphics-template']:
-                return enums.FileTypeEnum.OpenDocumentDrawing
-            elif mime_subtype == 'vnd.oasis.opendocument.formula':
-                return enums.FileTypeEnum.OpenDocumentFormula
-            elif mime_subtype == 'vnd.oasis.opendocument.text-master':
-                return enums.FileTypeEnum.OpenDocumentMaster
-            elif mime_subtype == 'msword':
-                return enums.FileTypeEnum.MsWordLegacy
-            elif mime_subtype == 'vnd.ms-excel':
-                return enums.FileTypeEnum.MsExcelLegacy
-            elif mime_subtype == 'vnd.ms-powerpoint':
-                return enums.FileTypeEnum.MsPowerpointLegacy
-            elif mime_subtype == 'x-ole-storage':
-                return extension_file_type if extension_file_type != enums.FileTypeEnum.Unknown else enums.FileTypeEnum.Unknown
-            elif mime_subtype == 'vnd.ms-outlook':
-                return enums.FileTypeEnum.MsMsg
-            elif mime_subtype == 'pdf':
-                return enums.FileTypeEnum.Pdf
-            elif mime_subtype in ['zip', 'x-zip-compressed']:
-                return enums.FileTypeEnum.Zip
-            elif mime_subtype == 'x-tar':
-                return enums.FileTypeEnum.Tar
-            elif mime_subtype in ['gzip', 'x-gzip', 'gzip-compressed', 'gzipped', 'x-gunzip', 'x-compress', 'x-compressed']:
-                return enums.FileTypeEnum.Gzip
-            elif mime_subtype == 'x-xz':
-                return enums.FileTypeEnum.Xz
-
-        return enums.FileTypeEnum.Unknown
-
-    @staticmethod
-    def _opendocument_filetypes() -> set[enums.FileTypeEnum]:
-        return {
-            enums.FileTypeEnum.OpenDocumentText,
-            enums.FileTypeEnum.OpenDocumentSpreadsheet,
-            enums.FileTypeEnum.OpenDocumentPresentation,
-            enums.FileTypeEnum.OpenDocumentDrawing,
-            enums.FileTypeEnum.OpenDocumentFormula,
-            enums.FileTypeEnum.OpenDocumentMaster,
-        }
-
-    @staticmethod
-    def _get_filetype_from_extension(extension: str) -> enums.FileTypeEnum:
-        extension_map = {
-            '.doc': enums.FileTypeEnum.MsWordLegacy,
-            '.xls': enums.FileTypeEnum.MsExcelLegacy,
-            '.ppt': enums.FileTypeEnum.MsPowerpointLegacy,
-            '.docx': enums.FileTypeEnum.MsWord,
-            '.xlsx': enums.FileTypeEnum.MsExcel,
-            '.pptx': enums.FileTypeEnum.MsPowerpoint,
-            '.mbox': enums.FileTypeEnum.Mbox,
-            '.pst': enums.FileTypeEnum.MsPst,
-            '.odt': enums.FileTypeEnum.OpenDocumentText,
-            '.ott': enums.FileTypeEnum.OpenDocumentText,
-            '.ods': enums.FileTypeEnum.OpenDocumentSpreadsheet,
-            '.ots': enums.FileTypeEnum.OpenDocumentSpreadsheet,
-            '.odp': enums.FileTypeEnum.OpenDocumentPresentation,
-            '.otp': enums.FileTypeEnum.OpenDocumentPresentation,
-            '.odg': enums.FileTypeEnum.OpenDocumentDrawing,
-            '.otg': enums.FileTypeEnum.OpenDocumentDrawing,
-            '.odf': enums.FileTypeEnum.OpenDocumentFormula,
-            '.odm': enums.FileTypeEnum.OpenDocumentMaster,
-            '.fodt': enums.FileTypeEnum.Plaintext,
-            '.fods': enums.FileTypeEnum.Plaintext,
-            '.fodp': enums.FileTypeEnum.Plaintext,
-        }
-        return extension_map.get(extension, enums.FileTypeEnum.Unknown)
+        return classify_file_type(mime_type_text, extension)
 
 
 class ArchiveFactory:
@@ -204,7 +243,11 @@ class ArchiveFactory:
     @classmethod
     def get_archive(cls, mime_type: str, extension: str) -> Optional[Type[Archive]]:
         """Get archive handler for the given file type."""
-        file_type = ScannerFactory._get_filetype(mime_type, extension)
+        return cls.get_archive_for(classify_file_type(mime_type, extension))
+
+    @classmethod
+    def get_archive_for(cls, file_type: enums.FileTypeEnum) -> Optional[Type[Archive]]:
+        """Get archive handler for an already classified file type."""
         return cls._registry.get(file_type)
 
     @classmethod
@@ -6,6 +6,7 @@
 from typing import Optional, Union, cast
 
 from . import panutils
+from .bytesource import ByteSource
 from .panutils import FileLikePayload
 from .enums import ScanStatusEnum
 from .pan import PAN
@@ -31,7 +32,8 @@ class Finding:
 
     def __init__(self, basename: str, dirname: str, payload: Optional[Union[bytes, FileLikePayload]] = None,
                  mimetype: Optional[str] = None, encoding: Optional[str] = None,
-                 err: Optional[Exception] = None, context: Optional[ScanContext] = None) -> None:
+                 err: Optional[Exception] = None, context: Optional[ScanContext] = None,
+                 source: Optional[ByteSource] = None) -> None:
         self.basename = basename
         self.dirname = dirname
         self.abspath = str(Path(dirname) / basename)
@@ -48,7 +50,7 @@ def __init__(self, basename: str, dirname: str, payload: Optional[Union[bytes, F
             self._set_error(str(err))
 
         if mimetype is None or encoding is None:
-            detected_mime, detected_encoding, mime_err = panutils.get_mimetype(self.abspath, payload)
+            detected_mime, detected_encoding, mime_err = panutils.get_mimetype(self.abspath, payload, source)
             if mime_err:
                 needed = []
                 if mimetype is None:
@@ -64,7 +66,7 @@ def __init__(self, basename: str, dirname: str, payload: Optional[Union[bytes, F
             self.mime_type = mimetype
             self.encoding = encoding
 
-        self._set_file_stats(payload)
+        self._set_file_stats(payload, source)
 
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, Finding):
@@ -74,9 +76,13 @@ def __eq__(self, other: object) -> bool:
     def __str__(self) -> str:
         return f'{self.abspath} ({self.mime_type} : {self.encoding})'
 
-    def _set_file_stats(self, payload: Optional[Union[bytes, FileLikePayload]]) -> None:
+    def _set_file_stats(self, payload: Optional[Union[bytes, FileLikePayload]],
+                        source: Optional[ByteSource] = None) -> None:
         try:
-            if payload is None:
+            if source is not None:
+                size = source.size
+                self.size = size if size is not None else 0
+            elif payload is None:
                 self.size = os.stat(self.abspath).st_size
             elif isinstance(payload, bytes):
                 self.size = len(payload)
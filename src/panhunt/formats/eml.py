@@ -1,97 +1,422 @@
 from __future__ import annotations
 
+import binascii
+import codecs
+import io
 import json
+import quopri
+import re
 from email import message, parser
-from typing import Optional, Union, cast
+from typing import IO, Iterable, Iterator, Optional, Sequence, Union, cast
 
+from ..dedup import new_digest
 from ..exceptions import PANHuntException
+from ..limitedio import spool_chunks
 from ..scancontext import ScanContext
+from .htmltext import HtmlTextExtractor
+
+DECODE_CHUNK_CHARS = 1024 * 1024
+FEED_CHUNK_BYTES = 64 * 1024
+# Longest line read at once; a longer line is read in pieces and cannot be a boundary.
+MAX_LINE_BYTES = 64 * 1024
+# Everything that is not part of the base64 alphabet, removed before decoding.
+_NON_BASE64 = bytes(set(range(256)) - set(b'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/='))
+
+
+def _encoded_chunks(payload: str, chunk_chars: int) -> Iterator[bytes]:
+    """Yield a part's encoded payload as bytes, in chunks that end at line breaks."""
+    start = 0
+    while start < len(payload):
+        end = payload.find('\n', start + chunk_chars)
+        end = len(payload) if end < 0 else end + 1
+        chunk = payload[start:end]
+        try:
+            yield chunk.encode('ascii', 'surrogateescape')
+        except UnicodeError:
+            yield chunk.encode('raw-unicode-escape')
+        start = end
+
+
+def _decode_base64(data: bytes) -> bytes:
+    """Decode base64 leniently: stray padding is ignored and missing padding added."""
+    try:
+        return binascii.a2b_base64(data)
+    except binascii.Error:
+        data = data.replace(b'=', b'')
+    if len(data) % 4 == 1:
+        data = data[:-1]  # a single trailing character holds no whole byte
+    return binascii.a2b_base64(data + b'=' * (-len(data) % 4))
+
+
+def decode_chunks(part: message.Message, chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Decode the Content-Transfer-Encoding of a part's encoded body, given in chunks that end at line breaks.
+
+    Base64 and quoted-printable bodies are decoded a chunk at a time, so the
+    decoded body is never held in memory as a whole.
+    """
+    cte = str(part.get('content-transfer-encoding', '')).lower()
+    if cte == 'base64':
+        pending = b''
+        for chunk in chunks:
+            pending += chunk.translate(None, _NON_BASE64)
+            whole = len(pending) - len(pending) % 4
+            yield _decode_base64(pending[:whole])
+            pending = pending[whole:]
+        if pending:
+            yield _decode_base64(pending)
+    elif cte == 'quoted-printable':
+        for chunk in chunks:
+            yield quopri.decodestring(chunk)
+    elif cte in ('', '7bit', '8bit', 'binary'):
+        yield from chunks
+    else:
+        # Uuencoded bodies are converted in one step, as the email package does.
+        encoded = message.Message()
+        encoded['Content-Transfer-Encoding'] = cte
+        encoded.set_payload(b''.join(chunks).decode('ascii', 'surrogateescape'))
+        yield cast(bytes, encoded.get_payload(decode=True))
+
+
+def iter_decoded_payload(part: message.Message, chunk_chars: int = DECODE_CHUNK_CHARS) -> Iterator[bytes]:
+    """Decode the Content-Transfer-Encoding of a non-multipart part.
+
+    Yields the same bytes as ``part.get_payload(decode=True)``, decoding
+    base64 and quoted-printable payloads a chunk at a time.
+    """
+    payload = part.get_payload()
+    if not isinstance(payload, str):
+        yield str(payload).encode('utf-8', errors='backslashreplace')
+        return
+    cte = str(part.get('content-transfer-encoding', '')).lower()
+    if cte in ('base64', 'quoted-printable'):
+        yield from decode_chunks(part, _encoded_chunks(payload, chunk_chars))
+    else:
+        # Unencoded and uuencoded payloads are converted in one step, as the email package does.
+        yield cast(bytes, part.get_payload(decode=True))
+
+
+def _incremental_decoder(part: message.Message) -> codecs.IncrementalDecoder:
+    try:
+        return codecs.getincrementaldecoder(part.get_content_charset() or 'utf-8')(errors='backslashreplace')
+    except LookupError:
+        return codecs.getincrementaldecoder('utf-8')(errors='backslashreplace')
+
+
+def html_to_text(part: message.Message, decoded: Iterable[bytes]) -> str:
+    """Convert the decoded body of a text/html part to text as each chunk arrives."""
+    decoder = _incremental_decoder(part)
+    extractor = HtmlTextExtractor()
+    text = []
+    for chunk in decoded:
+        extractor.feed(decoder.decode(chunk))
+        text.append(extractor.take_text())
+    extractor.feed(decoder.decode(b'', final=True))
+    extractor.close()
+    text.append(extractor.take_text())
+    return ''.join(text)
+
+
+def decode_html_part(part: message.Message) -> str:
+    """Decode a text/html part and convert it to text as each chunk is decoded."""
+    return html_to_text(part, iter_decoded_payload(part))
+
+
+def iter_leaf_parts(msg: message.Message) -> Iterator[message.Message]:
+    """Walk the non-multipart parts of a message.
+
+    A text/html part offered as an alternative to a text/plain part is left
+    out, so the same text is not scanned and reported twice.
+    """
+    redundant: set[int] = set()
+    for part in msg.walk():
+        if not part.is_multipart():
+            if id(part) not in redundant:
+                yield part
+            continue
+        if part.get_content_type() == 'multipart/alternative':
+            alternatives = cast(list[message.Message], part.get_payload())
+            if any(alternative.get_content_type() == 'text/plain' for alternative in alternatives):
+                redundant.update(id(alternative) for alternative in alternatives
+                                 if alternative.get_content_type() == 'text/html')
+
+
+# A header field, a continuation line or an mbox "From " line, as in email.feedparser.
+_HEADER_LINE = re.compile(rb'(From |[\041-\071\073-\176]*:|[\t ])')
+
+
+def _split_line_end(line: bytes) -> tuple[bytes, bytes]:
+    if line.endswith(b'\r\n'):
+        return line[:-2], b'\r\n'
+    if line.endswith(b'\n'):
+        return line[:-1], b'\n'
+    return line, b''
+
+
+class MimeReader:
+    """Walks the parts of a message read line by line from a binary stream.
+
+    ``parts`` yields the headers of each non-multipart part, parsed on
+    their own, with an iterator over its still encoded body. The body is
+    read up to the next boundary of an enclosing multipart as the iterator
+    is consumed, in chunks of about ``FEED_CHUNK_BYTES`` that end at line
+    breaks, and is skipped if the consumer leaves it. Only one part's
+    headers and one chunk are held in memory at a time. Parts of a
+    message/rfc822 part are walked as well, and a text/html part offered
+    as an alternative after a text/plain part is skipped, so the same text
+    is not scanned and reported twice.
+    """
+
+    def __init__(self, stream: IO[bytes]) -> None:
+        self._stream = stream
+        self._at_line_start = True
+        self._pushed_back: Optional[bytes] = None
+        # The boundary line that ended the last header block, body, preamble
+        # or epilogue, as (boundary, closes), or None at the end of the stream.
+        self._delimiter: Optional[tuple[bytes, bool]] = None
+
+    def parts(self) -> Iterator[tuple[message.Message, Iterator[bytes]]]:
+        headers, has_body = self._read_headers(())
+        yield from self._walk(headers, has_body, ())
+
+    def _walk(self, headers: message.Message, has_body: bool, boundaries: Sequence[bytes],
+              skip: bool = False) -> Iterator[tuple[message.Message, Iterator[bytes]]]:
+        boundary = headers.get_boundary() if headers.get_content_maintype() == 'multipart' else None
+        if has_body and boundary:
+            inner = (*boundaries, boundary.encode('ascii', 'surrogateescape'))
+            self._skip_to_boundary(inner)  # the preamble
+            digest = headers.get_content_type() == 'multipart/digest'
+            alternative = headers.get_content_type() == 'multipart/alternative'
+            plain_seen = False
+            while self._delimiter == (inner[-1], False):
+                part, part_has_body = self._read_headers(inner)
+                if digest and 'content-type' not in part:
+                    part.set_default_type('message/rfc822')
+                content_type = part.get_content_type()
+                yield from self._walk(part, part_has_body, inner,
+                                      skip or (alternative and plain_seen and content_type == 'text/html'))
+                plain_seen = plain_seen or content_type == 'text/plain'
+            if self._delimiter == (inner[-1], True):
+                self._skip_to_boundary(boundaries)  # the epilogue
+            return
+        if has_body and headers.get_content_type() == 'message/rfc822':
+            yield from self._walk(*self._read_headers(boundaries), boundaries, skip)
+            return
+        body = self._read_body(boundaries) if has_body else iter(())
+        if not skip:
+            yield headers, body
+        for _ in body:
+            pass
+
+    def _readline(self) -> tuple[bytes, bool]:
+        """Return the next line, or the next piece of a long line, and whether it starts a line."""
+        if self._pushed_back is not None:
+            line, self._pushed_back = self._pushed_back, None
+            return line, True
+        at_line_start = self._at_line_start
+        line = self._stream.readline(MAX_LINE_BYTES)
+        self._at_line_start = line.endswith(b'\n')
+        return line, at_line_start
+
+    def _match_boundary(self, line: bytes, boundaries: Sequence[bytes]) -> bool:
+        """Return True and note the boundary if ``line`` is a boundary line of an enclosing multipart."""
+        if not line.startswith(b'--'):
+            return False
+        delimiter = line.rstrip(b' \t\r\n')[2:]
+        for boundary in reversed(boundaries):
+            if delimiter == boundary or delimiter == boundary + b'--':
+                self._delimiter = (boundary, delimiter != boundary)
+                return True
+        return False
+
+    def _read_headers(self, boundaries: Sequence[bytes]) -> tuple[message.Message, bool]:
+        """Parse a header block; returns the headers and whether a body follows them."""
+        lines = []
+        has_body = True
+        while True:
+            line, line_start = self._readline()
+            if not line:
+                self._delimiter = None
+                has_body = False
+                break
+            if line_start:
+                if line in (b'\n', b'\r\n'):
+                    break
+                if self._match_boundary(line, boundaries):
+                    has_body = False
+                    break
+                if not _HEADER_LINE.match(line):
+                    self._pushed_back = line  # the body starts without an empty line
+                    break
+            lines.append(line)
+        return parser.BytesHeaderParser().parsebytes(b''.join(lines)), has_body
+
+    def _read_body(self, boundaries: Sequence[bytes]) -> Iterator[bytes]:
+        """Yield the encoded body up to the next boundary; the line break before the boundary is dropped."""
+        chunk = bytearray()
+        line_end = b''
+        while True:
+            line, line_start = self._readline()
+            if not line:
+                self._delimiter = None
+                chunk += line_end
+                break
+            if line_start and self._match_boundary(line, boundaries):
+                break
+            chunk += line_end
+            if line_end and len(chunk) >= FEED_CHUNK_BYTES:
+                yield bytes(chunk)
+                chunk.clear()
+            content, line_end = _split_line_end(line)
+            chunk += content
+        if chunk:
+            yield bytes(chunk)
+
+    def _skip_to_boundary(self, boundaries: Sequence[bytes]) -> None:
+        while True:
+            line, line_start = self._readline()
+            if not line:
+                self._delimiter = None
+                return
+            if line_start and self._match_boundary(line, boundaries):
+                return
 
 
 class Eml:
+    """Reader for RFC 822 messages.
+
+    The message is read from ``payload``, which may be bytes or a binary
+    stream, or from the file at ``path``, and its parts are walked by a
+    ``MimeReader`` as they are read, so the message is never held in memory
+    as a whole. By default the text of all text/plain and text/html parts
+    is collected in ``body``, HTML converted to text while it is decoded,
+    and the attachments in ``attachments``. With ``scan_only``, nothing is
+    read up front; ``iter_parts`` reads the message and yields each text
+    part and attachment in turn.
+    """
 
     filename: str
     body: str
     attachments: list['Attachment']
-
-    __text: str
+    attachment_count: int
 
     def __init__(
             self,
             path: str,
-            payload: Optional[bytes] = None,
+            payload: Optional[Union[bytes, IO[bytes]]] = None,
             size_limit: int = 8 * 1_073_741_824,
             max_attachments: int = 1_000,
             max_total_attachment_bytes: int = 8 * 1_073_741_824,
-            context: Optional[ScanContext] = None) -> None:
-        if payload:
-            msg = parser.BytesParser().parsebytes(payload)
-        else:
-            with open(path, "rb") as f:
-                msg = parser.BytesParser().parse(f)
-
+            context: Optional[ScanContext] = None,
+            spool_threshold: int = 8 * 1024 * 1024,
+            scan_only: bool = False) -> None:
         self.filename = path
         self.body = ''
         self.attachments = []
+        self.attachment_count = 0
         self._size_limit = size_limit
         self._max_attachments = max_attachments
         self._max_total_attachment_bytes = max_total_attachment_bytes
         self._decoded_attachment_bytes = 0
         self._context = context
-        self._extract_message(msg)
-        self.__text = self.to_text()
-
-    def _extract_message(self, msg: message.Message) -> None:
-        if msg.is_multipart():
-            for part in msg.walk():
-                if part.is_multipart():
-                    continue
-                self._parse_part(part)
+        self._spool_threshold = spool_threshold
+        self._payload = payload
+        self._unread = True
+        if scan_only:
+            return
+        try:
+            for item in self.iter_parts():
+                if isinstance(item, Attachment):
+                    self.attachments.append(item)
+                else:
+                    self.body += item
+        except Exception:
+            self.close()
+            raise
+
+    def iter_parts(self) -> Iterator[Union[str, 'Attachment']]:
+        """Yield the decoded text of each text part and each spooled attachment, in message order.
+
+        The message is read only once. Attachments are checked against the
+        attachment limits as they are reached. The caller owns each yielded
+        attachment's payload.
+        """
+        if not self._unread:
+            return
+        self._unread = False
+        payload, self._payload = self._payload, None
+        if payload is None:
+            with open(self.filename, 'rb') as file:
+                yield from self._iter_parts(file)
+        elif isinstance(payload, bytes):
+            yield from self._iter_parts(io.BytesIO(payload))
         else:
-            self._parse_part(msg)
+            yield from self._iter_parts(payload)
+
+    def _iter_parts(self, stream: IO[bytes]) -> Iterator[Union[str, 'Attachment']]:
+        for headers, body in MimeReader(stream).parts():
+            item = self._parse_part(headers, body)
+            if item is not None:
+                yield item
 
-    def _parse_part(self, part: message.Message) -> None:
+    def _parse_part(self, part: message.Message, body: Iterator[bytes]) -> Optional[Union[str, 'Attachment']]:
         disposition = part.get_content_disposition()
         filename = part.get_filename()
         if disposition == 'attachment' or filename:
-            self.parse_attachment(part)
-        elif part.get_content_type() == 'text/plain':
-            self.parse_body(part)
+            return self._spool_attachment(filename, decode_chunks(part, body))
+        if part.get_content_type() == 'text/plain':
+            decoder = _incremental_decoder(part)
+            text = [decoder.decode(chunk) for chunk in decode_chunks(part, body)]
+            text.append(decoder.decode(b'', final=True))
+            return ''.join(text)
+        if part.get_content_type() == 'text/html':
+            return html_to_text(part, decode_chunks(part, body))
+        return None
 
     def parse_body(self, body_payload: Union[message.Message, str]) -> None:
         if isinstance(body_payload, message.Message):
-            charset = body_payload.get_content_charset() or 'utf-8'
-            decoded = cast(Optional[bytes], body_payload.get_payload(decode=True))
-            if decoded is None:
-                self.body += str(body_payload.get_payload())
-            else:
-                self.body += decoded.decode(charset, errors='backslashreplace')
+            self.body += self._decode_body(body_payload)
         elif isinstance(body_payload, str):
             self.body += body_payload
 
+    @staticmethod
+    def _decode_body(body_payload: message.Message) -> str:
+        charset = body_payload.get_content_charset() or 'utf-8'
+        decoded = cast(Optional[bytes], body_payload.get_payload(decode=True))
+        if decoded is None:
+            return str(body_payload.get_payload())
+        return decoded.decode(charset, errors='backslashreplace')
+
     def parse_attachment(self, attachment_payload: message.Message) -> None:
-        filename = attachment_payload.get_filename() or '[NoFilename]'
-        binary_data = cast(Optional[bytes], attachment_payload.get_payload(decode=True))
-        if binary_data is None:
-            raw = attachment_payload.get_payload()
-            if isinstance(raw, str):
-                binary_data = raw.encode('utf-8', errors='backslashreplace')
-            elif isinstance(raw, bytes):
-                binary_data = raw
-            else:
-                binary_data = str(raw).encode('utf-8', errors='backslashreplace')
-        attachment_count = len(self.attachments) + 1
-        byte_count = len(binary_data)
+        self.attachments.append(
+            self._spool_attachment(attachment_payload.get_filename(), iter_decoded_payload(attachment_payload)))
+
+    def _spool_attachment(self, filename: Optional[str], decoded: Iterable[bytes]) -> 'Attachment':
+        filename = filename or '[NoFilename]'
+        attachment_count = self.attachment_count + 1
         if attachment_count > self._max_attachments:
             raise PANHuntException(f'Attachment count limit exceeded for "{self.filename}": {attachment_count} over {self._max_attachments}')
-        if byte_count > self._size_limit:
-            raise PANHuntException(f'Attachment "{filename}" exceeds configured size limit')
-        if self._decoded_attachment_bytes + byte_count > self._max_total_attachment_bytes:
-            raise PANHuntException(f'Decoded attachment bytes exceed configured message limit for "{self.filename}"')
-        if self._context:
-            self._context.reserve_attachment(filename, byte_count, attachment_count)
+        digest = new_digest()
+        try:
+            payload, byte_count = spool_chunks(decoded, self._size_limit,
+                                               spool_threshold=self._spool_threshold, digest=digest)
+        except PANHuntException as ex:
+            raise PANHuntException(f'Attachment "{filename}" exceeds configured size limit') from ex
+        try:
+            if self._decoded_attachment_bytes + byte_count > self._max_total_attachment_bytes:
+                raise PANHuntException(f'Decoded attachment bytes exceed configured message limit for "{self.filename}"')
+            if self._context:
+                self._context.reserve_attachment(filename, byte_count, attachment_count)
+        except Exception:
+            payload.close()
+            raise
+        self.attachment_count = attachment_count
         self._decoded_attachment_bytes += byte_count
-        self.attachments.append(Attachment(filename=filename, payload=binary_data))
+        return Attachment(filename, payload, byte_count, digest.digest())
+
+    def close(self) -> None:
+        """Close the spooled payloads of attachments that were not handed over to child jobs."""
+        for attachment in self.attachments:
+            attachment.close()
 
     def to_text(self) -> str:
         d: dict = {}
@@ -104,15 +429,32 @@ def to_text(self) -> str:
 
     def __str__(self) -> str:
 
-        return self.__text
+        return self.to_text()
 
 
 class Attachment:
+    """A decoded attachment spooled to a ``SpooledTemporaryFile``; Payload is None when it is empty."""
 
     Filename: str
-    BinaryData: Optional[bytes] = None
+    Payload: Optional[IO[bytes]] = None
+    Size: int
+    ContentHash: Optional[bytes] = None
 
-    def __init__(self, filename: str, payload: bytes) -> None:
+    def __init__(self, filename: str, payload: IO[bytes], size: int, content_hash: Optional[bytes] = None) -> None:
         self.Filename = filename
-        if len(payload) > 0:
-            self.BinaryData = payload
+        self.Size = size
+        if size > 0:
+            self.Payload = payload
+            self.ContentHash = content_hash
+        else:
+            payload.close()
+
+    def take_payload(self) -> Optional[IO[bytes]]:
+        """Hand the payload over to its new owner, which must close it."""
+        payload, self.Payload = self.Payload, None
+        return payload
+
+    def close(self) -> None:
+        if self.Payload is not None:
+            self.Payload.close()
+            self.Payload = None
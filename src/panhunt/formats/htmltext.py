@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import html
+import re
+
+# Elements that start a new line of text, so cells and paragraphs are not run together.
+_BLOCK_TAG = re.compile(
+    r'</?(?:a(?:ddress|rticle)|b(?:lockquote|r)|d(?:[dlt]|iv)|footer|h(?:[1-6r]|eader)|li|ol|p(?:re)?'
+    r'|section|t(?:able|body|[dhr]|foot|head|itle)|ul)\b[^>]*>',
+    re.IGNORECASE)
+_TAG = re.compile(r'</?[A-Za-z][^>]*>|<[!?][^>]*>')
+# Comments and elements whose content is not text shown to the reader.
+_SKIPPED = re.compile(r'<!--.*?-->|<(script|style|template)\b.*?</\1\s*>', re.IGNORECASE | re.DOTALL)
+_SKIPPED_START = re.compile(r'<!--|<(?:script|style|template)\b', re.IGNORECASE)
+_PARTIAL_ENTITY = re.compile(r'&#?[A-Za-z0-9]{0,32}$')
+
+
+class HtmlTextExtractor:
+    """Incremental HTML-to-text conversion for scanning mail bodies.
+
+    Markup is fed in chunks with ``feed``. Each chunk is converted with a
+    few regular expression passes: tags are removed and character
+    references decoded, inline tags such as ``<b>`` leave nothing behind
+    so digits split by them are joined again, and block elements end the
+    line. Non-breaking spaces become spaces. A tag, comment, script or
+    reference cut at the end of a chunk is kept until the next one.
+    ``take_text`` returns the text converted so far.
+    """
+
+    MAX_PENDING_CHARS = 64 * 1024
+
+    def __init__(self) -> None:
+        self._parts: list[str] = []
+        self._pending = ''
+
+    def feed(self, markup: str) -> None:
+        markup = _SKIPPED.sub('', self._pending + markup)
+        self._pending = ''
+        opened = _SKIPPED_START.search(markup)
+        if opened:
+            # Content closed in a later chunk; only the end of it is kept to find the end tag.
+            pending = markup[opened.start():]
+            if len(pending) > self.MAX_PENDING_CHARS:
+                pending = opened.group(0) + ' ' + pending[-16:]
+            markup, self._pending = markup[:opened.start()], pending
+        else:
+            start = markup.rfind('<')
+            if 0 <= start and '>' not in markup[start:] and len(markup) - start <= self.MAX_PENDING_CHARS:
+                markup, self._pending = markup[:start], markup[start:]
+            elif reference := _PARTIAL_ENTITY.search(markup):
+                markup, self._pending = markup[:reference.start()], markup[reference.start():]
+        self._parts.append(self._convert(markup))
+
+    def close(self) -> None:
+        if not _SKIPPED_START.match(self._pending):
+            self._parts.append(self._convert(self._pending))
+        self._pending = ''
+
+    def take_text(self) -> str:
+        text = ''.join(self._parts)
+        self._parts.clear()
+        return text
+
+    @staticmethod
+    def _convert(markup: str) -> str:
+        text = _TAG.sub('', _BLOCK_TAG.sub('\n', markup))
+        if '&' in text:
+            text = html.unescape(text)
+        return text.replace('\xa0', ' ')
+
+
+def html_to_text(markup: str) -> str:
+    extractor = HtmlTextExtractor()
+    extractor.feed(markup)
+    extractor.close()
+    return extractor.take_text()
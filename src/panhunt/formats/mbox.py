@@ -1,78 +1,131 @@
 from __future__ import annotations
 
+import io
 import json
-import mailbox
-import os
-import tempfile
-from typing import Any, Optional
+from email.message import Message
+from email.parser import BytesFeedParser
+from typing import IO, Any, Iterator, Optional, Union
 
+from ..dedup import new_digest
+from ..limitedio import spool_chunks
 from ..scancontext import ScanContext
 
 from ..exceptions import PANHuntException
+from .eml import Attachment, decode_html_part, iter_decoded_payload, iter_leaf_parts
+
+READ_CHUNK_BYTES = 1024 * 1024
 
 
 class Mbox:
+    """Reader that parses an mbox file one message at a time.
+
+    Iterating yields a ``Mail`` per message, read from the file at ``path`` or
+    from ``payload``, which may be bytes or a binary stream. Only the message
+    being parsed is held in memory. Messages are separated by lines starting
+    with ``From ``, as in ``mailbox.mbox``; the empty line before a separator
+    is not part of the message.
+    """
 
     filename: str
-    mails: list['Mail']
+    mail_count: int
 
     def __init__(
             self,
             path: str,
-            payload: Optional[bytes] = None,
+            payload: Optional[Union[bytes, IO[bytes]]] = None,
             size_limit: int = 8 * 1_073_741_824,
             max_attachments_per_message: int = 1_000,
             max_total_attachment_bytes: int = 8 * 1_073_741_824,
-            context: Optional[ScanContext] = None) -> None:
+            context: Optional[ScanContext] = None,
+            spool_threshold: int = 8 * 1024 * 1024) -> None:
         self.filename = path
-        self.mails = []
+        self.mail_count = 0
+        self._payload = payload
         self._size_limit = size_limit
         self._max_attachments_per_message = max_attachments_per_message
         self._max_total_attachment_bytes = max_total_attachment_bytes
         self._decoded_attachment_bytes = 0
         self._context = context
+        self._spool_threshold = spool_threshold
 
-        if payload:
-            if len(payload) > size_limit:
-                raise PANHuntException(f'MBOX payload exceeds configured size limit for "{path}"')
-            fd, temp_path = tempfile.mkstemp(prefix='panhunt-mbox-')
-            try:
-                with os.fdopen(fd, 'wb') as temp_file:
-                    temp_file.write(payload)
-                self._load_mailbox(temp_path)
-            finally:
-                if os.path.exists(temp_path):
-                    os.unlink(temp_path)
-        else:
-            self._load_mailbox(path)
+        if isinstance(payload, bytes) and len(payload) > size_limit:
+            raise PANHuntException(f'MBOX payload exceeds configured size limit for "{path}"')
 
-    def _load_mailbox(self, path: str) -> None:
-        mbox = mailbox.mbox(path)
-        try:
-            for message in mbox:
-                self.mails.append(Mail(
-                    message,
-                    size_limit=self._size_limit,
-                    max_attachments=self._max_attachments_per_message,
-                    max_total_attachment_bytes=self._max_total_attachment_bytes,
-                    context=self._context
-                ))
-                self._decoded_attachment_bytes += self.mails[-1].decoded_attachment_bytes
-                if self._decoded_attachment_bytes > self._max_total_attachment_bytes:
-                    raise PANHuntException(f'Decoded attachment bytes exceed configured mailbox limit for "{self.filename}"')
-        finally:
-            mbox.close()
+    def __iter__(self) -> Iterator['Mail']:
+        if self._payload is None:
+            with open(self.filename, 'rb') as file:
+                yield from self._read_mails(file)
+        elif isinstance(self._payload, bytes):
+            yield from self._read_mails(io.BytesIO(self._payload))
+        else:
+            yield from self._read_mails(self._payload)
+
+    def _read_mails(self, stream: IO[bytes]) -> Iterator['Mail']:
+        for message in self._iter_messages(stream):
+            if self._context:
+                self._context.check_cancelled()
+            mail = Mail(
+                message,
+                size_limit=self._size_limit,
+                max_attachments=self._max_attachments_per_message,
+                max_total_attachment_bytes=self._max_total_attachment_bytes,
+                context=self._context,
+                spool_threshold=self._spool_threshold
+            )
+            self._decoded_attachment_bytes += mail.decoded_attachment_bytes
+            if self._decoded_attachment_bytes > self._max_total_attachment_bytes:
+                mail.close()
+                raise PANHuntException(f'Decoded attachment bytes exceed configured mailbox limit for "{self.filename}"')
+            self.mail_count += 1
+            yield mail
+
+    @staticmethod
+    def _iter_messages(stream: IO[bytes]) -> Iterator[Message]:
+        parser: Optional[BytesFeedParser] = None
+        # Lines are fed in batches of about READ_CHUNK_BYTES; feeding single lines is slow.
+        batch: list[bytes] = []
+        batch_size = 0
+        for line in _iter_lines(stream):
+            if line.startswith(b'From '):
+                if parser is not None:
+                    if batch and batch[-1] in (b'\n', b'\r\n'):
+                        batch.pop()
+                    parser.feed(b''.join(batch))
+                    yield parser.close()
+                parser = BytesFeedParser()
+                batch, batch_size = [], 0
+                continue
+            if parser is None:
+                continue  # text before the first separator
+            batch.append(line)
+            batch_size += len(line)
+            if batch_size >= READ_CHUNK_BYTES and line not in (b'\n', b'\r\n'):
+                parser.feed(b''.join(batch))
+                batch, batch_size = [], 0
+        if parser is not None:
+            parser.feed(b''.join(batch))
+            yield parser.close()
 
     def __str__(self) -> str:
         d: dict = {}
         d['filename'] = self.filename
-        d['mails'] = []
-        for mail in self.mails:
-            d['mails'].append(mail.__dict__)
+        d['mails'] = self.mail_count
 
         return json.dumps(d, sort_keys=True, indent=4)
 
 
+def _iter_lines(stream: IO[bytes], chunk_size: int = READ_CHUNK_BYTES) -> Iterator[bytes]:
+    """Yield the lines of a binary stream, including their line endings, reading it in chunks."""
+    pending = b''
+    while chunk := stream.read(chunk_size):
+        lines = (pending + chunk).split(b'\n')
+        pending = lines.pop()
+        for line in lines:
+            yield line + b'\n'
+    if pending:
+        yield pending
+
+
 class Mail:
     subject: str
     body: str
@@ -80,11 +133,12 @@ class Mail:
 
     def __init__(
             self,
-            message: mailbox.mboxMessage,
+            message: Message,
             size_limit: int = 8 * 1_073_741_824,
             max_attachments: int = 1_000,
             max_total_attachment_bytes: int = 8 * 1_073_741_824,
-            context: Optional[ScanContext] = None) -> None:
+            context: Optional[ScanContext] = None,
+            spool_threshold: int = 8 * 1024 * 1024) -> None:
         self.subject = self.get_subject(message)
         self.body = ''
         self.attachments = []
@@ -93,19 +147,26 @@ def __init__(
         self._max_total_attachment_bytes = max_total_attachment_bytes
         self.decoded_attachment_bytes = 0
         self._context = context
-        self._extract_message(message)
+        self._spool_threshold = spool_threshold
+        try:
+            self._extract_message(message)
+        except Exception:
+            self.close()
+            raise
 
-    def _extract_message(self, msg: mailbox.mboxMessage) -> None:
+    def _extract_message(self, msg: Message) -> None:
         if msg.is_multipart():
-            for part in msg.walk():
-                if part.is_multipart():
-                    continue
+            for part in iter_leaf_parts(msg):
                 disposition = part.get_content_disposition()
                 filename = part.get_filename()
                 if disposition == 'attachment' or filename:
                     self.parse_attachment(part)
                 elif part.get_content_type() == 'text/plain':
                     self.parse_body(part)
+                elif part.get_content_type() == 'text/html':
+                    self.body += decode_html_part(part)
+        elif msg.get_content_type() == 'text/html':
+            self.body = decode_html_part(msg)
         else:
             payloads: Any = msg.get_payload()
             if isinstance(payloads, str):
@@ -113,7 +174,7 @@ def _extract_message(self, msg: mailbox.mboxMessage) -> None:
             else:
                 self.parse_body(msg)
 
-    def get_subject(self, message: mailbox.mboxMessage) -> str:
+    def get_subject(self, message: Message) -> str:
         return str(message.get('Subject'))
 
     def parse_body(self, body_payload: Any) -> None:
@@ -127,22 +188,29 @@ def parse_body(self, body_payload: Any) -> None:
 
     def parse_attachment(self, attachment_payload: Any) -> None:
         filename = attachment_payload.get_filename() or '[NoFilename]'
-        binary_data = attachment_payload.get_payload(decode=True)
-        if binary_data is None:
-            raw = attachment_payload.get_payload()
-            binary_data = raw.encode('utf-8', errors='backslashreplace') if isinstance(raw, str) else bytes(raw)
         attachment_count = len(self.attachments) + 1
-        byte_count = len(binary_data)
         if attachment_count > self._max_attachments:
             raise PANHuntException(f'Attachment count limit exceeded for "{self.subject}": {attachment_count} over {self._max_attachments}')
-        if byte_count > self._size_limit:
-            raise PANHuntException(f'Attachment "{filename}" exceeds configured size limit')
-        if self.decoded_attachment_bytes + byte_count > self._max_total_attachment_bytes:
-            raise PANHuntException(f'Decoded attachment bytes exceed configured message limit for "{self.subject}"')
-        if self._context:
-            self._context.reserve_attachment(filename, byte_count, attachment_count)
+        digest = new_digest()
+        try:
+            payload, byte_count = spool_chunks(iter_decoded_payload(attachment_payload), self._size_limit,
+                                               spool_threshold=self._spool_threshold, digest=digest)
+        except PANHuntException as ex:
+            raise PANHuntException(f'Attachment "{filename}" exceeds configured size limit') from ex
+        try:
+            if self.decoded_attachment_bytes + byte_count > self._max_total_attachment_bytes:
+                raise PANHuntException(f'Decoded attachment bytes exceed configured message limit for "{self.subject}"')
+            if self._context:
+                self._context.reserve_attachment(filename, byte_count, attachment_count)
+        except Exception:
+            payload.close()
+            raise
         self.decoded_attachment_bytes += byte_count
-        self.attachments.append(Attachment(filename=filename, payload=binary_data))
+        self.attachments.append(Attachment(filename, payload, byte_count, digest.digest()))
+
+    def close(self) -> None:
+        for attachment in self.attachments:
+            attachment.close()
 
     def __str__(self) -> str:
         d: dict = {}
@@ -154,13 +222,3 @@ def __str__(self) -> str:
 
         return json.dumps(d, sort_keys=True, indent=4)
 
-
-class Attachment:
-
-    Filename: str
-    BinaryData: Optional[bytes] = None
-
-    def __init__(self, filename: str, payload: bytes) -> None:
-        self.Filename = filename
-        if len(payload) > 0:
-            self.BinaryData = payload
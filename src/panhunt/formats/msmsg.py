@@ -10,19 +10,21 @@
 
 from __future__ import annotations
 
+import io
 import logging
+import mmap
 import os
 import struct
+from bisect import bisect_right
 from datetime import datetime, timedelta
-from io import BufferedReader
-from typing import Literal, Optional, Union
+from itertools import accumulate
+from typing import IO, Any, Collection, Iterable, Literal, Optional, Union, cast
 
 from .. import panutils
 from ..enums import PropIdEnum, PTypeEnum
 from ..exceptions import PANHuntException
 
-_FilePathOrFileObject = Union[BufferedReader, int, str, bytes, os.PathLike[
-    str], os.PathLike[bytes]]
+_CompoundFileSource = Union[IO[bytes], str, os.PathLike[str], bytes, bytearray, memoryview]
 
 _ValueType = Optional[Union[int, float, datetime, bool, str, bytes,
                             list[int], list[float], list[datetime], list[bytes], list[str]]]
@@ -50,26 +52,36 @@ class FAT:
     def __init__(self, mscfb: 'MSCFB') -> None:
 
         self.mscfb = mscfb  # Microsoft Compound File Binary File
-        difat_index: int = 0
         self.entries = []
-        while mscfb.DIFAT[difat_index] != FAT.FREESECT:
-            sector: int = mscfb.DIFAT[difat_index]
-            sector_bytes: bytes = mscfb.get_sector_bytes(sector)
-            format: str = 'I' * (mscfb.SectorSize // 4)
-            sector_fat_entries = struct.unpack(format, sector_bytes)
-            self.entries.extend(sector_fat_entries)
-            difat_index += 1
+        entry_format: str = f'<{mscfb.SectorSize // 4}I'
+        for sector in mscfb.DIFAT:
+            if sector == FAT.FREESECT:
+                break
+            self.entries.extend(struct.unpack_from(entry_format, mscfb.view, mscfb.get_sector_offset(sector)))
 
-    def get_stream(self, sector: int, size: int) -> bytes:
+    def get_chain(self, sector: int) -> list[int]:
+        """Follow a sector chain to its end, rejecting chains that leave the FAT or loop."""
 
-        stream_bytes: bytes = b''
+        chain: list[int] = []
         while sector != FAT.ENDOFCHAIN:
-            stream_bytes += self.mscfb.get_sector_bytes(sector)
+            if sector >= len(self.entries) or len(chain) >= len(self.entries):
+                raise PANHuntException('FAT sector chain is broken')
+            chain.append(sector)
             sector = self.entries[sector]
-        if size > len(stream_bytes) or size < len(stream_bytes) - self.mscfb.SectorSize:
+        return chain
+
+    def get_runs(self, sector: int, size: int) -> list[tuple[int, int]]:
+
+        chain: list[int] = self.get_chain(sector)
+        sector_size: int = self.mscfb.SectorSize
+        if size > len(chain) * sector_size or size < len(chain) * sector_size - sector_size:
             raise PANHuntException(
                 'FAT stream size does not match number of sectors')
-        return stream_bytes[:size]
+        return self.mscfb.get_runs((self.mscfb.get_sector_offset(s) for s in chain), sector_size, size)
+
+    def get_stream(self, sector: int, size: int) -> bytes:
+
+        return self.mscfb.read_runs(self.get_runs(sector, size))
 
     def __str__(self) -> str:
 
@@ -82,44 +94,114 @@ class MiniFAT:
 
     entries: list[int]
     mscfb: 'MSCFB'
-    mini_stream_bytes: bytes
+    mini_stream_offsets: list[int]
 
     def __init__(self, mscfb: 'MSCFB') -> None:
 
         self.entries = []
         self.mscfb = mscfb
-        self.mini_stream_bytes: bytes = b''
+        # File offsets of the regular sectors holding the mini stream.
+        self.mini_stream_offsets = []
 
-        current_sector: int = mscfb.FirstMiniFATSectorLocation
-        for _ in range(mscfb.MiniFATSectors):
-            sector_bytes: bytes = mscfb.get_sector_bytes(current_sector)
-            current_sector = panutils.as_int(mscfb.fat.entries[current_sector])
-            minifat_entries = struct.unpack(
-                'I' * int(mscfb.SectorSize / 4), sector_bytes)
-            self.entries.extend(minifat_entries)
+        entry_format: str = f'<{mscfb.SectorSize // 4}I'
+        for sector in mscfb.fat.get_chain(mscfb.FirstMiniFATSectorLocation)[:mscfb.MiniFATSectors]:
+            self.entries.extend(struct.unpack_from(entry_format, mscfb.view, mscfb.get_sector_offset(sector)))
 
     def get_all_mini_stream_fat_sectors(self) -> None:
+        """Locate the regular sectors of the mini stream; mini sectors are read from them on demand."""
         if self.mscfb.MiniStreamSectorLocation != FAT.ENDOFCHAIN:
-            self.mini_stream_bytes = self.mscfb.fat.get_stream(
+            runs: list[tuple[int, int]] = self.mscfb.fat.get_runs(
                 self.mscfb.MiniStreamSectorLocation, self.mscfb.MiniStreamSize)
+            self.mini_stream_offsets = [
+                sector_offset
+                for offset, length in runs
+                for sector_offset in range(offset, offset + length, self.mscfb.SectorSize)
+            ]
 
-    def get_stream(self, sector: int, size: int) -> bytes:
+    def get_runs(self, sector: int, size: int) -> list[tuple[int, int]]:
 
-        stream_bytes: bytes = b''
+        chain: list[int] = []
         while sector != FAT.ENDOFCHAIN:
-            stream_bytes += self.mini_stream_bytes[sector *
-                                                   MiniFAT.SECTORSIZE: sector * MiniFAT.SECTORSIZE + MiniFAT.SECTORSIZE]
+            if sector >= len(self.entries) or len(chain) >= len(self.entries):
+                raise PANHuntException('Mini FAT sector chain is broken')
+            chain.append(sector)
             sector = self.entries[sector]
-        if size > len(stream_bytes) or size < len(stream_bytes) - MiniFAT.SECTORSIZE:
+        if size > len(chain) * MiniFAT.SECTORSIZE or size < len(chain) * MiniFAT.SECTORSIZE - MiniFAT.SECTORSIZE:
             raise PANHuntException(
                 'Mini FAT mini stream size does not match number of mini sectors')
-        return stream_bytes[:size]
+        sector_size: int = self.mscfb.SectorSize
+        try:
+            offsets: list[int] = [
+                self.mini_stream_offsets[position // sector_size] + position % sector_size
+                for position in (s * MiniFAT.SECTORSIZE for s in chain)
+            ]
+        except IndexError:
+            raise PANHuntException('Mini FAT sector is outside the mini stream') from None
+        return self.mscfb.get_runs(offsets, MiniFAT.SECTORSIZE, size)
+
+    def get_stream(self, sector: int, size: int) -> bytes:
+
+        return self.mscfb.read_runs(self.get_runs(sector, size))
 
     def __str__(self) -> str:
 
         return ', '.join([f"{hex(sector)}:{hex(entry)}" for sector, entry in zip(list(range(len(self.entries))), self.entries)])
 
 
+class StreamReader(io.RawIOBase):
+    """Seekable reader over a CFB stream that copies sector bytes only into the caller's buffer.
+
+    The stream is a list of ``(offset, length)`` runs in the compound file,
+    with adjacent sectors already merged into one run.
+    """
+
+    def __init__(self, view: memoryview, runs: list[tuple[int, int]], size: int) -> None:
+        super().__init__()
+        self._view = view
+        self._runs = runs
+        self._starts: list[int] = list(accumulate((length for _, length in runs), initial=0))
+        self._size = size
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        if whence == os.SEEK_SET:
+            position = offset
+        elif whence == os.SEEK_CUR:
+            position = self._position + offset
+        elif whence == os.SEEK_END:
+            position = self._size + offset
+        else:
+            raise ValueError(f'invalid whence ({whence})')
+        if position < 0:
+            raise ValueError(f'negative seek position {position}')
+        self._position = position
+        return position
+
+    def readinto(self, buffer: Any) -> int:
+        target = memoryview(buffer).cast('B')
+        count: int = max(0, min(len(target), self._size - self._position))
+        written: int = 0
+        run: int = bisect_right(self._starts, self._position) - 1
+        while written < count:
+            offset, length = self._runs[run]
+            skip: int = self._position - self._starts[run]
+            chunk: int = min(length - skip, count - written)
+            target[written:written + chunk] = self._view[offset + skip:offset + skip + chunk]
+            written += chunk
+            self._position += chunk
+            run += 1
+        return written
+
+
 class Directory:
 
     mscfb: 'MSCFB'
@@ -135,10 +217,8 @@ def __init__(self, mscfb: 'MSCFB') -> None:
     def get_all_directory_entries(self, start_sector: int) -> list['DirectoryEntry']:
 
         entries: list[DirectoryEntry] = []
-        sector: int = start_sector
-        while sector != FAT.ENDOFCHAIN:
+        for sector in self.mscfb.fat.get_chain(start_sector):
             entries.extend(self.get_directory_sector(sector))
-            sector = self.mscfb.fat.entries[sector]
         return entries
 
     def set_entry_children(self, dir_entry: 'DirectoryEntry') -> None:
@@ -243,18 +323,34 @@ def __init__(self, mscfb: 'MSCFB', directory_bytes: bytes) -> None:
     def __cmp__(self, other: 'DirectoryEntry') -> bool:
         return self.Name == other.Name
 
-    def get_data(self) -> bytes:
+    def get_runs(self) -> list[tuple[int, int]]:
 
         if self.ObjectType != DirectoryEntry.OBJECT_STREAM:
             raise PANHuntException('Directory Entry is not a stream object')
         if self.StreamSize < self.mscfb.MiniStreamCutoffSize:  # Mini FAT stream
-            self.stream_data = self.mscfb.minifat.get_stream(
-                self.StartingSectorLocation, self.StreamSize)
-        else:  # FAT
-            self.stream_data = self.mscfb.fat.get_stream(
-                self.StartingSectorLocation, self.StreamSize)
+            return self.mscfb.minifat.get_runs(self.StartingSectorLocation, self.StreamSize)
+        return self.mscfb.fat.get_runs(self.StartingSectorLocation, self.StreamSize)
+
+    def get_data(self) -> bytes:
+
+        self.stream_data = self.mscfb.read_runs(self.get_runs())
         return self.stream_data
 
+    def get_view(self) -> Union[bytes, memoryview]:
+        """Return the stream without copying when its sectors are contiguous in the file."""
+
+        runs: list[tuple[int, int]] = self.get_runs()
+        if len(runs) == 1:
+            offset, length = runs[0]
+            return self.mscfb.view[offset:offset + length]
+        return self.mscfb.read_runs(runs)
+
+    def open_stream(self) -> StreamReader:
+        """Return a reader over the stream that reads sectors from the file as it is consumed."""
+
+        # A slice of the view keeps the mapping alive if the reader outlives the file object.
+        return StreamReader(self.mscfb.view[:], self.get_runs(), self.StreamSize)
+
     def list_children(self, level: int = 0, expand: bool = False) -> str:
 
         line_pfx: str = '\t' * level
@@ -276,7 +372,7 @@ def __str__(self) -> str:
 
 
 class MSCFB:
-    fd: BufferedReader
+    view: memoryview
     fat: FAT
     minifat: MiniFAT
     directory: Directory
@@ -302,23 +398,34 @@ class MSCFB:
     signature: bytes
     CLSID: bytes
 
-    def __init__(self, cfb_file: _FilePathOrFileObject) -> None:
-        """cfb_file is unicode or string filename or a file object"""
+    HEADER_SIZE: int = 512
+
+    def __init__(self, cfb_file: _CompoundFileSource) -> None:
+        """cfb_file is a file name, an open binary file, or the file content as a bytes-like object.
 
-        if isinstance(cfb_file, BufferedReader):
-            self.fd = cfb_file
+        Files are memory-mapped; every stream is read from the mapped view.
+        """
+
+        self._file: Optional[IO[bytes]] = None
+        self._mmap: Optional[mmap.mmap] = None
+        if isinstance(cfb_file, (bytes, bytearray, memoryview)):
+            self.view = memoryview(cfb_file).cast('B')
+        elif hasattr(cfb_file, 'read'):
+            self.view = self._map(cast(IO[bytes], cfb_file))
         else:
-            self.fd = open(cfb_file, 'rb')
+            self._file = open(cast(str, cfb_file), 'rb')
+            self.view = self._map(self._file)
 
-        self.read_header(self.fd)
+        self.read_header()
         if not self.validCFB:
             # DevSkim: ignore DS187371
-            logging.debug(f'Skipping invalid MSG file: {cfb_file!r}')
+            logging.debug('Skipping invalid MSG file')
             return
         if self.MajorVersion == 3:
             self.SectorSize = 512
         else:  # 4
             self.SectorSize = 4096
+        self.read_difat_sectors()
 
         self.fat = FAT(self)
         self.minifat = MiniFAT(self)
@@ -328,28 +435,53 @@ def __init__(self, cfb_file: _FilePathOrFileObject) -> None:
         self.MiniStreamSize = self.directory.entries[0].StreamSize
         self.minifat.get_all_mini_stream_fat_sectors()
 
-    def read_header(self, fd: BufferedReader) -> None:
+    def _map(self, file: IO[bytes]) -> memoryview:
+
+        try:
+            fileno: int = file.fileno()
+            if os.fstat(fileno).st_size == 0:
+                return memoryview(b'')
+            self._mmap = mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+            return memoryview(self._mmap)
+        except (OSError, ValueError, io.UnsupportedOperation):
+            # No file behind the stream, such as a spooled file still in memory.
+            try:
+                file.seek(0)
+            except (OSError, io.UnsupportedOperation):
+                pass  # forward-only stream, read from its current position
+            return memoryview(file.read())
+
+    def read_header(self) -> None:
 
         self.validCFB = False
-        fd.seek(0)
-        self.signature = fd.read(8)
+        if len(self.view) < MSCFB.HEADER_SIZE:
+            return
+        self.signature = bytes(self.view[:8])
         if self.signature != b'\xD0\xCF\x11\xE0\xA1\xB1\x1A\xE1':
             return
-        self.CLSID = fd.read(16)
-        self.MinorVersion, self.MajorVersion, self.ByteOrder, self.SectorShift, self.MiniSectorShift = struct.unpack(
-            'HHHHH', fd.read(10))
+        self.CLSID = bytes(self.view[8:24])
+        self.MinorVersion, self.MajorVersion, self.ByteOrder, self.SectorShift, self.MiniSectorShift = struct.unpack_from(
+            '<HHHHH', self.view, 24)
         if self.MajorVersion not in (3, 4):
             return
-        _ = fd.read(6)
-        self.DirectorySector, self.FATSectors, self.FirstDirectorySectorLocation, self.TransactionSignatureNumber = struct.unpack(
-            'IIII', fd.read(16))
-        self.MiniStreamCutoffSize, self.FirstMiniFATSectorLocation, self.MiniFATSectors, self.FirstDIFATSectorLocation, self.DIFATSectors = struct.unpack(
-            'IIIII', fd.read(20))
-        self.DIFAT = list(struct.unpack('I' * 109, fd.read(436)))
+        self.DirectorySector, self.FATSectors, self.FirstDirectorySectorLocation, self.TransactionSignatureNumber = struct.unpack_from(
+            '<IIII', self.view, 40)
+        self.MiniStreamCutoffSize, self.FirstMiniFATSectorLocation, self.MiniFATSectors, self.FirstDIFATSectorLocation, self.DIFATSectors = struct.unpack_from(
+            '<IIIII', self.view, 56)
+        self.DIFAT = list(struct.unpack_from('<109I', self.view, 76))
         self.validCFB = True
 
-        if self.FirstDIFATSectorLocation != FAT.ENDOFCHAIN:
-            raise PANHuntException('More than 109 DIFAT entries not supported')
+    def read_difat_sectors(self) -> None:
+        """Append the FAT sector locations listed in DIFAT sectors, used by files above about 7 MB."""
+
+        sector: int = self.FirstDIFATSectorLocation
+        entries_per_sector: int = self.SectorSize // 4 - 1
+        for _ in range(self.DIFATSectors):
+            if sector in (FAT.ENDOFCHAIN, FAT.FREESECT):
+                break
+            entries = struct.unpack_from(f'<{entries_per_sector + 1}I', self.view, self.get_sector_offset(sector))
+            self.DIFAT.extend(entries[:-1])
+            sector = entries[-1]
 
     def get_sector_offset(self, sector: int) -> int:
 
@@ -358,11 +490,53 @@ def get_sector_offset(self, sector: int) -> int:
     def get_sector_bytes(self, sector: int) -> bytes:
 
         offset: int = self.get_sector_offset(sector)
-        self.fd.seek(offset)
-        return self.fd.read(self.SectorSize)
+        return bytes(self.view[offset:offset + self.SectorSize])
+
+    def get_runs(self, offsets: Iterable[int], unit: int, size: int) -> list[tuple[int, int]]:
+        """Turn the file offsets of a stream's sectors into ``(offset, length)`` runs of ``size`` bytes.
+
+        Consecutive sectors are merged, so a contiguous stream is a single run.
+        """
+
+        runs: list[tuple[int, int]] = []
+        remaining: int = size
+        for offset in offsets:
+            if remaining <= 0:
+                break
+            length: int = min(unit, remaining)
+            if offset + length > len(self.view):
+                raise PANHuntException('Stream sector is beyond the end of the file')
+            if runs and runs[-1][0] + runs[-1][1] == offset:
+                runs[-1] = (runs[-1][0], runs[-1][1] + length)
+            else:
+                runs.append((offset, length))
+            remaining -= length
+        return runs
+
+    def read_runs(self, runs: list[tuple[int, int]]) -> bytes:
+
+        if len(runs) == 1:
+            offset, length = runs[0]
+            return bytes(self.view[offset:offset + length])
+        return b''.join([self.view[offset:offset + length] for offset, length in runs])
+
+    def close(self) -> None:
+
+        view: Optional[memoryview] = getattr(self, 'view', None)
+        if view is not None:
+            view.release()
+        if getattr(self, '_mmap', None) is not None:
+            try:
+                cast(mmap.mmap, self._mmap).close()
+            except BufferError:
+                pass  # a stream reader still holds a view; the mapping is released with it
+            self._mmap = None
+        if getattr(self, '_file', None) is not None:
+            cast(IO[bytes], self._file).close()
+            self._file = None
 
     def __del__(self) -> None:
-        self.fd.close()
+        self.close()
 
 
 ###################################################################################################################################
@@ -383,15 +557,19 @@ class PropertyStream:
     EMBEDDED_MSG_HEADER_SIZE: int = 24
 
     msmsg: 'MSMSG'
+    dir_entry: DirectoryEntry
     properties: dict[int, 'PropertyEntry']
     NextRecipientID: int
     NextAttachmentID: int
     RecipientCount: int
     AttachmentCount: int
 
-    def __init__(self, msmsg_obj: 'MSMSG', parent_dir_entry: DirectoryEntry, header_size: int) -> None:
+    def __init__(self, msmsg_obj: 'MSMSG', parent_dir_entry: DirectoryEntry, header_size: int,
+                 prop_ids: Optional[Collection[int]] = None) -> None:
+        """Decode the property entries of a storage; with prop_ids, only the values of those properties"""
 
         self.msmsg = msmsg_obj
+        self.dir_entry = parent_dir_entry
         property_dir_entry: DirectoryEntry = parent_dir_entry.children[
             PropertyStream.PROPERTY_STREAM_NAME]
         property_bytes: bytes = property_dir_entry.get_data()
@@ -406,8 +584,11 @@ def __init__(self, msmsg_obj: 'MSMSG', parent_dir_entry: DirectoryEntry, header_
             property_entries_count: int = int(
                 (len(property_bytes) - header_size) / 16)
             for i in range(property_entries_count):
+                property_entry_bytes: bytes = property_bytes[header_size + i * 16: header_size + i * 16 + 16]
+                if prop_ids is not None and panutils.unpack_integer('I', property_entry_bytes[:4]) >> 16 not in prop_ids:
+                    continue
                 prop_entry: PropertyEntry = PropertyEntry(
-                    self.msmsg, parent_dir_entry, property_bytes[header_size + i * 16: header_size + i * 16 + 16])
+                    self.msmsg, parent_dir_entry, property_entry_bytes)
                 if prop_entry in self.properties.values():
                     raise PANHuntException(
                         'PropertyID already in properties dictionary')
@@ -419,6 +600,11 @@ def get_value(self, prop_id: int) -> 'PropertyEntry':  # type: ignore
             return self.properties[prop_id]
         # raise IndexError('prop_id')
 
+    def get_stream_entry(self, prop_tag: int) -> Optional[DirectoryEntry]:
+        """Return the stream holding a variable-size property without decoding it"""
+
+        return self.dir_entry.children.get(PropertyEntry.stream_name(prop_tag))
+
     def __str__(self) -> str:
         return '\n'.join([str(prop) for prop in list(self.properties.values())])
 
@@ -449,8 +635,7 @@ def __init__(self, msmsg: 'MSMSG', parent_dir_entry: DirectoryEntry, property_en
         if ptype.is_variable or ptype.is_multi:
             self.size = panutils.unpack_integer(
                 'I', property_entry_bytes[8:12])
-            stream_name: str = PropertyEntry.SUB_PREFIX + \
-                panutils.to_zeropaddedhex(self.PropertyTag, 8)
+            stream_name: str = PropertyEntry.stream_name(self.PropertyTag)
             property_bytes: bytes = parent_dir_entry.children[stream_name].get_data(
             )
 
@@ -485,6 +670,10 @@ def __init__(self, msmsg: 'MSMSG', parent_dir_entry: DirectoryEntry, property_en
             self.size = ptype.byte_count
             self.value = ptype.get_value(property_entry_bytes[8:8 + self.size])
 
+    @staticmethod
+    def stream_name(prop_tag: int) -> str:
+        return PropertyEntry.SUB_PREFIX + panutils.to_zeropaddedhex(prop_tag, 8)
+
     def __str__(self) -> str:
         return f"{hex(self.PropertyTag)}-{str(self.value)}"
 
@@ -654,8 +843,20 @@ class Attachment:
     BinaryData: Optional[bytes] = None
     AttachMimeTag: str
     AttachExtension: str
+    data_entry: Optional[DirectoryEntry] = None
 
-    def __init__(self, prop_stream: PropertyStream) -> None:
+    SCAN_PROPERTIES: frozenset[int] = frozenset((
+        PropIdEnum.PidTagAttachMethod.value,
+        PropIdEnum.PidTagAttachFilename.value,
+        PropIdEnum.PidTagAttachLongFilename.value))
+    DATA_BINARY_TAG: int = PropIdEnum.PidTagAttachDataBinary.value << 16 | PTypeEnum.PtypBinary.value
+
+    def __init__(self, prop_stream: PropertyStream, lazy: bool = False) -> None:
+        """With lazy, only the file name is decoded and the data is left in its stream for open_data()"""
+
+        if lazy:
+            self._set_scan_properties(prop_stream)
+            return
 
         self.DisplayName = panutils.as_str(prop_stream.get_value(
             PropIdEnum.PidTagDisplayName.value).value)
@@ -688,6 +889,41 @@ def __init__(self, prop_stream: PropertyStream) -> None:
         if amt:
             self.AttachMimeTag = panutils.as_str(amt.value)
 
+    def _set_scan_properties(self, prop_stream: PropertyStream) -> None:
+
+        values: dict[int, _ValueType] = {
+            prop_id: prop.value for prop_id, prop in prop_stream.properties.items()}
+        method = values.get(PropIdEnum.PidTagAttachMethod.value)
+        self.AttachMethod = method if isinstance(method, int) else 0
+        long_filename = values.get(PropIdEnum.PidTagAttachLongFilename.value)
+        filename = values.get(PropIdEnum.PidTagAttachFilename.value)
+        self.AttachLongFilename = long_filename if isinstance(long_filename, str) else ''
+        self.AttachFilename = filename if isinstance(filename, str) else ''
+        self.Filename = os.path.basename(self.AttachLongFilename or self.AttachFilename) or \
+            f'[NoFilename_Method{self.AttachMethod}]'
+        self.data_entry = prop_stream.get_stream_entry(Attachment.DATA_BINARY_TAG)
+
+    @property
+    def data_size(self) -> int:
+        if self.data_entry is not None:
+            return self.data_entry.StreamSize
+        return len(self.BinaryData) if self.BinaryData else 0
+
+    def open_data(self) -> Optional[Union[StreamReader, io.BytesIO]]:
+        """Return a reader over the attachment data, or None if the attachment has none"""
+
+        if self.data_entry is not None:
+            return self.data_entry.open_stream()
+        if self.BinaryData is not None:
+            return io.BytesIO(self.BinaryData)
+        return None
+
+    def get_data(self) -> Optional[bytes]:
+
+        if self.data_entry is not None:
+            return self.data_entry.get_data()
+        return self.BinaryData
+
     def __str__(self) -> str:
         size: int = 0
         if self.BinaryData:
@@ -705,6 +941,7 @@ class MSMSG:
     recipients: list[Recipient]
     attachments: list[Attachment]
     ptype_mapping: dict[PTypeEnum, MsgPTypeWrapper]
+    _shared_ptype_mapping: Optional[dict[PTypeEnum, MsgPTypeWrapper]] = None
     Subject: str
     ClientSubmitTime: Optional[datetime]
     SentRepresentingName: str
@@ -720,8 +957,14 @@ class MSMSG:
     XOriginatingIP: str
 
 
-    def __init__(self, msg_target_path: _FilePathOrFileObject) -> None:
-        """msg_file is unicode or string filename or a file object"""
+    SCAN_PROPERTIES: frozenset[int] = frozenset((PropIdEnum.PidTagBody.value,))
+
+    def __init__(self, msg_target_path: _CompoundFileSource, scan_only: bool = False) -> None:
+        """msg_file is unicode or string filename, a file object or the bytes of the file
+
+        With scan_only, only Body and the attachments are resolved: recipients and the other
+        message properties are not decoded, and attachment data is left in its stream (see
+        Attachment.open_data)"""
 
         self.set_property_types()
         self.cfb = MSCFB(msg_target_path)
@@ -731,6 +974,16 @@ def __init__(self, msg_target_path: _FilePathOrFileObject) -> None:
             return
 
         self.root_dir_entry = self.cfb.directory.entries[0]
+
+        if scan_only:
+            self.prop_stream = PropertyStream(
+                self, self.root_dir_entry, PropertyStream.TOPLEVEL_HEADER_SIZE, MSMSG.SCAN_PROPERTIES)
+            body: Optional[PropertyEntry] = self.prop_stream.get_value(PropIdEnum.PidTagBody.value)
+            self.Body = body.value if body and isinstance(body.value, str) else ''
+            self.recipients = []
+            self.set_attachments(lazy=True)
+            return
+
         self.prop_stream = PropertyStream(
             self, self.root_dir_entry, PropertyStream.TOPLEVEL_HEADER_SIZE)  # root
 
@@ -738,6 +991,9 @@ def __init__(self, msg_target_path: _FilePathOrFileObject) -> None:
         self.set_recipients()
         self.set_attachments()
 
+    def close(self) -> None:
+        self.cfb.close()
+
     def set_common_properties(self) -> None:
 
         self.Subject = panutils.as_str(self.prop_stream.get_value(
@@ -818,7 +1074,7 @@ def set_recipients(self) -> None:
             else:
                 break
 
-    def set_attachments(self) -> None:
+    def set_attachments(self, lazy: bool = False) -> None:
         self.attachments = []
         attachment_dir_index: int = 0
         while True:
@@ -827,8 +1083,9 @@ def set_attachments(self) -> None:
                 attachment_dir_entry: DirectoryEntry = self.root_dir_entry.children[
                     attachment_dir_name]
                 aps: PropertyStream = PropertyStream(
-                    self, attachment_dir_entry, PropertyStream.RECIP_OR_ATTACH_HEADER_SIZE)
-                attachment: Attachment = Attachment(aps)
+                    self, attachment_dir_entry, PropertyStream.RECIP_OR_ATTACH_HEADER_SIZE,
+                    Attachment.SCAN_PROPERTIES if lazy else None)
+                attachment: Attachment = Attachment(aps, lazy)
                 self.attachments.append(attachment)
                 attachment_dir_index += 1
             else:
@@ -836,6 +1093,11 @@ def set_attachments(self) -> None:
 
     def set_property_types(self) -> None:
 
+        # The wrappers hold no per-message state, so one mapping is shared by all messages.
+        if MSMSG._shared_ptype_mapping is not None:
+            self.ptype_mapping = MSMSG._shared_ptype_mapping
+            return
+
         self.ptype_mapping = {
             PTypeEnum.PtypInteger16: MsgPTypeWrapper(PTypeEnum.PtypInteger16, 2, False, False),
             PTypeEnum.PtypInteger32: MsgPTypeWrapper(PTypeEnum.PtypInteger32, 4, False, False),
@@ -871,3 +1133,4 @@ def set_property_types(self) -> None:
             PTypeEnum.PtypObject: MsgPTypeWrapper(
                 PTypeEnum.PtypObject, 0, False, False)
         }
+        MSMSG._shared_ptype_mapping = self.ptype_mapping
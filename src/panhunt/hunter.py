@@ -3,24 +3,42 @@
 import logging
 import os
 import threading
+import time
+from typing import Iterator, Optional, Sequence
 
+from . import panutils
 from .buffer import JobBuffer
 from .config import ScanConfiguration
 from .dispatcher import Dispatcher
-from .finding import Finding
 from .job import Job
+from .models import UnfinishedWork
+from .sink import ResultRecord
 
 
 class Hunter:
+    MAILDIR_FOLDERS = frozenset({'cur', 'new', 'tmp'})
+
     def __init__(self, dispatcher: Dispatcher, buffer: JobBuffer) -> None:
         self._dispatcher = dispatcher
         self._buffer = buffer
+        self.unfinished: Optional[UnfinishedWork] = None
+
+    def hunt(self, config: ScanConfiguration) -> tuple[Sequence[ResultRecord], Sequence[ResultRecord]]:
+        """Walk the target, wait for the dispatcher and return its findings and failures.
 
-    def hunt(self, config: ScanConfiguration) -> tuple[list[Finding], list[Finding]]:
+        When ``config.max_runtime_seconds`` is set and the deadline passes, the
+        walk stops, running jobs are cancelled, queued jobs are drained and
+        ``self.unfinished`` records what was left unscanned.
+        """
         logging.info("Search base: %s", config.target_path)
         if not config.quiet:
             print(f"Scanning {config.target_path}...", flush=True)
 
+        self.unfinished = None
+        deadline: Optional[float] = None
+        if config.max_runtime_seconds:
+            deadline = time.monotonic() + config.max_runtime_seconds
+
         done = threading.Event()
         progress_thread = None
 
@@ -35,28 +53,26 @@ def hunt(self, config: ScanConfiguration) -> tuple[list[Finding], list[Finding]]
         try:
             self._dispatcher.start()
             target_path = str(config.target_path)
+            unscanned: list[str] = []
             if os.path.isfile(target_path):
                 basename = os.path.basename(target_path)
                 dirname = os.path.dirname(target_path)
                 if not self._is_path_excluded(target_path, config):
                     self._buffer.enqueue(Job(basename, dirname=dirname))
             else:
-                for root, dirs, files in os.walk(target_path):
-                    dirs[:] = [
-                        d for d in dirs
-                        if not self._is_path_excluded(os.path.join(root, d), config)
-                    ]
-                    for file in files:
-                        if not self._is_path_excluded(os.path.join(root, file), config):
-                            self._buffer.enqueue(
-                                Job(basename=file, dirname=root, payload=None))
+                unscanned = self._walk(target_path, config, deadline)
 
             self._buffer.mark_input_complete()
 
             # Prefer a blocking wait method on the buffer if you can add one.
             while not self._buffer.is_finished():
+                if deadline is not None and time.monotonic() >= deadline:
+                    break
                 done.wait(0.25)  # cheap wait for reporter cadence; not a busy loop
 
+            if deadline is not None and (unscanned or not self._buffer.is_finished()):
+                self.unfinished = self._wind_down(unscanned)
+
             return self._dispatcher.get_findings(), self._dispatcher.get_failures()
         except KeyboardInterrupt:
             logging.info("Interrupted by user; stopping scanner workers.")
@@ -70,6 +86,87 @@ def hunt(self, config: ScanConfiguration) -> tuple[list[Finding], list[Finding]]
             self._dispatcher.stop()
             self._dispatcher.join()
 
+    def _walk(self, target_path: str, config: ScanConfiguration, deadline: Optional[float]) -> list[str]:
+        """Enqueue every file below ``target_path`` and return the paths left unwalked at the deadline.
+
+        Directories are visited depth-first in the same order as ``os.walk``
+        with an explicit stack, so the subtrees still pending when the
+        deadline passes are known. The messages in the ``cur``, ``new`` and
+        ``tmp`` folders of a Maildir are queued in batches of
+        ``config.maildir_batch_messages`` file names.
+        """
+        stack: list[str] = [target_path]
+        maildir_folders = set(self._maildir_folders(os.path.dirname(os.path.abspath(target_path))))
+        while stack:
+            if deadline is not None and time.monotonic() >= deadline:
+                return list(reversed(stack))
+            root = stack.pop()
+            try:
+                with os.scandir(root) as entries:
+                    dirs, files = self._split_entries(entries)
+            except OSError:
+                continue  # unreadable directory, skipped like os.walk does
+
+            subdirs = [d for d in dirs if not self._is_path_excluded(d.path, config)]
+            stack.extend(d.path for d in reversed(subdirs) if not d.is_symlink())
+            if self.MAILDIR_FOLDERS <= {d.name for d in dirs}:
+                maildir_folders.update(os.path.join(os.path.abspath(root), name) for name in self.MAILDIR_FOLDERS)
+            batch_size = config.maildir_batch_messages if os.path.abspath(root) in maildir_folders else 0
+            batch: list[str] = []
+            for index, file in enumerate(files):
+                if deadline is not None and time.monotonic() >= deadline:
+                    return ([os.path.join(root, name) for name in batch] + [f.path for f in files[index:]]
+                            + list(reversed(stack)))
+                if self._is_path_excluded(file.path, config):
+                    continue
+                if not batch_size:
+                    self._buffer.enqueue(Job(basename=file.name, dirname=root, payload=None))
+                    continue
+                batch.append(file.name)
+                if len(batch) == batch_size:
+                    self._buffer.enqueue(Job(basename='', dirname=root, batch=batch))
+                    batch = []
+            if batch:
+                self._buffer.enqueue(Job(basename='', dirname=root, batch=batch))
+        return []
+
+    def _maildir_folders(self, path: str) -> list[str]:
+        """Return the message folders of ``path`` if it is a Maildir, else an empty list."""
+        folders = [os.path.join(path, name) for name in self.MAILDIR_FOLDERS]
+        return folders if all(os.path.isdir(folder) for folder in folders) else []
+
+    @staticmethod
+    def _split_entries(entries: Iterator[os.DirEntry]) -> tuple[list[os.DirEntry], list[os.DirEntry]]:
+        dirs: list[os.DirEntry] = []
+        files: list[os.DirEntry] = []
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            (dirs if is_dir else files).append(entry)
+        return dirs, files
+
+    def _wind_down(self, unscanned: list[str]) -> UnfinishedWork:
+        logging.warning("Maximum runtime reached; stopping the scan and reporting partial results.")
+        self._dispatcher.cancel()
+        self._dispatcher.join()
+        pending = self._buffer.drain()
+        # Workers still running after join cannot add results from here on;
+        # their jobs, and any children they enqueue, are listed as unscanned.
+        unscanned.extend(self._dispatcher.seal())
+        pending.extend(self._buffer.drain())
+        for job in pending:
+            unscanned.extend(Dispatcher.unscanned_paths(job))
+            self._dispatcher.abandon(job)
+            if job.payload is not None and panutils.is_file_like(job.payload):
+                close = getattr(job.payload, 'close', None)
+                if callable(close):
+                    close()
+            job.payload = None
+        logging.warning(f"Left {len(unscanned)} paths unscanned, including {len(pending)} pending jobs.")
+        return UnfinishedWork(unscanned_paths=unscanned, pending_jobs=len(pending))
+
     def _print_progress(self, done: threading.Event) -> None:
         while not done.wait(0.25):
             print(".", end="", flush=True)
@@ -1,7 +1,10 @@
 import os
-from typing import Optional, Union
+from typing import Optional, Sequence, Union
 
+from .bytesource import ByteSource
+from .enums import FileTypeEnum
 from .panutils import FileLikePayload
+from .ranges import RangeGroup
 from .scancontext import ScanContext
 
 
@@ -9,18 +12,72 @@ class Job:
 
     basename: str
     dirname: str
-    payload: Optional[Union[bytes, FileLikePayload]]
     abspath: str
     context: Optional[ScanContext]
+    reserved_bytes: int
+    mime_type: Optional[str]
+    encoding: Optional[str]
+    file_type: Optional[FileTypeEnum]
+    handler: Optional[type]
+    range_group: Optional[RangeGroup]
+    range_index: int
+    content_hash: Optional[bytes]
+    batch: Optional[Sequence[str]]
+    message_range: Optional[tuple[int, int]]
 
     def __init__(
             self,
             basename: str,
             dirname: str,
             payload: Optional[Union[bytes, FileLikePayload]] = None,
-            context: Optional[ScanContext] = None) -> None:
+            context: Optional[ScanContext] = None,
+            reserved_bytes: int = 0,
+            content_hash: Optional[bytes] = None,
+            batch: Optional[Sequence[str]] = None) -> None:
         self.basename = basename
         self.dirname = dirname
+        self._source: Optional[ByteSource] = None
         self.payload = payload
         self.abspath = os.path.join(self.dirname, self.basename)
         self.context = context
+        self.reserved_bytes = reserved_bytes
+        # BLAKE2b of an extracted member or attachment, used to reuse the
+        # outcome of an identical payload scanned earlier.
+        self.content_hash = content_hash
+        # Set once by the dispatcher's classification step; handler is the
+        # archive or scanner class registered for file_type, if any.
+        self.mime_type = None
+        self.encoding = None
+        self.file_type = None
+        self.handler = None
+        # Set on the sub-jobs of a file split into byte ranges.
+        self.range_group = None
+        self.range_index = 0
+        # Set on a batch of Maildir messages: the file names in dirname that
+        # one worker scans in turn, each as its own job. While the batch
+        # runs it holds only the names not yet started.
+        self.batch = batch
+        # Set on a batch of mbox messages read from the mailbox's byte range:
+        # the numbers of its first and last message, counted from 1.
+        self.message_range = None
+
+    @property
+    def payload(self) -> Optional[Union[bytes, FileLikePayload]]:
+        return self._payload
+
+    @payload.setter
+    def payload(self, payload: Optional[Union[bytes, FileLikePayload]]) -> None:
+        self.release_source()
+        self._payload = payload
+
+    @property
+    def source(self) -> ByteSource:
+        """The job's content as a ``ByteSource``, created on first use and shared by all consumers."""
+        if self._source is None:
+            self._source = ByteSource.from_payload(self.abspath, self._payload)
+        return self._source
+
+    def release_source(self) -> None:
+        if self._source is not None:
+            self._source.close()
+            self._source = None
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from io import IOBase
-from typing import Any, IO, Optional
+from typing import Any, IO, Iterable, Iterator, Optional
 
 from . import panutils
 from .exceptions import PANHuntException
@@ -58,6 +58,55 @@ def close(self) -> None:
         super().close()
 
 
+class FileRangeReader(IOBase):
+    """Seekable reader over bytes ``start`` to ``end`` of a file, which is opened on first read.
+
+    Many readers can be queued for one large file without holding a file
+    descriptor each.
+    """
+
+    def __init__(self, path: str, start: int, end: int) -> None:
+        self.path = path
+        self.start = start
+        self.end = end
+        self._position = 0
+        self._file: Optional[IO[bytes]] = None
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def read(self, size: Optional[int] = -1) -> bytes:
+        remaining = self.end - self.start - self._position
+        count = remaining if size is None or size < 0 else min(size, remaining)
+        if count <= 0:
+            return b''
+        if self._file is None:
+            self._file = open(self.path, 'rb')
+            self._file.seek(self.start + self._position)
+        data = self._file.read(count)
+        self._position += len(data)
+        return data
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        base = (0, self._position, self.end - self.start)[whence]
+        self._position = max(0, base + offset)
+        if self._file is not None:
+            self._file.seek(self.start + self._position)
+        return self._position
+
+    def tell(self) -> int:
+        return self._position
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        super().close()
+
+
 def read_limited(stream: IO[bytes], limit: int, chunk_size: int = 1024 * 1024) -> bytes:
     chunks: list[bytes] = []
     total = 0
@@ -76,16 +125,26 @@ def read_limited(stream: IO[bytes], limit: int, chunk_size: int = 1024 * 1024) -
 
 
 def spool_limited(stream: IO[bytes], limit: int, spool_threshold: int = 8 * 1024 * 1024,
-                  chunk_size: int = 1024 * 1024) -> tuple[IO[bytes], int]:
+                  chunk_size: int = 1024 * 1024, digest: Optional[Any] = None) -> tuple[IO[bytes], int]:
+    """Copy a stream into a rewound spooled file, optionally feeding each chunk to a ``hashlib`` digest."""
+    def read_chunks() -> Iterator[bytes]:
+        total = 0
+        while chunk := stream.read(min(chunk_size, limit - total + 1)):
+            total += len(chunk)
+            yield chunk
+
+    return spool_chunks(read_chunks(), limit, spool_threshold=spool_threshold, digest=digest)
+
+
+def spool_chunks(chunks: Iterable[bytes], limit: int, spool_threshold: int = 8 * 1024 * 1024,
+                 digest: Optional[Any] = None) -> tuple[IO[bytes], int]:
+    """Write chunks, such as those of an incremental decoder, into a rewound spooled file of at most ``limit`` bytes."""
     from tempfile import SpooledTemporaryFile
 
     total = 0
     spooled = SpooledTemporaryFile(max_size=spool_threshold, mode='w+b')
     try:
-        while True:
-            chunk = stream.read(min(chunk_size, limit - total + 1))
-            if not chunk:
-                break
+        for chunk in chunks:
             total += len(chunk)
             if total > limit:
                 raise PANHuntException(
@@ -93,6 +152,8 @@ def spool_limited(stream: IO[bytes], limit: int, spool_threshold: int = 8 * 1024
                     f'{panutils.size_friendly(size=limit)}'
                 )
             spooled.write(chunk)
+            if digest is not None:
+                digest.update(chunk)
         spooled.seek(0)
         return spooled, total
     except Exception:
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Optional
+
+from .mimecache import SECONDS_PER_DAY, _signed64
+
+_SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS offsets ('
+    ' dev INTEGER NOT NULL, ino INTEGER NOT NULL, offset INTEGER NOT NULL, tail_digest BLOB NOT NULL,'
+    ' last_seen INTEGER NOT NULL, PRIMARY KEY (dev, ino))',
+    'CREATE INDEX IF NOT EXISTS offsets_last_seen ON offsets (last_seen)',
+)
+
+
+def tail_digest(path: str, offset: int, tail_bytes: int) -> bytes:
+    """Hash the ``tail_bytes`` bytes of a file that end at ``offset``."""
+    start = max(0, offset - tail_bytes)
+    with open(path, 'rb') as file:
+        file.seek(start)
+        data = file.read(offset - start)
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+class LogState:
+    """Persistent record of how far each plain-text file on disk has been scanned.
+
+    Entries are keyed by ``(st_dev, st_ino)`` and hold the offset scanned up
+    to and a hash of the bytes just before it. A file that has only been
+    appended to since still has those bytes at that offset, so the next scan
+    can start there. A file that is shorter than the offset was truncated and
+    one whose tail no longer matches was rewritten; both are scanned from the
+    start. A rotated log is a new inode and has no entry.
+
+    Updates are buffered and written in batches. On close, entries not seen
+    for ``MAX_AGE_DAYS`` are removed.
+    """
+
+    FILE_NAME = 'logstate.sqlite3'
+    FLUSH_EVERY = 1_000
+    TAIL_BYTES = 4096
+    MAX_AGE_DAYS = 30
+
+    def __init__(self, state_dir: str, clock: Callable[[], float] = time.time) -> None:
+        if not os.path.isdir(state_dir):
+            os.makedirs(state_dir)
+        self.path = os.path.join(state_dir, self.FILE_NAME)
+        self._now = int(clock())
+        self._lock = threading.Lock()
+        self._pending: dict[tuple[int, int], tuple[int, int, int, bytes, int]] = {}
+        self.resumed = 0
+        self.rescanned = 0
+        self.skipped_bytes = 0
+        try:
+            self._conn: Optional[sqlite3.Connection] = self._connect()
+        except sqlite3.DatabaseError as ex:
+            logging.warning(f'Discarding unreadable log state {self.path}: {ex}')
+            os.remove(self.path)
+            self._conn = self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        try:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            for statement in _SCHEMA:
+                conn.execute(statement)
+        except sqlite3.DatabaseError:
+            conn.close()
+            raise
+        return conn
+
+    def resume_offset(self, path: str, st: os.stat_result) -> int:
+        """Return the offset to continue scanning ``path`` from, or 0 to scan all of it."""
+        dev, ino = _signed64(st.st_dev), _signed64(st.st_ino)
+        with self._lock:
+            if self._conn is None:
+                return 0
+            pending = self._pending.get((dev, ino))
+            try:
+                row = pending[2:4] if pending is not None else self._conn.execute(
+                    'SELECT offset, tail_digest FROM offsets WHERE dev = ? AND ino = ?', (dev, ino)
+                ).fetchone()
+            except sqlite3.Error as ex:
+                self._disable(ex)
+                return 0
+        if row is None:
+            return 0
+        offset, digest = row[0], bytes(row[1])
+        if st.st_size < offset:
+            logging.info(f'{path} was truncated, scanning it from the start')
+        elif tail_digest(path, offset, self.TAIL_BYTES) != digest:
+            logging.info(f'{path} was rewritten, scanning it from the start')
+        else:
+            with self._lock:
+                self.resumed += 1
+                self.skipped_bytes += offset
+            return offset
+        with self._lock:
+            self.rescanned += 1
+        return 0
+
+    def record(self, path: str, st: os.stat_result, offset: int) -> None:
+        """Remember that ``path`` has been scanned up to ``offset``."""
+        digest = tail_digest(path, offset, self.TAIL_BYTES)
+        dev, ino = _signed64(st.st_dev), _signed64(st.st_ino)
+        with self._lock:
+            if self._conn is None:
+                return
+            self._pending[(dev, ino)] = (dev, ino, offset, digest, self._now)
+            if len(self._pending) >= self.FLUSH_EVERY:
+                self._flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is None:
+                return
+            self._flush()
+            try:
+                self._conn.execute('DELETE FROM offsets WHERE last_seen < ?',
+                                   (self._now - self.MAX_AGE_DAYS * SECONDS_PER_DAY,))
+            except sqlite3.Error as ex:
+                logging.warning(f'Log state eviction failed: {ex}')
+            self._conn.close()
+            self._conn = None
+
+    def summary(self) -> str:
+        return (f'Log state: {self.resumed} files resumed, {self.rescanned} rescanned after truncation or rewrite, '
+                f'{self.skipped_bytes} bytes skipped')
+
+    def __len__(self) -> int:
+        with self._lock:
+            if self._conn is None:
+                return 0
+            return self._conn.execute('SELECT COUNT(*) FROM offsets').fetchone()[0]
+
+    def _flush(self) -> None:
+        if self._conn is None or not self._pending:
+            return
+        rows, self._pending = list(self._pending.values()), {}
+        try:
+            self._conn.execute('BEGIN')
+            self._conn.executemany('INSERT OR REPLACE INTO offsets VALUES (?, ?, ?, ?, ?)', rows)
+            self._conn.execute('COMMIT')
+        except sqlite3.Error as ex:
+            self._disable(ex)
+
+    def _disable(self, ex: Exception) -> None:
+        """Stop using a failing store; files are then scanned in full."""
+        logging.warning(f'Disabling log state {self.path}: {ex}')
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except sqlite3.Error:
+                pass
+        self._conn = None
+        self._pending = {}
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Optional
+
+SECONDS_PER_DAY = 86_400
+
+_SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)',
+    'CREATE TABLE IF NOT EXISTS mime ('
+    ' dev INTEGER NOT NULL, ino INTEGER NOT NULL, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL,'
+    ' extension TEXT NOT NULL, mime_type TEXT NOT NULL, encoding TEXT NOT NULL, last_seen INTEGER NOT NULL,'
+    ' PRIMARY KEY (dev, ino))',
+    'CREATE INDEX IF NOT EXISTS mime_last_seen ON mime (last_seen)',
+)
+
+
+def _signed64(value: int) -> int:
+    """Map an unsigned 64-bit device or inode number onto SQLite's signed INTEGER."""
+    return value - (1 << 64) if value >= (1 << 63) else value
+
+
+class MimeCache:
+    """Persistent map from file identity to its detected MIME type and encoding.
+
+    Entries are keyed by ``(st_dev, st_ino)`` and are only valid while the
+    file's size, ``st_mtime_ns`` and extension are unchanged, so a modified or
+    renamed file is detected again and its entry replaced. The database lives
+    in ``state_dir`` and is discarded when ``detector_version`` changes, so an
+    upgraded libmagic or signature table never serves stale answers.
+
+    New entries and last-seen updates are buffered and written in batches;
+    lookups see buffered entries before they reach the database. On close, entries not seen for
+    ``max_age_days`` (0 keeps them indefinitely) are removed, then the least
+    recently seen entries beyond ``max_entries``.
+    """
+
+    FILE_NAME = 'mimecache.sqlite3'
+    FLUSH_EVERY = 1_000
+
+    def __init__(self,
+                 state_dir: str,
+                 max_entries: int,
+                 max_age_days: int,
+                 detector_version: str,
+                 clock: Callable[[], float] = time.time) -> None:
+        if not os.path.isdir(state_dir):
+            os.makedirs(state_dir)
+        self.path = os.path.join(state_dir, self.FILE_NAME)
+        self.max_entries = max_entries
+        self.max_age_days = max_age_days
+        self._now = int(clock())
+        self._lock = threading.Lock()
+        self._pending_puts: dict[tuple[int, int], tuple[int, int, int, int, str, str, str, int]] = {}
+        self._pending_seen: list[tuple[int, int, int]] = []
+        self.hits = 0
+        self.misses = 0
+        try:
+            self._conn: Optional[sqlite3.Connection] = self._connect(detector_version)
+        except sqlite3.DatabaseError as ex:
+            logging.warning(f'Discarding unreadable MIME cache {self.path}: {ex}')
+            os.remove(self.path)
+            self._conn = self._connect(detector_version)
+
+    def _connect(self, detector_version: str) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        try:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            for statement in _SCHEMA:
+                conn.execute(statement)
+            row = conn.execute("SELECT value FROM meta WHERE key = 'detector'").fetchone()
+            if row is None or row[0] != detector_version:
+                if row is not None:
+                    logging.info(f'MIME detector changed ({row[0]} -> {detector_version}), clearing MIME cache')
+                conn.execute('BEGIN')
+                conn.execute('DELETE FROM mime')
+                conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('detector', ?)", (detector_version,))
+                conn.execute('COMMIT')
+        except sqlite3.DatabaseError:
+            conn.close()
+            raise
+        return conn
+
+    def get(self, st: os.stat_result, extension: str) -> Optional[tuple[str, str]]:
+        """Return the cached MIME type and encoding for an unchanged file, or None."""
+        dev, ino = _signed64(st.st_dev), _signed64(st.st_ino)
+        with self._lock:
+            if self._conn is None:
+                return None
+            pending = self._pending_puts.get((dev, ino))
+            try:
+                row = pending[2:] if pending is not None else self._conn.execute(
+                    'SELECT size, mtime_ns, extension, mime_type, encoding, last_seen FROM mime WHERE dev = ? AND ino = ?',
+                    (dev, ino)
+                ).fetchone()
+            except sqlite3.Error as ex:
+                self._disable(ex)
+                return None
+            if row is None or row[0] != st.st_size or row[1] != st.st_mtime_ns or row[2] != extension:
+                self.misses += 1
+                return None
+            self.hits += 1
+            if row[5] != self._now:
+                self._pending_seen.append((self._now, dev, ino))
+                self._flush_if_full()
+            return row[3], row[4]
+
+    def put(self, st: os.stat_result, extension: str, mime_type: str, encoding: str) -> None:
+        with self._lock:
+            if self._conn is None:
+                return
+            dev, ino = _signed64(st.st_dev), _signed64(st.st_ino)
+            self._pending_puts[(dev, ino)] = (
+                dev, ino, st.st_size, st.st_mtime_ns, extension, mime_type, encoding, self._now
+            )
+            self._flush_if_full()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is None:
+                return
+            self._flush()
+            try:
+                self._evict()
+            except sqlite3.Error as ex:
+                logging.warning(f'MIME cache eviction failed: {ex}')
+            self._conn.close()
+            self._conn = None
+
+    def summary(self) -> str:
+        total = self.hits + self.misses
+        ratio = self.hits / total if total else 0.0
+        return f'MIME cache: {self.hits} of {total} lookups served from {self.path} ({ratio:.1%})'
+
+    def __len__(self) -> int:
+        with self._lock:
+            if self._conn is None:
+                return 0
+            return self._conn.execute('SELECT COUNT(*) FROM mime').fetchone()[0]
+
+    def _flush_if_full(self) -> None:
+        if len(self._pending_puts) + len(self._pending_seen) >= self.FLUSH_EVERY:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._conn is None or not (self._pending_puts or self._pending_seen):
+            return
+        puts, self._pending_puts = list(self._pending_puts.values()), {}
+        seen, self._pending_seen = self._pending_seen, []
+        try:
+            self._conn.execute('BEGIN')
+            self._conn.executemany('INSERT OR REPLACE INTO mime VALUES (?, ?, ?, ?, ?, ?, ?, ?)', puts)
+            self._conn.executemany('UPDATE mime SET last_seen = ? WHERE dev = ? AND ino = ?', seen)
+            self._conn.execute('COMMIT')
+        except sqlite3.Error as ex:
+            self._disable(ex)
+
+    def _evict(self) -> None:
+        assert self._conn is not None
+        if self.max_age_days > 0:
+            self._conn.execute('DELETE FROM mime WHERE last_seen < ?',
+                               (self._now - self.max_age_days * SECONDS_PER_DAY,))
+        excess = self._conn.execute('SELECT COUNT(*) FROM mime').fetchone()[0] - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                'DELETE FROM mime WHERE rowid IN (SELECT rowid FROM mime ORDER BY last_seen LIMIT ?)', (excess,)
+            )
+
+    def _disable(self, ex: Exception) -> None:
+        """Stop using a failing cache; MIME detection continues without it."""
+        logging.warning(f'Disabling MIME cache {self.path}: {ex}')
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except sqlite3.Error:
+                pass
+        self._conn = None
+        self._pending_puts = {}
+        self._pending_seen = []
@@ -1,21 +1,46 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
+from typing import Optional, Sequence
 
 from .config import ScanConfiguration
-from .finding import Finding
+from .sink import ResultRecord
+
+
+@dataclass
+class UnfinishedWork:
+    """Work left over when a scan stops at its ``max_runtime_seconds`` deadline.
+
+    ``unscanned_paths`` lists the directories and files the walk never reached,
+    followed by the logical paths of jobs that were abandoned, still running
+    or drained unscanned from the queue.
+    """
+
+    unscanned_paths: list[str] = field(default_factory=list)
+    pending_jobs: int = 0
 
 
 @dataclass
 class ScanResult:
-    """Data transfer object carrying all output from a completed scan."""
+    """Data transfer object carrying all output from a completed scan.
+
+    ``matched_files`` and ``interesting_files`` may be lazy views over the
+    dispatcher's per-worker result shards, or over the records of a result
+    sink when one is configured; iterate them rather than copying.
+    ``unfinished`` is set when the scan stopped at its deadline.
+    """
 
-    matched_files: list[Finding]
-    interesting_files: list[Finding]
+    matched_files: Sequence[ResultRecord]
+    interesting_files: Sequence[ResultRecord]
     start_time: datetime
     end_time: datetime
     config: ScanConfiguration
+    unfinished: Optional[UnfinishedWork] = None
+
+    @property
+    def is_partial(self) -> bool:
+        return self.unfinished is not None
 
     @property
     def elapsed(self) -> timedelta:
@@ -5,6 +5,7 @@
 import os
 import pathlib
 import re
+import stat
 import struct
 import threading
 import unicodedata
@@ -13,6 +14,10 @@
 from types import SimpleNamespace
 from typing import Any, Optional, Protocol, Union
 
+from .bytesource import ByteSource
+from .mimecache import MimeCache
+from .signatures import SIGNATURE_TABLE_VERSION, SNIFF_BYTES, detection_stats, sniff
+
 try:
     from typing import TypeGuard
 except ImportError:
@@ -103,6 +108,9 @@ def _guess_encoding(buffer: bytes) -> str:
 
 _thread_local = threading.local()
 
+# Persistent MIME cache for files on disk, installed for the duration of a scan.
+_mime_cache: Optional[MimeCache] = None
+
 
 class FileLikePayload(Protocol):
     def read(self, __size: int = -1) -> bytes:
@@ -137,25 +145,49 @@ def is_seekable_file_like(payload: Any) -> TypeGuard[SeekableFileLikePayload]:
 
 
 def get_mimetype(path: Optional[str] = None,
-                 payload: Optional[Union[bytes, FileLikePayload]] = None) -> tuple[str, str, Optional[Exception]]:
+                 payload: Optional[Union[bytes, FileLikePayload]] = None,
+                 source: Optional[ByteSource] = None) -> tuple[str, str, Optional[Exception]]:
+    """Detect the MIME type and encoding of a payload, or of the file at ``path``.
+
+    Pass the job's ``source`` to reuse its cached header and stat result.
+    Regular files are looked up in the installed MIME cache first.
+    """
     mime_type = 'Unknown/Unknown'
     encoding = 'Unknown'
     error: Optional[Exception] = None
 
+    extension = get_ext(path) if path else ''
+    if source is None:
+        if payload is not None and (isinstance(payload, bytes) or is_file_like(payload)):
+            source = ByteSource.from_payload(path or '', payload)
+        elif payload is None and path is not None:
+            source = ByteSource(path=path)
     try:
-        if payload is not None:
-            if isinstance(payload, bytes):
-                mime_type, encoding = __get_mime_data_from_buffer(payload)
-            elif is_file_like(payload):
-                mime_type, encoding = __get_mime_data_from_stream(payload)
-        elif path is not None:
-            mime_type, encoding = __get_mime_data_from_file(path)
+        if source is not None:
+            cache = _mime_cache
+            if cache is not None and source.kind == ByteSource.PATH:
+                mime_type, encoding = __get_cached_mime_data(cache, source, extension)
+            else:
+                mime_type, encoding = __get_mime_data(source, extension)
     except Exception as ex:
         error = ex
 
     return mime_type, encoding, error
 
 
+def set_mime_cache(cache: Optional[MimeCache]) -> None:
+    """Install the persistent MIME cache consulted by ``get_mimetype``, or remove it with None."""
+    global _mime_cache
+    _mime_cache = cache
+
+
+def mime_detector_version() -> str:
+    """Identify the signature table and libmagic build whose answers a MIME cache holds."""
+    version = getattr(magic, 'version', None)
+    libmagic = f'libmagic-{version()}' if callable(version) else 'fallback'
+    return f'signatures-{SIGNATURE_TABLE_VERSION};{libmagic}'
+
+
 def _get_magic() -> Any:
     """Return a per-thread libmagic detector.
 
@@ -188,42 +220,48 @@ def _parse_mime_data(raw_mime_data: str) -> tuple[str, str]:
     return mime_type, encoding
 
 
-def __get_mime_data_from_buffer(payload: bytes) -> tuple[str, str]:
-    buffer: bytes
-    if (len(payload) < 2048):
-        buffer = payload
-    else:
-        buffer = payload[:2048]
-
-    return _parse_mime_data(_get_magic().from_buffer(buffer))  # type: ignore
-
-
-def __get_mime_data_from_file(path: str) -> tuple[str, str]:
-    return _parse_mime_data(_get_magic().from_file(filename=path))  # type: ignore
-
-
-def __get_mime_data_from_stream(stream: FileLikePayload) -> tuple[str, str]:
-    seek = getattr(stream, 'seek', None)
-    if callable(seek):
-        try:
-            seek(0)
-        except (OSError, IOError):
-            pass
+def _sniff_header(header: bytes, extension: str, complete: bool) -> Optional[tuple[str, str]]:
+    """Try the built-in signature table and record whether libmagic is still needed."""
+    result = sniff(header, extension, complete)
+    detection_stats.record(signature_hit=result is not None)
+    return result
 
-    buffer: bytes = stream.read(2048)
-    result = _parse_mime_data(_get_magic().from_buffer(buffer))  # type: ignore
 
-    if callable(seek):
-        try:
-            seek(0)
-        except (OSError, IOError):
-            pass
+def __get_mime_data(source: ByteSource, extension: str = '') -> tuple[str, str]:
+    if source.kind != ByteSource.PATH:
+        header, complete = source.sniff_header()
+        sniffed = _sniff_header(header, extension, complete)
+        if sniffed is not None:
+            return sniffed
+        return _parse_mime_data(_get_magic().from_buffer(header))  # type: ignore
 
-    return result
+    try:
+        header, complete = source.sniff_header()
+    except OSError:
+        pass  # let libmagic report the error or describe the special file
+    else:
+        sniffed = _sniff_header(header, extension, complete)
+        if sniffed is not None:
+            return sniffed
+    # libmagic reads well beyond the sniffed prefix for files, so give it the path.
+    return _parse_mime_data(_get_magic().from_file(filename=source.path))  # type: ignore
+
+
+def __get_cached_mime_data(cache: MimeCache, source: ByteSource, extension: str) -> tuple[str, str]:
+    st = source.stat()
+    if not stat.S_ISREG(st.st_mode):
+        return __get_mime_data(source, extension)
+    cached = cache.get(st, extension)
+    if cached is not None:
+        return cached
+    mime_type, encoding = __get_mime_data(source, extension)
+    cache.put(st, extension, mime_type, encoding)
+    return mime_type, encoding
 
 
 def is_valid_zip(path: Optional[str] = None,
-                 payload: Optional[Union[bytes, FileLikePayload]] = None) -> bool:
+                 payload: Optional[Union[bytes, FileLikePayload]] = None,
+                 source: Optional[ByteSource] = None) -> bool:
     """Return True only when Python can locate a valid ZIP central directory.
 
     libmagic can classify partial or otherwise malformed files as ZIP data from
@@ -231,6 +269,10 @@ def is_valid_zip(path: Optional[str] = None,
     central-directory check that ``ZipFile`` needs before extraction, so use it
     as a cheap guard before dispatching a job to ZIP archive parsing.
     """
+    if source is not None:
+        if source.kind == ByteSource.BUFFER:
+            return zipfile.is_zipfile(source.open())
+        path, payload = source.path, source.stream
     if payload is not None:
         if isinstance(payload, bytes):
             return zipfile.is_zipfile(io.BytesIO(payload))
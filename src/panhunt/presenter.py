@@ -1,6 +1,6 @@
-import json
 import logging
 import os
+from typing import Iterable, Union
 
 import colorama
 
@@ -32,7 +32,7 @@ def show(self, result: ScanResult) -> None:
     def _save_text(self, result: ScanResult) -> None:
         path = result.config.get_report_path()
         logging.info("Creating TXT report.")
-        _write_file(path, self._report_gen.generate_text(result))
+        _write_file(path, self._report_gen.iter_text(result))
         logging.info("Created TXT report.")
 
     def _save_json(self, result: ScanResult) -> None:
@@ -40,7 +40,7 @@ def _save_json(self, result: ScanResult) -> None:
         if path is None:
             return
         logging.info("Creating JSON report.")
-        _write_file(path, json.dumps(self._report_gen.generate_json(result), indent=4))
+        _write_file(path, self._report_gen.iter_json(result))
         logging.info("Created JSON report.")
 
     # ------------------------------------------------------------------
@@ -65,6 +65,10 @@ def _print(self, result: ScanResult) -> None:
                 print(colorama.Fore.YELLOW + '\t- ' + panutils.unicode_to_ascii(
                     f'{interesting.abspath} ({panutils.size_friendly(interesting.size)})'))
 
+        if result.unfinished is not None:
+            print(colorama.Fore.RED + panutils.unicode_to_ascii(
+                ReportGenerator.format_partial_notice(result).rstrip('\n')))
+
         print(colorama.Fore.WHITE + f'Report written to {panutils.unicode_to_ascii(result.config.get_report_path())}')
 
 
@@ -72,9 +76,12 @@ def _print(self, result: ScanResult) -> None:
 # Shared helper
 # ------------------------------------------------------------------
 
-def _write_file(path: str, content: str) -> None:
+def _write_file(path: str, content: Union[str, Iterable[str]]) -> None:
     basedir = os.path.dirname(os.path.abspath(path))
     if not os.path.exists(basedir):
         os.makedirs(basedir)
     with open(path, 'w', encoding='utf-8') as f:
-        f.write(content)
+        if isinstance(content, str):
+            f.write(content)
+        else:
+            f.writelines(content)
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import threading
+from typing import Optional
+
+from .pan import PAN
+
+
+class RangeGroup:
+    """Collects the results of the byte-range sub-jobs a large file was split into.
+
+    Parts complete in any order on any worker. The worker that completes the
+    last part receives True from ``complete`` and reports the file once, with
+    the matches of all parts in file order. Ranges are cut between digit runs,
+    so a PAN is found by exactly one part and the merged list has no
+    duplicates at the range boundaries.
+
+    ``earlier_matches`` holds the stored matches of the part of a log before
+    the resume offset, which are reported together with the new ones.
+    """
+
+    def __init__(self, ranges: list[tuple[int, int]], earlier_matches: Optional[list[str]] = None) -> None:
+        self.ranges = ranges
+        self.earlier_matches = earlier_matches or []
+        self._lock = threading.Lock()
+        self._matches: list[list[PAN]] = [[] for _ in ranges]
+        self._errors: list[Exception] = []
+        self._remaining = len(ranges)
+
+    def complete(self, index: int, matches: list[PAN], error: Optional[Exception] = None) -> bool:
+        """Record a finished part; return True if it was the last one."""
+        with self._lock:
+            self._matches[index] = matches
+            if error is not None:
+                self._errors.append(error)
+            self._remaining -= 1
+            return self._remaining == 0
+
+    @property
+    def matches(self) -> list[PAN]:
+        with self._lock:
+            return [pan for part in self._matches for pan in part]
+
+    @property
+    def error(self) -> Optional[Exception]:
+        """The first error raised by any part, or None if every part succeeded."""
+        with self._lock:
+            return self._errors[0] if self._errors else None
@@ -1,8 +1,53 @@
+import json
 import platform
+from typing import Any, Iterable, Iterator
 
 from . import panutils
 from .models import ScanResult
 
+_JSON_INDENT = ' ' * 4
+
+
+class _JsonObject:
+    """Members of a JSON object, produced lazily so a large report is streamed."""
+
+    def __init__(self, members: Iterable[tuple[str, Any]]) -> None:
+        self.members = members
+
+
+class _JsonArray:
+    """Items of a JSON array, produced lazily so a large report is streamed."""
+
+    def __init__(self, items: Iterable[Any]) -> None:
+        self.items = items
+
+
+def _iter_json(value: Any, level: int = 0) -> Iterator[str]:
+    """Yield ``value`` as JSON text laid out like ``json.dumps(value, indent=4)``."""
+    if isinstance(value, (_JsonObject, _JsonArray)):
+        is_object = isinstance(value, _JsonObject)
+        opening, closing = ('{', '}') if is_object else ('[', ']')
+        inner = '\n' + _JSON_INDENT * (level + 1)
+        empty = True
+        for entry in (value.members if is_object else value.items):  # type: ignore[union-attr]
+            yield (',' if not empty else opening) + inner
+            if is_object:
+                key, entry = entry
+                yield json.dumps(key) + ': '
+            yield from _iter_json(entry, level + 1)
+            empty = False
+        yield opening + closing if empty else '\n' + _JSON_INDENT * level + closing
+    else:
+        yield json.dumps(value, indent=4).replace('\n', '\n' + _JSON_INDENT * level)
+
+
+def _to_python(value: Any) -> Any:
+    if isinstance(value, _JsonObject):
+        return {key: _to_python(entry) for key, entry in value.members}
+    if isinstance(value, _JsonArray):
+        return [_to_python(entry) for entry in value.items]
+    return value
+
 
 class ReportGenerator:
     """Formats a ScanResult into text or JSON. Pure logic — no file I/O."""
@@ -19,48 +64,83 @@ def format_header(result: ScanResult) -> str:
             f'Uname: {" | ".join(platform.uname())}{newline}'
             f'Elapsed time: {result.elapsed}{newline}'
             f'Found {result.pan_count} possible PANs.{newline}'
+            f'{ReportGenerator.format_partial_notice(result)}'
             f'{sep}{newline}'
         )
 
+    @staticmethod
+    def format_partial_notice(result: ScanResult) -> str:
+        if result.unfinished is None:
+            return ''
+        return (
+            f'PARTIAL SCAN: stopped at the maximum runtime of {result.config.max_runtime_seconds}s with '
+            f'{result.unfinished.pending_jobs} pending jobs and '
+            f'{len(result.unfinished.unscanned_paths)} unscanned paths.\n'
+        )
+
     def generate_text(self, result: ScanResult) -> str:
+        return ''.join(self.iter_text(result))
+
+    def iter_text(self, result: ScanResult) -> Iterator[str]:
+        """Yield the text report one file entry at a time so it can be written while reading the results.
+
+        Files are listed in the order the results were recorded.
+        """
         newline = '\n'
-        report = self.format_header(result) + newline
+        yield self.format_header(result) + newline
 
         for file in result.matched_files:
             # size_friendly is called once per matched file by design — file size is part of the report spec.
-            report += f'FOUND PANs: {file.abspath} ({panutils.size_friendly(file.size)}){newline}'
+            entry = f'FOUND PANs: {file.abspath} ({panutils.size_friendly(file.size)}){newline}'
             for pan in file.matches:
-                report += f'\t{pan}{newline}'
-            report += newline
+                entry += f'\t{pan}{newline}'
+            yield entry + newline
 
         if result.interesting_files:
-            report += f'Interesting Files to check separately, probably a permission or file size issue:{newline}'
-            for interesting in sorted(result.interesting_files, key=lambda x: x.basename):
-                report += f'{interesting.abspath} ({panutils.size_friendly(interesting.size)}){newline}'
-                report += f'Error: {interesting.errors}{newline}'
+            yield f'Interesting Files to check separately, probably a permission or file size issue:{newline}'
+            for interesting in result.interesting_files:
+                yield (
+                    f'{interesting.abspath} ({panutils.size_friendly(interesting.size)}){newline}'
+                    f'Error: {interesting.errors}{newline}'
+                )
 
-        return report
+        if result.unfinished is not None and result.unfinished.unscanned_paths:
+            yield f'{newline}Unscanned paths, not searched before the maximum runtime was reached:{newline}'
+            for path in result.unfinished.unscanned_paths:
+                yield f'{path}{newline}'
 
     def generate_json(self, result: ScanResult) -> dict:
-        data: dict = {
-            'timestamp': result.start_time.strftime('%H:%M:%S %d/%m/%Y'),
-            'searched': result.config.target_path,
-            'excluded': ','.join(result.config.excluded_paths),
-            'elapsed': str(result.elapsed),
-            'pans_found': result.pan_count,
-            'pans_found_results': {
-                f.abspath: [str(pan) for pan in f.matches]
-                for f in result.matched_files
-            },
-        }
+        return _to_python(self._json_report(result))
+
+    def iter_json(self, result: ScanResult) -> Iterator[str]:
+        """Yield the JSON report in pieces, one file entry at a time, formatted as with ``indent=4``."""
+        return _iter_json(self._json_report(result))
+
+    def _json_report(self, result: ScanResult) -> _JsonObject:
+        return _JsonObject(self._json_members(result))
+
+    def _json_members(self, result: ScanResult) -> Iterator[tuple[str, Any]]:
+        yield 'timestamp', result.start_time.strftime('%H:%M:%S %d/%m/%Y')
+        yield 'searched', result.config.target_path
+        yield 'excluded', ','.join(result.config.excluded_paths)
+        yield 'elapsed', str(result.elapsed)
+        yield 'pans_found', result.pan_count
+        yield 'pans_found_results', _JsonObject(
+            (f.abspath, [str(pan) for pan in f.matches]) for f in result.matched_files
+        )
 
         if result.interesting_files:
-            data['interesting_files'] = {
-                'total': len(result.interesting_files),
-                'files': [
+            yield 'interesting_files', _JsonObject((
+                ('total', len(result.interesting_files)),
+                ('files', _JsonArray(
                     {'path': f.abspath, 'size': f.size, 'errors': f.errors}
                     for f in result.interesting_files
-                ],
-            }
+                )),
+            ))
 
-        return data
+        if result.unfinished is not None:
+            yield 'partial', {
+                'max_runtime_seconds': result.config.max_runtime_seconds,
+                'pending_jobs': result.unfinished.pending_jobs,
+                'unscanned_paths': list(result.unfinished.unscanned_paths),
+            }
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import itertools
+import threading
+from typing import Any, Generic, Iterator, Optional, Sequence, TypeVar, Union, overload
+
+T = TypeVar('T')
+
+
+class ResultShards(Generic[T]):
+    """Append-only result collection with one shard per producing thread.
+
+    Each worker appends to its own list, so recording a result never contends
+    on a shared lock. Readers take a ``snapshot()``, which records the current
+    length of every shard and merges them lazily on iteration without copying
+    the results.
+    """
+
+    def __init__(self) -> None:
+        self._shards: list[list[T]] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def append(self, item: T) -> None:
+        shard: Optional[list[T]] = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = []
+            self._local.shard = shard
+            with self._lock:
+                self._shards.append(shard)
+        shard.append(item)
+
+    def snapshot(self) -> 'ResultView[T]':
+        with self._lock:
+            return ResultView([(shard, len(shard)) for shard in self._shards])
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self.snapshot())
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(shard) for shard in self._shards)
+
+
+class ResultView(Sequence[T]):
+    """Read-only, point-in-time view over result shards."""
+
+    def __init__(self, bounds: list[tuple[list[T], int]]) -> None:
+        self._bounds = bounds
+
+    def __iter__(self) -> Iterator[T]:
+        return itertools.chain.from_iterable(
+            itertools.islice(shard, length) for shard, length in self._bounds
+        )
+
+    def __len__(self) -> int:
+        return sum(length for _, length in self._bounds)
+
+    @overload
+    def __getitem__(self, index: int) -> T:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[T]:
+        ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[T, list[T]]:
+        if isinstance(index, slice):
+            return list(self)[index]
+        if index < 0:
+            index += len(self)
+        if index >= 0:
+            for shard, length in self._bounds:
+                if index < length:
+                    return shard[index]
+                index -= length
+        raise IndexError('result index out of range')
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, Sequence) or isinstance(other, (str, bytes)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f'ResultView({list(self)!r})'
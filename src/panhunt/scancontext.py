@@ -5,7 +5,7 @@
 from typing import Optional
 
 from . import panutils
-from .exceptions import PANHuntException
+from .exceptions import PANHuntException, ScanCancelledException
 
 
 @dataclass(frozen=True)
@@ -28,8 +28,22 @@ def __init__(self, limits: ScanLimits) -> None:
         self._expanded_bytes = 0
         self._attachment_bytes = 0
         self._lock = threading.Lock()
+        self._cancelled = threading.Event()
+
+    def cancel(self) -> None:
+        """Ask every job sharing this budget to stop at its next cancellation check."""
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def check_cancelled(self, logical_path: str) -> None:
+        if self._cancelled.is_set():
+            raise ScanCancelledException(f'Scan stopped before "{logical_path}" was completed')
 
     def reserve_child(self, logical_path: str, depth: int, payload_size: int = 0) -> None:
+        self.check_cancelled(logical_path)
         with self._lock:
             if depth > self.limits.max_depth:
                 raise PANHuntException(
@@ -104,6 +118,29 @@ def attachment_bytes(self) -> int:
             return self._attachment_bytes
 
 
+class JobTree:
+    """Counts the queued and running jobs of one file on disk and of the content inside it.
+
+    The file's own job is counted from the start. The job buffer adds every
+    job of the tree it is given: archive members, attachments, byte ranges
+    and batches. ``done`` is called once per processed job and returns True
+    for the last one, when every result of the file has been recorded.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._pending = 1
+
+    def add(self) -> None:
+        with self._lock:
+            self._pending += 1
+
+    def done(self) -> bool:
+        with self._lock:
+            self._pending -= 1
+            return self._pending == 0
+
+
 class ScanContext:
     """Per-job scan metadata backed by a shared ResourceBudget."""
 
@@ -114,12 +151,14 @@ def __init__(
             depth: int,
             budget: ResourceBudget,
             parent_archive: Optional[str] = None,
-            container_chain: Optional[list[str]] = None) -> None:
+            container_chain: Optional[list[str]] = None,
+            tree: Optional[JobTree] = None) -> None:
         self.logical_path = logical_path
         self.depth = depth
         self.parent_archive = parent_archive
         self.container_chain = list(container_chain or [])
         self.budget = budget
+        self.tree = tree if tree is not None else JobTree()
 
     @classmethod
     def root(
@@ -135,6 +174,14 @@ def root(
             container_chain=[]
         )
 
+    @property
+    def root_path(self) -> str:
+        """Logical path of the file on disk that this job's content came from."""
+        return self.container_chain[0] if self.container_chain else self.logical_path
+
+    def check_cancelled(self) -> None:
+        self.budget.check_cancelled(self.logical_path)
+
     def reserve_attachment(self, basename: str, byte_count: int, attachment_count: int = 1) -> None:
         logical_path = f'{self.logical_path}!/{basename}'
         self.budget.reserve_attachment(
@@ -144,18 +191,26 @@ def reserve_attachment(self, basename: str, byte_count: int, attachment_count: i
         )
 
     def child(self, basename: str, payload_size: int = 0) -> 'ScanContext':
+        context = self.part(basename)
+        self.budget.reserve_child(logical_path=context.logical_path, depth=context.depth, payload_size=payload_size)
+        return context
+
+    def part(self, basename: str) -> 'ScanContext':
+        """Return the context of a part of this job's content that is reported but not queued, such as a message.
+
+        Unlike ``child``, nothing is reserved in the budget.
+        """
         logical_path = f'{self.logical_path}!/{basename}'
-        depth = self.depth + 1
         if len(logical_path) > self.budget.limits.max_path_length:
             raise PANHuntException(
                 f'Scan path length limit exceeded for "{logical_path}": '
                 f'{len(logical_path)} over {self.budget.limits.max_path_length}'
             )
-        self.budget.reserve_child(logical_path=logical_path, depth=depth, payload_size=payload_size)
         return ScanContext(
             logical_path=logical_path,
-            depth=depth,
+            depth=self.depth + 1,
             budget=self.budget,
             parent_archive=self.logical_path,
-            container_chain=[*self.container_chain, self.logical_path]
+            container_chain=[*self.container_chain, self.logical_path],
+            tree=self.tree
         )
@@ -1,34 +1,89 @@
 from __future__ import annotations
 
+import codecs
+import functools
+import hashlib
 import io
+import itertools
 import logging
 import os
+import re
+import struct
 from abc import ABC, abstractmethod
-from typing import Optional, Union
+from typing import IO, Callable, Iterator, Optional, Union, cast
 
-from . import panutils
 from .buffer import JobBuffer
+from .bytesource import ByteSource, FileSlices
 from .config import ScanConfiguration
-from .constants import BLOCK_SIZE_BYTES, MIN_PAN_LENGTH, STREAM_CHUNK_SIZE_BYTES
+from .constants import BLOCK_SIZE_BYTES, MIN_PAN_LENGTH, MMAP_WINDOW_BYTES, STREAM_CHUNK_SIZE_BYTES
+from .dedup import new_digest, payload_digest
 from .exceptions import PANHuntException
 from .finder import PanFinder
+from .finding import Finding
+from .formats.eml import Attachment as EmlAttachment
 from .formats.eml import Eml
-from .formats.mbox import Mbox
-from .formats.msmsg import MSMSG
+from .formats.mbox import Mail, Mbox
+from .formats.msmsg import MSCFB, MSMSG, DirectoryEntry
 from .formats.pdf import Pdf
 from .formats.pst import PST
 from .formats.pst import Attachment as PstAttachment
 from .job import FileLikePayload, Job
+from .limitedio import FileRangeReader, spool_limited
 from .pan import PAN
 from .parser_isolation import SubprocessParserRunner
+from .scancontext import ScanContext
+
+# Lines scanned between cooperative cancellation checks in line-oriented loops.
+CANCEL_CHECK_INTERVAL_LINES = 4096
+
+# PANs are runs of digits optionally separated by spaces or hyphens. The
+# PanFinder patterns accept any Unicode decimal digit through \d.
+_PAN_CANDIDATE_TEXT = re.compile(r'\d[\d \-]{%d,}\d' % (MIN_PAN_LENGTH - 2))
+# Bytes decoded on each side of a run: the longest UTF-8 character, so the
+# neighbouring character seen by look-around assertions is complete.
+_CANDIDATE_MARGIN_BYTES = 4
+# A mapped window may end after any ASCII byte that cannot be part of a run.
+_WINDOW_BOUNDARY = re.compile(rb'[\x00-\x1f\x21-\x2c\x2e\x2f\x3a-\x7f]')
+
+
+@functools.lru_cache(maxsize=None)
+def _non_ascii_digits() -> str:
+    # Every Unicode decimal digit lies below U+20000.
+    return ''.join(re.findall(r'\d', ''.join(map(chr, range(0x80, 0x20000)))))
+
+
+@functools.lru_cache(maxsize=None)
+def _pan_candidate(encoding: str) -> re.Pattern[bytes]:
+    """Byte runs that may hold a PAN in the ASCII-compatible ``encoding``.
+
+    Every brand prefix starts with an ASCII digit, so a run does too. It then
+    continues over ASCII digits, spaces and hyphens, and over the non-ASCII
+    bytes that encode other decimal digits in ``encoding``. Runs holding
+    such bytes are checked with ``_PAN_CANDIDATE_TEXT`` once decoded.
+    """
+    extra = set()
+    for digit in _non_ascii_digits():
+        try:
+            extra.update(byte for byte in digit.encode(encoding) if byte >= 0x80)
+        except UnicodeEncodeError:
+            continue
+    digits = b'0-9' + b''.join(b'\\x%02x' % byte for byte in sorted(extra))
+    return re.compile(b'[0-9][%s \\-]{%d,}[%s]' % (digits, MIN_PAN_LENGTH - 2, digits))
 
 
 class ScannerBase(ABC):
 
-    def __init__(self, buffer: JobBuffer, config: ScanConfiguration, pan_finder: Optional[PanFinder] = None) -> None:
+    # Scanners that enqueue attachments as child jobs; their outcome is not
+    # reusable for a duplicate payload, which must produce its own children.
+    enqueues_children = False
+
+    def __init__(self, buffer: JobBuffer, config: ScanConfiguration, pan_finder: Optional[PanFinder] = None,
+                 report: Optional[Callable[[Finding], None]] = None) -> None:
         self._buffer = buffer
         self._config = config
         self._pan_finder = pan_finder if pan_finder is not None else PanFinder(config)
+        # Records findings for parts of a job's content that are not queued as jobs of their own.
+        self._report = report
 
     @abstractmethod
     def scan(self, job: Job, encoding: str = 'utf8') -> list[PAN]:
@@ -46,52 +101,63 @@ def _validate_attachment(self, parent: Job, basename: str, payload: Optional[byt
         if parent.context:
             parent.context.reserve_attachment(basename, payload_size, attachment_count)
 
-    def _child_job(self, parent: Job, basename: str, payload: Optional[bytes]) -> Job:
-        payload_size = len(payload) if payload is not None else 0
-        context = parent.context.child(basename=basename, payload_size=payload_size) if parent.context else None
+    def _child_job(self, parent: Job, basename: str, payload: Optional[Union[bytes, IO[bytes]]],
+                   payload_size: Optional[int] = None, content_hash: Optional[bytes] = None) -> Job:
+        """Create the job of an attachment; streamed payloads pass their size and content hash."""
+        if isinstance(payload, bytes):
+            payload_size = len(payload)
+            content_hash = payload_digest(payload) if payload else None
+        context = parent.context.child(basename=basename, payload_size=payload_size or 0) if parent.context else None
         return Job(
             basename=basename,
             dirname=parent.abspath,
             payload=payload,
-            context=context
+            context=context,
+            content_hash=content_hash
         )
 
+    def _spool_attachment(self, parent: Job, basename: str, stream: IO[bytes], attachment_count: int) -> Job:
+        """Copy an attachment stream into a spooled file and return its child job, enforcing the attachment limits."""
+        if attachment_count > self._config.max_attachments_per_message:
+            raise PANHuntException(
+                f'Attachment count limit exceeded for "{parent.abspath}": '
+                f'{attachment_count} over {self._config.max_attachments_per_message}'
+            )
+        digest = new_digest()
+        try:
+            payload, payload_size = spool_limited(stream, self._config.max_attachment_size,
+                                                  spool_threshold=self._config.archive_spool_threshold, digest=digest)
+        except PANHuntException as ex:
+            raise PANHuntException(f'Attachment "{basename}" exceeds configured size limit') from ex
+        try:
+            if parent.context:
+                parent.context.reserve_attachment(basename, payload_size, attachment_count)
+            return self._child_job(parent, basename, payload, payload_size, digest.digest())
+        except Exception:
+            payload.close()
+            raise
+
+    def _enqueue_attachments(self, parent: Job, attachments: list[EmlAttachment]) -> None:
+        """Hand decoded attachments over to child jobs, which close their spooled payloads."""
+        for att in attachments:
+            self._buffer.enqueue(self._child_job(parent, att.Filename, att.take_payload(), att.Size, att.ContentHash))
+
     def _payload_bytes(self, job: Job) -> Optional[bytes]:
-        payload = job.payload
-        if payload is None:
+        """Return an in-memory or streamed payload as bytes, or None for jobs backed by a file."""
+        if job.payload is None:
             return None
-        if isinstance(payload, bytes):
-            return payload
-        if not panutils.is_file_like(payload):
-            return None
-
-        seek = getattr(payload, 'seek', None)
-        if callable(seek):
-            try:
-                seek(0)
-            except io.UnsupportedOperation:
-                pass  # non-seekable stream; read from current position
-            except OSError as e:
-                logging.warning(f"Failed to seek stream to start: {e}")
-
-        stream_payload: Union[bytes, bytearray, memoryview] = payload.read()
-        if isinstance(stream_payload, bytes):
-            return stream_payload
-        elif isinstance(stream_payload, memoryview):
-            return stream_payload.tobytes()
-        elif isinstance(stream_payload, bytearray):
-            return bytes(stream_payload)
+        return job.source.to_bytes()
 
 
 class PlainTextFileScanner(ScannerBase):
 
     def scan(self, job: Job, encoding: str = 'utf8') -> list[PAN]:
-        if job.payload:
-            if isinstance(job.payload, bytes):
-                return self._scan_bytes(job.payload, encoding)
-            if panutils.is_file_like(job.payload):
-                return self._scan_stream(job.payload, encoding)
-        return self._scan_file(job.abspath, encoding)
+        source = job.source
+        if source.kind == ByteSource.BUFFER:
+            return self._scan_bytes(source.view(), encoding)
+        if source.kind == ByteSource.STREAM:
+            return self._scan_stream(cast(FileLikePayload, source.stream), encoding, job.context)
+        return self._scan_file(job.abspath, encoding, job.context)
 
     @staticmethod
     def _text_encoding(encoding: str) -> str:
@@ -100,17 +166,18 @@ def _text_encoding(encoding: str) -> str:
         # streams as UTF-8 with replacement so ASCII PANs remain searchable.
         return 'utf8' if encoding.lower() in ('binary', 'unknown') else encoding
 
-    def _scan_bytes(self, payload: bytes, encoding: str = 'utf8') -> list[PAN]:
+    def _scan_bytes(self, payload: Union[bytes, memoryview], encoding: str = 'utf8') -> list[PAN]:
         encoding = self._text_encoding(encoding)
 
-        text = payload.decode(encoding=encoding, errors='backslashreplace')
+        text = str(payload, encoding, 'backslashreplace')
 
         if len(text) < MIN_PAN_LENGTH:
             return []
 
         return self._pan_finder.find(text)
 
-    def _scan_file(self, filepath: str, encoding: str = 'utf8') -> list[PAN]:
+    def _scan_file(self, filepath: str, encoding: str = 'utf8',
+                   context: Optional[ScanContext] = None) -> list[PAN]:
         matches: list[PAN] = []
         encoding = self._text_encoding(encoding)
 
@@ -123,14 +190,189 @@ def _scan_file(self, filepath: str, encoding: str = 'utf8') -> list[PAN]:
             with open(file=filepath, mode='r', encoding=encoding, errors='backslashreplace') as f:
                 text = f.read()
             matches.extend(self._pan_finder.find(text))
+        elif self._is_ascii_compatible(encoding):
+            source = ByteSource(path=filepath)
+            try:
+                view = source.view()
+                try:
+                    matches.extend(self._scan_mapped(view, encoding, context))
+                finally:
+                    view.release()
+            finally:
+                source.close()
         else:
-            with open(file=filepath, mode='r', encoding=encoding, errors='backslashreplace') as f:
-                for line in f:
-                    matches.extend(self._pan_finder.find(line))
+            matches.extend(self._scan_lines(filepath, encoding, context))
+
+        return matches
+
+    def _scan_lines(self, filepath: str, encoding: str,
+                    context: Optional[ScanContext] = None) -> list[PAN]:
+        matches: list[PAN] = []
+        with open(file=filepath, mode='r', encoding=encoding, errors='backslashreplace') as f:
+            for index, line in enumerate(f):
+                if context is not None and index % CANCEL_CHECK_INTERVAL_LINES == 0:
+                    context.check_cancelled()
+                matches.extend(self._pan_finder.find(line))
+        return matches
+
+    @classmethod
+    def supports_ranges(cls, encoding: str) -> bool:
+        """Whether files in ``encoding`` can be split into byte ranges and scanned a range at a time."""
+        return cls._is_ascii_compatible(cls._text_encoding(encoding))
+
+    @classmethod
+    def split_ranges(cls, filepath: str, encoding: str, range_size: int,
+                     start: int = 0, end: Optional[int] = None, live: bool = False) -> list[tuple[int, int]]:
+        """Divide bytes ``start`` to ``end`` of a file into ranges of about ``range_size``.
+
+        Each range ends after a byte that cannot be part of a PAN, like the
+        windows of a mapped scan, so every digit run lies in exactly one range.
+        Returns an empty list for encodings the mapped scan cannot handle.
+        A ``live`` file, which may be truncated meanwhile, is read, not mapped.
+        """
+        if not cls.supports_ranges(encoding):
+            return []
+        if live:
+            slices = FileSlices(filepath)
+            try:
+                return cls._split(slices, range_size, start, end)
+            finally:
+                slices.release()
+        source = ByteSource(path=filepath)
+        try:
+            view = source.view()
+            try:
+                return cls._split(view, range_size, start, end)
+            finally:
+                view.release()
+        finally:
+            source.close()
+
+    @classmethod
+    def _split(cls, view: Union[memoryview, FileSlices], range_size: int,
+               start: int, end: Optional[int]) -> list[tuple[int, int]]:
+        stop = len(view) if end is None else min(end, len(view))
+        ranges: list[tuple[int, int]] = []
+        while start < stop:
+            range_end = cls._window_end(view, start, min(start + range_size, stop), stop)
+            ranges.append((start, range_end))
+            start = range_end
+        return ranges
+
+    @staticmethod
+    def resume_point(filepath: str, end: int) -> int:
+        """Return the offset after the last byte before ``end`` that cannot be part of a PAN.
+
+        Scanning that was stopped at ``end`` resumes there, so a card number
+        still being written when the file was scanned is read again whole.
+        The file is a log that may be truncated meanwhile, so it is read.
+        """
+        slices = FileSlices(filepath)
+        try:
+            return _rfind(slices, _WINDOW_BOUNDARY, 0, min(end, len(slices))) + 1
+        finally:
+            slices.release()
+
+    def scan_range(self, filepath: str, encoding: str, start: int, end: int,
+                   context: Optional[ScanContext] = None, live: bool = False) -> list[PAN]:
+        """Scan bytes ``start`` to ``end`` of a file produced by ``split_ranges``.
+
+        A ``live`` file is read a window at a time instead of mapped.
+        """
+        if start >= end:
+            return []
+        encoding = self._text_encoding(encoding)
+        if live:
+            return self._scan_read(filepath, encoding, context, start, end)
+        source = ByteSource(path=filepath)
+        try:
+            view = source.view()
+            try:
+                return self._scan_mapped(view, encoding, context, start=start, end=end)
+            finally:
+                view.release()
+        finally:
+            source.close()
+
+    def _scan_mapped(self, view: memoryview, encoding: str,
+                     context: Optional[ScanContext] = None,
+                     window_size: int = MMAP_WINDOW_BYTES,
+                     start: int = 0,
+                     end: Optional[int] = None) -> list[PAN]:
+        """Match over large windows of a memory-mapped file without decoding it.
+
+        The page cache does the I/O. Each window is searched in one call for
+        runs of at least ``MIN_PAN_LENGTH`` digits, spaces and hyphens, which
+        every PAN is made of; only those runs are decoded, together with a few
+        bytes either side so look-around assertions see their neighbours, and
+        passed to the PAN patterns. Windows end after a byte that cannot be part
+        of a run, so no run straddles two windows.
+        """
+        matches: list[PAN] = []
+        pan_candidate = _pan_candidate(encoding)
+        length = len(view)
+        stop = length if end is None else end
+        position = start
+        while position < stop:
+            if context is not None:
+                context.check_cancelled()
+            window_end = self._window_end(view, position, min(position + window_size, stop), stop)
+            for candidate in pan_candidate.finditer(view, position, window_end):
+                text_start = max(0, candidate.start() - _CANDIDATE_MARGIN_BYTES)
+                text_end = min(length, candidate.end() + _CANDIDATE_MARGIN_BYTES)
+                # The margins may begin or end inside a multi-byte character.
+                text = str(view[text_start:text_end], encoding, 'ignore')
+                if candidate.group().isascii() or _PAN_CANDIDATE_TEXT.search(text):
+                    matches.extend(self._pan_finder.find(text))
+            position = window_end
+        return matches
 
+    def _scan_read(self, filepath: str, encoding: str, context: Optional[ScanContext],
+                   start: int, end: int, window_size: int = MMAP_WINDOW_BYTES) -> list[PAN]:
+        """Scan bytes ``start`` to ``end`` of a file as ``_scan_mapped`` does, reading one window at a time.
+
+        Each window is read with the margins either side that candidates are
+        decoded with. Bytes lost to a truncation are not scanned.
+        """
+        matches: list[PAN] = []
+        slices = FileSlices(filepath)
+        try:
+            stop = min(end, len(slices))
+            position = start
+            while position < stop:
+                window_end = self._window_end(slices, position, min(position + window_size, stop), stop)
+                block_start = max(0, position - _CANDIDATE_MARGIN_BYTES)
+                block = slices[block_start:window_end + _CANDIDATE_MARGIN_BYTES]
+                matches.extend(self._scan_mapped(block, encoding, context, window_size=window_end - position,
+                                                 start=position - block_start,
+                                                 end=min(window_end - block_start, len(block))))
+                position = window_end
+        finally:
+            slices.release()
         return matches
 
-    def _scan_stream(self, stream: FileLikePayload, encoding: str = 'utf8') -> list[PAN]:
+    @staticmethod
+    def _window_end(view: Union[memoryview, FileSlices], start: int, limit: int, stop: int) -> int:
+        """Pick where a window ending at or before ``limit`` may be cut; ``stop`` is always allowed."""
+        if limit >= stop:
+            return stop
+        boundary = _rfind(view, _WINDOW_BOUNDARY, start, limit)
+        if boundary >= 0:
+            return boundary + 1
+        # A whole window of digits and separators: extend it to the end of the run.
+        boundary = _find(view, _WINDOW_BOUNDARY, limit, stop)
+        return boundary + 1 if boundary >= 0 else stop
+
+    @staticmethod
+    def _is_ascii_compatible(encoding: str) -> bool:
+        try:
+            name = codecs.lookup(encoding).name
+        except LookupError:
+            return False
+        return not name.startswith(('utf-16', 'utf-32'))
+
+    def _scan_stream(self, stream: FileLikePayload, encoding: str = 'utf8',
+                     context: Optional[ScanContext] = None) -> list[PAN]:
         matches: list[PAN] = []
 
         encoding = self._text_encoding(encoding)
@@ -146,6 +388,8 @@ def _scan_stream(self, stream: FileLikePayload, encoding: str = 'utf8') -> list[
 
         buffer = ''
         while True:
+            if context is not None:
+                context.check_cancelled()
             chunk = stream.read(STREAM_CHUNK_SIZE_BYTES)
             if not chunk:
                 if buffer and len(buffer) >= MIN_PAN_LENGTH:
@@ -167,80 +411,227 @@ def _scan_stream(self, stream: FileLikePayload, encoding: str = 'utf8') -> list[
         return matches
 
 
+def scan_file_range(config: ScanConfiguration, filepath: str, encoding: str, start: int, end: int,
+                    context: Optional[ScanContext] = None, live: bool = False) -> list[PAN]:
+    """Scan one range of a split plain-text file; module-level so worker processes can run it."""
+    # Plain-text scanning never enqueues child jobs, so no buffer is needed.
+    scanner = PlainTextFileScanner(buffer=cast(JobBuffer, None), config=config)
+    return scanner.scan_range(filepath, encoding, start, end, context, live)
+
+
+def _find(view: Union[memoryview, FileSlices], pattern: re.Pattern[bytes], begin: int, end: int) -> int:
+    """Return the offset of the first match of a single-byte pattern in ``view[begin:end]``, or -1.
+
+    Blocks are copied from the start forwards with a growing size, like ``_rfind``.
+    """
+    step = 256
+    while begin < end:
+        block_end = min(end, begin + step)
+        match = pattern.search(view[begin:block_end])
+        if match:
+            return begin + match.start()
+        begin = block_end
+        step = min(step * 4, 1024 * 1024)
+    return -1
+
+
+def _rfind(view: Union[memoryview, FileSlices], pattern: re.Pattern[bytes], begin: int, end: int) -> int:
+    """Return the offset of the last match of a single-byte pattern in ``view[begin:end]``, or -1.
+
+    Blocks are copied from the end backwards with a growing size, so a match
+    near the end is found without copying the whole range.
+    """
+    step = 256
+    while end > begin:
+        block_start = max(begin, end - step)
+        last = -1
+        for match in pattern.finditer(view[block_start:end]):
+            last = match.start()
+        if last >= 0:
+            return block_start + last
+        end = block_start
+        step = min(step * 4, 1024 * 1024)
+    return -1
+
+
 class LegacyOfficeScanner(ScannerBase):
     """Scanner for legacy Office 97-2003 compound binary files.
 
     Word .doc, Excel .xls, and PowerPoint .ppt files are not ZIP containers
-    like .docx/.xlsx/.pptx.  Their document text is commonly stored as ASCII
-    or UTF-16LE strings inside an OLE/CFB binary, so extract printable string
-    runs from the raw bytes and scan those runs for PANs.
+    like .docx/.xlsx/.pptx. They are OLE/CFB files whose document text is
+    stored as ASCII or UTF-16LE strings in a few named streams. The file is
+    opened with the MSCFB reader and printable string runs are extracted
+    from those streams only, not from FAT sectors, free space or pictures.
+
+    Files embedded in the document live in their own storages: ``ObjectPool``
+    in Word and ``MBD*`` in Excel. The text streams of an embedded legacy
+    document are scanned here; packaged files such as an embedded .xlsx or
+    PDF are enqueued as child jobs. A file that cannot be read as CFB is
+    scanned whole, as before.
     """
 
+    enqueues_children = True
+
     _MIN_STRING_RUN = MIN_PAN_LENGTH
+    # Printable ASCII runs, and the same characters each followed by a zero
+    # byte as UTF-16LE stores them. Matched over the mapped file in C; the
+    # leading single character lets the engine skip quickly to candidates.
+    _ASCII_RUN = re.compile(rb'[\t\n\r\x20-\x7e][\t\n\r\x20-\x7e]{%d,}' % (MIN_PAN_LENGTH - 1))
+    _UTF16LE_RUN = re.compile(rb'[\t\n\r\x20-\x7e]\x00(?:[\t\n\r\x20-\x7e]\x00){%d,}' % (MIN_PAN_LENGTH - 1))
+    # Only runs holding a digit sequence long enough for a PAN are matched,
+    # and repeated ones such as shared cell text only once. Those runs are
+    # remembered by hash, and the set is cleared when it reaches this size,
+    # so memory does not grow with the file.
+    _MAX_SEEN_RUNS = 100_000
+
+    _CFB_SIGNATURE = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'
+    # Stream names are compared upper-cased; CFB names are case-insensitive.
+    _TEXT_STREAMS = frozenset({
+        'WORDDOCUMENT', 'WORKBOOK', 'BOOK', 'POWERPOINT DOCUMENT',
+        '\x05SUMMARYINFORMATION', '\x05DOCUMENTSUMMARYINFORMATION',
+    })
+    _EMBEDDED_FILE_STREAMS = frozenset({'PACKAGE', 'CONTENTS', '\x01OLE10NATIVE'})
 
     def scan(self, job: Job, encoding: str = 'utf8') -> list[PAN]:
-        payload = self._payload_bytes(job)
-        if payload is None:
-            with open(job.abspath, 'rb') as file:
-                payload = file.read()
-        return self._scan_payload(payload)
+        # Files are memory-mapped and in-memory payloads viewed in place.
+        payload = job.source.view()
+        try:
+            cfb = self._open_compound_file(job, payload)
+            if cfb is None:
+                return self._scan_payload(payload)
+            try:
+                return self._scan_compound_file(job, cfb)
+            finally:
+                cfb.close()
+        finally:
+            payload.release()
+
+    def _open_compound_file(self, job: Job, payload: memoryview) -> Optional[MSCFB]:
+        if payload[:len(self._CFB_SIGNATURE)] != self._CFB_SIGNATURE:
+            return None
+        try:
+            cfb = MSCFB(payload)
+        except (PANHuntException, struct.error, IndexError, KeyError, ValueError, RecursionError) as ex:
+            logging.debug(f'Scanning unreadable compound file as raw bytes: {job.abspath}: {ex}')
+            return None
+        return cfb
+
+    def _scan_compound_file(self, job: Job, cfb: MSCFB) -> list[PAN]:
+        matches: list[PAN] = []
+        seen: set[bytes] = set()
+        embedded_count = 0
+        for storage_path, entry in self._iter_streams(cfb.directory.entries[0]):
+            if job.context:
+                job.context.check_cancelled()
+            name = entry.Name.upper()
+            if name in self._TEXT_STREAMS:
+                matches.extend(self._scan_payload(entry.get_view(), seen))
+            elif storage_path and name in self._EMBEDDED_FILE_STREAMS:
+                basename, data = self._embedded_file(storage_path, entry)
+                if not data:
+                    continue
+                embedded_count += 1
+                self._validate_attachment(job, basename, data, embedded_count)
+                self._buffer.enqueue(self._child_job(job, basename, data))
+        return matches
+
+    @classmethod
+    def _iter_streams(cls, storage: DirectoryEntry, storage_path: tuple[str, ...] = ()):
+        """Yield the document's top-level streams and every stream inside embedded-object storages."""
+        for child in sorted(storage.children.values(), key=lambda entry: entry.Name):
+            if child.ObjectType == DirectoryEntry.OBJECT_STREAM:
+                yield storage_path, child
+            elif child.ObjectType == DirectoryEntry.OBJECT_STORAGE and (
+                    storage_path or child.Name == 'ObjectPool' or child.Name.startswith('MBD')):
+                yield from cls._iter_streams(child, storage_path + (child.Name,))
+
+    @classmethod
+    def _embedded_file(cls, storage_path: tuple[str, ...], entry: DirectoryEntry) -> tuple[str, bytes]:
+        data = entry.get_data()
+        name = entry.Name.lstrip('\x01')
+        if entry.Name.upper() == '\x01OLE10NATIVE':
+            packaged = cls._unpack_ole10_native(data)
+            if packaged is not None:
+                name, data = packaged
+        return '/'.join(storage_path + (name,)), data
+
+    @staticmethod
+    def _unpack_ole10_native(data: bytes) -> Optional[tuple[str, bytes]]:
+        """Return the file name and content of an OLE Package object, or None if malformed.
+
+        Layout: size, flags, NUL-terminated label and source path, two
+        reserved integers, NUL-terminated temporary path, content size and
+        content.
+        """
+        try:
+            position = 6
+            label_end = data.index(b'\x00', position)
+            label = data[position:label_end].decode('latin-1')
+            position = data.index(b'\x00', label_end + 1) + 1 + 8
+            position = data.index(b'\x00', position) + 1
+            (size,) = struct.unpack_from('<I', data, position)
+        except (ValueError, struct.error):
+            return None
+        content = data[position + 4:position + 4 + size]
+        if len(content) != size:
+            return None
+        return os.path.basename(label.replace('\\', '/')) or 'Ole10Native', content
 
-    def _scan_payload(self, payload: bytes) -> list[PAN]:
+    def _scan_payload(self, payload: Union[bytes, memoryview], seen: Optional[set[bytes]] = None) -> list[PAN]:
         matches: list[PAN] = []
-        seen: set[str] = set()
+        if seen is None:
+            seen = set()
 
         for text in self._iter_binary_strings(payload):
-            if text in seen:
+            if _PAN_CANDIDATE_TEXT.search(text) is None:
                 continue
-            seen.add(text)
+            digest = hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+            if digest in seen:
+                continue
+            if len(seen) >= self._MAX_SEEN_RUNS:
+                seen.clear()
+            seen.add(digest)
             matches.extend(self._pan_finder.find(text))
 
         return matches
 
     @classmethod
-    def _iter_binary_strings(cls, payload: bytes):
+    def _iter_binary_strings(cls, payload: Union[bytes, memoryview]):
         yield from cls._iter_ascii_strings(payload)
         yield from cls._iter_utf16le_strings(payload)
 
     @classmethod
-    def _iter_ascii_strings(cls, payload: bytes):
-        current = bytearray()
-        for value in payload:
-            if value in (9, 10, 13) or 32 <= value <= 126:
-                current.append(value)
-                continue
-            if len(current) >= cls._MIN_STRING_RUN:
-                yield current.decode('ascii', errors='ignore')
-            current.clear()
-        if len(current) >= cls._MIN_STRING_RUN:
-            yield current.decode('ascii', errors='ignore')
+    def _iter_ascii_strings(cls, payload: Union[bytes, memoryview]):
+        for match in cls._ASCII_RUN.finditer(payload):
+            yield match.group().decode('ascii')
 
     @classmethod
-    def _iter_utf16le_strings(cls, payload: bytes):
-        current = bytearray()
-        length = len(payload) - 1
-        index = 0
-        while index < length:
-            value = payload[index]
-            marker = payload[index + 1]
-            if marker == 0 and (value in (9, 10, 13) or 32 <= value <= 126):
-                current.extend((value, marker))
-                index += 2
-                continue
-            if len(current) >= cls._MIN_STRING_RUN * 2:
-                yield current.decode('utf-16le', errors='ignore')
-            current.clear()
-            index += 1
-        if len(current) >= cls._MIN_STRING_RUN * 2:
-            yield current.decode('utf-16le', errors='ignore')
+    def _iter_utf16le_strings(cls, payload: Union[bytes, memoryview]):
+        for match in cls._UTF16LE_RUN.finditer(payload):
+            yield match.group().decode('utf-16le')
 
 
 class MsgScanner(ScannerBase):
 
-    def scan(self, job: Job, encoding: str = 'utf8') -> list[PAN]:
-        payload = self._payload_bytes(job)
-        msg = MSMSG(msg_target_path=payload if payload is not None else job.abspath)
+    enqueues_children = True
 
+    def scan(self, job: Job, encoding: str = 'utf8') -> list[PAN]:
+        # Files are memory-mapped and in-memory payloads viewed in place. Streams,
+        # such as attachments spooled to disk, are mapped from their file by MSCFB
+        # instead of being read into memory.
+        source = job.source
+        payload = source.view() if source.kind != ByteSource.STREAM else None
+        try:
+            msg = MSMSG(msg_target_path=payload if payload is not None else source.open(), scan_only=True)
+            try:
+                return self._scan_message(job, msg)
+            finally:
+                msg.close()
+        finally:
+            if payload is not None:
+                payload.release()
+
+    def _scan_message(self, job: Job, msg: MSMSG) -> list[PAN]:
         matches: list[PAN] = []
 
         if msg.validMSG:
@@ -248,85 +639,156 @@ def scan(self, job: Job, encoding: str = 'utf8') -> list[PAN]:
                 matches.extend(self._pan_finder.find(msg.Body))
             if msg.attachments:
                 for index, att in enumerate(msg.attachments, start=1):
-                    self._validate_attachment(job, att.Filename, att.BinaryData, index)
-                    self._buffer.enqueue(self._child_job(job, att.Filename, att.BinaryData))
+                    stream = att.open_data()
+                    if stream is None:
+                        self._validate_attachment(job, att.Filename, None, index)
+                        self._buffer.enqueue(self._child_job(job, att.Filename, None))
+                        continue
+                    # The message stays mapped only until its attachments are spooled.
+                    with stream:
+                        child = self._spool_attachment(job, att.Filename, cast(IO[bytes], stream), index)
+                    self._buffer.enqueue(child)
 
         return matches
 
 
 class EmlScanner(ScannerBase):
 
+    enqueues_children = True
+
     def scan(self, job: Job, encoding: str = 'utf8') -> list[PAN]:
-        payload = self._payload_bytes(job)
-        eml = (
-            Eml(
-                path=job.abspath,
-                payload=payload,
-                size_limit=self._config.max_attachment_size,
-                max_attachments=self._config.max_attachments_per_message,
-                max_total_attachment_bytes=self._config.max_total_attachment_bytes,
-                context=job.context
-            )
-            if payload is not None
-            else Eml(
-                path=job.abspath,
-                size_limit=self._config.max_attachment_size,
-                max_attachments=self._config.max_attachments_per_message,
-                max_total_attachment_bytes=self._config.max_total_attachment_bytes,
-                context=job.context
-            )
+        # Path-backed jobs are opened by Eml itself; payloads are read through the shared source.
+        stream = job.source.open() if job.payload is not None else None
+        eml = Eml(
+            path=job.abspath,
+            payload=stream,
+            size_limit=self._config.max_attachment_size,
+            max_attachments=self._config.max_attachments_per_message,
+            max_total_attachment_bytes=self._config.max_total_attachment_bytes,
+            context=job.context,
+            spool_threshold=self._config.archive_spool_threshold,
+            scan_only=True
         )
 
         matches: list[PAN] = []
 
-        if eml.body:
-            matches.extend(self._pan_finder.find(eml.body))
-        if eml.attachments:
-            for att in eml.attachments:
-                self._buffer.enqueue(self._child_job(job, att.Filename, att.BinaryData))
+        for item in eml.iter_parts():
+            if isinstance(item, EmlAttachment):
+                self._enqueue_attachments(job, [item])
+            elif item:
+                matches.extend(self._pan_finder.find(item))
 
         return matches
 
 
 class MboxScanner(ScannerBase):
 
+    enqueues_children = True
+
+    # Message separators, as recognised by Mbox: lines starting with "From ". A
+    # literal pattern is searched about ten times faster than one anchored with ^.
+    _FROM_LINE = re.compile(rb'\nFrom ')
+
     def scan(self, job: Job, encoding: str = 'utf8') -> list[PAN]:
-        payload = self._payload_bytes(job)
-        mbox = (
-            Mbox(
-                path=job.abspath,
-                payload=payload,
-                size_limit=self._config.max_attachment_size,
-                max_attachments_per_message=self._config.max_attachments_per_message,
-                max_total_attachment_bytes=self._config.max_total_attachment_bytes,
-                context=job.context
-            )
-            if payload is not None
-            else Mbox(
-                path=job.abspath,
-                size_limit=self._config.max_attachment_size,
-                max_attachments_per_message=self._config.max_attachments_per_message,
-                max_total_attachment_bytes=self._config.max_total_attachment_bytes,
-                context=job.context
-            )
+        if job.payload is None and 0 < self._config.mbox_split_threshold < (job.source.size or 0):
+            view = job.source.view()
+            try:
+                batches = self.split_batches(view, self._config.mbox_batch_messages)
+            finally:
+                view.release()
+            if len(batches) > 1:
+                self._enqueue_batches(job, batches)
+                return []
+
+        # Path-backed jobs are opened by Mbox itself; payloads are read through the shared source.
+        stream = job.source.open() if job.payload is not None else None
+        mbox = Mbox(
+            path=job.abspath,
+            payload=stream,
+            size_limit=self._config.max_attachment_size,
+            max_attachments_per_message=self._config.max_attachments_per_message,
+            max_total_attachment_bytes=self._config.max_total_attachment_bytes,
+            context=job.context,
+            spool_threshold=self._config.archive_spool_threshold
         )
 
-        matches: list[PAN] = []
-
-        for mail in mbox.mails:
-            if mail.body:
-                matches.extend(self._pan_finder.find(mail.body))
-            if mail.attachments:
-                for att in mail.attachments:
-                    self._buffer.enqueue(self._child_job(job, att.Filename, att.BinaryData))
+        for number, mail in enumerate(mbox, start=job.message_range[0] if job.message_range else 1):
+            try:
+                self._scan_message(job, number, mail)
+            finally:
+                mail.close()
+
+        return []
+
+    def _scan_message(self, job: Job, number: int, mail: Mail) -> None:
+        """Report the body of a message as ``message N`` of the mailbox and queue its attachments below it.
+
+        Messages are numbered from 1 in the mailbox, whether or not it is
+        split into batches. The message itself is not queued, so nothing is
+        reserved for it in the scan budget.
+        """
+        matches = self._pan_finder.find(mail.body) if mail.body else []
+        if not matches and not mail.attachments:
+            return
+        basename = f'message {number}'
+        message = Job(basename=basename, dirname=job.abspath,
+                      context=job.context.part(basename) if job.context else None)
+        if matches:
+            if self._report is None:
+                raise PANHuntException(f'No results to report the findings of "{message.abspath}" to')
+            finding = Finding(basename=basename, dirname=job.abspath, payload=mail.body.encode('utf-8'),
+                              mimetype='text/plain', encoding='utf-8', context=message.context)
+            finding.matches = matches
+            self._report(finding)
+        self._enqueue_attachments(message, mail.attachments)
 
-        return matches
+    @classmethod
+    def split_batches(cls, view: memoryview, batch_messages: int) -> list[tuple[int, int, int, int]]:
+        """Index the message separators of a mailbox and group its messages into byte ranges.
+
+        Returns ``(first, last, start, end)`` per batch of up to ``batch_messages``
+        messages, numbered from 1. Every range but the first starts at a separator.
+        """
+        offsets: Iterator[int] = (match.start() + 1 for match in cls._FROM_LINE.finditer(view))
+        if view[:5] == b'From ':
+            offsets = itertools.chain((0,), offsets)
+        starts: list[int] = []
+        count = 0
+        for count, offset in enumerate(offsets, start=1):
+            if count % batch_messages == 1 or batch_messages == 1:
+                starts.append(offset)
+        if not starts:
+            return []
+        starts[0] = 0
+        ends = starts[1:] + [len(view)]
+        return [
+            (index * batch_messages + 1, min((index + 1) * batch_messages, count), start, end)
+            for index, (start, end) in enumerate(zip(starts, ends))
+        ]
+
+    def _enqueue_batches(self, job: Job, batches: list[tuple[int, int, int, int]]) -> None:
+        """Queue each batch of messages as a job so idle workers parse parts of the mailbox concurrently.
+
+        A batch shares the mailbox's scan context.
+        """
+        logging.info(f"Splitting {job.abspath} into {len(batches)} batches of messages")
+        for first, last, start, end in batches:
+            # Batches are read from the mailbox on disk and are not charged as expanded bytes.
+            child = Job(basename=job.basename, dirname=job.dirname,
+                        payload=FileRangeReader(job.abspath, start, end), context=job.context)
+            child.mime_type, child.encoding = job.mime_type, job.encoding
+            child.file_type, child.handler = job.file_type, job.handler
+            child.message_range = (first, last)
+            self._buffer.enqueue(child)
 
 
 class PstScanner(ScannerBase):
 
-    def __init__(self, buffer: JobBuffer, config: ScanConfiguration, pan_finder: Optional[PanFinder] = None) -> None:
-        super().__init__(buffer, config, pan_finder)
+    enqueues_children = True
+
+    def __init__(self, buffer: JobBuffer, config: ScanConfiguration, pan_finder: Optional[PanFinder] = None,
+                 report: Optional[Callable[[Finding], None]] = None) -> None:
+        super().__init__(buffer, config, pan_finder, report)
         self._pst: Optional[PST] = None  # instance variable, not class variable
 
     def scan(self, job: Job, encoding: str = 'utf8') -> list[PAN]:
@@ -343,6 +805,8 @@ def scan(self, job: Job, encoding: str = 'utf8') -> list[PAN]:
             for folder in self._pst.folder_generator():
                 folder_count += 1
                 for message in self._pst.message_generator(folder=folder):
+                    if job.context:
+                        job.context.check_cancelled()
                     message_count += 1
                     if message.Body:
                         matches.extend(self._pan_finder.find(message.Body))
@@ -363,7 +827,8 @@ def scan(self, job: Job, encoding: str = 'utf8') -> list[PAN]:
                                         context=job.context.child(
                                             basename=att.Filename,
                                             payload_size=len(att.BinaryData) if att.BinaryData is not None else 0
-                                        ) if job.context else None
+                                        ) if job.context else None,
+                                        content_hash=payload_digest(att.BinaryData) if att.BinaryData else None
                                     ))
             self._pst.close()
 
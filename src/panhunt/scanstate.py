@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Optional
+
+from .mimecache import SECONDS_PER_DAY, _signed64
+from .sink import FindingRecord
+
+_SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS files ('
+    ' path TEXT PRIMARY KEY, dev INTEGER NOT NULL, ino INTEGER NOT NULL, size INTEGER NOT NULL,'
+    ' mtime_ns INTEGER NOT NULL, content_hash BLOB, results TEXT NOT NULL, last_seen INTEGER NOT NULL)',
+    'CREATE INDEX IF NOT EXISTS files_last_seen ON files (last_seen)',
+)
+
+HASH_CHUNK_BYTES = 1024 * 1024
+
+
+def content_hash(path: str) -> bytes:
+    digest = hashlib.blake2b(digest_size=32)
+    with open(path, 'rb') as file:
+        while chunk := file.read(HASH_CHUNK_BYTES):
+            digest.update(chunk)
+    return digest.digest()
+
+
+class _Entry:
+    """A file being scanned in this run and the results attributed to it so far."""
+
+    __slots__ = ('st', 'content_hash', 'records', 'interrupted', 'stored_results')
+
+    def __init__(self, st: os.stat_result, content_hash: Optional[bytes],
+                 stored_results: Optional[str] = None) -> None:
+        self.st = st
+        self.content_hash = content_hash
+        self.records: list[FindingRecord] = []
+        self.interrupted = False
+        # Results of the file's previous scan, for a file that grew since.
+        self.stored_results = stored_results
+
+
+_PUT = 'INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?)'
+_SEEN = 'UPDATE files SET last_seen = ? WHERE path = ?'
+
+
+class ScanState:
+    """Persistent record of each scanned file and the results its last scan produced.
+
+    Files are keyed by path and are unchanged while their device, inode, size
+    and ``st_mtime_ns`` match the stored values. With ``use_content_hash``, a
+    file whose metadata changed but whose BLAKE2b hash did not is also treated
+    as unchanged, so touched or copied-in-place files are not parsed again.
+
+    The results of a file include those of every archive member, attachment,
+    byte range and message batch inside it. They are collected while the
+    file's jobs run and written when ``finish`` is called after the last of
+    them, in transactions of ``FLUSH_EVERY`` changes. Only files with jobs
+    still running are held in memory. A file whose scan was interrupted
+    keeps its previous entry. Entries not seen for ``MAX_AGE_DAYS`` are
+    removed on close.
+    """
+
+    FILE_NAME = 'scanstate.sqlite3'
+    MAX_AGE_DAYS = 30
+    FLUSH_EVERY = 1_000
+
+    def __init__(self, state_dir: str, use_content_hash: bool = False, rescan: bool = False,
+                 clock: Callable[[], float] = time.time) -> None:
+        if not os.path.isdir(state_dir):
+            os.makedirs(state_dir)
+        self.path = os.path.join(state_dir, self.FILE_NAME)
+        self.use_content_hash = use_content_hash
+        self.rescan = rescan
+        self._now = int(clock())
+        self._lock = threading.Lock()
+        self._scanned: dict[str, _Entry] = {}
+        self._pending: list[tuple[str, tuple]] = []
+        self.skipped = 0
+        try:
+            self._conn: Optional[sqlite3.Connection] = self._connect()
+        except sqlite3.DatabaseError as ex:
+            logging.warning(f'Discarding unreadable scan state {self.path}: {ex}')
+            os.remove(self.path)
+            self._conn = self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        try:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            for statement in _SCHEMA:
+                conn.execute(statement)
+        except sqlite3.DatabaseError:
+            conn.close()
+            raise
+        return conn
+
+    def previous_results(self, path: str, st: os.stat_result) -> Optional[list[FindingRecord]]:
+        """Return the results of the last scan of an unchanged file, or None if it must be scanned.
+
+        A file that must be scanned is registered, and results attributed to
+        it with ``add`` are saved by ``finish``. With ``rescan`` every file
+        must be scanned and its entry is replaced.
+        """
+        with self._lock:
+            if self._conn is None:
+                return None
+            if self.rescan:
+                row = None
+            else:
+                try:
+                    row = self._conn.execute(
+                        'SELECT dev, ino, size, mtime_ns, content_hash, results FROM files WHERE path = ?', (path,)
+                    ).fetchone()
+                except sqlite3.Error as ex:
+                    self._disable(ex)
+                    return None
+        unchanged = row is not None and row[:4] == (
+            _signed64(st.st_dev), _signed64(st.st_ino), st.st_size, st.st_mtime_ns
+        )
+        digest: Optional[bytes] = None
+        if self.use_content_hash and (not unchanged or row[4] is None):
+            digest = content_hash(path)
+            if not unchanged:
+                unchanged = row is not None and row[4] is not None and bytes(row[4]) == digest
+        with self._lock:
+            if not unchanged:
+                # Stored results only describe the start of the same file; a replaced file has a new inode.
+                same_file = row is not None and row[:2] == (_signed64(st.st_dev), _signed64(st.st_ino))
+                self._scanned[path] = _Entry(st, digest, row[5] if same_file else None)
+                return None
+            self.skipped += 1
+            if digest is None:
+                self._queue(_SEEN, (self._now, path))
+            else:
+                # Same content: store the new metadata and hash so the next run need not hash it.
+                self._queue(_PUT, (path, _signed64(st.st_dev), _signed64(st.st_ino), st.st_size,
+                                   st.st_mtime_ns, digest, row[5], self._now))
+            return [FindingRecord.from_json(line) for line in row[5].splitlines()]
+
+    def add(self, path: str, record: FindingRecord) -> None:
+        """Attribute a result to the scanned file at ``path``."""
+        with self._lock:
+            entry = self._scanned.get(path)
+            if entry is not None:
+                entry.records.append(record)
+
+    def carry_forward(self, path: str) -> Optional[list[FindingRecord]]:
+        """Return the previous results of a registered file whose scan resumes where the last one ended.
+
+        The caller merges their matches into the file's new result. Returns
+        None when no results are stored for the same device and inode, and
+        the file must be scanned in full.
+        """
+        with self._lock:
+            entry = self._scanned.get(path)
+            if entry is None or entry.stored_results is None:
+                return None
+            records = [FindingRecord.from_json(line) for line in entry.stored_results.splitlines()]
+            entry.stored_results = None
+            return records
+
+    def finish(self, path: str) -> None:
+        """Save the entry of ``path`` once every job of the file has completed."""
+        with self._lock:
+            entry = self._scanned.pop(path, None)
+            if entry is not None and not entry.interrupted and self._conn is not None:
+                self._queue(_PUT, self._row(path, entry))
+
+    def interrupt(self, path: str) -> None:
+        """Keep the previous entry of ``path`` because its scan did not complete."""
+        with self._lock:
+            entry = self._scanned.get(path)
+            if entry is not None:
+                entry.interrupted = True
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is None:
+                return
+            for path, entry in self._scanned.items():
+                if not entry.interrupted:
+                    self._pending.append((_PUT, self._row(path, entry)))
+            self._pending.append(('DELETE FROM files WHERE last_seen < ?',
+                                  (self._now - self.MAX_AGE_DAYS * SECONDS_PER_DAY,)))
+            self._flush()
+            if self._conn is not None:
+                self._conn.close()
+            self._conn = None
+            self._scanned = {}
+
+    def summary(self) -> str:
+        return f'Scan state: {self.skipped} unchanged files skipped using {self.path}'
+
+    def __len__(self) -> int:
+        with self._lock:
+            if self._conn is None:
+                return 0
+            return self._conn.execute('SELECT COUNT(*) FROM files').fetchone()[0]
+
+    def _disable(self, ex: Exception) -> None:
+        """Stop using a failing store; every file is then scanned."""
+        logging.warning(f'Disabling scan state {self.path}: {ex}')
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except sqlite3.Error:
+                pass
+        self._conn = None
+        self._scanned = {}
+        self._pending = []
+
+    def _row(self, path: str, entry: _Entry) -> tuple:
+        return (path, _signed64(entry.st.st_dev), _signed64(entry.st.st_ino), entry.st.st_size,
+                entry.st.st_mtime_ns, entry.content_hash,
+                '\n'.join(record.to_json() for record in entry.records), self._now)
+
+    def _queue(self, statement: str, parameters: tuple) -> None:
+        self._pending.append((statement, parameters))
+        if len(self._pending) >= self.FLUSH_EVERY:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._conn is None or not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        try:
+            self._conn.execute('BEGIN')
+            for statement, parameters in pending:
+                self._conn.execute(statement, parameters)
+            self._conn.execute('COMMIT')
+        except sqlite3.Error as ex:
+            self._disable(ex)
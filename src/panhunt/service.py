@@ -1,19 +1,26 @@
 import logging
+import sqlite3
 from datetime import datetime
 from typing import Callable, Optional
 
 from .buffer import InMemoryJobBuffer, JobBuffer
+from . import panutils
 from .config import ScanConfiguration
 from .dispatcher import Dispatcher
 from .hunter import Hunter
+from .logstate import LogState
+from .mimecache import MimeCache
 from .models import ScanResult
+from .scanstate import ScanState
+from .signatures import detection_stats
+from .sink import NdjsonResultSink, ResultSink
 
 
 class PanHuntService:
     """Orchestrates a full scan session. No UI concerns."""
 
     def __init__(self, buffer_factory: Optional[Callable[[], JobBuffer]] = None) -> None:
-        self._buffer_factory: Callable[[], JobBuffer] = buffer_factory or InMemoryJobBuffer
+        self._buffer_factory: Optional[Callable[[], JobBuffer]] = buffer_factory
 
     def scan(self, config: ScanConfiguration) -> ScanResult:
         """Run a scan and return structured results."""
@@ -22,14 +29,45 @@ def scan(self, config: ScanConfiguration) -> ScanResult:
         config.validate()
 
         start_time = datetime.now()
+        detection_stats.reset()
         logging.info("Started searching in file(s).")
 
-        buffer = self._buffer_factory()
-        dispatcher = Dispatcher(buffer=buffer, config=config)
+        buffer = (
+            self._buffer_factory()
+            if self._buffer_factory is not None
+            else InMemoryJobBuffer(max_in_flight_bytes=config.max_in_flight_bytes)
+        )
+        ndjson_path = config.get_ndjson_path()
+        sink: Optional[ResultSink] = NdjsonResultSink(ndjson_path) if ndjson_path else None
+        mime_cache = self._open_mime_cache(config)
+        log_state = self._open_log_state(config)
+        scan_state = self._open_scan_state(config)
+        dispatcher = Dispatcher(buffer=buffer, config=config, sink=sink, log_state=log_state, scan_state=scan_state)
         hunter = Hunter(dispatcher=dispatcher, buffer=buffer)
 
-        findings, failures = hunter.hunt(config)
+        panutils.set_mime_cache(mime_cache)
+        try:
+            findings, failures = hunter.hunt(config)
+        finally:
+            panutils.set_mime_cache(None)
+            if mime_cache is not None:
+                mime_cache.close()
+            if log_state is not None:
+                log_state.close()
+            if scan_state is not None:
+                scan_state.close()
+            if sink is not None:
+                sink.close()
         logging.info("Finished searching.")
+        logging.info(detection_stats.summary())
+        if mime_cache is not None:
+            logging.info(mime_cache.summary())
+        if log_state is not None:
+            logging.info(log_state.summary())
+        if scan_state is not None:
+            logging.info(scan_state.summary())
+        if dispatcher.content_cache is not None:
+            logging.info(dispatcher.content_cache.summary())
 
         return ScanResult(
             matched_files=findings,
@@ -37,4 +75,44 @@ def scan(self, config: ScanConfiguration) -> ScanResult:
             start_time=start_time,
             end_time=datetime.now(),
             config=config,
+            unfinished=hunter.unfinished,
         )
+
+    @staticmethod
+    def _open_mime_cache(config: ScanConfiguration) -> Optional[MimeCache]:
+        if not config.mime_cache_dir:
+            return None
+        try:
+            return MimeCache(
+                state_dir=config.mime_cache_dir,
+                max_entries=config.mime_cache_max_entries,
+                max_age_days=config.mime_cache_max_age_days,
+                detector_version=panutils.mime_detector_version(),
+            )
+        except (OSError, sqlite3.Error) as ex:
+            logging.warning(f'MIME cache unavailable, detecting every file: {ex}')
+            return None
+
+    @staticmethod
+    def _open_log_state(config: ScanConfiguration) -> Optional[LogState]:
+        if not config.log_state_dir:
+            return None
+        try:
+            return LogState(state_dir=config.log_state_dir)
+        except (OSError, sqlite3.Error) as ex:
+            logging.warning(f'Log state unavailable, scanning plain-text files in full: {ex}')
+            return None
+
+    @staticmethod
+    def _open_scan_state(config: ScanConfiguration) -> Optional[ScanState]:
+        if not config.scan_state_dir:
+            return None
+        try:
+            return ScanState(
+                state_dir=config.scan_state_dir,
+                use_content_hash=config.scan_state_hash,
+                rescan=config.full_rescan,
+            )
+        except (OSError, sqlite3.Error) as ex:
+            logging.warning(f'Scan state unavailable, scanning every file: {ex}')
+            return None
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import re
+import threading
+from typing import Optional
+
+# Number of leading bytes sniffed for MIME detection, for signatures and libmagic alike.
+SNIFF_BYTES = 2048
+
+# Bump whenever sniff() may answer differently for the same content, so
+# persisted MIME detections made with an older table are discarded.
+SIGNATURE_TABLE_VERSION = 3
+
+_OLE_SIGNATURE = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'
+_TAR_MAGIC_OFFSET = 257
+
+# libmagic only reports the generic OLE type from a header; the concrete legacy
+# Office type is resolved from the extension, so only these are safe to sniff.
+_OLE_EXTENSIONS = frozenset({'.doc', '.xls', '.ppt'})
+
+_OOXML_FIRST_MEMBERS = (b'[Content_Types].xml', b'_rels/.rels')
+_OOXML_PARTS = (
+    (b'word/', 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'),
+    (b'ppt/', 'application/vnd.openxmlformats-officedocument.presentationml.presentation'),
+    (b'xl/', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+)
+
+_NON_TEXT_BYTE = re.compile(rb'[^\t\n\r\f\x20-\x7e]')
+# Text that libmagic may classify as something other than text/* (mail, JSON,
+# markup, PostScript, armoured keys, netpbm images) is left to libmagic.
+_AMBIGUOUS_TEXT = re.compile(rb'\s*(?:[{\[<]|%!|-----BEGIN|P[1-6]\s|[A-Za-z][A-Za-z0-9-]*:)')
+# Extensions that make text/plain, but no other text type, classify as mail.
+_MAIL_EXTENSIONS = frozenset({'.eml', '.mbox'})
+# Leading header fields that libmagic reports as message/rfc822.
+_MAIL_FIRST_FIELD = re.compile(rb'Received:|From:|Date:|(?i:return-path:|delivered-to:)')
+# Two header fields, folded continuation lines included.
+_HEADER_FIELDS = re.compile(rb'(?:[!-9;-~]+:[^\n]*\n(?:[ \t][^\n]*\n)*){2}')
+
+
+def sniff(header: bytes, extension: str = '', complete: bool = True) -> Optional[tuple[str, str]]:
+    """Resolve the MIME type and encoding of common formats from their leading bytes.
+
+    ``header`` holds the first ``SNIFF_BYTES`` of the content and ``complete``
+    says whether it is the whole content. Returns None when the header is not
+    recognised or the answer depends on more than a signature; callers then
+    fall back to libmagic. The MIME type may be more generic than libmagic's:
+    text that libmagic names more precisely, such as a Python script
+    (``text/x-script.python``) or HTML (``text/html``), is reported as
+    ``text/plain``. Only the file type it classifies as, and so the scanner
+    chosen, is the same as for libmagic's answer.
+    """
+    if header.startswith(b'%PDF'):
+        return 'application/pdf', 'binary'
+    if header.startswith(b'PK\x03\x04'):
+        return _sniff_zip(header)
+    if header.startswith(b'\x1f\x8b'):
+        return 'application/gzip', 'binary'
+    if header.startswith(b'\xfd7zXZ\x00'):
+        return 'application/x-xz', 'binary'
+    if header.startswith(_OLE_SIGNATURE):
+        return ('application/x-ole-storage', 'binary') if extension in _OLE_EXTENSIONS else None
+    if header.startswith(b'!BDN'):
+        return 'application/vnd.ms-outlook', 'binary'
+    if header[_TAR_MAGIC_OFFSET:_TAR_MAGIC_OFFSET + 5] == b'ustar':
+        return 'application/x-tar', 'binary'
+    if header.startswith(b'From '):
+        encoding = _text_encoding(header, complete)
+        return ('text/plain', encoding) if encoding else None
+    if _MAIL_FIRST_FIELD.match(header):
+        return sniff_rfc822(header, complete)
+    if (header and extension not in _MAIL_EXTENSIONS
+            and not _NON_TEXT_BYTE.search(header) and not _AMBIGUOUS_TEXT.match(header)):
+        # Text named .eml or .mbox is mail only if libmagic calls it
+        # text/plain and not something more precise, so it is left to libmagic.
+        # A pure-ASCII prefix of a longer file may still be followed by UTF-8.
+        return 'text/plain', 'us-ascii' if complete else 'utf-8'
+    return None
+
+
+def sniff_rfc822(header: bytes, complete: bool = True, known_mail: bool = False) -> Optional[tuple[str, str]]:
+    """Recognise an RFC 822 message from its leading header fields.
+
+    By default only the first fields libmagic reports as mail are accepted.
+    With ``known_mail``, for files that can only be messages such as those
+    in a Maildir, any two leading header fields are enough. Messages that
+    are not ASCII or UTF-8 text are left to libmagic.
+    """
+    if not (_HEADER_FIELDS.match(header) if known_mail else _MAIL_FIRST_FIELD.match(header)):
+        return None
+    encoding = _text_encoding(header, complete)
+    return ('message/rfc822', encoding) if encoding else None
+
+
+def _sniff_zip(header: bytes) -> Optional[tuple[str, str]]:
+    name_length = int.from_bytes(header[26:28], 'little')
+    first_member = header[30:30 + name_length]
+    if first_member == b'mimetype':
+        # ODF and EPUB store their MIME type uncompressed as the first member.
+        extra_length = int.from_bytes(header[28:30], 'little')
+        start = 30 + name_length + extra_length
+        declared = header[start:start + 80].split(b'PK', 1)[0]
+        if declared and not _NON_TEXT_BYTE.search(declared):
+            return declared.decode('ascii'), 'binary'
+        return None
+    if first_member in _OOXML_FIRST_MEMBERS:
+        for part, mime_type in _OOXML_PARTS:
+            if part in header:
+                return mime_type, 'binary'
+        return None
+    if first_member.startswith(b'META-INF/'):
+        return None  # Java and Android archives carry their own MIME types
+    return 'application/zip', 'binary'
+
+
+def _text_encoding(header: bytes, complete: bool) -> Optional[str]:
+    if not _NON_TEXT_BYTE.search(header):
+        return 'us-ascii' if complete else 'utf-8'
+    try:
+        header.decode('utf-8')
+    except UnicodeDecodeError as ex:
+        # A multi-byte character cut at the end of the sniffed prefix is still UTF-8.
+        if complete or ex.reason != 'unexpected end of data':
+            return None
+    return 'utf-8'
+
+
+class DetectionStats:
+    """Counts MIME detections resolved by signature versus libmagic."""
+
+    def __init__(self) -> None:
+        self._signature_hits = 0
+        self._libmagic_calls = 0
+        self._lock = threading.Lock()
+
+    def record(self, signature_hit: bool) -> None:
+        with self._lock:
+            if signature_hit:
+                self._signature_hits += 1
+            else:
+                self._libmagic_calls += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._signature_hits = 0
+            self._libmagic_calls = 0
+
+    @property
+    def signature_hits(self) -> int:
+        with self._lock:
+            return self._signature_hits
+
+    @property
+    def libmagic_calls(self) -> int:
+        with self._lock:
+            return self._libmagic_calls
+
+    @property
+    def hit_ratio(self) -> float:
+        with self._lock:
+            total = self._signature_hits + self._libmagic_calls
+            return self._signature_hits / total if total else 0.0
+
+    def summary(self) -> str:
+        with self._lock:
+            total = self._signature_hits + self._libmagic_calls
+            ratio = self._signature_hits / total if total else 0.0
+            return (
+                f'MIME detection: {self._signature_hits} of {total} resolved by signature '
+                f'({ratio:.1%}), {self._libmagic_calls} by libmagic'
+            )
+
+
+detection_stats = DetectionStats()
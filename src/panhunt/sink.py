@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import itertools
+import json
+import os
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass, field
+from typing import IO, Iterator, Optional, Sequence, Union
+
+from .enums import ScanStatusEnum
+from .finding import Finding
+
+
+@dataclass
+class FindingRecord:
+    """Serialisable summary of a ``Finding`` with the fields reports need."""
+
+    basename: str
+    dirname: str
+    abspath: str
+    logical_path: str
+    status: ScanStatusEnum
+    size: int
+    mime_type: str
+    encoding: str
+    matches: list[str] = field(default_factory=list)
+    errors: list[str] = field(default_factory=list)
+
+    @classmethod
+    def from_finding(cls, finding: Finding) -> 'FindingRecord':
+        return cls(
+            basename=finding.basename,
+            dirname=finding.dirname,
+            abspath=finding.abspath,
+            logical_path=finding.logical_path,
+            status=finding.status,
+            size=finding.size,
+            mime_type=finding.mime_type,
+            encoding=finding.encoding,
+            matches=[str(pan) for pan in finding.matches],
+            errors=list(finding.errors),
+        )
+
+    def to_json(self) -> str:
+        data = asdict(self)
+        data['status'] = self.status.name
+        return json.dumps(data, ensure_ascii=False)
+
+    @classmethod
+    def from_json(cls, line: str) -> 'FindingRecord':
+        data = json.loads(line)
+        data['status'] = ScanStatusEnum[data['status']]
+        return cls(**data)
+
+
+# A result as held in memory or as re-read from a sink; both expose the fields reports use.
+ResultRecord = Union[Finding, FindingRecord]
+
+
+class ResultSink(ABC):
+    """Destination that receives each scan result as soon as it is produced."""
+
+    @abstractmethod
+    def write(self, finding: ResultRecord) -> None:
+        pass
+
+    @abstractmethod
+    def findings(self) -> Sequence[FindingRecord]:
+        """Return the successful results written so far, re-read from the sink."""
+
+    @abstractmethod
+    def failures(self) -> Sequence[FindingRecord]:
+        """Return the failed results written so far, re-read from the sink."""
+
+    def close(self) -> None:
+        pass
+
+
+class NdjsonResultSink(ResultSink):
+    """Appends one JSON object per result to a file and flushes it immediately.
+
+    The file can be tailed during long scans, and the final report is built by
+    re-reading it instead of keeping every ``Finding`` in memory.
+    """
+
+    def __init__(self, path: str) -> None:
+        basedir = os.path.dirname(os.path.abspath(path))
+        if not os.path.exists(basedir):
+            os.makedirs(basedir)
+        self.path = path
+        # Records appended by an earlier run are not part of this scan's result.
+        self._start_offset = os.path.getsize(path) if os.path.exists(path) else 0
+        self._file: Optional[IO[str]] = open(path, 'a', encoding='utf-8')
+        self._counts = {ScanStatusEnum.Success: 0, ScanStatusEnum.Failure: 0}
+        self._lock = threading.Lock()
+
+    def write(self, finding: ResultRecord) -> None:
+        record = finding if isinstance(finding, FindingRecord) else FindingRecord.from_finding(finding)
+        line = record.to_json()
+        with self._lock:
+            if self._file is None:
+                raise ValueError(f'Result sink is closed: {self.path}')
+            self._file.write(line + '\n')
+            self._file.flush()
+            self._counts[finding.status] += 1
+
+    def findings(self) -> Sequence[FindingRecord]:
+        return _NdjsonView(self, ScanStatusEnum.Success)
+
+    def failures(self) -> Sequence[FindingRecord]:
+        return _NdjsonView(self, ScanStatusEnum.Failure)
+
+    def count(self, status: ScanStatusEnum) -> int:
+        with self._lock:
+            return self._counts[status]
+
+    def iter_records(self) -> Iterator[FindingRecord]:
+        with open(self.path, 'rb') as file:
+            file.seek(self._start_offset)
+            for line in file:
+                if line.strip():
+                    yield FindingRecord.from_json(line.decode('utf-8'))
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class _NdjsonView(Sequence[FindingRecord]):
+    """Lazy sequence of one status' records, streamed from the sink file on each iteration."""
+
+    def __init__(self, sink: NdjsonResultSink, status: ScanStatusEnum) -> None:
+        self._sink = sink
+        self._status = status
+        self._length = sink.count(status)
+
+    def __iter__(self) -> Iterator[FindingRecord]:
+        matching = (record for record in self._sink.iter_records() if record.status == self._status)
+        return itertools.islice(matching, self._length)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index):  # type: ignore[override]
+        if isinstance(index, slice):
+            return list(self)[index]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError('result index out of range')
+        return next(itertools.islice(iter(self), index, None))
@@ -1,9 +1,10 @@
 """Shared fixtures for the PANhunt test suite."""
 
 import os
+import struct
 import tempfile
 from datetime import datetime
-from typing import Generator
+from typing import Callable, Generator
 from unittest.mock import MagicMock
 
 import pytest
@@ -109,3 +110,144 @@ def finding_no_error(tmp_text_file: str) -> Finding:
         basename=os.path.basename(tmp_text_file),
         dirname=os.path.dirname(tmp_text_file),
     )
+
+
+# ---------------------------------------------------------------------------
+# Compound file (OLE/CFB) fixtures
+# ---------------------------------------------------------------------------
+
+_CFB_SECTOR = 512
+_CFB_MINI_SECTOR = 64
+_CFB_MINI_CUTOFF = 4096
+_ENDOFCHAIN, _FATSECT, _FREESECT, _NOSTREAM = 0xFFFFFFFE, 0xFFFFFFFD, 0xFFFFFFFF, 0xFFFFFFFF
+
+
+def _build_cfb(streams: dict[str, bytes]) -> bytes:
+    """Build a version 3 compound file; keys are '/'-separated stream paths."""
+    # Directory tree: index 0 is the root; storages are created from paths.
+    nodes: list[dict] = [{'name': 'Root Entry', 'type': 5, 'children': [], 'data': None}]
+    storages: dict[tuple[str, ...], int] = {(): 0}
+    for path, data in streams.items():
+        parts = tuple(path.split('/'))
+        for depth in range(1, len(parts)):
+            if parts[:depth] not in storages:
+                storages[parts[:depth]] = len(nodes)
+                nodes[storages[parts[:depth - 1]]]['children'].append(len(nodes))
+                nodes.append({'name': parts[depth - 1], 'type': 1, 'children': [], 'data': None})
+        nodes[storages[parts[:-1]]]['children'].append(len(nodes))
+        nodes.append({'name': parts[-1], 'type': 2, 'children': [], 'data': data})
+
+    fat: list[int] = []
+    sectors: list[bytes] = []
+
+    def allocate(data: bytes) -> int:
+        if not data:
+            return _ENDOFCHAIN
+        first = len(sectors)
+        count = (len(data) + _CFB_SECTOR - 1) // _CFB_SECTOR
+        for index in range(count):
+            sectors.append(data[index * _CFB_SECTOR:(index + 1) * _CFB_SECTOR].ljust(_CFB_SECTOR, b'\x00'))
+            fat.append(first + index + 1 if index < count - 1 else _ENDOFCHAIN)
+        return first
+
+    mini_stream = b''
+    minifat: list[int] = []
+    for node in nodes:
+        data = node['data']
+        if data is None:
+            continue
+        if len(data) >= _CFB_MINI_CUTOFF:
+            node['start'] = allocate(data)
+        elif data:
+            first = len(mini_stream) // _CFB_MINI_SECTOR
+            count = (len(data) + _CFB_MINI_SECTOR - 1) // _CFB_MINI_SECTOR
+            mini_stream += data.ljust(count * _CFB_MINI_SECTOR, b'\x00')
+            minifat.extend(first + index + 1 if index < count - 1 else _ENDOFCHAIN for index in range(count))
+            node['start'] = first
+        else:
+            node['start'] = _ENDOFCHAIN
+    nodes[0]['start'] = allocate(mini_stream)
+    nodes[0]['size'] = len(mini_stream)
+    minifat_bytes = struct.pack(f'<{len(minifat)}I', *minifat)
+    minifat_start = allocate(minifat_bytes.ljust(-(-len(minifat_bytes) // _CFB_SECTOR) * _CFB_SECTOR, b'\xff'))
+    minifat_sectors = -(-len(minifat_bytes) // _CFB_SECTOR)
+
+    entries = b''
+    for node in nodes:
+        name = node['name'].encode('utf-16-le') + b'\x00\x00'
+        children = node['children']
+        child = children[0] if children else _NOSTREAM
+        data = node['data']
+        size = node.get('size', len(data) if data is not None else 0)
+        entries += name.ljust(64, b'\x00') + struct.pack(
+            '<HBBIII16sI8s8sIQ', len(name), node['type'], 1, _NOSTREAM, _NOSTREAM, child,
+            b'\x00' * 16, 0, b'\x00' * 8, b'\x00' * 8, node.get('start', _ENDOFCHAIN), size)
+        # Siblings are chained through the right-sibling field.
+        for left, right in zip(children, children[1:]):
+            node.setdefault('links', []).append((left, right))
+    entry_bytes = bytearray(entries.ljust(-(-len(entries) // _CFB_SECTOR) * _CFB_SECTOR, b'\x00'))
+    for node in nodes:
+        for left, right in node.get('links', []):
+            struct.pack_into('<I', entry_bytes, left * 128 + 72, right)
+    directory_start = allocate(bytes(entry_bytes))
+
+    fat_sector_count = 1
+    while (len(fat) + fat_sector_count) > fat_sector_count * (_CFB_SECTOR // 4):
+        fat_sector_count += 1
+    fat_start = len(sectors)
+    fat.extend([_FATSECT] * fat_sector_count)
+    fat.extend([_FREESECT] * (fat_sector_count * (_CFB_SECTOR // 4) - len(fat)))
+    fat_bytes = struct.pack(f'<{len(fat)}I', *fat)
+    for index in range(fat_sector_count):
+        sectors.append(fat_bytes[index * _CFB_SECTOR:(index + 1) * _CFB_SECTOR])
+
+    difat = [fat_start + index for index in range(fat_sector_count)]
+    difat += [_FREESECT] * (109 - len(difat))
+    header = (b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1' + b'\x00' * 16
+              + struct.pack('<HHHHH', 0x3E, 3, 0xFFFE, 9, 6) + b'\x00' * 6
+              + struct.pack('<IIII', 0, fat_sector_count, directory_start, 0)
+              + struct.pack('<IIIII', _CFB_MINI_CUTOFF, minifat_start if minifat else _ENDOFCHAIN,
+                            minifat_sectors, _ENDOFCHAIN, 0)
+              + struct.pack('<109I', *difat))
+    return header.ljust(_CFB_SECTOR, b'\x00') + b''.join(sectors)
+
+
+@pytest.fixture
+def make_cfb() -> Callable[[dict[str, bytes]], bytes]:
+    """Builder for OLE compound files such as legacy Office documents and MSG files."""
+    return _build_cfb
+
+
+def _msg_properties(header_size: int, properties: dict[int, bytes], storage: str) -> dict[str, bytes]:
+    """Property stream and value streams of one MSG storage; fixed-size values are 8 bytes or less."""
+    prefix = storage + '/' if storage else ''
+    entries = []
+    streams = {}
+    for tag, value in properties.items():
+        if tag & 0xFFFF in (0x001F, 0x001E, 0x0102):
+            entries.append(struct.pack('<IIII', tag, 6, len(value), 0))
+            streams[f'{prefix}__substg1.0_{tag:08X}'] = value
+        else:
+            entries.append(struct.pack('<II', tag, 6) + value.ljust(8, b'\x00'))
+    streams[prefix + '__properties_version1.0'] = b'\x00' * header_size + b''.join(entries)
+    return streams
+
+
+def _build_msg(body: str, attachments: dict[str, bytes], recipient: bytes = b'') -> bytes:
+    """Build an Outlook MSG file with a body, named attachments and optionally raw recipient properties."""
+    streams = _msg_properties(32, {0x1000001F: body.encode('utf-16le'), 0x0037001F: 'Subject'.encode('utf-16le')}, '')
+    for index, (name, data) in enumerate(attachments.items()):
+        streams.update(_msg_properties(8, {
+            0x37050003: struct.pack('<I', 1),
+            0x3707001F: name.encode('utf-16le'),
+            0x37010102: data,
+        }, f'__attach_version1.0_#{index:08X}'))
+    if recipient:
+        streams['__recip_version1.0_#00000000/__properties_version1.0'] = recipient
+    return _build_cfb(streams)
+
+
+@pytest.fixture
+def make_msg() -> Callable[..., bytes]:
+    """Builder for Outlook MSG files."""
+    return _build_msg
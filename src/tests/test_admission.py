@@ -0,0 +1,92 @@
+"""Tests for the in-flight byte admission controller."""
+
+import io
+import threading
+
+import pytest
+
+from panhunt.admission import ByteAdmissionController, payload_footprint
+from panhunt.constants import STREAM_CHUNK_SIZE_BYTES
+from panhunt.limitedio import LimitedReader
+
+
+class TestPayloadFootprint:
+    def test_bytes_are_charged_their_length(self):
+        assert payload_footprint(b'abcd') == 4
+
+    def test_none_is_free(self):
+        assert payload_footprint(None) == 0
+
+    def test_seekable_stream_is_measured_without_moving_position(self):
+        stream = io.BytesIO(b'0123456789')
+        stream.seek(3)
+        assert payload_footprint(stream) == 10
+        assert stream.tell() == 3
+
+    def test_known_size_is_used_for_streams(self):
+        assert payload_footprint(io.BytesIO(b'abc'), size=3) == 3
+
+    def test_lazy_decompression_stream_is_charged_one_chunk(self):
+        reader = LimitedReader(io.BytesIO(b'abc'), limit=10)
+        assert payload_footprint(reader) == STREAM_CHUNK_SIZE_BYTES
+
+
+class TestByteAdmissionController:
+    def test_rejects_non_positive_capacity(self):
+        with pytest.raises(ValueError):
+            ByteAdmissionController(0)
+
+    def test_acquire_and_release_track_in_flight_bytes(self):
+        controller = ByteAdmissionController(100)
+        assert controller.acquire(40) == 40
+        assert controller.in_flight == 40
+        controller.release(40)
+        assert controller.in_flight == 0
+
+    def test_waiters_are_admitted_in_arrival_order(self):
+        controller = ByteAdmissionController(100)
+        controller.acquire(100)
+        order = []
+        lock = threading.Lock()
+
+        def waiter(name, size, started):
+            started.set()
+            controller.acquire(size)
+            with lock:
+                order.append(name)
+
+        threads = []
+        for name, size in (('large', 90), ('small', 5)):
+            started = threading.Event()
+            thread = threading.Thread(target=waiter, args=(name, size, started))
+            thread.start()
+            started.wait()
+            threads.append(thread)
+            # give the waiter time to register its ticket before the next arrives
+            threading.Event().wait(0.05)
+
+        controller.release(10)
+        threading.Event().wait(0.05)
+        assert order == []  # the small request must not overtake the large one
+
+        controller.release(90)
+        for thread in threads:
+            thread.join(1.0)
+        assert order == ['large', 'small']
+
+    def test_blocked_running_jobs_are_admitted_over_capacity(self):
+        controller = ByteAdmissionController(10)
+        controller.acquire(10)
+        admitted = threading.Event()
+
+        def worker():
+            controller.job_started()
+            controller.acquire(10)
+            admitted.set()
+            controller.job_finished()
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        assert admitted.wait(1.0)
+        thread.join()
+        assert controller.in_flight == 20
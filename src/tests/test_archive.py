@@ -35,6 +35,46 @@ def test_zip_archive_returns_scan_jobs_for_files_and_skips_directories():
     ]
 
 
+
+def test_zip_archive_hashes_member_content():
+    payload = _zip_payload({
+        'a/logo.txt': b'Payment 4111111111111111',
+        'b/logo.txt': b'Payment 4111111111111111',
+        'c/other.txt': b'no card here',
+    })
+
+    children, error = ZipArchive(path='sample.zip', payload=payload).get_children()
+
+    assert error is None
+    hashes = [child.content_hash for child in children]
+    assert hashes[0] is not None and hashes[0] == hashes[1] != hashes[2]
+
+def test_zip_archive_reserves_child_payloads_against_in_flight_budget():
+    from panhunt.admission import ByteAdmissionController
+
+    admission = ByteAdmissionController(1024)
+    payload = _zip_payload({'a.txt': b'12345', 'b.txt': b'6789'})
+
+    children, error = ZipArchive(path='sample.zip', payload=payload, admission=admission).get_children()
+
+    assert error is None
+    assert [child.reserved_bytes for child in children] == [5, 4]
+    assert admission.in_flight == 9
+
+
+def test_zip_archive_releases_reservations_when_expansion_fails():
+    from panhunt.admission import ByteAdmissionController
+
+    admission = ByteAdmissionController(1024)
+    payload = _zip_payload({'one.txt': b'12345', 'two.txt': b'67890'})
+
+    children, error = ZipArchive(path='too-large.zip', payload=payload, size_limit=8, admission=admission).get_children()
+
+    assert children == []
+    assert error is not None
+    assert admission.in_flight == 0
+
+
 def test_zip_archive_refuses_total_uncompressed_content_over_configured_limit():
     payload = _zip_payload({'one.txt': b'12345', 'two.txt': b'67890'})
 
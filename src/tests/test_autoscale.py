@@ -0,0 +1,112 @@
+"""Tests for CPU-aware worker sizing and the worker autoscaler."""
+
+import logging
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from panhunt.autoscale import LoadSample, WorkerAutoscaler, available_cpu_count, cgroup_cpu_quota
+
+
+def _cgroup_tree(tmp_path, relative: str, limits: dict) -> tuple[str, str]:
+    root = tmp_path / 'cgroup'
+    (root / relative.lstrip('/')).mkdir(parents=True)
+    for path, value in limits.items():
+        (root / path.lstrip('/') / 'cpu.max').write_text(value + '\n')
+    proc = tmp_path / 'proc_cgroup'
+    proc.write_text(f'0::{relative}\n')
+    return str(root), str(proc)
+
+
+class TestCgroupQuota:
+    def test_reads_quota_of_own_cgroup(self, tmp_path):
+        root, proc = _cgroup_tree(tmp_path, '/system.slice/panhunt.service',
+                                  {'/system.slice/panhunt.service': '60000 100000'})
+        assert cgroup_cpu_quota(root, proc) == pytest.approx(0.6)
+
+    def test_tightest_ancestor_quota_wins(self, tmp_path):
+        root, proc = _cgroup_tree(tmp_path, '/a/b', {'/a': '200000 100000', '/a/b': '400000 100000'})
+        assert cgroup_cpu_quota(root, proc) == pytest.approx(2.0)
+
+    def test_max_means_unlimited(self, tmp_path):
+        root, proc = _cgroup_tree(tmp_path, '/', {'/': 'max 100000'})
+        assert cgroup_cpu_quota(root, proc) is None
+
+    def test_missing_cgroup_v2_entry(self, tmp_path):
+        proc = tmp_path / 'proc_cgroup'
+        proc.write_text('4:cpu:/\n')
+        assert cgroup_cpu_quota(str(tmp_path), str(proc)) is None
+
+
+class TestAvailableCpuCount:
+    def test_quota_caps_affinity(self):
+        with patch('panhunt.autoscale.os.sched_getaffinity', return_value=set(range(8)), create=True), \
+                patch('panhunt.autoscale.cgroup_cpu_quota', return_value=1.5):
+            assert available_cpu_count() == 2
+
+    def test_affinity_used_without_quota(self):
+        with patch('panhunt.autoscale.os.sched_getaffinity', return_value={0, 1, 2}, create=True), \
+                patch('panhunt.autoscale.cgroup_cpu_quota', return_value=None):
+            assert available_cpu_count() == 3
+
+    def test_falls_back_to_one(self):
+        with patch('panhunt.autoscale.os.sched_getaffinity', side_effect=OSError, create=True), \
+                patch('panhunt.autoscale.os.cpu_count', return_value=None), \
+                patch('panhunt.autoscale.cgroup_cpu_quota', return_value=None):
+            assert available_cpu_count() == 1
+
+
+def _autoscaler(workers: int = 2, depth: int = 10) -> tuple[WorkerAutoscaler, MagicMock]:
+    resize = MagicMock()
+    scaler = WorkerAutoscaler(
+        get_worker_count=lambda: workers,
+        resize=resize,
+        queue_depth=lambda: depth,
+        min_workers=1,
+        max_workers=4,
+        cpu_limit=2,
+    )
+    return scaler, resize
+
+
+class TestDecide:
+    def test_grows_when_queue_backs_up_with_cpu_headroom(self):
+        scaler, _ = _autoscaler()
+        assert scaler.decide(2, LoadSample(cpu_utilisation=0.3, iowait=0.0, queue_depth=10)) == 3
+
+    def test_grows_on_iowait_even_when_busy(self):
+        scaler, _ = _autoscaler()
+        assert scaler.decide(2, LoadSample(cpu_utilisation=0.9, iowait=0.4, queue_depth=10)) == 3
+
+    def test_shrinks_when_queue_is_empty(self):
+        scaler, _ = _autoscaler()
+        assert scaler.decide(3, LoadSample(cpu_utilisation=0.1, iowait=0.0, queue_depth=0)) == 2
+
+    def test_shrinks_when_quota_saturated_with_more_workers_than_cpus(self):
+        scaler, _ = _autoscaler()
+        assert scaler.decide(3, LoadSample(cpu_utilisation=1.0, iowait=0.0, queue_depth=10)) == 2
+
+    def test_stays_within_bounds(self):
+        scaler, _ = _autoscaler()
+        assert scaler.decide(4, LoadSample(cpu_utilisation=0.1, iowait=0.0, queue_depth=10)) == 4
+        assert scaler.decide(1, LoadSample(cpu_utilisation=0.1, iowait=0.0, queue_depth=0)) == 1
+
+    def test_invalid_bounds_raise(self):
+        with pytest.raises(ValueError, match='min_workers'):
+            WorkerAutoscaler(lambda: 1, MagicMock(), lambda: 0, min_workers=3, max_workers=2, cpu_limit=1)
+
+
+class TestStep:
+    def test_step_resizes_and_logs_decision(self, caplog):
+        scaler, resize = _autoscaler(workers=2, depth=10)
+        with patch.object(scaler, 'sample', return_value=LoadSample(0.2, 0.0, 10)):
+            with caplog.at_level(logging.INFO):
+                assert scaler.step() == 3
+        resize.assert_called_once_with(3)
+        assert 'growing workers 2 -> 3' in caplog.text
+
+    def test_step_without_change_does_not_resize(self):
+        scaler, resize = _autoscaler(workers=2, depth=2)
+        with patch.object(scaler, 'sample', return_value=LoadSample(0.5, 0.0, 2)):
+            assert scaler.step() == 2
+        resize.assert_not_called()
@@ -62,6 +62,32 @@ def test_finished_with_no_jobs(self):
         b = InMemoryJobBuffer()
         b.mark_input_complete()
         assert b.is_finished()
+    def test_drain_removes_pending_jobs_and_finishes(self):
+        b = InMemoryJobBuffer()
+        b.enqueue(_make_job('a.txt'))
+        b.enqueue(Job(basename='b.txt', dirname='/tmp', payload=b'x' * 10))
+        b.mark_input_complete()
+
+        drained = b.drain()
+
+        assert [job.basename for job in drained] == ['a.txt', 'b.txt']
+        assert not b.has_jobs()
+        assert b.admission.in_flight == 0
+        assert b.is_finished()
+
+    def test_jobs_enqueued_after_drain_are_kept_for_the_next_drain(self):
+        b = InMemoryJobBuffer()
+        b.mark_input_complete()
+        b.drain()
+
+        b.enqueue(Job(basename='late.txt', dirname='/tmp', payload=b'x' * 10))
+
+        assert b.dequeue(timeout=0.01) is None
+        assert b.admission.in_flight == 0
+        assert b.is_finished()
+        assert [job.basename for job in b.drain()] == ['late.txt']
+        assert b.drain() == []
+
 
 
 class TestThreadSafety:
@@ -145,25 +171,121 @@ def consumer():
         assert len(set(results)) == num_jobs
 
 
-class TestMemoryCheck:
-    def test_large_payload_raises_memory_error(self):
-        from unittest.mock import MagicMock, patch
-        import psutil
+class TestWorkStealing:
+    def test_children_enqueued_by_worker_are_popped_lifo_by_that_worker(self):
+        b = InMemoryJobBuffer()
+        b.enqueue(_make_job('archive.zip'))
+        b.enqueue(_make_job('later.txt'))
+        parent = b.dequeue()
+        b.enqueue(_make_job('child_1.txt'))
+        b.enqueue(_make_job('child_2.txt'))
+        b.complete_job(parent)
+
+        assert b.dequeue().basename == 'child_2.txt'
+        assert b.dequeue().basename == 'child_1.txt'
+        assert b.dequeue().basename == 'later.txt'
+
+    def test_idle_worker_steals_oldest_child_from_busy_worker(self):
+        b = InMemoryJobBuffer()
+        b.enqueue(_make_job('archive.zip'))
+        parent = b.dequeue()
+        b.enqueue(_make_job('child_1.txt'))
+        b.enqueue(_make_job('child_2.txt'))
+
+        stolen = []
+        thief = threading.Thread(target=lambda: stolen.append(b.dequeue(timeout=1.0)))
+        thief.start()
+        thief.join()
+
+        assert stolen[0].basename == 'child_1.txt'
+        b.complete_job(parent)
+        assert b.dequeue().basename == 'child_2.txt'
 
+    def test_exiting_worker_hands_its_jobs_to_the_injection_queue(self):
         b = InMemoryJobBuffer()
-        payload = b'\x00' * 1024  # 1 KB — small, but we mock totals so it looks huge
+        b.enqueue(_make_job('archive.zip'))
+
+        def worker():
+            b.dequeue()
+            b.enqueue(_make_job('child.txt'))
+            b.release_worker()
 
-        mock_vm = MagicMock()
-        mock_vm.total = 512          # 512 bytes total
-        mock_vm.free = 256           # 256 bytes free
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
 
-        with patch('psutil.virtual_memory', return_value=mock_vm):
-            job = Job(basename='huge.bin', dirname='/tmp', payload=payload)
-            with pytest.raises(MemoryError):
-                b.enqueue(job)
+        assert b._worker_queues == []
+        assert b.queue_depth() == 1
+        assert b.dequeue().basename == 'child.txt'
 
-    def test_none_payload_skips_memory_check(self):
+    def test_waiting_worker_wakes_when_job_arrives(self):
         b = InMemoryJobBuffer()
+        received = []
+        consumer = threading.Thread(target=lambda: received.append(b.dequeue(timeout=2.0)))
+        consumer.start()
+        time.sleep(0.05)
+        start = time.monotonic()
+        b.enqueue(_make_job('late.txt'))
+        consumer.join()
+        assert received[0].basename == 'late.txt'
+        assert time.monotonic() - start < 1.0
+
+
+class TestInFlightBudget:
+    def test_enqueue_charges_bytes_payload_until_complete(self):
+        b = InMemoryJobBuffer(max_in_flight_bytes=1024)
+        job = Job(basename='inline.bin', dirname='/tmp', payload=b'\x00' * 100)
+        b.enqueue(job)
+        assert job.reserved_bytes == 100
+        assert b.admission.in_flight == 100
+
+        out = b.dequeue()
+        b.complete_job(out)
+
+        assert out.reserved_bytes == 0
+        assert b.admission.in_flight == 0
+
+    def test_stream_payload_is_charged_its_size(self):
+        import io
+
+        b = InMemoryJobBuffer(max_in_flight_bytes=1024)
+        b.enqueue(Job(basename='member.txt', dirname='/tmp', payload=io.BytesIO(b'x' * 64)))
+        assert b.admission.in_flight == 64
+
+    def test_payload_reserved_by_producer_is_not_charged_twice(self):
+        b = InMemoryJobBuffer(max_in_flight_bytes=1024)
+        reserved = b.admission.acquire(10)
+        b.enqueue(Job(basename='child.bin', dirname='/tmp', payload=b'0123456789', reserved_bytes=reserved))
+        assert b.admission.in_flight == 10
+
+    def test_producer_blocks_until_ceiling_frees(self):
+        b = InMemoryJobBuffer(max_in_flight_bytes=100)
+        b.enqueue(Job(basename='first.bin', dirname='/tmp', payload=b'\x00' * 80))
+        admitted = threading.Event()
+
+        def producer():
+            b.enqueue(Job(basename='second.bin', dirname='/tmp', payload=b'\x00' * 80))
+            admitted.set()
+
+        thread = threading.Thread(target=producer)
+        thread.start()
+        assert not admitted.wait(0.1)
+
+        b.complete_job(b.dequeue())
+        assert admitted.wait(1.0)
+        thread.join()
+        assert b.admission.in_flight == 80
+
+    def test_oversized_payload_is_admitted_when_nothing_in_flight(self):
+        b = InMemoryJobBuffer(max_in_flight_bytes=16)
+        job = Job(basename='huge.bin', dirname='/tmp', payload=b'\x00' * 1024)
+        b.enqueue(job)
+        assert b.has_jobs()
+        assert job.reserved_bytes == 1024
+
+    def test_none_payload_is_not_charged(self):
+        b = InMemoryJobBuffer(max_in_flight_bytes=16)
         job = Job(basename='file.txt', dirname='/tmp', payload=None)
         b.enqueue(job)
         assert b.has_jobs()
+        assert b.admission.in_flight == 0
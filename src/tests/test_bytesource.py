@@ -0,0 +1,130 @@
+"""Tests for ByteSource and BufferReader."""
+
+import io
+import mmap
+import zipfile
+
+import pytest
+
+from panhunt.bytesource import BufferReader, ByteSource, FileSlices
+from panhunt.job import Job
+from panhunt.signatures import SNIFF_BYTES
+
+
+class CountingStream(io.BytesIO):
+    def __init__(self, data: bytes) -> None:
+        super().__init__(data)
+        self.seeks = 0
+        self.reads = 0
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        self.seeks += 1
+        return super().seek(offset, whence)
+
+    def read(self, size=-1):
+        self.reads += 1
+        return super().read(size)
+
+
+class TestByteSource:
+    def test_kinds(self, tmp_path):
+        assert ByteSource.from_payload(str(tmp_path / 'a')).kind == ByteSource.PATH
+        assert ByteSource.from_payload('a', b'data').kind == ByteSource.BUFFER
+        assert ByteSource.from_payload('a', io.BytesIO(b'data')).kind == ByteSource.STREAM
+
+    def test_unsupported_payload_raises(self):
+        with pytest.raises(TypeError, match='Unsupported payload'):
+            ByteSource.from_payload('a', 42)
+
+    def test_buffer_view_shares_memory(self):
+        payload = b'0123456789'
+        source = ByteSource(buffer=payload)
+        view = source.view(2, 5)
+        assert view.obj is payload
+        assert bytes(view) == b'234'
+        assert source.to_bytes() is payload
+
+    def test_path_view_is_memory_mapped(self, tmp_path):
+        path = tmp_path / 'a.bin'
+        path.write_bytes(b'hello world')
+        source = ByteSource(path=str(path))
+        view = source.view(6)
+        assert isinstance(view.obj, mmap.mmap)
+        assert bytes(view) == b'world'
+        view.release()
+        source.close()
+
+    def test_empty_file_view(self, tmp_path):
+        path = tmp_path / 'empty'
+        path.write_bytes(b'')
+        assert len(ByteSource(path=str(path)).view()) == 0
+
+    def test_stream_size_and_header_are_read_once(self):
+        stream = CountingStream(b'x' * (SNIFF_BYTES + 10))
+        source = ByteSource(stream=stream)
+        assert source.size == SNIFF_BYTES + 10
+        header, complete = source.sniff_header()
+        seeks, reads = stream.seeks, stream.reads
+
+        assert source.size == SNIFF_BYTES + 10
+        assert source.sniff_header() == (header, complete)
+        assert (stream.seeks, stream.reads) == (seeks, reads)
+        assert len(header) == SNIFF_BYTES and not complete
+        assert stream.tell() == 0
+
+    def test_short_buffer_header_is_complete(self):
+        assert ByteSource(buffer=b'abc').sniff_header() == (b'abc', True)
+
+    def test_path_stat_is_cached(self, tmp_path):
+        path = tmp_path / 'a.txt'
+        path.write_bytes(b'abc')
+        source = ByteSource(path=str(path))
+        first = source.stat()
+        path.write_bytes(b'abcdef')
+        assert source.stat() is first
+        assert source.size == 3
+
+
+class TestBufferReader:
+    def test_read_seek_tell(self):
+        reader = BufferReader(memoryview(b'abcdef'))
+        assert reader.read(2) == b'ab'
+        assert reader.tell() == 2
+        reader.seek(-1, io.SEEK_END)
+        assert reader.read() == b'f'
+        assert reader.read(5) == b''
+
+    def test_zipfile_reads_from_buffer(self):
+        data = io.BytesIO()
+        with zipfile.ZipFile(data, 'w') as archive:
+            archive.writestr('card.txt', 'hello')
+        source = ByteSource(buffer=data.getvalue())
+        with zipfile.ZipFile(source.open()) as archive:
+            assert archive.read('card.txt') == b'hello'
+
+
+class TestFileSlices:
+    def test_slices_of_a_truncated_file_are_short_instead_of_faulting(self, tmp_path):
+        path = tmp_path / 'app.log'
+        path.write_bytes(b'0123456789' * 1000)
+        slices = FileSlices(str(path))
+        try:
+            assert len(slices) == 10_000
+            assert bytes(slices[5:15]) == b'5678901234'
+            with open(path, 'r+b') as file:
+                file.truncate(100)
+            assert bytes(slices[95:9_000]) == b'56789'
+            assert bytes(slices[5_000:6_000]) == b''
+        finally:
+            slices.release()
+
+
+class TestJobSource:
+    def test_source_is_shared_until_payload_changes(self):
+        job = Job(basename='a.txt', dirname='/data', payload=b'abc')
+        source = job.source
+        assert job.source is source
+        job.payload = None
+        assert job.source is not source
+        assert job.source.kind == ByteSource.PATH
+        assert job.source.path == job.abspath
@@ -27,13 +27,13 @@ def test_default_quiet_is_false(self):
     def test_default_size_limit(self):
         assert ScanConfiguration().size_limit == 8 * 1_073_741_824
 
-    def test_default_worker_count_uses_cpu_count(self):
-        with patch('panhunt.config.os.cpu_count', return_value=6):
-            assert ScanConfiguration().worker_count == 6
-
-    def test_default_worker_count_falls_back_to_one(self):
-        with patch('panhunt.config.os.cpu_count', return_value=None):
-            assert ScanConfiguration().worker_count == 1
+    def test_default_worker_count_uses_available_cpus(self):
+        with patch('panhunt.config.available_cpu_count', return_value=6):
+            c = ScanConfiguration()
+        assert c.worker_count == 6
+        assert c.max_worker_count == 12
+        assert c.min_worker_count == 1
+        assert c.autoscale_workers is False
 
     def test_default_scan_limits(self):
         c = ScanConfiguration()
@@ -109,6 +109,28 @@ def test_scan_limit_overrides(self):
         assert c.max_attachments_per_message == 9
         assert c.max_total_attachment_bytes == 4096
 
+    def test_max_in_flight_bytes_override(self):
+        c = ScanConfiguration.from_args(max_in_flight_bytes=65536)
+        assert c.max_in_flight_bytes == 65536
+
+    def test_zero_max_in_flight_bytes_raises(self):
+        with pytest.raises(ValueError, match='max_in_flight_bytes'):
+            ScanConfiguration.from_args(max_in_flight_bytes=0)
+
+    def test_max_runtime_seconds_override(self):
+        assert ScanConfiguration().max_runtime_seconds == 0
+        c = ScanConfiguration.from_args(max_runtime_seconds=3600)
+        assert c.max_runtime_seconds == 3600
+
+    def test_negative_max_runtime_seconds_raises(self):
+        with pytest.raises(ValueError, match='max_runtime_seconds'):
+            ScanConfiguration.from_args(max_runtime_seconds=-1)
+
+    def test_autoscale_overrides(self):
+        c = ScanConfiguration.from_args(autoscale_workers=True, min_worker_count=2, max_worker_count=8)
+        assert c.autoscale_workers is True
+        assert (c.min_worker_count, c.max_worker_count) == (2, 8)
+
     def test_invalid_worker_count_raises(self):
         with pytest.raises(ValueError, match='worker_count'):
             ScanConfiguration.from_args(worker_count=0)
@@ -176,6 +198,58 @@ def test_workers_from_file(self, tmp_path: Path):
         c = ScanConfiguration.from_file(ini)
         assert c.worker_count == 4
 
+    def test_ndjson_from_file(self, tmp_path: Path):
+        ini = self._write_ini(tmp_path, f'[DEFAULT]\nndjson={tmp_path}\n')
+        c = ScanConfiguration.from_file(ini)
+        assert c.ndjson_dir == str(tmp_path.resolve())
+
+    def test_mime_cache_from_file(self, tmp_path: Path):
+        ini = self._write_ini(
+            tmp_path, f'[DEFAULT]\nmimeCache={tmp_path}\nmimeCacheMaxEntries=500\nmimeCacheMaxAgeDays=0\n')
+        c = ScanConfiguration.from_file(ini)
+        assert c.mime_cache_dir == str(tmp_path.resolve())
+        assert (c.mime_cache_max_entries, c.mime_cache_max_age_days) == (500, 0)
+
+    def test_autoscale_from_file(self, tmp_path: Path):
+        ini = self._write_ini(tmp_path, '[DEFAULT]\nautoscale=true\nminWorkers=2\nmaxWorkers=6\n')
+        c = ScanConfiguration.from_file(ini)
+        assert c.autoscale_workers is True
+        assert (c.min_worker_count, c.max_worker_count) == (2, 6)
+
+    def test_max_in_flight_bytes_from_file(self, tmp_path: Path):
+        ini = self._write_ini(tmp_path, '[DEFAULT]\nmaxInFlightBytes=1048576\n')
+        c = ScanConfiguration.from_file(ini)
+        assert c.max_in_flight_bytes == 1048576
+
+    def test_log_state_from_file(self, tmp_path: Path):
+        ini = self._write_ini(tmp_path, f'[DEFAULT]\nlogState={tmp_path}\n')
+        c = ScanConfiguration.from_file(ini)
+        assert c.log_state_dir == str(tmp_path.resolve())
+
+    def test_scan_state_from_file(self, tmp_path: Path):
+        ini = self._write_ini(tmp_path, f'[DEFAULT]\nscanState={tmp_path}\nscanStateHash=true\n')
+        c = ScanConfiguration.from_file(ini)
+        assert c.scan_state_dir == str(tmp_path.resolve())
+        assert (c.scan_state_hash, c.full_rescan) == (True, False)
+        assert ScanConfiguration.from_file(ini, full_rescan=True).full_rescan is True
+
+    def test_range_splitting_from_file(self, tmp_path: Path):
+        ini = self._write_ini(
+            tmp_path, '[DEFAULT]\nrangeSplitThreshold=0\nrangeSize=4096\nmboxSplitThreshold=1024\nmboxBatchMessages=50\n')
+        c = ScanConfiguration.from_file(ini)
+        assert (c.range_split_threshold, c.range_size) == (0, 4096)
+        assert (c.mbox_split_threshold, c.mbox_batch_messages) == (1024, 50)
+
+    def test_maildir_batch_messages_from_file(self, tmp_path: Path):
+        assert ScanConfiguration().maildir_batch_messages == 200
+        ini = self._write_ini(tmp_path, '[DEFAULT]\nmaildirBatchMessages=0\n')
+        assert ScanConfiguration.from_file(ini).maildir_batch_messages == 0
+
+    def test_content_cache_entries_from_file(self, tmp_path: Path):
+        assert ScanConfiguration().content_cache_entries == 100_000
+        ini = self._write_ini(tmp_path, '[DEFAULT]\ncontentCacheEntries=0\n')
+        assert ScanConfiguration.from_file(ini).content_cache_entries == 0
+
 
 class TestHelpers:
     def test_is_excluded_match(self):
@@ -206,6 +280,15 @@ def test_get_json_path_returns_path_when_dir_set(self, tmp_path: Path):
         assert path is not None
         assert c.json_file in path
 
+    def test_get_ndjson_path_none_when_no_dir(self):
+        assert ScanConfiguration().get_ndjson_path() is None
+
+    def test_get_ndjson_path_returns_path_when_dir_set(self, tmp_path: Path):
+        c = ScanConfiguration.from_args(ndjson_dir=str(tmp_path))
+        path = c.get_ndjson_path()
+        assert path is not None
+        assert path.endswith('.ndjson')
+
     def test_two_instances_are_independent(self):
         c1 = ScanConfiguration.from_args(quiet=True)
         c2 = ScanConfiguration.from_args(quiet=False)
@@ -258,6 +341,19 @@ def test_validate_rejects_json_dir_that_is_a_file(self, tmp_path: Path):
         with pytest.raises(ValueError, match='json_dir'):
             c.validate()
 
+    def test_validate_rejects_zero_mime_cache_entries(self):
+        with pytest.raises(ValueError, match='mime_cache_max_entries'):
+            ScanConfiguration.from_args(mime_cache_max_entries=0)
+
+    def test_validate_rejects_zero_range_size(self):
+        with pytest.raises(ValueError, match='range_size'):
+            ScanConfiguration.from_args(range_size=0)
+
+    def test_validate_rejects_inverted_worker_bounds(self, tmp_path: Path):
+        c = ScanConfiguration.from_args(target_path=str(tmp_path), min_worker_count=4, max_worker_count=2)
+        with pytest.raises(ValueError, match='min_worker_count'):
+            c.validate()
+
     def test_invalid_config_integer_reports_key(self, tmp_path: Path):
         ini = tmp_path / 'config.ini'
         ini.write_text('[DEFAULT]\nworkers=lots\n')
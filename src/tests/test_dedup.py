@@ -0,0 +1,42 @@
+"""Tests for the scan-wide content cache."""
+
+from panhunt.dedup import CachedScan, ContentCache, payload_digest
+from panhunt.pan import PAN
+
+
+def _scan(*pans: str) -> CachedScan:
+    return CachedScan('text/plain', 'utf8', [PAN('Visa', pan) for pan in pans])
+
+
+class TestContentCache:
+    def test_hit_returns_stored_outcome(self):
+        cache = ContentCache(max_entries=10)
+        digest = payload_digest(b'Payment 4111111111111111')
+        cache.put(digest, '.txt', _scan('4111111111111111'))
+
+        entry = cache.get(digest, '.txt')
+
+        assert entry is not None
+        assert [str(pan) for pan in entry.matches] == ['Visa:411111******1111']
+        assert (cache.hits, cache.misses) == (1, 0)
+
+    def test_extension_is_part_of_the_key(self):
+        cache = ContentCache(max_entries=10)
+        digest = payload_digest(b'same bytes')
+        cache.put(digest, '.txt', _scan())
+
+        assert cache.get(digest, '.doc') is None
+        assert cache.misses == 1
+
+    def test_least_recently_used_entry_is_dropped(self):
+        cache = ContentCache(max_entries=2)
+        first, second, third = (payload_digest(data) for data in (b'a', b'b', b'c'))
+        cache.put(first, '.txt', _scan())
+        cache.put(second, '.txt', _scan())
+        cache.get(first, '.txt')
+        cache.put(third, '.txt', _scan())
+
+        assert len(cache) == 2
+        assert cache.get(second, '.txt') is None
+        assert cache.get(first, '.txt') is not None
+        assert 'duplicate payloads reused' in cache.summary()
@@ -13,6 +13,8 @@
 from panhunt.dispatcher import Dispatcher
 from panhunt.finding import Finding
 from panhunt.job import Job
+from panhunt.scanner import PlainTextFileScanner
+from panhunt.sink import ResultSink
 
 
 def _make_job(name: str = 'test.txt') -> Job:
@@ -238,6 +240,76 @@ def test_get_findings_returns_snapshot(self):
         snapshot2 = d.get_findings()
         assert snapshot1 is not snapshot2
 
+    def test_iter_streams_results_from_all_workers(self):
+        num_jobs = 30
+        buffer = InMemoryJobBuffer()
+        for i in range(num_jobs):
+            buffer.enqueue(_make_job(f'file_{i}.txt'))
+        buffer.mark_input_complete()
+
+        d = Dispatcher(buffer=buffer, config=_make_config(worker_count=3))
+        d._dispatch_job = MagicMock(side_effect=lambda job: _success_finding() if job.basename.endswith(('0.txt', '5.txt')) else _failure_finding())
+        d.start()
+        _wait_for_finish(buffer)
+        d.stop()
+        d.join()
+
+        assert sum(1 for _ in d.iter_findings()) == 6
+        assert sum(1 for _ in d.iter_failures()) == 24
+
+    def test_cancel_stops_workers_and_cancels_budget(self):
+        buffer = InMemoryJobBuffer()
+        d = Dispatcher(buffer=buffer, config=_make_config(worker_count=2))
+        d.start()
+        d.cancel()
+        d.join()
+        assert d._resource_budget.cancelled is True
+        assert all(not thread.is_alive() for thread in d._threads)
+
+    def test_resize_grows_and_shrinks_pool(self):
+        buffer = InMemoryJobBuffer()
+        d = Dispatcher(buffer=buffer, config=_make_config(worker_count=1))
+        d.start()
+        d.resize(3)
+        assert d.worker_count == 3
+        assert sum(t.is_alive() for t in d._threads) == 3
+
+        d.resize(1)
+        deadline = time.monotonic() + 5
+        while sum(t.is_alive() for t in d._threads) > 1 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert sum(t.is_alive() for t in d._threads) == 1
+        d.stop()
+        d.join()
+
+    def test_autoscale_clamps_initial_pool_to_bounds(self):
+        config = ScanConfiguration.from_args(
+            target_path='/tmp', quiet=True, worker_count=8,
+            autoscale_workers=True, min_worker_count=1, max_worker_count=2)
+        d = Dispatcher(buffer=InMemoryJobBuffer(), config=config)
+        d.start()
+        assert d.worker_count == 2
+        d.stop()
+        d.join()
+
+    def test_results_are_written_to_sink(self):
+        buffer = InMemoryJobBuffer()
+        for i in range(4):
+            buffer.enqueue(_make_job(f'file_{i}.txt'))
+        buffer.mark_input_complete()
+
+        sink = MagicMock(spec=ResultSink)
+        d = Dispatcher(buffer=buffer, config=_make_config(worker_count=2), sink=sink)
+        d._dispatch_job = MagicMock(side_effect=lambda job: _success_finding())
+        d.start()
+        _wait_for_finish(buffer)
+        d.stop()
+        d.join()
+
+        assert sink.write.call_count == 4
+        assert len(d.findings) == 0
+        assert d.get_findings() is sink.findings.return_value
+
 
 class TestArchiveChildJobs:
     def test_archive_children_are_processed(self):
@@ -332,6 +404,108 @@ def test_invalid_zip_magic_falls_back_without_failure(self, tmp_path: Path):
         assert result is None
         assert buffer.dequeue(timeout=0) is None
 
+    def test_job_is_classified_once(self, tmp_path: Path):
+        from panhunt.scanner import PlainTextFileScanner
+        text = tmp_path / 'notes.txt'
+        text.write_text('card 4111111111111111\n')
+
+        buffer = InMemoryJobBuffer()
+        d = Dispatcher(buffer=buffer, config=_make_config(worker_count=1))
+        job = Job(basename=text.name, dirname=str(tmp_path))
+
+        with patch('panhunt.dispatcher.panutils.get_mimetype',
+                   return_value=('text/plain', 'us-ascii', None)) as get_mimetype:
+            first = d._dispatch_job(job)
+            second = d._dispatch_job(job)
+
+        # The dispatcher and Finding share panutils, so this also covers Finding.
+        get_mimetype.assert_called_once()
+        assert first is not None and second is not None
+        assert first.mime_type == 'text/plain'
+        assert job.file_type == enums.FileTypeEnum.Plaintext
+        assert job.handler is PlainTextFileScanner
+
+
+class TestRangeSplitting:
+    CARDS = ['4111111111111111', '5555 5555 5555 4444', '378282246310005']
+
+    def _write_log(self, tmp_path: Path) -> Path:
+        path = tmp_path / 'export.log'
+        lines = [f'row {i} ref {self.CARDS[i % 3] if i % 5 == 0 else "n/a"}' for i in range(400)]
+        path.write_text('\n'.join(lines))
+        return path
+
+    def _run(self, path: Path, threshold: int, in_threads: bool = False,
+             scan_state=None) -> tuple[Dispatcher, list[str]]:
+        config = _make_config(worker_count=4)
+        config.range_split_threshold = threshold
+        config.range_size = 1024
+        buffer = InMemoryJobBuffer()
+        d = Dispatcher(buffer=buffer, config=config, scan_state=scan_state)
+        d._range_processes_unavailable = in_threads
+        processed: list[str] = []
+        original = d._dispatch_job
+
+        def tracking_dispatch(job):
+            processed.append(job.basename)
+            return original(job)
+
+        d._dispatch_job = tracking_dispatch
+        buffer.enqueue(Job(basename=path.name, dirname=str(path.parent)))
+        buffer.mark_input_complete()
+        d.start()
+        try:
+            _wait_for_finish(buffer, timeout=60)
+        finally:
+            d.stop()
+            d.join()
+        return d, processed
+
+    def test_large_file_is_reported_once_with_all_matches(self, tmp_path: Path):
+        path = self._write_log(tmp_path)
+
+        d, processed = self._run(path, threshold=1024)
+
+        findings = d.get_findings()
+        assert len(processed) > 2
+        assert len(findings) == 1
+        assert findings[0].abspath == str(path)
+        assert len(findings[0].matches) == 80
+        assert d.get_failures() == []
+
+    def test_ranges_match_unsplit_scan(self, tmp_path: Path):
+        path = self._write_log(tmp_path)
+
+        split, _ = self._run(path, threshold=1024, in_threads=True)
+        whole, processed = self._run(path, threshold=0)
+
+        assert processed == [path.name]
+        assert sorted(map(str, split.get_findings()[0].matches)) == sorted(map(str, whole.get_findings()[0].matches))
+
+    def test_scan_state_is_saved_after_the_last_range(self, tmp_path: Path):
+        path = self._write_log(tmp_path)
+        scan_state = MagicMock()
+        scan_state.previous_results.return_value = None
+        recorded_at_finish = []
+        scan_state.finish.side_effect = lambda _: recorded_at_finish.append(scan_state.add.call_count)
+
+        _, processed = self._run(path, threshold=1024, in_threads=True, scan_state=scan_state)
+
+        assert len(processed) > 2
+        scan_state.finish.assert_called_once_with(str(path))
+        assert recorded_at_finish == [1]
+
+    def test_range_error_fails_the_file(self, tmp_path: Path):
+        path = self._write_log(tmp_path)
+
+        with patch('panhunt.dispatcher.scan_file_range', side_effect=OSError('read failed')):
+            d, _ = self._run(path, threshold=1024, in_threads=True)
+
+        failures = d.get_failures()
+        assert d.get_findings() == []
+        assert len(failures) == 1
+        assert failures[0].errors == ['read failed']
+
 
 class TestWorkerResilience:
     def test_unhandled_exception_does_not_kill_worker(self):
@@ -445,3 +619,201 @@ def test_complete_job_called_exactly_once_per_job(self):
 
         # is_finished() only returns True when all jobs are completed exactly once
         assert buffer.is_finished()
+
+    def test_seal_lists_running_jobs_and_drops_their_late_results(self):
+        buffer = InMemoryJobBuffer()
+        buffer.enqueue(_make_job('slow.txt'))
+        buffer.mark_input_complete()
+        started, release = threading.Event(), threading.Event()
+
+        def slow(job):
+            started.set()
+            release.wait(5)
+            buffer.enqueue(_make_job('child.txt'))
+            return _success_finding()
+
+        d = Dispatcher(buffer=buffer, config=_make_config(worker_count=1))
+        d._dispatch_job = MagicMock(side_effect=slow)
+        d.start()
+        assert started.wait(5)
+        d.cancel()
+        d.join(timeout=0.1)
+
+        assert buffer.drain() == []
+        assert d.seal() == ['/tmp/slow.txt']
+        release.set()
+        _wait_for_finish(buffer)
+
+        assert [job.basename for job in buffer.drain()] == ['child.txt']
+        assert len(d.get_findings()) == 0
+        assert d.seal() == []
+
+
+    @pytest.mark.parametrize('seal_while_running', [True, False])
+    def test_job_with_stored_result_is_not_listed_unscanned(self, seal_while_running):
+        buffer = InMemoryJobBuffer()
+        buffer.enqueue(_make_job('done.txt'))
+        buffer.mark_input_complete()
+        d = Dispatcher(buffer=buffer, config=_make_config(worker_count=1))
+        d._dispatch_job = MagicMock(return_value=_success_finding())
+        store = d._store
+        sealed = []
+
+        def store_then_cancel(finding, job=None):
+            stored = store(finding, job)
+            d.cancel()  # the deadline passes before the worker has finished the job
+            if seal_while_running:
+                sealed.append(d.seal())
+            return stored
+
+        d._store = store_then_cancel
+        d.start()
+        _wait_for_finish(buffer)
+        d.join()
+
+        assert len(d.get_findings()) == 1
+        assert sealed + [d.seal()] == ([[], []] if seal_while_running else [[]])
+
+    def test_failure_after_cancellation_is_listed_unscanned_instead(self):
+        d = Dispatcher(buffer=InMemoryJobBuffer(), config=_make_config())
+        d._dispatch_job = MagicMock(return_value=_failure_finding())
+        d.cancel()
+
+        d._process(_make_job('cut-short.txt'))
+
+        assert d.get_failures() == []
+        assert d.seal() == ['/tmp/cut-short.txt']
+
+
+class TestContentCache:
+    def _run(self, tmp_path: Path, cache_entries: int = 100) -> tuple[Dispatcher, list[str]]:
+        import zipfile
+
+        path = tmp_path / 'mail-export.zip'
+        with zipfile.ZipFile(path, 'w') as archive:
+            archive.writestr('one/invoice.txt', b'Payment 4111111111111111')
+            archive.writestr('two/invoice.txt', b'Payment 4111111111111111')
+            archive.writestr('two/invoice.csv', b'Payment 4111111111111111')
+        config = _make_config(worker_count=1)
+        config.content_cache_entries = cache_entries
+        buffer = InMemoryJobBuffer()
+        d = Dispatcher(buffer=buffer, config=config)
+        scanned: list[str] = []
+        original = PlainTextFileScanner.scan
+
+        def tracking_scan(scanner, job, encoding='utf8'):
+            scanned.append(job.basename)
+            return original(scanner, job, encoding)
+
+        with patch.object(PlainTextFileScanner, 'scan', autospec=True, side_effect=tracking_scan):
+            buffer.enqueue(Job(basename=path.name, dirname=str(tmp_path)))
+            buffer.mark_input_complete()
+            d.start()
+            try:
+                _wait_for_finish(buffer)
+            finally:
+                d.stop()
+                d.join()
+        return d, scanned
+
+    def test_duplicate_member_reuses_result_under_its_own_path(self, tmp_path: Path):
+        d, scanned = self._run(tmp_path)
+
+        assert len(scanned) == 2
+        assert 'two/invoice.csv' in scanned
+        findings = sorted(d.get_findings(), key=lambda f: f.logical_path)
+        assert [f.logical_path.rsplit('!/', 1)[1] for f in findings] == [
+            'one/invoice.txt', 'two/invoice.csv', 'two/invoice.txt'
+        ]
+        assert all([str(pan) for pan in f.matches] == ['Visa:411111******1111'] for f in findings)
+        assert d.content_cache is not None and d.content_cache.hits == 1
+
+    def test_zero_entries_disables_cache(self, tmp_path: Path):
+        d, scanned = self._run(tmp_path, cache_entries=0)
+
+        assert d.content_cache is None
+        assert len(scanned) == 3
+        assert len(d.get_findings()) == 3
+
+
+class TestMboxBatches:
+    @pytest.mark.parametrize('split_threshold', [1, 0])
+    def test_findings_are_reported_per_message(self, tmp_path: Path, split_threshold: int):
+        attachment = (
+            b'From a@example.com Mon Jan  1 00:00:00 2024\nSubject: 3\nMIME-Version: 1.0\n'
+            b'Content-Type: multipart/mixed; boundary="b"\n\n--b\nContent-Type: text/plain\n\nSee attached\n'
+            b'--b\nContent-Type: text/plain\nContent-Disposition: attachment; filename="card.txt"\n\n'
+            b'Card 5555555555554444\n--b--\n\n')
+        path = tmp_path / 'archive.mbox'
+        path.write_bytes(b''.join(
+            b'From a@example.com Mon Jan  1 00:00:00 2024\nSubject: %d\n\nCard 4111111111111111\n\n' % index
+            for index in range(1, 3)) + attachment)
+        config = _make_config(worker_count=1)
+        config.mbox_split_threshold, config.mbox_batch_messages = split_threshold, 2
+        buffer = InMemoryJobBuffer()
+        d = Dispatcher(buffer=buffer, config=config)
+
+        buffer.enqueue(Job(basename=path.name, dirname=str(tmp_path)))
+        buffer.mark_input_complete()
+        d.start()
+        try:
+            _wait_for_finish(buffer)
+        finally:
+            d.stop()
+            d.join()
+
+        findings = sorted(d.get_findings(), key=lambda f: f.logical_path)
+        assert [f.logical_path.split('!/', 1)[1] for f in findings] == [
+            'message 1', 'message 2', 'message 3!/card.txt']
+        assert [len(f.matches) for f in findings] == [1, 1, 1]
+        assert d._resource_budget.child_jobs == 1  # only the attachment is queued as a job
+
+
+class TestMaildirBatches:
+    def test_messages_are_scanned_under_their_own_paths(self, tmp_path: Path):
+        messages = {
+            'm1': b'X-Original-To: bob@example.com\nSubject: one\n\nCard 4111111111111111\n',
+            'm2': b'Return-Path: <a@example.com>\nSubject: two\n\nNothing here\n',
+            'm3': b'Delivered-To: bob@example.com\nSubject: three\n\nCard 5555555555554444\n',
+        }
+        for name, content in messages.items():
+            (tmp_path / name).write_bytes(content)
+        buffer = InMemoryJobBuffer()
+        d = Dispatcher(buffer=buffer, config=_make_config(worker_count=1))
+
+        buffer.enqueue(Job(basename='', dirname=str(tmp_path), batch=sorted(messages)))
+        buffer.mark_input_complete()
+        with patch('panhunt.dispatcher.panutils.get_mimetype') as get_mimetype:
+            d.start()
+            try:
+                _wait_for_finish(buffer)
+            finally:
+                d.stop()
+                d.join()
+
+        get_mimetype.assert_not_called()
+        findings = sorted(d.get_findings(), key=lambda f: f.logical_path)
+        assert [f.logical_path for f in findings] == [str(tmp_path / 'm1'), str(tmp_path / 'm3')]
+        assert {f.mime_type for f in findings} == {'message/rfc822'}
+
+    def test_messages_left_when_cancelled_are_reported_unscanned(self, tmp_path: Path):
+        d = Dispatcher(buffer=InMemoryJobBuffer(), config=_make_config())
+        scanned = []
+
+        def process(message):
+            scanned.append(message.basename)
+            d._resource_budget.cancel()
+
+        batch = Job(basename='', dirname=str(tmp_path), batch=['m1', 'm2', 'm3'])
+        with patch.object(d, '_classify_message'), patch.object(d, '_process', side_effect=process):
+            d._scan_batch(batch)
+        d.abandon(batch)
+
+        assert scanned == ['m1']
+        assert d.seal() == [str(tmp_path / 'm2'), str(tmp_path / 'm3')]
+
+    def test_abandoned_batch_keeps_previous_state_of_its_messages(self):
+        scan_state = MagicMock()
+        d = Dispatcher(buffer=InMemoryJobBuffer(), config=_make_config(), scan_state=scan_state)
+        d.abandon(Job(basename='', dirname='/mail/cur', batch=['m1', 'm2']))
+        assert [c.args[0] for c in scan_state.interrupt.call_args_list] == ['/mail/cur/m1', '/mail/cur/m2']
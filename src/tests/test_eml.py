@@ -0,0 +1,114 @@
+"""Tests for the EML reader."""
+
+import io
+import os
+from email import message_from_bytes
+from email.message import EmailMessage
+
+import pytest
+
+from panhunt.formats.eml import Attachment, Eml, MimeReader, decode_chunks, iter_decoded_payload, iter_leaf_parts
+
+
+@pytest.mark.parametrize('cte', ['base64', 'quoted-printable'])
+def test_incremental_decoding_matches_email_package(cte):
+    message = EmailMessage()
+    if cte == 'base64':
+        message.set_content(os.urandom(30_001), maintype='application', subtype='octet-stream', cte=cte)
+    else:
+        message.set_content('Café total = 4111 1111 1111 1111\n' * 1000, cte=cte)
+    part = message_from_bytes(message.as_bytes())
+
+    chunks = list(iter_decoded_payload(part, chunk_chars=1000))
+
+    assert len(chunks) > 1
+    assert b''.join(chunks) == part.get_payload(decode=True)
+
+
+def test_base64_with_missing_padding_is_decoded_leniently():
+    part = message_from_bytes(b'Content-Transfer-Encoding: base64\n\nQUJD\nRA\n')
+
+    assert b''.join(iter_decoded_payload(part)) == b'ABCD'
+
+
+@pytest.mark.parametrize('encoded, decoded', [
+    (b'QQ==QUJD\nR\n', b'A'),
+    (b'QUJD\nR\n', b'ABC'),
+    (b'QUJD\nRA=\n', b'ABCD'),
+])
+def test_malformed_base64_tail_is_decoded_without_error(encoded, decoded):
+    part = message_from_bytes(b'Content-Transfer-Encoding: base64\n\n' + encoded)
+
+    assert b''.join(iter_decoded_payload(part)) == decoded
+
+
+def test_scan_only_yields_text_parts_and_attachments_in_order():
+    message = EmailMessage()
+    message.set_content('Card 4111111111111111')
+    message.add_attachment(b'Total 5555555555554444', maintype='application', subtype='octet-stream',
+                           filename='card.bin')
+    eml = Eml('mail.eml', payload=io.BytesIO(message.as_bytes()), scan_only=True)
+
+    text, attachment = list(eml.iter_parts())
+
+    assert text == 'Card 4111111111111111\n'
+    assert isinstance(attachment, Attachment)
+    assert (attachment.Filename, attachment.Payload.read()) == ('card.bin', b'Total 5555555555554444')
+    assert eml.attachments == [] and eml.attachment_count == 1
+    attachment.close()
+    assert list(eml.iter_parts()) == []
+
+
+def test_html_parts_are_converted_to_text():
+    message = EmailMessage()
+    message.set_content('<p>Card <b>4111</b>&nbsp;1111 1111 <i>1111</i></p>', subtype='html', cte='base64')
+    eml = Eml('mail.eml', payload=message.as_bytes())
+
+    assert eml.body.strip() == 'Card 4111 1111 1111 1111'
+
+
+def test_html_alternative_to_plain_text_is_not_scanned_twice():
+    message = EmailMessage()
+    message.set_content('Card 4111111111111111')
+    message.add_alternative('<p>Card 4111111111111111</p>', subtype='html')
+    eml = Eml('mail.eml', payload=message.as_bytes())
+
+    assert eml.body == 'Card 4111111111111111\n'
+
+
+def test_parts_are_yielded_before_the_rest_of_the_message_is_read():
+    message = EmailMessage()
+    message.set_content('Card 4111111111111111')
+    message.add_attachment(os.urandom(1_000_000), maintype='application', subtype='octet-stream',
+                           filename='large.bin')
+    stream = io.BytesIO(message.as_bytes())
+    eml = Eml('mail.eml', payload=stream, scan_only=True)
+
+    parts = eml.iter_parts()
+
+    assert next(parts) == 'Card 4111111111111111\n'
+    assert stream.tell() < len(stream.getvalue()) // 2
+    attachment = next(parts)
+    assert attachment.Size == 1_000_000
+    attachment.close()
+
+
+@pytest.mark.parametrize('line_end', [b'\n', b'\r\n'])
+def test_reader_yields_the_parts_of_the_email_package(line_end):
+    inner = EmailMessage()
+    inner.set_content('Inner 378282246310005')
+    inner.add_attachment(b'Inner 5555555555554444', maintype='text', subtype='plain', filename='inner.txt')
+    message = EmailMessage()
+    message.set_content('Café 4111 1111 1111 1111\n' * 5000, cte='quoted-printable')
+    message.add_alternative('<p>Card 4111111111111111</p>', subtype='html')
+    message.add_attachment(os.urandom(200_001), maintype='application', subtype='octet-stream', filename='a.bin')
+    message.add_attachment(inner)
+    data = message.as_bytes().replace(b'\n', line_end)
+
+    expected = [(part.get_content_type(), part.get_filename(), part.get_payload(decode=True))
+                for part in iter_leaf_parts(message_from_bytes(data))]
+    parts = [(part.get_content_type(), part.get_filename(), b''.join(decode_chunks(part, body)))
+             for part, body in MimeReader(io.BytesIO(data)).parts()]
+
+    assert [name for _, name, _ in parts] == [None, 'a.bin', None, 'inner.txt']
+    assert parts == expected
@@ -137,3 +137,54 @@ def test_help_mentions_config_has_additional_options(monkeypatch, capsys):
     output = capsys.readouterr().out
     assert 'For advanced scanning controls, use -C config.ini.' in output
     assert 'additional options beyond the command-line parameters' in output
+
+
+def test_full_rescan_without_scan_state_is_rejected(monkeypatch, capsys, tmp_path):
+    import pytest
+    import panhunt
+
+    def fail_scan(self, config):
+        raise AssertionError('scan should not be called')
+
+    monkeypatch.setattr('sys.argv', ['panhunt', '-F', str(tmp_path)])
+    monkeypatch.setattr(panhunt.PanHuntService, 'scan', fail_scan)
+
+    with pytest.raises(SystemExit) as exc_info:
+        panhunt.main()
+
+    assert exc_info.value.code == 2
+    assert '-F needs a scan state' in capsys.readouterr().err
+
+
+def test_scan_state_option_enables_full_rescan(monkeypatch, tmp_path):
+    import panhunt
+
+    scanned = []
+    state_dir = tmp_path / 'state'
+
+    monkeypatch.setattr('sys.argv', ['panhunt', '-q', '-F', '-S', str(state_dir), str(tmp_path)])
+    monkeypatch.setattr(panhunt.PanHuntService, 'scan', lambda self, config: scanned.append(config))
+    monkeypatch.setattr(panhunt.CliPresenter, 'show', lambda self, result: None)
+
+    panhunt.main()
+
+    assert scanned[0].scan_state_dir == str(state_dir)
+    assert scanned[0].full_rescan is True
+
+
+def test_scan_state_option_overrides_config_file(monkeypatch, tmp_path):
+    import panhunt
+
+    scanned = []
+    config_file = tmp_path / 'config.ini'
+    config_file.write_text(f'[DEFAULT]\nsearch = {tmp_path}\n')
+    state_dir = tmp_path / 'state'
+
+    monkeypatch.setattr('sys.argv', ['panhunt', '-C', str(config_file), '-F', '-S', str(state_dir)])
+    monkeypatch.setattr(panhunt.PanHuntService, 'scan', lambda self, config: scanned.append(config))
+    monkeypatch.setattr(panhunt.CliPresenter, 'show', lambda self, result: None)
+
+    panhunt.main()
+
+    assert scanned[0].scan_state_dir == str(state_dir)
+    assert scanned[0].full_rescan is True
@@ -5,7 +5,8 @@
 from panhunt.buffer import InMemoryJobBuffer
 from panhunt.config import ScanConfiguration
 from panhunt.enums import FileTypeEnum
-from panhunt.factory import ArchiveFactory, ScannerFactory
+from panhunt import factory as factory_module
+from panhunt.factory import ArchiveFactory, ScannerFactory, classify_file_type
 from panhunt.scanner import (
     EmlScanner,
     MboxScanner,
@@ -166,3 +167,32 @@ def test_odt_octet_stream_extension_fallback(self):
         from panhunt.archive import OpenDocumentArchive
         cls = ArchiveFactory.get_archive('application/octet-stream', '.odt')
         assert cls is OpenDocumentArchive
+
+
+class TestClassifyFileType:
+    def test_precomputed_pair(self):
+        assert classify_file_type('application/octet-stream', '.docx') == FileTypeEnum.MsWord
+        assert ('application/octet-stream', '.docx') in factory_module._classifications
+
+    def test_legacy_office_extension_wins(self):
+        assert classify_file_type('application/x-ole-storage', '.xls') == FileTypeEnum.MsExcelLegacy
+        assert classify_file_type('text/plain', '.doc') == FileTypeEnum.MsWordLegacy
+
+    def test_unlisted_pair_is_memoised(self):
+        key = ('text/x-python', '.py')
+        factory_module._classifications.pop(key, None)
+        assert classify_file_type(*key) == FileTypeEnum.Plaintext
+        assert factory_module._classifications[key] == FileTypeEnum.Plaintext
+
+    def test_memo_is_bounded(self, monkeypatch):
+        monkeypatch.setattr(factory_module, '_classifications', dict(factory_module._classifications))
+        monkeypatch.setattr(factory_module, 'CLASSIFICATION_CACHE_LIMIT', 0)
+        assert classify_file_type('text/x-unlisted', '.unlisted') == FileTypeEnum.Plaintext
+        assert ('text/x-unlisted', '.unlisted') not in factory_module._classifications
+
+    def test_get_scanner_for_resolved_type(self, buffer, config):
+        factory = ScannerFactory(buffer=buffer, config=config)
+        assert isinstance(factory.get_scanner_for(FileTypeEnum.Pdf), PdfScanner)
+        assert factory.get_scanner_for(FileTypeEnum.Zip) is None
+        from panhunt.archive import ZipArchive
+        assert ArchiveFactory.get_archive_for(FileTypeEnum.Zip) is ZipArchive
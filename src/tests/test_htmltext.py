@@ -0,0 +1,29 @@
+"""Tests for the HTML-to-text conversion of mail bodies."""
+
+from panhunt.formats.htmltext import HtmlTextExtractor, html_to_text
+
+
+def test_inline_markup_and_entities_are_removed_in_one_pass():
+    text = html_to_text('<p>Card <b>4111</b>&nbsp;1111<span> 1111</span> &#49;111 &amp; more</p>')
+    assert text == '\nCard 4111 1111 1111 1111 & more\n'
+
+
+def test_block_elements_separate_cells():
+    text = html_to_text('<table><tr><td>4111111111111111</td><td>2024</td></tr></table>')
+    assert text.split('\n') == ['', '', '', '4111111111111111', '', '2024', '', '', '']
+
+
+def test_script_and_style_content_is_skipped():
+    text = html_to_text('<style>.a{color:red}</style><script>var x = "5555";</script>Hello<br/>there')
+    assert text == 'Hello\nthere'
+
+
+def test_markup_split_across_chunks_is_converted():
+    extractor = HtmlTextExtractor()
+    parts = []
+    for chunk in ('<di', 'v>Card 4111 <sp', 'an>1111</span> 1111 1111&am', 'p;</div><scr', 'ipt>x = "4111', '";</script>'):
+        extractor.feed(chunk)
+        parts.append(extractor.take_text())
+    extractor.close()
+    parts.append(extractor.take_text())
+    assert ''.join(parts) == '\nCard 4111 1111 1111 1111&\n'
@@ -1,7 +1,7 @@
 """Tests for Hunter."""
 
 import os
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 import pytest
 
@@ -17,6 +17,8 @@ def mock_dispatcher():
     d = MagicMock(spec=Dispatcher)
     d.get_findings.return_value = []
     d.get_failures.return_value = []
+    d.seal.return_value = []
+    d.unscanned_paths.side_effect = Dispatcher.unscanned_paths
     return d
 
 
@@ -93,6 +95,48 @@ def test_excludes_single_file_target(self, mock_dispatcher, mock_buffer, tmp_tex
         mock_buffer.enqueue.assert_not_called()
 
 
+class TestHuntMaildir:
+    def _maildir(self, root: str, messages: int) -> str:
+        maildir = os.path.join(root, 'mail')
+        for folder in ('cur', 'new', 'tmp'):
+            os.makedirs(os.path.join(maildir, folder))
+        for index in range(messages):
+            open(os.path.join(maildir, 'cur', f'{index}.host:2,S'), 'w').close()
+        open(os.path.join(maildir, 'dovecot.index'), 'w').close()
+        return maildir
+
+    def _jobs(self, mock_buffer) -> list[Job]:
+        return [c.args[0] for c in mock_buffer.enqueue.call_args_list]
+
+    def test_messages_are_queued_in_batches(self, mock_dispatcher, mock_buffer, tmp_dir):
+        maildir = self._maildir(tmp_dir, 5)
+        config = ScanConfiguration.from_args(target_path=tmp_dir, quiet=True)
+        config.maildir_batch_messages = 2
+        Hunter(dispatcher=mock_dispatcher, buffer=mock_buffer).hunt(config)
+
+        jobs = self._jobs(mock_buffer)
+        assert [job.basename for job in jobs if job.batch is None] == ['dovecot.index']
+        batches = [job for job in jobs if job.batch is not None]
+        assert {job.dirname for job in batches} == {os.path.join(maildir, 'cur')}
+        assert sorted(len(job.batch) for job in batches) == [1, 2, 2]
+        assert sorted(name for job in batches for name in job.batch) == sorted(os.listdir(os.path.join(maildir, 'cur')))
+
+    def test_maildir_folder_as_target_is_batched(self, mock_dispatcher, mock_buffer, tmp_dir):
+        maildir = self._maildir(tmp_dir, 3)
+        config = ScanConfiguration.from_args(target_path=os.path.join(maildir, 'cur'), quiet=True)
+        Hunter(dispatcher=mock_dispatcher, buffer=mock_buffer).hunt(config)
+        assert [len(job.batch) for job in self._jobs(mock_buffer)] == [3]
+
+    def test_zero_batch_size_queues_each_message(self, mock_dispatcher, mock_buffer, tmp_dir):
+        self._maildir(tmp_dir, 3)
+        config = ScanConfiguration.from_args(target_path=tmp_dir, quiet=True)
+        config.maildir_batch_messages = 0
+        Hunter(dispatcher=mock_dispatcher, buffer=mock_buffer).hunt(config)
+        jobs = self._jobs(mock_buffer)
+        assert len(jobs) == 4
+        assert all(job.batch is None for job in jobs)
+
+
 class TestHuntResults:
     def test_returns_findings_and_failures(self, mock_dispatcher, mock_buffer, tmp_dir):
         finding = MagicMock(spec=Finding)
@@ -149,3 +193,81 @@ def test_keyboard_interrupt_stops_and_joins_dispatcher(self, mock_dispatcher, mo
         mock_dispatcher.stop.assert_called_once()
         mock_dispatcher.join.assert_called_once()
         mock_buffer.mark_input_complete.assert_not_called()
+
+
+class TestHuntDeadline:
+    def _clock(self, expire_after_calls: int):
+        calls = {'count': 0}
+
+        def monotonic():
+            calls['count'] += 1
+            return 0.0 if calls['count'] <= expire_after_calls else 100.0
+        return monotonic
+
+    def test_no_deadline_leaves_result_complete(self, mock_dispatcher, mock_buffer, tmp_dir):
+        config = ScanConfiguration.from_args(target_path=tmp_dir, quiet=True)
+        h = Hunter(dispatcher=mock_dispatcher, buffer=mock_buffer)
+        h.hunt(config)
+        assert h.unfinished is None
+        mock_dispatcher.cancel.assert_not_called()
+
+    def test_deadline_during_walk_lists_unscanned_subtrees(self, mock_dispatcher, mock_buffer, tmp_dir):
+        open(os.path.join(tmp_dir, 'a.txt'), 'w').close()
+        for name in ('sub1', 'sub2'):
+            os.makedirs(os.path.join(tmp_dir, name))
+            open(os.path.join(tmp_dir, name, 'b.txt'), 'w').close()
+        mock_buffer.drain.return_value = []
+        config = ScanConfiguration.from_args(target_path=tmp_dir, quiet=True, max_runtime_seconds=1)
+        h = Hunter(dispatcher=mock_dispatcher, buffer=mock_buffer)
+
+        # deadline computation, root directory, a.txt, then expiry before the subdirectories
+        with patch('panhunt.hunter.time.monotonic', side_effect=self._clock(3)):
+            h.hunt(config)
+
+        mock_buffer.enqueue.assert_called_once()
+        mock_dispatcher.cancel.assert_called_once()
+        assert h.unfinished is not None
+        assert sorted(h.unfinished.unscanned_paths) == [
+            os.path.join(tmp_dir, 'sub1'), os.path.join(tmp_dir, 'sub2')]
+        assert h.unfinished.pending_jobs == 0
+
+    def test_deadline_drains_pending_jobs(self, mock_dispatcher, mock_buffer, tmp_text_file):
+        mock_buffer.is_finished.return_value = False
+        mock_buffer.drain.side_effect = [[Job(basename='queued.txt', dirname='/data')], []]
+        config = ScanConfiguration.from_args(target_path=tmp_text_file, quiet=True, max_runtime_seconds=1)
+        h = Hunter(dispatcher=mock_dispatcher, buffer=mock_buffer)
+
+        with patch('panhunt.hunter.time.monotonic', side_effect=self._clock(1)):
+            h.hunt(config)
+
+        mock_dispatcher.cancel.assert_called_once()
+        assert h.unfinished is not None
+        assert h.unfinished.pending_jobs == 1
+        assert h.unfinished.unscanned_paths == [os.path.join('/data', 'queued.txt')]
+
+    def test_deadline_lists_each_message_of_pending_batches(self, mock_dispatcher, mock_buffer, tmp_text_file):
+        mock_buffer.is_finished.return_value = False
+        mock_buffer.drain.side_effect = [[Job(basename='', dirname='/mail/cur', batch=['m1', 'm2'])], []]
+        config = ScanConfiguration.from_args(target_path=tmp_text_file, quiet=True, max_runtime_seconds=1)
+        h = Hunter(dispatcher=mock_dispatcher, buffer=mock_buffer)
+
+        with patch('panhunt.hunter.time.monotonic', side_effect=self._clock(1)):
+            h.hunt(config)
+
+        assert h.unfinished is not None
+        assert h.unfinished.pending_jobs == 1
+        assert h.unfinished.unscanned_paths == ['/mail/cur/m1', '/mail/cur/m2']
+
+    def test_deadline_lists_running_jobs_and_their_late_children(self, mock_dispatcher, mock_buffer, tmp_text_file):
+        mock_buffer.is_finished.return_value = False
+        mock_buffer.drain.side_effect = [[], [Job(basename='member.txt', dirname='/data/a.zip')]]
+        mock_dispatcher.seal.return_value = ['/data/a.zip']
+        config = ScanConfiguration.from_args(target_path=tmp_text_file, quiet=True, max_runtime_seconds=1)
+        h = Hunter(dispatcher=mock_dispatcher, buffer=mock_buffer)
+
+        with patch('panhunt.hunter.time.monotonic', side_effect=self._clock(1)):
+            h.hunt(config)
+
+        assert h.unfinished is not None
+        assert h.unfinished.pending_jobs == 1
+        assert h.unfinished.unscanned_paths == ['/data/a.zip', os.path.join('/data/a.zip', 'member.txt')]
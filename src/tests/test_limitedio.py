@@ -1,11 +1,12 @@
 """Behavior tests for byte-limit stream helpers."""
 
+import hashlib
 import io
 
 import pytest
 
 from panhunt.exceptions import PANHuntException
-from panhunt.limitedio import LimitedReader, read_limited, spool_limited
+from panhunt.limitedio import FileRangeReader, LimitedReader, read_limited, spool_chunks, spool_limited
 from panhunt.scancontext import ScanContext, ScanLimits
 
 
@@ -85,3 +86,39 @@ def test_limited_reader_close_closes_wrapped_stream():
     reader.close()
 
     assert stream.closed is True
+
+
+def test_spool_limited_feeds_digest_while_spooling():
+    digest = hashlib.blake2b(digest_size=32)
+    payload, _ = spool_limited(io.BytesIO(b'Payment 4111111111111111'), limit=30, chunk_size=5, digest=digest)
+
+    payload.close()
+    assert digest.digest() == hashlib.blake2b(b'Payment 4111111111111111', digest_size=32).digest()
+
+
+def test_spool_chunks_writes_decoder_output_up_to_limit():
+    payload, size = spool_chunks(iter([b'Payment ', b'', b'4111111111111111']), limit=24, spool_threshold=4)
+
+    try:
+        assert size == 24
+        assert payload.read() == b'Payment 4111111111111111'
+    finally:
+        payload.close()
+
+    with pytest.raises(PANHuntException):
+        spool_chunks(iter([b'abc', b'def']), limit=5)
+
+
+def test_file_range_reader_opens_file_on_first_read(tmp_path):
+    path = tmp_path / 'archive.mbox'
+    path.write_bytes(b'0123456789')
+    reader = FileRangeReader(str(path), 2, 8)
+
+    assert reader.seek(0, 2) == 6
+    assert reader._file is None
+    reader.seek(1)
+    assert reader.read(3) == b'345'
+    assert reader.read() == b'67'
+    reader.seek(0)
+    assert reader.read() == b'234567'
+    reader.close()
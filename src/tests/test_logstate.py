@@ -0,0 +1,86 @@
+"""Tests for the append-only log scan state."""
+
+import os
+
+from panhunt.logstate import LogState
+from panhunt.mimecache import SECONDS_PER_DAY
+
+DAY_ONE = 1_700_000_000
+
+
+def _state(tmp_path, clock: float = DAY_ONE) -> LogState:
+    return LogState(str(tmp_path / 'state'), clock=lambda: clock)
+
+
+def _log(tmp_path, content: bytes, name: str = 'app.log') -> str:
+    path = tmp_path / name
+    path.write_bytes(content)
+    return str(path)
+
+
+class TestLogState:
+    def test_appended_file_resumes_at_recorded_offset(self, tmp_path):
+        path = _log(tmp_path, b'first line\n')
+        state = _state(tmp_path)
+        assert state.resume_offset(path, os.stat(path)) == 0
+        state.record(path, os.stat(path), 11)
+        state.close()
+
+        with open(path, 'ab') as f:
+            f.write(b'second line\n')
+        reopened = _state(tmp_path)
+        assert reopened.resume_offset(path, os.stat(path)) == 11
+        assert (reopened.resumed, reopened.skipped_bytes) == (1, 11)
+        reopened.close()
+
+    def test_truncated_file_is_scanned_from_start(self, tmp_path):
+        path = _log(tmp_path, b'first line\nsecond line\n')
+        state = _state(tmp_path)
+        state.record(path, os.stat(path), 23)
+
+        with open(path, 'wb') as f:
+            f.write(b'new\n')
+        assert state.resume_offset(path, os.stat(path)) == 0
+        assert state.rescanned == 1
+        state.close()
+
+    def test_rewritten_file_is_scanned_from_start(self, tmp_path):
+        path = _log(tmp_path, b'first line\n')
+        state = _state(tmp_path)
+        state.record(path, os.stat(path), 11)
+
+        with open(path, 'r+b') as f:
+            f.write(b'FIRST')
+            f.seek(0, os.SEEK_END)
+            f.write(b'more\n')
+        assert state.resume_offset(path, os.stat(path)) == 0
+        state.close()
+
+    def test_other_inode_has_no_entry(self, tmp_path):
+        path = _log(tmp_path, b'first line\n')
+        state = _state(tmp_path)
+        state.record(path, os.stat(path), 11)
+
+        rotated = _log(tmp_path, b'first line\n', name='app.log.1')
+        assert state.resume_offset(rotated, os.stat(rotated)) == 0
+        state.close()
+
+    def test_entries_not_seen_within_max_age_are_evicted(self, tmp_path):
+        path = _log(tmp_path, b'first line\n')
+        state = _state(tmp_path)
+        state.record(path, os.stat(path), 11)
+        state.close()
+
+        later = _state(tmp_path, clock=DAY_ONE + (LogState.MAX_AGE_DAYS + 1) * SECONDS_PER_DAY)
+        later.close()
+        assert len(_state(tmp_path)) == 0
+
+    def test_corrupt_database_is_rebuilt(self, tmp_path):
+        state_dir = tmp_path / 'state'
+        state_dir.mkdir()
+        (state_dir / LogState.FILE_NAME).write_bytes(b'not a database' * 100)
+        path = _log(tmp_path, b'first line\n')
+
+        state = _state(tmp_path)
+        assert state.resume_offset(path, os.stat(path)) == 0
+        state.close()
@@ -0,0 +1,62 @@
+"""Tests for the incremental mbox reader."""
+
+import io
+import mailbox
+
+import pytest
+
+from panhunt.exceptions import PANHuntException
+from panhunt.formats.mbox import Mbox
+
+ATTACHMENT_MAIL = (
+    b'Subject: Receipt\n'
+    b'Content-Type: multipart/mixed; boundary="b"\n\n'
+    b'--b\nContent-Type: text/plain\n\nSee attached\n'
+    b'--b\nContent-Disposition: attachment; filename="card.txt"\n\nCard 5555555555554444\n'
+    b'--b--\n'
+)
+
+
+def _mbox_bytes(*messages: bytes) -> bytes:
+    return b''.join(b'From sender@example.com Mon Jan  1 00:00:00 2024\n' + message + b'\n' for message in messages)
+
+
+def test_messages_match_standard_library_reader(tmp_path):
+    payload = _mbox_bytes(
+        b'Subject: First\n\nCard 4111111111111111\n\n>From the archive\n',
+        b'Subject: Second\n\nNo card here\n',
+        ATTACHMENT_MAIL,
+    )
+    path = tmp_path / 'archive.mbox'
+    path.write_bytes(payload)
+    expected = [message.get_payload() for message in mailbox.mbox(str(path)) if not message.is_multipart()]
+
+    mails = list(Mbox(str(path)))
+
+    assert [mail.subject for mail in mails] == ['First', 'Second', 'Receipt']
+    assert [mail.body for mail in mails[:2]] == expected
+    assert mails[2].body == 'See attached'
+    assert mails[2].attachments[0].Payload.read() == b'Card 5555555555554444'
+    mails[2].close()
+
+
+def test_html_bodies_are_converted_to_text():
+    payload = _mbox_bytes(
+        b'Subject: Html\nContent-Type: text/html\n\n<div>Card <b>4111</b> 1111 1111 1111</div>\n',
+        b'Subject: Mixed\nContent-Type: multipart/mixed; boundary="b"\n\n'
+        b'--b\nContent-Type: text/html\n\n<p>Card 5555&#32;5555 5555 4444</p>\n--b--\n',
+    )
+
+    mails = list(Mbox('archive.mbox', payload=payload))
+
+    assert [mail.body.strip() for mail in mails] == ['Card 4111 1111 1111 1111', 'Card 5555 5555 5555 4444']
+
+
+def test_messages_are_yielded_before_the_rest_is_parsed():
+    payload = _mbox_bytes(b'Subject: First\n\nCard 4111111111111111\n', ATTACHMENT_MAIL)
+    mbox = Mbox('archive.mbox', payload=io.BytesIO(payload), max_total_attachment_bytes=10)
+    mails = iter(mbox)
+
+    assert next(mails).body == 'Card 4111111111111111\n'
+    with pytest.raises(PANHuntException, match='message limit'):
+        next(mails)
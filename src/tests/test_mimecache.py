@@ -0,0 +1,131 @@
+"""Tests for the persistent MIME cache."""
+
+import os
+import sqlite3
+
+import pytest
+
+from panhunt import panutils
+from panhunt.mimecache import SECONDS_PER_DAY, MimeCache
+
+DAY_ONE = 1_700_000_000
+
+
+def _cache(tmp_path, clock: float = DAY_ONE, **kwargs) -> MimeCache:
+    options = {'max_entries': 100, 'max_age_days': 30, 'detector_version': 'v1'}
+    options.update(kwargs)
+    return MimeCache(str(tmp_path / 'state'), clock=lambda: clock, **options)
+
+
+def _file(tmp_path, name: str, content: bytes = b'hello\n') -> os.stat_result:
+    path = tmp_path / name
+    path.write_bytes(content)
+    return os.stat(path)
+
+
+class TestMimeCache:
+    def test_round_trip_across_runs(self, tmp_path):
+        st = _file(tmp_path, 'a.txt')
+        cache = _cache(tmp_path)
+        assert cache.get(st, '.txt') is None
+        cache.put(st, '.txt', 'text/plain', 'us-ascii')
+        cache.close()
+
+        reopened = _cache(tmp_path)
+        assert reopened.get(st, '.txt') == ('text/plain', 'us-ascii')
+        assert (reopened.hits, reopened.misses) == (1, 0)
+        reopened.close()
+
+    def test_changed_file_is_a_miss(self, tmp_path):
+        st = _file(tmp_path, 'a.txt')
+        cache = _cache(tmp_path)
+        cache.put(st, '.txt', 'text/plain', 'us-ascii')
+        cache.flush()
+        changed = _file(tmp_path, 'a.txt', b'hello, world\n')
+        assert cache.get(changed, '.txt') is None
+        assert cache.get(st, '.doc') is None
+        cache.close()
+
+    def test_detector_change_clears_cache(self, tmp_path):
+        st = _file(tmp_path, 'a.txt')
+        cache = _cache(tmp_path)
+        cache.put(st, '.txt', 'text/plain', 'us-ascii')
+        cache.close()
+
+        upgraded = _cache(tmp_path, detector_version='v2')
+        assert upgraded.get(st, '.txt') is None
+        assert len(upgraded) == 0
+        upgraded.close()
+
+    def test_entries_not_seen_within_max_age_are_evicted(self, tmp_path):
+        old, fresh = _file(tmp_path, 'old.txt'), _file(tmp_path, 'fresh.txt')
+        cache = _cache(tmp_path, max_age_days=1)
+        cache.put(old, '.txt', 'text/plain', 'us-ascii')
+        cache.put(fresh, '.txt', 'text/plain', 'us-ascii')
+        cache.close()
+
+        later = _cache(tmp_path, clock=DAY_ONE + 2 * SECONDS_PER_DAY, max_age_days=1)
+        assert later.get(fresh, '.txt') is not None
+        later.close()
+
+        cache = _cache(tmp_path, clock=DAY_ONE + 2 * SECONDS_PER_DAY)
+        assert cache.get(old, '.txt') is None
+        assert cache.get(fresh, '.txt') is not None
+        cache.close()
+
+    def test_least_recently_seen_entries_beyond_limit_are_evicted(self, tmp_path):
+        files = [_file(tmp_path, f'{i}.txt') for i in range(3)]
+        for day, st in enumerate(files):
+            cache = _cache(tmp_path, clock=DAY_ONE + day * SECONDS_PER_DAY, max_entries=2)
+            cache.put(st, '.txt', 'text/plain', 'us-ascii')
+            cache.close()
+
+        cache = _cache(tmp_path, clock=DAY_ONE + 3 * SECONDS_PER_DAY)
+        assert len(cache) == 2
+        assert cache.get(files[0], '.txt') is None
+        cache.close()
+
+    def test_corrupt_database_is_rebuilt(self, tmp_path):
+        state = tmp_path / 'state'
+        state.mkdir()
+        (state / MimeCache.FILE_NAME).write_bytes(b'not a database' * 100)
+        cache = _cache(tmp_path)
+        assert len(cache) == 0
+        cache.close()
+
+
+class TestGetMimetypeWithCache:
+    @pytest.fixture
+    def cache(self, tmp_path):
+        cache = _cache(tmp_path)
+        panutils.set_mime_cache(cache)
+        yield cache
+        panutils.set_mime_cache(None)
+        cache.close()
+
+    def test_second_lookup_is_served_from_cache(self, tmp_path, cache, monkeypatch):
+        path = tmp_path / 'notes.txt'
+        path.write_text('plain ascii text\n')
+        first = panutils.get_mimetype(path=str(path))
+        monkeypatch.setattr(panutils, 'sniff', lambda *args: pytest.fail('detected again'))
+        assert panutils.get_mimetype(path=str(path)) == first
+        assert cache.hits == 1
+
+    def test_payloads_bypass_cache(self, cache):
+        panutils.get_mimetype(path='/data/a.txt', payload=b'plain ascii text\n')
+        assert (cache.hits, cache.misses) == (0, 0)
+
+    def test_failing_cache_disables_itself(self, tmp_path, cache, monkeypatch):
+        path = tmp_path / 'notes.txt'
+        path.write_text('plain ascii text\n')
+        monkeypatch.setattr(cache, '_conn', _BrokenConnection())
+        assert panutils.get_mimetype(path=str(path))[0] == 'text/plain'
+        assert cache._conn is None
+
+
+class _BrokenConnection:
+    def execute(self, *args):
+        raise sqlite3.OperationalError('disk I/O error')
+
+    def close(self):
+        pass
@@ -0,0 +1,108 @@
+"""Tests for the MS-CFB compound file and MSG readers."""
+
+import struct
+
+import pytest
+
+from panhunt.exceptions import PANHuntException
+from panhunt.formats.msmsg import MSCFB, MSMSG, DirectoryEntry, StreamReader
+
+LARGE = bytes(range(256)) * 40 + b'Payment 4111111111111111'
+SMALL = b'Short stream 5555555555554444' * 3
+
+
+def _stream(cfb: MSCFB, name: str) -> DirectoryEntry:
+    return cfb.directory.entries[0].children[name]
+
+
+class TestMSCFB:
+    def test_reads_fat_and_mini_streams_from_bytes(self, make_cfb):
+        cfb = MSCFB(make_cfb({'Large': LARGE, 'Small': SMALL}))
+
+        assert _stream(cfb, 'Large').get_data() == LARGE
+        assert _stream(cfb, 'Small').get_data() == SMALL
+        cfb.close()
+
+    def test_reads_memory_mapped_file(self, make_cfb, tmp_path):
+        path = tmp_path / 'sample.msg'
+        path.write_bytes(make_cfb({'Large': LARGE, 'Small': SMALL}))
+
+        cfb = MSCFB(str(path))
+
+        assert _stream(cfb, 'Large').get_data() == LARGE
+        assert _stream(cfb, 'Small').get_data() == SMALL
+        cfb.close()
+
+    def test_contiguous_stream_is_one_run_viewed_in_place(self, make_cfb):
+        cfb = MSCFB(make_cfb({'Large': LARGE}))
+        entry = _stream(cfb, 'Large')
+
+        assert len(entry.get_runs()) == 1
+        view = entry.get_view()
+        assert isinstance(view, memoryview) and view == LARGE
+        view.release()
+        cfb.close()
+
+    def test_stream_reader_reads_lazily(self, make_cfb):
+        cfb = MSCFB(make_cfb({'Small': SMALL}))
+        reader = _stream(cfb, 'Small').open_stream()
+
+        assert reader.read(10) == SMALL[:10]
+        reader.seek(60)
+        assert reader.read(10) == SMALL[60:70]
+        reader.seek(0)
+        assert reader.read() == SMALL
+        assert reader.read(1) == b''
+        cfb.close()
+
+    def test_stream_reader_joins_runs_in_chain_order(self):
+        reader = StreamReader(memoryview(b'0123456789abcdef'), [(10, 4), (2, 3)], 7)
+
+        assert reader.read(5) == b'abcd2'
+        assert reader.read() == b'34'
+        reader.seek(3)
+        assert reader.read(2) == b'd2'
+
+    def test_looping_sector_chain_is_rejected(self, make_cfb):
+        payload = bytearray(make_cfb({'Large': LARGE}))
+        fat_offset = (struct.unpack_from('<I', payload, 76)[0] + 1) * 512
+        last_sector = len(LARGE) // 512
+        struct.pack_into('<I', payload, fat_offset + last_sector * 4, 0)
+
+        cfb = MSCFB(bytes(payload))
+
+        with pytest.raises(PANHuntException, match='chain'):
+            _stream(cfb, 'Large').get_data()
+        cfb.close()
+
+    def test_non_compound_content_is_invalid(self):
+        cfb = MSCFB(b'plain text, not a compound file')
+
+        assert cfb.validCFB is False
+        cfb.close()
+
+
+class TestMSMSGScanOnly:
+    def test_resolves_body_and_lazy_attachments(self, make_msg):
+        attachment = b'Invoice 4111111111111111' * 300
+        msg = MSMSG(make_msg('Card 5555555555554444', {'docs/invoice.txt': attachment}), scan_only=True)
+
+        assert msg.validMSG
+        assert msg.Body == 'Card 5555555555554444'
+        assert not hasattr(msg, 'Subject')
+        [att] = msg.attachments
+        assert att.Filename == 'invoice.txt'
+        assert att.BinaryData is None
+        assert att.data_size == len(attachment)
+        assert att.open_data().read() == attachment
+        assert att.get_data() == attachment
+        msg.close()
+
+    def test_does_not_decode_recipients(self, make_msg):
+        payload = make_msg('Body', {}, recipient=b'\x00' * 8 + b'truncated')
+
+        msg = MSMSG(payload, scan_only=True)
+
+        assert msg.recipients == []
+        assert msg.attachments == []
+        msg.close()
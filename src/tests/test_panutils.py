@@ -60,8 +60,9 @@ def from_buffer(self, buffer):
     monkeypatch.delattr(panutils._thread_local, 'magic_detector', raising=False)
     monkeypatch.setattr(panutils.magic, 'Magic', FakeMagic)
 
-    assert panutils.get_mimetype(payload=b'hello') == ('text/plain', 'us-ascii', None)
-    assert panutils.get_mimetype(payload=b'world') == ('text/plain', 'us-ascii', None)
+    # Leading NUL bytes keep these payloads out of the built-in signature table.
+    assert panutils.get_mimetype(payload=b'\x00hello') == ('text/plain', 'us-ascii', None)
+    assert panutils.get_mimetype(payload=b'\x00world') == ('text/plain', 'us-ascii', None)
     assert FakeMagic.instances == 1
 
 
@@ -84,22 +85,22 @@ def from_file(self, filename):
             return 'text/plain; charset=utf-8'
 
     file_path = tmp_path / 'sample.txt'
-    file_path.write_text('hello', encoding='utf-8')
-    stream = BytesIO(b'stream payload')
+    file_path.write_bytes(b'\x00hello')
+    stream = BytesIO(b'\x00stream payload')
     stream.seek(3)
 
     monkeypatch.delattr(panutils._thread_local, 'magic_detector', raising=False)
     monkeypatch.setattr(panutils.magic, 'Magic', FakeMagic)
 
     assert panutils.get_mimetype(path=str(file_path)) == ('text/plain', 'utf-8', None)
-    assert panutils.get_mimetype(payload=b'buffer payload') == ('text/plain', 'utf-8', None)
+    assert panutils.get_mimetype(payload=b'\x00buffer payload') == ('text/plain', 'utf-8', None)
     assert panutils.get_mimetype(payload=stream) == ('text/plain', 'utf-8', None)
 
     assert FakeMagic.instances == 1
     assert calls == [
         ('file', str(file_path), {'mime': True, 'mime_encoding': True}),
-        ('buffer', b'buffer payload', {'mime': True, 'mime_encoding': True}),
-        ('buffer', b'stream payload', {'mime': True, 'mime_encoding': True}),
+        ('buffer', b'\x00buffer payload', {'mime': True, 'mime_encoding': True}),
+        ('buffer', b'\x00stream payload', {'mime': True, 'mime_encoding': True}),
     ]
     assert stream.tell() == 0
 
@@ -150,8 +151,8 @@ def from_buffer(self, buffer):
     monkeypatch.delattr(panutils._thread_local, 'magic_detector', raising=False)
     monkeypatch.setattr(panutils.magic, 'Magic', FakeMagic)
 
-    assert panutils.get_mimetype(payload=b'abc') == ('application/octet-stream', 'binary', None)
-    assert seen_buffers == [b'abc']
+    assert panutils.get_mimetype(payload=b'\x00bc') == ('application/octet-stream', 'binary', None)
+    assert seen_buffers == [b'\x00bc']
 
 
 def test_get_mimetype_returns_error_fallback(monkeypatch):
@@ -165,7 +166,7 @@ def from_buffer(self, buffer):
     monkeypatch.delattr(panutils._thread_local, 'magic_detector', raising=False)
     monkeypatch.setattr(panutils.magic, 'Magic', FakeMagic)
 
-    mime_type, encoding, error = panutils.get_mimetype(payload=b'abc')
+    mime_type, encoding, error = panutils.get_mimetype(payload=b'\x00bc')
 
     assert mime_type == 'Unknown/Unknown'
     assert encoding == 'Unknown'
@@ -86,7 +86,7 @@ def test_json_not_written_without_dir(self, tmp_dir):
         presenter = CliPresenter()
         with patch.object(presenter, '_report_gen') as mock_gen:
             presenter._save_json(result)
-            mock_gen.generate_json.assert_not_called()
+            mock_gen.iter_json.assert_not_called()
 
 
 class TestShow:
@@ -1,12 +1,13 @@
 """Tests for ReportGenerator."""
 
+import json
 import os
 from datetime import datetime, timedelta
 
 import pytest
 
 from panhunt.finding import Finding
-from panhunt.models import ScanResult
+from panhunt.models import ScanResult, UnfinishedWork
 from panhunt.pan import PAN
 from panhunt.report import ReportGenerator
 
@@ -60,6 +61,12 @@ def test_interesting_files_section_when_present(self, generator, config):
         text = generator.generate_text(result)
         assert 'Interesting Files' in text
 
+    def test_interesting_files_are_listed_in_recorded_order(self, generator, config):
+        result = _make_result(config, interesting=[
+            Finding(basename='zeta.txt', dirname='/no/such/dir'), Finding(basename='alpha.txt', dirname='/no/such/dir')])
+        text = generator.generate_text(result)
+        assert text.index('zeta.txt') < text.index('alpha.txt')
+
     def test_no_interesting_section_when_empty(self, generator, config):
         result = _make_result(config)
         text = generator.generate_text(result)
@@ -124,3 +131,40 @@ def test_json_report_omits_command_line(self, generator, config):
         result = _make_result(config)
         data = generator.generate_json(result)
         assert 'command' not in data
+
+    @pytest.mark.parametrize('matched_count, interesting_count', [(0, 0), (2, 1)])
+    def test_streamed_json_matches_dumped_report(self, generator, config, matched_count, interesting_count):
+        matched = []
+        for index in range(matched_count):
+            finding = Finding(basename=f'card{index}.txt', dirname='/data')
+            finding.matches = [PAN(brand='Visa', pan='4111111111111111'), PAN(brand='Visa', pan='4012888888881881')]
+            matched.append(finding)
+        interesting = [Finding(basename=f'ghost{index}.txt', dirname='/no/such/dir') for index in range(interesting_count)]
+        result = _make_result(config, matched=matched, interesting=interesting)
+        result.unfinished = UnfinishedWork(unscanned_paths=['/data/later'], pending_jobs=1)
+
+        assert ''.join(generator.iter_json(result)) == json.dumps(generator.generate_json(result), indent=4)
+
+
+class TestPartialScan:
+    def _partial_result(self, config):
+        result = _make_result(config)
+        result.unfinished = UnfinishedWork(unscanned_paths=['/data/archive', '/data/b.zip!/c.txt'], pending_jobs=1)
+        return result
+
+    def test_text_lists_unscanned_paths(self, generator, config):
+        text = generator.generate_text(self._partial_result(config))
+        assert 'PARTIAL SCAN' in text
+        assert '1 pending jobs and 2 unscanned paths' in text
+        assert '/data/archive\n' in text
+        assert '/data/b.zip!/c.txt\n' in text
+
+    def test_json_has_partial_section(self, generator, config):
+        data = generator.generate_json(self._partial_result(config))
+        assert data['partial']['pending_jobs'] == 1
+        assert data['partial']['unscanned_paths'] == ['/data/archive', '/data/b.zip!/c.txt']
+
+    def test_complete_scan_has_no_partial_section(self, generator, config):
+        result = _make_result(config)
+        assert 'PARTIAL SCAN' not in generator.generate_text(result)
+        assert 'partial' not in generator.generate_json(result)
@@ -0,0 +1,62 @@
+"""Tests for per-worker result shards and their lazy views."""
+
+import threading
+
+import pytest
+
+from panhunt.results import ResultShards
+
+
+class TestResultShards:
+    def test_each_thread_appends_to_its_own_shard(self):
+        shards = ResultShards()
+
+        def producer(prefix):
+            for i in range(100):
+                shards.append(f'{prefix}-{i}')
+
+        threads = [threading.Thread(target=producer, args=(p,)) for p in 'abcd']
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(shards) == 400
+        assert len(shards._shards) == 4
+        assert sorted(shards) == sorted(f'{p}-{i}' for p in 'abcd' for i in range(100))
+
+    def test_snapshot_does_not_see_later_appends(self):
+        shards = ResultShards()
+        shards.append('first')
+        view = shards.snapshot()
+        shards.append('second')
+
+        assert list(view) == ['first']
+        assert len(view) == 1
+        assert len(shards.snapshot()) == 2
+
+
+class TestResultView:
+    def test_indexing_spans_shards(self):
+        shards = ResultShards()
+        shards.append('main')
+        worker = threading.Thread(target=lambda: shards.append('worker'))
+        worker.start()
+        worker.join()
+        view = shards.snapshot()
+
+        assert view[0] == 'main'
+        assert view[1] == 'worker'
+        assert view[-1] == 'worker'
+        with pytest.raises(IndexError):
+            view[2]
+
+    def test_compares_equal_to_sequence_with_same_items(self):
+        shards = ResultShards()
+        assert shards.snapshot() == []
+        shards.append(1)
+        assert shards.snapshot() == [1]
+        assert shards.snapshot() != [2]
+
+    def test_empty_view_is_falsy(self):
+        assert not ResultShards().snapshot()
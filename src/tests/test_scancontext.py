@@ -1,6 +1,6 @@
 import pytest
 
-from panhunt.exceptions import PANHuntException
+from panhunt.exceptions import PANHuntException, ScanCancelledException
 from panhunt.scancontext import ResourceBudget, ScanContext, ScanLimits
 
 
@@ -84,3 +84,14 @@ def test_attachment_budget_enforces_per_message_count():
 
     with pytest.raises(PANHuntException, match='Attachment count limit exceeded'):
         root.reserve_attachment('two.txt', 1, attachment_count=2)
+
+
+def test_cancelled_budget_rejects_new_children():
+    root = _root_context()
+    root.budget.cancel()
+
+    assert root.budget.cancelled is True
+    with pytest.raises(ScanCancelledException, match='/tmp/root.zip!/child.txt'):
+        root.child('child.txt')
+    with pytest.raises(ScanCancelledException):
+        root.check_cancelled()
@@ -1,13 +1,20 @@
 """Tests for PlainTextFileScanner (and shared ScannerBase wiring)."""
 
+import base64
 import io
 import os
+import struct
+from unittest.mock import patch
 
 import pytest
 
+from panhunt.bytesource import ByteSource
+from panhunt.dedup import payload_digest
+from panhunt.exceptions import PANHuntException, ScanCancelledException
 from panhunt.finder import PanFinder
 from panhunt.job import Job
-from panhunt.scanner import LegacyOfficeScanner, PlainTextFileScanner
+from panhunt.scancontext import ScanContext, ScanLimits
+from panhunt.scanner import EmlScanner, LegacyOfficeScanner, MboxScanner, MsgScanner, PlainTextFileScanner
 
 
 @pytest.fixture
@@ -183,6 +190,128 @@ def test_empty_stream_returns_empty(self, scanner):
         assert result == []
 
 
+    def test_cancelled_context_stops_stream_scan(self, scanner):
+        limits = ScanLimits(max_depth=1, max_child_jobs=1, max_total_expanded_bytes=1)
+        context = ScanContext.root('/tmp/stream.txt', limits)
+        context.budget.cancel()
+        job = Job(basename='stream.txt', dirname='/tmp', payload=io.BytesIO(b'4111111111111111\n'), context=context)
+        with pytest.raises(ScanCancelledException):
+            scanner.scan(job)
+
+class TestMappedScan:
+    CARDS = ['4111111111111111', '5555 5555 5555 4444', '378282246310005']
+
+    def _content(self) -> bytes:
+        lines = [f'row {i} ref {self.CARDS[i % 3] if i % 7 == 0 else "n/a"} end' for i in range(200)]
+        return '\n'.join(lines).encode('utf-8')
+
+    @pytest.mark.parametrize('window_size', [17, 64, 1000, 1 << 20])
+    def test_windows_match_line_scan(self, scanner, tmp_path, window_size):
+        path = tmp_path / 'big.log'
+        path.write_bytes(self._content())
+
+        expected = scanner._scan_lines(str(path), 'utf8')
+        result = scanner._scan_mapped(memoryview(path.read_bytes()), 'utf8', window_size=window_size)
+
+        assert sorted(map(str, result)) == sorted(map(str, expected))
+        assert len(result) == len(expected) > 0
+
+    def test_window_never_splits_a_pan_without_newlines(self, scanner):
+        content = b'|'.join(b'4111111111111111' for _ in range(50))
+        result = scanner._scan_mapped(memoryview(content), 'utf8', window_size=23)
+        assert len(result) == 50
+
+    def test_lookbehind_sees_previous_window(self, scanner):
+        content = b'a' * 20 + b'|' + b'z4111111111111111 ' * 3
+        assert scanner._scan_mapped(memoryview(content), 'utf8', window_size=21) == []
+
+    def test_non_ascii_digits_match_as_in_decoded_text(self, scanner):
+        content = 'ref 4\u0661\u0661\u0661 \u0661\u0661\u0661\u0661 1111 \u0661111 \u0928\u092e\u0938\u094d\u0924\u0947\n'
+        expected = scanner._pan_finder.find(content)
+        result = scanner._scan_mapped(memoryview(content.encode('utf-8')), 'utf8', window_size=8)
+        assert [str(pan) for pan in result] == [str(pan) for pan in expected]
+        assert len(result) == 1
+
+    def test_large_file_uses_mapped_scan(self, scanner, tmp_path, monkeypatch):
+        monkeypatch.setattr('panhunt.scanner.BLOCK_SIZE_BYTES', 64)
+        path = tmp_path / 'big.log'
+        path.write_bytes(self._content())
+        monkeypatch.setattr(scanner, '_scan_lines', lambda *args: pytest.fail('line scan used'))
+        job = Job(basename=path.name, dirname=str(tmp_path))
+        assert len(scanner.scan(job)) == len([i for i in range(200) if i % 7 == 0])
+
+    def test_utf16_falls_back_to_line_scan(self, scanner, tmp_path, monkeypatch):
+        monkeypatch.setattr('panhunt.scanner.BLOCK_SIZE_BYTES', 64)
+        path = tmp_path / 'wide.txt'
+        path.write_bytes(('pad ' * 20 + '4111111111111111\n').encode('utf-16'))
+        assert len(scanner._scan_file(str(path), 'utf-16')) == 1
+
+    def test_cancelled_context_stops_mapped_scan(self, scanner):
+        limits = ScanLimits(max_depth=1, max_child_jobs=1, max_total_expanded_bytes=1)
+        context = ScanContext.root('/tmp/big.log', limits)
+        context.budget.cancel()
+        with pytest.raises(ScanCancelledException):
+            scanner._scan_mapped(memoryview(b'4111111111111111\n'), 'utf8', context)
+
+    def test_ranges_cover_file_between_digit_runs(self, tmp_path):
+        path = tmp_path / 'big.log'
+        content = self._content()
+        path.write_bytes(content)
+
+        ranges = PlainTextFileScanner.split_ranges(str(path), 'utf8', 100)
+
+        assert ranges[0][0] == 0 and ranges[-1][1] == len(content)
+        assert all(a[1] == b[0] for a, b in zip(ranges, ranges[1:]))
+        assert all(content[end - 1:end] not in b'0123456789 -' for _, end in ranges[:-1])
+
+    def test_range_scans_match_whole_file(self, scanner, tmp_path):
+        path = tmp_path / 'big.log'
+        path.write_bytes(self._content())
+
+        ranges = PlainTextFileScanner.split_ranges(str(path), 'utf8', 100)
+        result = [pan for start, end in ranges for pan in scanner.scan_range(str(path), 'utf8', start, end)]
+
+        assert len(ranges) > 10
+        assert list(map(str, result)) == list(map(str, scanner._scan_lines(str(path), 'utf8')))
+
+    def test_live_range_scans_read_the_same_ranges_and_matches(self, scanner, tmp_path):
+        path = tmp_path / 'big.log'
+        path.write_bytes(self._content())
+
+        ranges = PlainTextFileScanner.split_ranges(str(path), 'utf8', 100, live=True)
+        result = [pan for start, end in ranges
+                  for pan in scanner.scan_range(str(path), 'utf8', start, end, live=True)]
+
+        assert ranges == PlainTextFileScanner.split_ranges(str(path), 'utf8', 100)
+        assert list(map(str, result)) == list(map(str, scanner._scan_lines(str(path), 'utf8')))
+
+    def test_live_range_scan_reads_in_windows(self, scanner, tmp_path):
+        path = tmp_path / 'big.log'
+        path.write_bytes(self._content())
+
+        result = scanner._scan_read(str(path), 'utf8', None, 0, len(self._content()), window_size=100)
+
+        assert list(map(str, result)) == list(map(str, scanner._scan_lines(str(path), 'utf8')))
+
+    def test_live_range_past_a_truncation_is_not_read(self, scanner, tmp_path):
+        path = tmp_path / 'app.log'
+        path.write_bytes(b'ref 4111111111111111\n')
+
+        assert list(map(str, scanner.scan_range(str(path), 'utf8', 0, 1_000_000, live=True))) == [
+            'Visa:411111******1111']
+
+    def test_resume_point_rewinds_over_an_unfinished_run(self, tmp_path):
+        path = tmp_path / 'app.log'
+        path.write_bytes(b'line one\nref 4111 1111')
+        assert PlainTextFileScanner.resume_point(str(path), 22) == 12
+        assert PlainTextFileScanner.resume_point(str(path), 9) == 9
+
+    def test_utf16_file_is_not_split(self, tmp_path):
+        path = tmp_path / 'wide.txt'
+        path.write_bytes(('pad ' * 200).encode('utf-16'))
+        assert PlainTextFileScanner.split_ranges(str(path), 'utf-16', 100) == []
+
+
 class TestPanFinderInjection:
     def test_custom_pan_finder_is_used(self, mock_buffer, config):
         custom_finder = PanFinder(config)
@@ -208,3 +337,184 @@ def test_finds_utf16le_pan_in_legacy_office_bytes(self, mock_buffer, config):
         result = scanner.scan(job, encoding='binary')
 
         assert len(result) == 1
+
+    def test_scans_only_text_streams_of_compound_file(self, mock_buffer, config, make_cfb):
+        scanner = LegacyOfficeScanner(buffer=mock_buffer, config=config)
+        payload = make_cfb({
+            'WordDocument': b'\x00' * 5000 + 'Payment 4111111111111111'.encode('utf-16le'),
+            '1Table': b'Style 5555555555554444',
+            'Data': b'Picture 378282246310005',
+        })
+        job = Job(basename='legacy.doc', dirname='/tmp', payload=payload)
+
+        result = scanner.scan(job, encoding='binary')
+
+        assert [str(pan) for pan in result] == ['Visa:411111******1111']
+        mock_buffer.enqueue.assert_not_called()
+
+    def test_enqueues_packaged_files_from_embedded_storages(self, mock_buffer, config, make_cfb):
+        scanner = LegacyOfficeScanner(buffer=mock_buffer, config=config)
+        packaged = b'card.txt\x00C:\\card.txt\x00' + b'\x00' * 8 + b'C:\\tmp\\card.txt\x00'
+        content = b'Payment 5555555555554444'
+        payload = make_cfb({
+            'Workbook': b'Total 4111111111111111',
+            'MBD0001A2B3/\x01Ole10Native': struct.pack('<IH', 0, 2) + packaged + struct.pack('<I', len(content)) + content,
+            'MBD0001A2B3/\x01CompObj': b'ignored 378282246310005',
+            'MBD0004C5D6/Workbook': b'Embedded 378282246310005',
+        })
+        job = Job(basename='legacy.xls', dirname='/tmp', payload=payload)
+
+        result = scanner.scan(job, encoding='binary')
+
+        assert sorted(str(pan) for pan in result) == ['AMEX:378282*****0005', 'Visa:411111******1111']
+        child = mock_buffer.enqueue.call_args.args[0]
+        assert mock_buffer.enqueue.call_count == 1
+        assert child.basename == 'MBD0001A2B3/card.txt'
+        assert child.payload == content
+
+    def test_corrupt_compound_file_is_scanned_as_raw_bytes(self, mock_buffer, config, make_cfb):
+        scanner = LegacyOfficeScanner(buffer=mock_buffer, config=config)
+        payload = make_cfb({'WordDocument': b'Payment 4111111111111111'})[:520]
+        job = Job(basename='legacy.doc', dirname='/tmp', payload=payload + b'Payment 4111111111111111')
+
+        assert len(scanner.scan(job, encoding='binary')) == 1
+
+    def test_repeated_string_is_scanned_once(self, mock_buffer, config):
+        scanner = LegacyOfficeScanner(buffer=mock_buffer, config=config)
+        cell = b'Payment 4111111111111111'
+        payload = b'\xd0\xcf\x11\xe0' + cell + b'\x01' + cell + b'\x02' + cell.decode().encode('utf-16le')
+
+        assert len(scanner._scan_payload(payload)) == 1
+
+    def test_extracts_runs_split_by_non_printable_bytes(self):
+        payload = b'short\x01' + b'Total\t4111111111111111\r\n' + b'\xff' + 'Ref 5555555555554444'.encode('utf-16le')
+
+        assert list(LegacyOfficeScanner._iter_binary_strings(payload)) == [
+            'Total\t4111111111111111\r\n', 'Ref 5555555555554444'
+        ]
+
+
+class TestMsgScanner:
+    def test_scans_body_and_enqueues_attachments_of_payload(self, mock_buffer, config, make_msg):
+        scanner = MsgScanner(buffer=mock_buffer, config=config)
+        payload = make_msg('Card 4111111111111111', {'invoice.txt': b'Total 5555555555554444'})
+        job = Job(basename='mail.msg', dirname='/tmp', payload=payload)
+
+        result = scanner.scan(job)
+
+        assert [str(pan) for pan in result] == ['Visa:411111******1111']
+        child = mock_buffer.enqueue.call_args.args[0]
+        assert child.basename == 'invoice.txt'
+        assert child.payload.read() == b'Total 5555555555554444'
+        assert child.content_hash is not None
+        child.payload.close()
+
+    def test_spooled_stream_payload_is_mapped_not_read(self, mock_buffer, config, make_msg, tmp_path):
+        scanner = MsgScanner(buffer=mock_buffer, config=config)
+        with open(tmp_path / 'spooled.msg', 'w+b') as spooled:
+            spooled.write(make_msg('Card 4111111111111111', {}))
+            job = Job(basename='mail.msg', dirname='/tmp', payload=spooled)
+
+            with patch.object(ByteSource, '_read_stream', side_effect=AssertionError('stream read into memory')):
+                result = scanner.scan(job)
+
+        assert [str(pan) for pan in result] == ['Visa:411111******1111']
+
+    def test_rejects_attachment_over_size_limit(self, mock_buffer, config, make_msg):
+        config.max_attachment_size = 10
+        scanner = MsgScanner(buffer=mock_buffer, config=config)
+        job = Job(basename='mail.msg', dirname='/tmp', payload=make_msg('Body', {'big.bin': b'x' * 11}))
+
+        with pytest.raises(PANHuntException, match='exceeds configured size limit'):
+            scanner.scan(job)
+        mock_buffer.enqueue.assert_not_called()
+
+
+EML = (b'From: a@example.com\r\nSubject: Invoice\r\nMIME-Version: 1.0\r\n'
+       b'Content-Type: multipart/mixed; boundary="b"\r\n\r\n'
+       b'--b\r\nContent-Type: text/plain\r\n\r\nCard 4111111111111111\r\n'
+       b'--b\r\nContent-Type: application/octet-stream\r\nContent-Disposition: attachment; filename="card.txt"\r\n'
+       b'Content-Transfer-Encoding: base64\r\n\r\n'
+       + base64.encodebytes(b'Total 5555555555554444') +
+       b'--b--\r\n')
+
+
+class TestEmailScanners:
+    def test_eml_attachment_is_enqueued_as_spooled_stream(self, mock_buffer, config):
+        scanner = EmlScanner(buffer=mock_buffer, config=config)
+        job = Job(basename='mail.eml', dirname='/tmp', payload=EML)
+
+        result = scanner.scan(job)
+
+        assert [str(pan) for pan in result] == ['Visa:411111******1111']
+        child = mock_buffer.enqueue.call_args.args[0]
+        assert child.basename == 'card.txt'
+        assert child.payload.read() == b'Total 5555555555554444'
+        assert child.content_hash == payload_digest(b'Total 5555555555554444')
+        child.payload.close()
+
+    def test_html_only_eml_is_scanned_without_child_jobs(self, mock_buffer, config):
+        scanner = EmlScanner(buffer=mock_buffer, config=config)
+        payload = b'Subject: Ticket\nContent-Type: text/html\n\n<p>Card <b>4111</b>&nbsp;1111 1111 1111</p>\n'
+        job = Job(basename='mail.eml', dirname='/tmp', payload=payload)
+
+        result = scanner.scan(job)
+
+        assert [str(pan) for pan in result] == ['Visa:411111******1111']
+        mock_buffer.enqueue.assert_not_called()
+
+    def test_mbox_messages_are_reported_with_their_attachments_below_them(self, mock_buffer, config):
+        findings = []
+        scanner = MboxScanner(buffer=mock_buffer, config=config, report=findings.append)
+        payload = b'From a@example.com Mon Jan  1 00:00:00 2024\n' + EML.replace(b'\r\n', b'\n')
+        job = Job(basename='mail.mbox', dirname='/tmp', payload=payload * 2)
+
+        assert scanner.scan(job) == []
+
+        assert [(f.abspath, [str(pan) for pan in f.matches]) for f in findings] == [
+            ('/tmp/mail.mbox/message 1', ['Visa:411111******1111']),
+            ('/tmp/mail.mbox/message 2', ['Visa:411111******1111']),
+        ]
+        children = [call.args[0] for call in mock_buffer.enqueue.call_args_list]
+        assert [child.abspath for child in children] == [
+            '/tmp/mail.mbox/message 1/card.txt', '/tmp/mail.mbox/message 2/card.txt']
+        assert [child.payload.read() for child in children] == [b'Total 5555555555554444'] * 2
+        for child in children:
+            child.payload.close()
+
+    def test_large_mbox_is_split_into_message_batches(self, mock_buffer, config, tmp_path):
+        config.mbox_split_threshold, config.mbox_batch_messages = 1, 2
+        messages = [b'From a@example.com Mon Jan  1 00:00:00 2024\nSubject: %d\n\nCard 4111111111111111\n\n' % index
+                    for index in range(1, 6)]
+        messages[2] = messages[2].replace(b'Card 4111111111111111', b'No card')
+        path = tmp_path / 'archive.mbox'
+        path.write_bytes(b'preamble\n' + b''.join(messages))
+        findings = []
+        scanner = MboxScanner(buffer=mock_buffer, config=config, report=findings.append)
+
+        assert scanner.scan(Job(basename='archive.mbox', dirname=str(tmp_path))) == []
+
+        batches = [call.args[0] for call in mock_buffer.enqueue.call_args_list]
+        assert [batch.message_range for batch in batches] == [(1, 2), (3, 4), (5, 5)]
+        assert {batch.abspath for batch in batches} == {str(path)}
+        assert batches[2].payload.read() == messages[4]
+        batches[2].payload.seek(0)
+        mock_buffer.reset_mock()
+        assert [scanner.scan(batch) for batch in batches] == [[], [], []]
+        mock_buffer.enqueue.assert_not_called()
+        assert [f.basename for f in findings] == ['message 1', 'message 2', 'message 4', 'message 5']
+        assert findings[0].abspath == os.path.join(str(path), 'message 1')
+        assert [str(pan) for pan in findings[0].matches] == ['Visa:411111******1111']
+        for batch in batches:
+            batch.payload.close()
+
+    def test_large_mbox_below_its_split_threshold_is_not_split(self, mock_buffer, config, tmp_path):
+        config.range_split_threshold, config.mbox_batch_messages = 1, 1
+        path = tmp_path / 'archive.mbox'
+        path.write_bytes(b'From a@example.com Mon Jan  1 00:00:00 2024\n\nCard 4111111111111111\n\n' * 2)
+        findings = []
+        scanner = MboxScanner(buffer=mock_buffer, config=config, report=findings.append)
+
+        assert scanner.scan(Job(basename='archive.mbox', dirname=str(tmp_path))) == []
+        assert [f.basename for f in findings] == ['message 1', 'message 2']
+        mock_buffer.enqueue.assert_not_called()
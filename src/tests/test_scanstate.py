@@ -0,0 +1,161 @@
+"""Tests for the persistent scan state."""
+
+import os
+
+from panhunt.enums import ScanStatusEnum
+from panhunt.mimecache import SECONDS_PER_DAY
+from panhunt.scanstate import ScanState
+from panhunt.sink import FindingRecord
+
+DAY_ONE = 1_700_000_000
+
+
+def _state(tmp_path, clock: float = DAY_ONE, **kwargs) -> ScanState:
+    return ScanState(str(tmp_path / 'state'), clock=lambda: clock, **kwargs)
+
+
+def _file(tmp_path, name: str = 'cards.txt', content: bytes = b'4111111111111111\n') -> str:
+    path = tmp_path / name
+    path.write_bytes(content)
+    return str(path)
+
+
+def _record(path: str) -> FindingRecord:
+    return FindingRecord(
+        basename=os.path.basename(path), dirname=os.path.dirname(path), abspath=path, logical_path=path,
+        status=ScanStatusEnum.Success, size=17, mime_type='text/plain', encoding='us-ascii',
+        matches=['Visa:411111******1111'],
+    )
+
+
+def _scan(tmp_path, path: str, **kwargs) -> None:
+    state = _state(tmp_path, **kwargs)
+    assert state.previous_results(path, os.stat(path)) is None
+    state.add(path, _record(path))
+    state.close()
+
+
+class TestScanState:
+    def test_unchanged_file_returns_previous_results(self, tmp_path):
+        path = _file(tmp_path)
+        _scan(tmp_path, path)
+
+        state = _state(tmp_path)
+        assert state.previous_results(path, os.stat(path)) == [_record(path)]
+        assert state.skipped == 1
+        state.close()
+
+    def test_clean_file_returns_empty_results(self, tmp_path):
+        path = _file(tmp_path, content=b'nothing here\n')
+        state = _state(tmp_path)
+        assert state.previous_results(path, os.stat(path)) is None
+        state.close()
+
+        state = _state(tmp_path)
+        assert state.previous_results(path, os.stat(path)) == []
+        state.close()
+
+    def test_modified_file_is_scanned_again(self, tmp_path):
+        path = _file(tmp_path)
+        _scan(tmp_path, path)
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+        state = _state(tmp_path)
+        assert state.previous_results(path, os.stat(path)) is None
+        state.close()
+
+    def test_content_hash_skips_touched_file(self, tmp_path):
+        path = _file(tmp_path)
+        _scan(tmp_path, path, use_content_hash=True)
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+        state = _state(tmp_path, use_content_hash=True)
+        assert state.previous_results(path, os.stat(path)) == [_record(path)]
+        state.close()
+
+        _file(tmp_path, content=b'4111111111111112\n')
+        state = _state(tmp_path, use_content_hash=True)
+        assert state.previous_results(path, os.stat(path)) is None
+        state.close()
+
+    def test_interrupted_file_keeps_previous_entry(self, tmp_path):
+        path = _file(tmp_path)
+        _scan(tmp_path, path)
+        _file(tmp_path, content=b'4111111111111111\n5555555555554444\n')
+
+        state = _state(tmp_path)
+        assert state.previous_results(path, os.stat(path)) is None
+        state.interrupt(path)
+        state.close()
+
+        state = _state(tmp_path)
+        assert state.previous_results(path, os.stat(path)) is None
+        state.close()
+
+    def test_rescan_ignores_previous_results(self, tmp_path):
+        path = _file(tmp_path)
+        _scan(tmp_path, path)
+
+        state = _state(tmp_path, rescan=True)
+        assert state.previous_results(path, os.stat(path)) is None
+        state.close()
+
+    def test_entries_not_seen_within_max_age_are_evicted(self, tmp_path):
+        path = _file(tmp_path)
+        _scan(tmp_path, path)
+
+        _state(tmp_path, clock=DAY_ONE + (ScanState.MAX_AGE_DAYS + 1) * SECONDS_PER_DAY).close()
+        assert len(_state(tmp_path)) == 0
+
+    def test_finished_entries_are_saved_without_close(self, tmp_path):
+        path = _file(tmp_path)
+        state = _state(tmp_path)
+        state.FLUSH_EVERY = 1
+        assert state.previous_results(path, os.stat(path)) is None
+        state.add(path, _record(path))
+        state.finish(path)
+        assert state._scanned == {}
+
+        other = _state(tmp_path)
+        assert other.previous_results(path, os.stat(path)) == [_record(path)]
+        other.close()
+        state.close()
+
+    def test_interrupted_file_is_not_saved_by_finish(self, tmp_path):
+        path = _file(tmp_path)
+        _scan(tmp_path, path)
+
+        state = _state(tmp_path, rescan=True)
+        assert state.previous_results(path, os.stat(path)) is None
+        state.interrupt(path)
+        state.finish(path)
+        state.close()
+
+        state = _state(tmp_path)
+        assert state.previous_results(path, os.stat(path)) == [_record(path)]
+        state.close()
+
+    def test_grown_file_carries_forward_its_stored_results(self, tmp_path):
+        path = _file(tmp_path)
+        _scan(tmp_path, path)
+        with open(path, 'ab') as file:
+            file.write(b'more\n')
+
+        state = _state(tmp_path)
+        assert state.previous_results(path, os.stat(path)) is None
+        assert state.carry_forward(path) == [_record(path)]
+        state.close()
+
+    def test_replaced_file_does_not_carry_forward_stored_results(self, tmp_path):
+        path = _file(tmp_path)
+        _scan(tmp_path, path)
+        replacement = _file(tmp_path, 'rotated.txt', b'4111111111111111\nmore\n')
+        os.link(path, str(tmp_path / 'cards.txt.1'))  # keeps the old inode from being reused
+        os.replace(replacement, path)
+
+        state = _state(tmp_path)
+        assert state.previous_results(path, os.stat(path)) is None
+        assert state.carry_forward(path) is None
+        state.close()
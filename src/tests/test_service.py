@@ -90,6 +90,98 @@ def test_failures_passed_through(self, config):
             result = svc.scan(config)
         assert len(result.interesting_files) == 1
 
+    def test_ndjson_sink_streams_results(self, tmp_path):
+        target = tmp_path / 'data'
+        target.mkdir()
+        (target / 'card.txt').write_text('4111 1111 1111 1111\n')
+        config = ScanConfiguration.from_args(
+            target_path=str(target), ndjson_dir=str(tmp_path / 'out'), quiet=True, worker_count=1)
+
+        result = PanHuntService().scan(config)
+
+        path = config.get_ndjson_path()
+        assert path is not None
+        with open(path, encoding='utf-8') as f:
+            assert len(f.read().splitlines()) == 1
+        assert [r.basename for r in result.matched_files] == ['card.txt']
+        assert result.pan_count == 1
+
+
+    def test_mime_cache_serves_second_scan(self, tmp_path):
+        target = tmp_path / 'data'
+        target.mkdir()
+        (target / 'card.txt').write_text('4111 1111 1111 1111\n')
+        config = ScanConfiguration.from_args(
+            target_path=str(target), mime_cache_dir=str(tmp_path / 'state'), quiet=True, worker_count=1)
+
+        PanHuntService().scan(config)
+        with patch('panhunt.panutils.sniff', side_effect=AssertionError('detected again')):
+            result = PanHuntService().scan(config)
+
+        assert (tmp_path / 'state' / 'mimecache.sqlite3').exists()
+        assert result.pan_count == 1
+
+    def test_scan_state_carries_results_of_unchanged_files(self, tmp_path):
+        target = tmp_path / 'data'
+        target.mkdir()
+        (target / 'card.txt').write_text('4111 1111 1111 1111\n')
+        (target / 'clean.txt').write_text('nothing to see\n')
+        config = ScanConfiguration.from_args(
+            target_path=str(target), scan_state_dir=str(tmp_path / 'state'), quiet=True, worker_count=1)
+
+        PanHuntService().scan(config)
+        with patch('panhunt.dispatcher.panutils.get_mimetype', side_effect=RuntimeError('scanned again')):
+            result = PanHuntService().scan(config)
+
+        assert result.pan_count == 1
+        assert [f.basename for f in result.matched_files] == ['card.txt']
+
+        config.full_rescan = True
+        with patch('panhunt.dispatcher.panutils.get_mimetype', side_effect=RuntimeError('scanned again')):
+            result = PanHuntService().scan(config)
+        assert len(result.interesting_files) == 2
+
+    def test_scan_state_keeps_results_of_log_before_resume_offset(self, tmp_path):
+        target = tmp_path / 'logs'
+        target.mkdir()
+        log = target / 'app.log'
+        log.write_text('charged 4111 1111 1111 1111\n')
+        config = ScanConfiguration.from_args(
+            target_path=str(target), log_state_dir=str(tmp_path / 'state'),
+            scan_state_dir=str(tmp_path / 'state'), quiet=True, worker_count=1)
+
+        assert PanHuntService().scan(config).pan_count == 1
+
+        with log.open('a') as f:
+            f.write('refund 5555 5555 5555 4444\n')
+        result = PanHuntService().scan(config)
+        assert [f.basename for f in result.matched_files] == ['app.log']
+        assert [str(pan) for pan in result.matched_files[0].matches] == [
+            'Visa:411111******1111', 'Mastercard:555555******4444']
+
+        result = PanHuntService().scan(config)
+        assert result.pan_count == 2
+
+    def test_log_state_scans_only_appended_bytes(self, tmp_path):
+        target = tmp_path / 'logs'
+        target.mkdir()
+        log = target / 'app.log'
+        log.write_text('charged 4111 1111 1111 1111\n')
+        config = ScanConfiguration.from_args(
+            target_path=str(target), log_state_dir=str(tmp_path / 'state'), quiet=True, worker_count=1)
+
+        assert PanHuntService().scan(config).pan_count == 1
+        assert PanHuntService().scan(config).pan_count == 0
+
+        with log.open('a') as f:
+            f.write('refund 5555 5555 5555 4444\n')
+        result = PanHuntService().scan(config)
+        assert [str(pan) for pan in result.matched_files[0].matches] == ['Mastercard:555555******4444']
+
+        log.write_text('rewritten 4111 1111 1111 1111\n' * 3)
+        assert PanHuntService().scan(config).pan_count == 3
+
+
 class TestServiceValidation:
     def test_scan_rejects_non_configuration(self):
         service = PanHuntService()
@@ -0,0 +1,124 @@
+"""Tests for the built-in MIME signature table."""
+
+import gzip
+import io
+import lzma
+import tarfile
+import zipfile
+
+import pytest
+
+from panhunt import panutils
+from panhunt.factory import ScannerFactory
+from panhunt.signatures import DetectionStats, detection_stats, sniff, sniff_rfc822
+
+
+def _zip(members: list[tuple[str, str]]) -> bytes:
+    stream = io.BytesIO()
+    with zipfile.ZipFile(stream, 'w') as archive:
+        for name, content in members:
+            archive.writestr(zipfile.ZipInfo(name), content)
+    return stream.getvalue()
+
+
+def _tar() -> bytes:
+    stream = io.BytesIO()
+    with tarfile.open(fileobj=stream, mode='w') as archive:
+        info = tarfile.TarInfo('a.txt')
+        info.size = 2
+        archive.addfile(info, io.BytesIO(b'hi'))
+    return stream.getvalue()
+
+
+SAMPLES = {
+    'pdf': (b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n1 0 obj\n', ''),
+    'gzip': (gzip.compress(b'hello'), ''),
+    'xz': (lzma.compress(b'hello'), ''),
+    'zip': (_zip([('a.txt', 'hi')]), ''),
+    'odt': (_zip([('mimetype', 'application/vnd.oasis.opendocument.text'), ('content.xml', '<x/>')]), ''),
+    'tar': (_tar(), ''),
+    'pst': (b'!BDN' + b'\x00' * 508, '.pst'),
+    'doc': (b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1' + b'\x00' * 504, '.doc'),
+    'mbox': (b'From alice@example.com Mon Jan  1 00:00:00 2024\nFrom: alice@example.com\n\nbody\n', '.mbox'),
+    'eml': (b'Return-Path: <alice@example.com>\nFrom: alice@example.com\nSubject: hi\n\nbody\n', ''),
+    'text': (b'2024-01-01 INFO card 4111111111111111\n', '.log'),
+    'script': (b'#!/usr/bin/env python3\nimport os\nprint(os.getcwd())\n', '.py'),
+}
+
+
+class TestSniff:
+    @pytest.mark.parametrize('name', sorted(SAMPLES))
+    def test_common_formats_are_resolved(self, name):
+        header, extension = SAMPLES[name]
+        assert sniff(header[:2048], extension) is not None
+
+    @pytest.mark.parametrize('name', sorted(SAMPLES))
+    def test_file_type_matches_libmagic(self, name):
+        if not hasattr(panutils.magic, 'from_buffer'):
+            pytest.skip('libmagic is not available')
+        header, extension = SAMPLES[name]
+        sniffed = sniff(header[:2048], extension)
+        assert sniffed is not None
+        expected = panutils._parse_mime_data(panutils._get_magic().from_buffer(header[:2048]))
+        assert ScannerFactory._get_filetype(sniffed[0], extension) == ScannerFactory._get_filetype(expected[0], extension)
+
+    def test_odf_mimetype_member_is_reported(self):
+        header, _ = SAMPLES['odt']
+        assert sniff(header) == ('application/vnd.oasis.opendocument.text', 'binary')
+
+    def test_ole_without_office_extension_defers_to_libmagic(self):
+        header, _ = SAMPLES['doc']
+        assert sniff(header, '.msg') is None
+
+    @pytest.mark.parametrize('text', [
+        b'Subject: hi\nTo: bob@example.com\n\nbody\n',
+        b'{"card": "4111111111111111"}',
+        b'<svg xmlns="http://www.w3.org/2000/svg"/>',
+        b'%!PS-Adobe-3.0\n',
+        b'-----BEGIN PGP PUBLIC KEY BLOCK-----\n',
+    ])
+    def test_ambiguous_text_defers_to_libmagic(self, text):
+        assert sniff(text) is None
+
+    def test_mail_headers_are_resolved(self):
+        assert sniff(b'Received: from mx\n\nbody\n') == ('message/rfc822', 'us-ascii')
+        assert sniff(b'delivered-to: bob@example.com\n\nbody\n', complete=False) == ('message/rfc822', 'utf-8')
+        assert sniff(b'From: alice@example.com\n\nna\xefve latin-1\n') is None
+
+    def test_known_mail_accepts_any_header_fields(self):
+        header = b'X-Original-To: bob@example.com\nSubject: hi\n  folded\n\nbody\n'
+        assert sniff_rfc822(header) is None
+        assert sniff_rfc822(header, known_mail=True) == ('message/rfc822', 'us-ascii')
+        assert sniff_rfc822(b'Subject: hi\n\nbody\n', known_mail=True) is None
+
+    @pytest.mark.parametrize('extension', ['.eml', '.mbox'])
+    def test_generic_text_named_as_mail_defers_to_libmagic(self, extension):
+        assert sniff(b'import os\nprint(os.getcwd())\n', extension) is None
+
+    def test_ascii_prefix_of_longer_content_is_utf8(self):
+        assert sniff(b'a' * 2048, complete=False) == ('text/plain', 'utf-8')
+        assert sniff(b'abc') == ('text/plain', 'us-ascii')
+
+    def test_binary_content_defers_to_libmagic(self):
+        assert sniff(b'\x00\x01\x02\x03') is None
+        assert sniff(b'') is None
+
+
+class TestDetectionStats:
+    def test_hit_ratio_and_summary(self):
+        stats = DetectionStats()
+        stats.record(signature_hit=True)
+        stats.record(signature_hit=True)
+        stats.record(signature_hit=False)
+        assert stats.signature_hits == 2
+        assert stats.libmagic_calls == 1
+        assert stats.hit_ratio == pytest.approx(2 / 3)
+        assert '2 of 3 resolved by signature' in stats.summary()
+
+    def test_get_mimetype_records_signature_hits(self, tmp_path):
+        path = tmp_path / 'report.pdf'
+        path.write_bytes(b'%PDF-1.7\n')
+        detection_stats.reset()
+        assert panutils.get_mimetype(path=str(path)) == ('application/pdf', 'binary', None)
+        assert detection_stats.signature_hits == 1
+        assert detection_stats.libmagic_calls == 0
@@ -0,0 +1,101 @@
+"""Tests for streaming result sinks."""
+
+import json
+from datetime import datetime
+
+import pytest
+
+from panhunt.enums import ScanStatusEnum
+from panhunt.finding import Finding
+from panhunt.models import ScanResult
+from panhunt.pan import PAN
+from panhunt.report import ReportGenerator
+from panhunt.sink import FindingRecord, NdjsonResultSink
+
+
+def _finding(name: str, error: bool = False) -> Finding:
+    finding = Finding(basename=name, dirname='/data', payload=b'x' * 10,
+                      mimetype='text/plain', encoding='utf-8',
+                      err=ValueError('unreadable') if error else None)
+    if not error:
+        finding.matches = [PAN(brand='Visa', pan='4111111111111111')]
+    return finding
+
+
+class TestFindingRecord:
+    def test_round_trip(self):
+        record = FindingRecord.from_finding(_finding('a.txt'))
+        restored = FindingRecord.from_json(record.to_json())
+        assert restored == record
+        assert restored.status == ScanStatusEnum.Success
+        assert restored.size == 10
+
+    def test_matches_are_stored_masked(self):
+        record = FindingRecord.from_finding(_finding('a.txt'))
+        assert '4111111111111111' not in record.to_json()
+        assert record.matches == [str(PAN(brand='Visa', pan='4111111111111111'))]
+
+
+class TestNdjsonResultSink:
+    def test_each_write_is_flushed_as_one_line(self, tmp_path):
+        path = tmp_path / 'out' / 'results.ndjson'
+        sink = NdjsonResultSink(str(path))
+        sink.write(_finding('a.txt'))
+        lines = path.read_text(encoding='utf-8').splitlines()
+        assert len(lines) == 1
+        assert json.loads(lines[0])['basename'] == 'a.txt'
+        sink.close()
+
+    def test_views_split_by_status(self, tmp_path):
+        sink = NdjsonResultSink(str(tmp_path / 'results.ndjson'))
+        sink.write(_finding('a.txt'))
+        sink.write(_finding('b.txt', error=True))
+        sink.write(_finding('c.txt'))
+        sink.close()
+
+        assert [r.basename for r in sink.findings()] == ['a.txt', 'c.txt']
+        assert [r.basename for r in sink.failures()] == ['b.txt']
+        assert sink.findings()[-1].basename == 'c.txt'
+        assert len(sink.failures()) == 1
+
+    def test_view_is_point_in_time(self, tmp_path):
+        sink = NdjsonResultSink(str(tmp_path / 'results.ndjson'))
+        sink.write(_finding('a.txt'))
+        view = sink.findings()
+        sink.write(_finding('b.txt'))
+        assert len(view) == 1
+        assert [r.basename for r in view] == ['a.txt']
+        sink.close()
+
+    def test_existing_records_are_not_part_of_result(self, tmp_path):
+        path = tmp_path / 'results.ndjson'
+        first = NdjsonResultSink(str(path))
+        first.write(_finding('old.txt'))
+        first.close()
+
+        second = NdjsonResultSink(str(path))
+        second.write(_finding('new.txt'))
+        second.close()
+
+        assert [r.basename for r in second.findings()] == ['new.txt']
+        assert len(path.read_text(encoding='utf-8').splitlines()) == 2
+
+    def test_write_after_close_raises(self, tmp_path):
+        sink = NdjsonResultSink(str(tmp_path / 'results.ndjson'))
+        sink.close()
+        with pytest.raises(ValueError, match='closed'):
+            sink.write(_finding('a.txt'))
+
+    def test_report_is_built_from_sink(self, tmp_path, config):
+        sink = NdjsonResultSink(str(tmp_path / 'results.ndjson'))
+        sink.write(_finding('a.txt'))
+        sink.write(_finding('b.txt', error=True))
+        sink.close()
+        result = ScanResult(matched_files=sink.findings(), interesting_files=sink.failures(),
+                            start_time=datetime.now(), end_time=datetime.now(), config=config)
+
+        text = ReportGenerator().generate_text(result)
+
+        assert 'Found 1 possible PANs' in text
+        assert 'FOUND PANs: /data/a.txt' in text
+        assert '/data/b.txt' in text